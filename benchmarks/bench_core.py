@@ -295,6 +295,54 @@ def bench_eval_conditional_expression():
     result = runtime._evaluate_condition("x >= min_val", context)
 
 
+# =============================================================================
+# Component Execution Benchmarks
+# =============================================================================
+
+EXECUTION_COMPONENT = '''
+<q:component name="Execution">
+    <q:set name="total" value="0" type="number" />
+    <q:set name="evens" value="0" type="number" />
+    <q:loop type="range" var="i" from="1" to="50">
+        <q:set name="total" value="{total + i}" type="number" />
+        <q:if condition="i % 2 == 0">
+            <q:set name="evens" value="{evens + 1}" type="number" />
+        </q:if>
+    </q:loop>
+    <q:loop type="list" var="color" items="red,green,blue">
+        <q:set name="last" value="{color}" />
+    </q:loop>
+    <div><p>{total}</p></div>
+    <q:return value="{total}" />
+</q:component>
+'''
+
+_execution_ast = None
+
+
+def _get_execution_ast():
+    global _execution_ast
+    if _execution_ast is None:
+        _execution_ast = QuantumParser().parse(EXECUTION_COMPONENT)
+    return _execution_ast
+
+
+@benchmark("execute_interpreted", category="execution", iterations=500, warmup=50)
+def bench_execute_interpreted():
+    """Benchmark component execution with the AST interpreter"""
+    from runtime.component import ComponentRuntime
+    runtime = ComponentRuntime(execution_mode='interpreted')
+    runtime.execute_component(_get_execution_ast())
+
+
+@benchmark("execute_compiled", category="execution", iterations=500, warmup=50)
+def bench_execute_compiled():
+    """Benchmark component execution with the closure compiler"""
+    from runtime.component import ComponentRuntime
+    runtime = ComponentRuntime(execution_mode='compiled')
+    runtime.execute_component(_get_execution_ast())
+
+
 # =============================================================================
 # Pure Python Comparisons (baseline)
 # =============================================================================
@@ -357,6 +405,7 @@ def run_core_benchmarks():
     suite = BenchmarkSuite("Quantum Core Benchmarks")
     suite.run_category("parsing")
     suite.run_category("expression")
+    suite.run_category("execution")
     suite.run_category("baseline_python")
     suite.print_summary()
     return suite
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+"""
+Job Queue Benchmark
+
+Measures JobQueueService workers:
+- Fan-out dispatch: dispatch() per job vs. dispatch_batch() (one commit)
+- Throughput: jobs/sec draining a backlog with 4 workers, claiming one job
+  at a time vs. batches with grouped completion commits
+- Dispatch-to-start latency of jobs dispatched one at a time to idle workers
+  (p50/p99), with dispatch() waking the workers vs. polling only
+- CPU-bound jobs: WORKERS threads vs. a WorkerPool of WORKERS processes
+
+Run: python benchmarks/bench_job_queue.py
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from runtime.job_executor import JobQueueService
+from runtime.job_worker_pool import WorkerPool
+
+BACKLOG = 2000
+WORKERS = 4
+LATENCY_SAMPLES = 50
+CPU_JOBS = 40
+CPU_LOOP = 1_000_000
+POLL_INTERVAL = 1.0
+
+
+def format_time(seconds: float) -> str:
+    """Format time in human-readable units"""
+    if seconds < 0.001:
+        return f"{seconds * 1_000_000:.2f} us"
+    elif seconds < 1:
+        return f"{seconds * 1_000:.2f} ms"
+    else:
+        return f"{seconds:.2f} s"
+
+
+def dispatch_rate(tmpdir: str, batched: bool) -> float:
+    """Jobs/sec dispatched one by one or in one batch"""
+    service = JobQueueService(db_path=os.path.join(tmpdir, f'dispatch-{batched}.db'))
+    jobs = [{'name': 'noop', 'params': {'n': n}} for n in range(BACKLOG)]
+
+    start = time.perf_counter()
+    if batched:
+        service.dispatch_batch(jobs)
+    else:
+        for job in jobs:
+            service.dispatch(job['name'], params=job['params'])
+    return BACKLOG / (time.perf_counter() - start)
+
+
+def throughput(tmpdir: str, batch_size: int) -> float:
+    """Jobs/sec for a backlog drained by WORKERS threads"""
+    service = JobQueueService(db_path=os.path.join(tmpdir, f'throughput-{batch_size}.db'))
+    done = threading.Semaphore(0)
+    service.register_handler('noop', lambda params: done.release())
+    service.dispatch_batch([{'name': 'noop', 'params': {'n': n}} for n in range(BACKLOG)])
+
+    start = time.perf_counter()
+    service.start_worker('default', POLL_INTERVAL, concurrency=WORKERS, batch_size=batch_size)
+    for _ in range(BACKLOG):
+        done.acquire()
+    elapsed = time.perf_counter() - start
+    service.stop_workers()
+    return BACKLOG / elapsed
+
+
+def latency(tmpdir: str, notify: bool):
+    """Dispatch-to-start latencies of jobs dispatched to idle workers"""
+    service = JobQueueService(db_path=os.path.join(tmpdir, f'latency-{notify}.db'))
+    if not notify:
+        # Workers only find jobs when their poll interval elapses
+        service._notify_workers = lambda: None
+
+    started = threading.Event()
+    start_times = []
+
+    def handler(params):
+        start_times.append(time.perf_counter())
+        started.set()
+
+    service.register_handler('ping', handler)
+    service.start_worker('default', POLL_INTERVAL, concurrency=WORKERS)
+    time.sleep(0.1)
+
+    samples = []
+    for _ in range(LATENCY_SAMPLES if notify else LATENCY_SAMPLES // 5):
+        started.clear()
+        dispatched = time.perf_counter()
+        service.dispatch('ping')
+        started.wait(POLL_INTERVAL * 2)
+        samples.append(start_times[-1] - dispatched)
+        # Land the next dispatch at a different point of the poll cycle
+        time.sleep(0.013)
+    service.stop_workers()
+
+    samples.sort()
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return statistics.median(samples), p99
+
+
+def cpu_job(params):
+    """CPU-bound handler (holds the GIL)"""
+    total = 0
+    for n in range(CPU_LOOP):
+        total += n * n
+    return total
+
+
+def register_jobs(queue):
+    queue.register_handler('cpu', cpu_job)
+
+
+def cpu_throughput(tmpdir: str, processes: bool) -> float:
+    """Jobs/sec for CPU-bound jobs run by WORKERS threads or processes"""
+    db_path = os.path.join(tmpdir, f'cpu-{processes}.db')
+    service = JobQueueService(db_path=db_path)
+    service.dispatch_batch([{'name': 'cpu'} for _ in range(CPU_JOBS)])
+
+    start = time.perf_counter()
+    if processes:
+        pool = WorkerPool(register_jobs, db_path=db_path, processes=WORKERS, poll_interval=0.05)
+        pool.start()
+    else:
+        register_jobs(service)
+        service.start_worker('default', POLL_INTERVAL, concurrency=WORKERS)
+    while service.get_queue_stats()['completed'] < CPU_JOBS:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    if processes:
+        pool.stop()
+    else:
+        service.stop_workers()
+    return CPU_JOBS / elapsed
+
+
+def main():
+    print("\n" + "=" * 70)
+    print("  JOB QUEUE BENCHMARK")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        print(f"  Backlog: {BACKLOG:,} jobs   Workers: {WORKERS}   Poll interval: {POLL_INTERVAL}s")
+        print(f"  ")
+        print(f"  {'Mode':<34} {'jobs/sec':>15}")
+        print(f"  {'-' * 50}")
+        print(f"  {'dispatch() per job':<34} {dispatch_rate(tmpdir, False):>15,.0f}")
+        print(f"  {'dispatch_batch()':<34} {dispatch_rate(tmpdir, True):>15,.0f}")
+        print(f"  {'Workers, claim 1 job':<34} {throughput(tmpdir, 1):>15,.0f}")
+        print(f"  {'Workers, claim 50 jobs':<34} {throughput(tmpdir, 50):>15,.0f}")
+        print(f"  ")
+        print(f"  {'Dispatch-to-start latency':<34} {'p50':>12} {'p99':>12}")
+        print(f"  {'-' * 60}")
+        for name, notify in (("Polling only", False), ("Woken by dispatch()", True)):
+            p50, p99 = latency(tmpdir, notify)
+            print(f"  {name:<34} {format_time(p50):>12} {format_time(p99):>12}")
+        print(f"  ")
+        print(f"  {'CPU-bound jobs (' + str(os.cpu_count()) + ' CPUs)':<34} {'jobs/sec':>15}")
+        print(f"  {'-' * 50}")
+        print(f"  {'Worker threads':<34} {cpu_throughput(tmpdir, False):>15,.1f}")
+        print(f"  {'Worker processes (incl. startup)':<34} {cpu_throughput(tmpdir, True):>15,.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+Service Container Benchmark
+
+Measures the per-request cost of building a ComponentRuntime:
+- Eager services (legacy: every service built for every request)
+- Per-request container (services created lazily, but not reused)
+- Shared container (process-wide services, what QuantumWebServer uses)
+
+Each simulated request constructs a runtime, executes a component that runs
+a q:query against SQLite, and renders it to HTML.
+
+Run: python benchmarks/bench_service_container.py
+"""
+
+import sys
+import time
+import sqlite3
+import tempfile
+import os
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.parser import QuantumParser
+from runtime.component import ComponentRuntime
+from runtime.renderer import HTMLRenderer
+from runtime.service_container import ServiceContainer
+
+# Services the legacy ComponentRuntime constructor created for every request
+LEGACY_EAGER_SERVICES = [
+    'database', 'invocation', 'data_import', 'logging', 'dump', 'file_upload',
+    'email', 'llm', 'knowledge', 'message_queue', 'job_executor',
+]
+
+COMPONENT = '''<?xml version="1.0" encoding="UTF-8"?>
+<q:component name="UserList">
+    <q:query name="users" datasource="bench">
+        SELECT id, name FROM users ORDER BY id LIMIT 20
+    </q:query>
+    <ul>
+        <q:loop query="users">
+            <li>{users.name}</li>
+        </q:loop>
+    </ul>
+</q:component>
+'''
+
+
+def format_time(seconds: float) -> str:
+    """Format time in human-readable units"""
+    if seconds < 0.001:
+        return f"{seconds * 1_000_000:.2f} us"
+    elif seconds < 1:
+        return f"{seconds * 1_000:.2f} ms"
+    else:
+        return f"{seconds:.2f} s"
+
+
+def create_database(tmpdir: str) -> str:
+    """Create a small SQLite database for the query"""
+    path = os.path.join(tmpdir, 'bench.db')
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.executemany("INSERT INTO users (name) VALUES (?)", [(f"user{i}",) for i in range(100)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+def handle_request(ast, config: dict, services: ServiceContainer = None, eager: bool = False) -> str:
+    """Simulate one HTTP request: build runtime, execute, render"""
+    if eager:
+        services = ServiceContainer(config)
+        for name in LEGACY_EAGER_SERVICES:
+            getattr(services, name)
+    runtime = ComponentRuntime(config=config, services=services)
+    runtime.execute_component(ast, {})
+    html = HTMLRenderer(runtime.execution_context).render(ast)
+    if eager or services is None:
+        # A per-request container dies with the request
+        runtime.services.shutdown()
+        runtime.database_service.close_all_connections()
+    return html
+
+
+def run_mode(name: str, ast, config: dict, iterations: int, **kwargs) -> float:
+    """Run one benchmark mode and return requests/sec"""
+    handle_request(ast, config, **kwargs)  # Warm up
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        handle_request(ast, config, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    rps = iterations / elapsed
+    print(f"  {name:<28} {format_time(elapsed / iterations):>12} {rps:>15,.0f}")
+    return rps
+
+
+def main():
+    print("\n" + "=" * 70)
+    print("  SERVICE CONTAINER BENCHMARK")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config = {
+            'datasources': {'bench': {'driver': 'sqlite', 'database': create_database(tmpdir)}},
+            'job_db_path': os.path.join(tmpdir, 'jobs.db'),
+        }
+        ast = QuantumParser().parse(COMPONENT)
+        iterations = 300
+
+        print(f"  Iterations: {iterations:,}")
+        print(f"  ")
+        print(f"  {'Mode':<28} {'Per request':>12} {'requests/sec':>15}")
+        print(f"  {'-' * 55}")
+
+        eager_rps = run_mode("Eager services (legacy)", ast, config, iterations, eager=True)
+        lazy_rps = run_mode("Per-request container", ast, config, iterations)
+
+        shared = ServiceContainer(config)
+        shared_rps = run_mode("Shared container", ast, config, iterations, services=shared)
+        shared.shutdown()
+
+        print(f"  ")
+        print(f"  Speedup (shared vs eager):       {shared_rps / eager_rps:.1f}x")
+        print(f"  Speedup (shared vs per-request): {shared_rps / lazy_rps:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
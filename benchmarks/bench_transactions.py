@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Transaction Benchmark
+
+Measures bulk writes from a q:loop of INSERT q:query statements:
+- Autocommit (no q:transaction: one COMMIT, and fsync, per row)
+- q:transaction, one execute() per row (single COMMIT)
+- q:transaction with batched writes (executemany(), what q:transaction does)
+
+Run: python benchmarks/bench_transactions.py
+"""
+
+import sys
+import time
+import tempfile
+import os
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.parser import QuantumParser
+from runtime import database_service
+from runtime.component import ComponentRuntime
+from runtime.database_service import DatabaseService
+from runtime.service_container import ServiceContainer
+
+ROWS = 500
+
+LOOP = f'''
+        <q:loop type="range" var="i" from="1" to="{ROWS}">
+            <q:query name="add" datasource="bench">
+                INSERT INTO items (name, qty) VALUES (:name, :qty)
+                <q:param name="name" value="item{{i}}" type="string" />
+                <q:param name="qty" value="{{i}}" type="integer" />
+            </q:query>
+        </q:loop>'''
+
+AUTOCOMMIT_COMPONENT = f'''<q:component name="BulkInsert">{LOOP}
+</q:component>'''
+
+TRANSACTION_COMPONENT = f'''<q:component name="BulkInsert">
+    <q:transaction>{LOOP}
+    </q:transaction>
+</q:component>'''
+
+
+def format_time(seconds: float) -> str:
+    """Format time in human-readable units"""
+    if seconds < 0.001:
+        return f"{seconds * 1_000_000:.2f} us"
+    elif seconds < 1:
+        return f"{seconds * 1_000:.2f} ms"
+    else:
+        return f"{seconds:.2f} s"
+
+
+def run_mode(name: str, source: str, tmpdir: str, iterations: int, batch_size: int) -> float:
+    """Run one benchmark mode and return inserted rows/sec"""
+    path = os.path.join(tmpdir, f'{name.split()[0].lower()}-{batch_size}.db')
+    service = DatabaseService(local_datasources={'bench': {'driver': 'sqlite', 'database': path}})
+    service.execute_query('bench', "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, qty INTEGER)")
+    services = ServiceContainer()
+    services._services['database'] = service
+    ast = QuantumParser().parse(source)
+
+    database_service.WRITE_BATCH_SIZE = batch_size
+    try:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            ComponentRuntime(services=services).execute_component(ast, {})
+        elapsed = time.perf_counter() - start
+    finally:
+        database_service.WRITE_BATCH_SIZE = 500
+
+    rows = service.execute_query('bench', "SELECT COUNT(*) AS n FROM items").data[0]['n']
+    assert rows == ROWS * iterations
+    service.shutdown()
+
+    rows_per_sec = rows / elapsed
+    print(f"  {name:<34} {format_time(elapsed / iterations):>12} {rows_per_sec:>15,.0f}")
+    return rows_per_sec
+
+
+def main():
+    print("\n" + "=" * 70)
+    print("  TRANSACTION BENCHMARK")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        iterations = 5
+
+        print(f"  Rows per request: {ROWS:,}   Requests: {iterations}")
+        print(f"  ")
+        print(f"  {'Mode':<34} {'Per request':>12} {'rows/sec':>15}")
+        print(f"  {'-' * 63}")
+
+        autocommit = run_mode("Autocommit (no q:transaction)", AUTOCOMMIT_COMPONENT, tmpdir, iterations, 500)
+        unbatched = run_mode("q:transaction, execute() per row", TRANSACTION_COMPONENT, tmpdir, iterations, 1)
+        batched = run_mode("q:transaction, executemany()", TRANSACTION_COMPONENT, tmpdir, iterations, 500)
+
+        print(f"  ")
+        print(f"  Speedup (transaction vs autocommit):  {unbatched / autocommit:.1f}x")
+        print(f"  Speedup (batched vs autocommit):      {batched / autocommit:.1f}x")
+        print(f"  Speedup (batched vs per-row execute): {batched / unbatched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,8 @@ TARGETS = ['html', 'desktop', 'mobile', 'textual', 'all']
 @click.option('--clean', is_flag=True, help='Clean output directory before build')
 @click.option('--config', '-c', type=click.Path(), default='quantum.config.yaml',
               help='Config file path')
+@click.option('--precompile', is_flag=True,
+              help='Precompile .q files into the persistent AST cache (.quantum/ast_cache)')
 @click.option('--debug', is_flag=True, help='Debug mode with verbose output')
 @click.option('--quiet', '-q', is_flag=True, help='Quiet mode')
 def build(
@@ -42,6 +44,7 @@ def build(
     watch: bool,
     clean: bool,
     config: str,
+    precompile: bool,
     debug: bool,
     quiet: bool
 ):
@@ -58,6 +61,8 @@ def build(
         quantum build --target all --output ./build
 
         quantum build --target mobile --no-minify
+
+        quantum build --precompile  # Servers start without parsing
     """
     console = get_console(quiet=quiet)
 
@@ -96,6 +101,11 @@ def build(
 
     console.info(f"Found {len(q_files)} .q files")
 
+    # Fill the persistent AST cache first; the target builds below then load
+    # the precompiled ASTs instead of parsing again
+    if precompile:
+        _precompile(project_root, q_files, config, debug, console)
+
     # Determine targets to build
     if target == 'all':
         targets_to_build = ['html', 'desktop', 'mobile', 'textual']
@@ -223,6 +233,43 @@ def _build_target(
     }
 
 
+def _precompile(project_root: Path, q_files: List[Path], config: str, debug: bool, console) -> None:
+    """Populate the persistent AST cache used by the web server and CLI."""
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+    import yaml
+    from core.parser import QuantumParser
+    from runtime.ast_cache import DEFAULT_AST_CACHE_DIR, get_ast_cache
+
+    # Same directory the server uses: performance.ast_cache_dir or the default
+    cache_dir = None
+    config_path = project_root / config
+    if config_path.exists():
+        with open(config_path, 'r', encoding='utf-8') as f:
+            performance = (yaml.safe_load(f) or {}).get('performance') or {}
+        cache_dir = performance.get('ast_cache_dir')
+    cache_dir = Path(cache_dir or DEFAULT_AST_CACHE_DIR)
+    if not cache_dir.is_absolute():
+        cache_dir = project_root / cache_dir
+
+    cache = get_ast_cache()
+    cache.configure(cache_dir=cache_dir)
+
+    with console.spinner("Precompiling .q files..."):
+        result = cache.precompile(q_files, QuantumParser(), prune=True)
+
+    console.success(
+        f"Precompiled {result['compiled']} files "
+        f"({result['cached']} up to date, {result['pruned']} stale removed) into {cache_dir}"
+    )
+    if debug:
+        for path, error in result['failed']:
+            console.warning(f"Could not precompile {Path(path).name}: {error}")
+    elif result['failed']:
+        console.warning(f"{len(result['failed'])} files could not be precompiled (use --debug for details)")
+
+
 def _build_application(
     app,
     target: str,
@@ -76,6 +76,24 @@ def create_jobs_parser(subparsers):
     stop_worker = worker_sub.add_parser('stop', help='Stop worker')
     stop_worker.add_argument('--graceful', action='store_true', help='Wait for running jobs to complete')
 
+    # Worker processes
+    work_parser = jobs_sub.add_parser('work', help='Run jobs in a supervised pool of worker processes')
+    work_parser.add_argument('--handlers', required=True,
+                             help='Module whose register_jobs(queue) function registers the job handlers')
+    work_parser.add_argument('--processes', type=int, help='Number of worker processes (default: CPU count)')
+    work_parser.add_argument('--queue', default='default',
+                             help='Queue(s) to process (comma-separated, queue:N runs at most N jobs at once)')
+    work_parser.add_argument('--db', default='quantum_jobs.db', help='Job queue database')
+    work_parser.add_argument('--store', choices=['sqlite', 'redis', 'postgresql'],
+                             help='Job store (default: $QUANTUM_JOB_STORE or sqlite; redis uses $REDIS_*, '
+                                  'postgresql $QUANTUM_JOB_STORE_DSN)')
+    work_parser.add_argument('--poll-interval', type=float, default=1.0, help='Poll interval in seconds')
+    work_parser.add_argument('--lease', default='1m', help='Job lease, renewed while the job runs')
+    work_parser.add_argument('--drain-timeout', type=float, default=30.0,
+                             help='Seconds running jobs get to finish on SIGTERM')
+    work_parser.add_argument('--stats-interval', type=float, default=60.0,
+                             help='Log per-worker throughput every N seconds (0 = off)')
+
     # Queues management
     queues_parser = jobs_sub.add_parser('queues', help='Manage job queues')
     queues_sub = queues_parser.add_subparsers(dest='queues_action', help='Queue action')
@@ -99,10 +117,13 @@ def handle_jobs(args) -> int:
 
     if not args.jobs_action:
         print("Usage: quantum jobs <action>")
-        print("Actions: list, status, run, pause, resume, cancel, history, worker, queues")
+        print("Actions: list, status, run, pause, resume, cancel, history, worker, work, queues")
         return 1
 
     try:
+        if args.jobs_action == 'work':
+            return _handle_jobs_work(args)
+
         executor = JobExecutor()
 
         if args.jobs_action == 'list':
@@ -316,6 +337,41 @@ def _handle_jobs_worker(executor, args) -> int:
     return 1
 
 
+def _handle_jobs_work(args) -> int:
+    """Run a supervised pool of worker processes until SIGTERM or Ctrl+C"""
+    from runtime.job_worker_pool import WorkerPool
+
+    # The handler module is usually part of the application in the current directory
+    sys.path.insert(0, str(Path.cwd()))
+    pool = WorkerPool(
+        args.handlers,
+        db_path=args.db,
+        store={'backend': args.store} if args.store else None,
+        processes=args.processes,
+        queues=args.queue,
+        poll_interval=args.poll_interval,
+        lease=args.lease,
+        drain_timeout=args.drain_timeout,
+        stats_interval=args.stats_interval
+    )
+    print(f"Starting {pool.processes} worker process(es) on the {pool.backend} job store...")
+    for queue, limit in pool.queue_limits.items():
+        print(f"  Queue: {queue}" + (f" (at most {limit} at once)" if limit else ""))
+    print("")
+    print("Send SIGTERM or press Ctrl+C to drain and stop.")
+    print("")
+
+    stats = pool.run()
+
+    print("")
+    print(f"{'Worker':<8} {'PID':<8} {'Completed':>10} {'Failed':>8} {'Jobs/s':>8} {'Busy':>6} {'Restarts':>9}")
+    print("-" * 62)
+    for stat in stats:
+        print(f"{stat.worker:<8} {stat.pid or '-':<8} {stat.completed:>10} {stat.failed:>8} "
+              f"{stat.jobs_per_second:>8.2f} {stat.utilization:>6.0%} {stat.restarts:>9}")
+    return 0
+
+
 def _handle_jobs_queues(executor, args) -> int:
     """Handle queue management commands"""
     if not args.queues_action:
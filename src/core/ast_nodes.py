@@ -6,6 +6,8 @@ from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional, Union
 from dataclasses import dataclass, field
 
+from core.databinding import BindingTemplate, compile_template
+
 
 class QuantumNode(ABC):
     """Base class for all Quantum AST nodes"""
@@ -514,6 +516,10 @@ class ThreadNode(QuantumNode):
         <q:invoke url="/api/process" method="POST" />
       </q:thread>
 
+      <q:thread name="renderReport" timeout="10m" isolation="process">  <!-- Killed at timeout -->
+        <q:python>q.result = render(q.report)</q:python>
+      </q:thread>
+
       <q:thread name="worker1" action="join" />  <!-- Wait for thread -->
       <q:thread name="worker1" action="terminate" />  <!-- Kill thread -->
     """
@@ -523,6 +529,7 @@ class ThreadNode(QuantumNode):
     timeout: Optional[str] = None  # e.g., '30s', '5m'
     on_complete: Optional[str] = None  # Callback function name
     on_error: Optional[str] = None  # Error handler function name
+    isolation: str = 'thread'  # thread, process (killed on terminate/timeout)
     body: List['QuantumNode'] = field(default_factory=list)
 
     def add_statement(self, statement: 'QuantumNode'):
@@ -538,6 +545,7 @@ class ThreadNode(QuantumNode):
             "timeout": self.timeout,
             "on_complete": self.on_complete,
             "on_error": self.on_error,
+            "isolation": self.isolation,
             "body_statements": len(self.body)
         }
 
@@ -549,6 +557,8 @@ class ThreadNode(QuantumNode):
             errors.append(f"Invalid thread action: {self.action}. Must be run, join, or terminate")
         if self.priority not in ['low', 'normal', 'high']:
             errors.append(f"Invalid thread priority: {self.priority}. Must be low, normal, or high")
+        if self.isolation not in ['thread', 'process']:
+            errors.append(f"Invalid thread isolation: {self.isolation}. Must be thread or process")
         # Body required only for 'run' action
         if self.action == 'run' and not self.body:
             errors.append("Thread with action='run' requires body statements")
@@ -680,8 +690,14 @@ class QueryNode(QuantumNode):
         self.paginate = False  # Enable automatic pagination
         self.page = None
         self.page_size = 20
+        self.pagination = 'count'  # count, window (COUNT(*) OVER()) or keyset
+        self.count_cache = None  # Seconds or duration to cache the COUNT(*) total
+        self.order_by = None  # Keyset columns ("id", "created_at DESC, id")
+        self.cursor = None  # Keyset cursor token (databound)
         self.timeout = None
         self.maxrows = None
+        self.stream = False  # Fetch rows lazily through a server-side cursor
+        self.fetch_size = None  # Rows per round trip when streaming
         self.result = None  # Variable name for metadata
 
     def add_param(self, param: 'QueryParamNode'):
@@ -798,6 +814,13 @@ class HTMLNode(QuantumNode):
         self.children = children or []
         self.self_closing = self_closing or tag in HTML_VOID_ELEMENTS
 
+        # Attribute values with {databinding}, pre-tokenized for the renderer
+        self.attribute_templates: Dict[str, BindingTemplate] = {
+            key: compile_template(value)
+            for key, value in self.attributes.items()
+            if isinstance(value, str) and '{' in value
+        }
+
         # Future: client-side event handlers (Phase 3)
         self.has_events = self._detect_event_handlers()
 
@@ -846,6 +869,10 @@ class TextNode(QuantumNode):
     def __init__(self, content: str):
         self.content = content
         self.has_databinding = '{' in content and '}' in content
+        # Pre-tokenized {databinding} segments for the renderer
+        self.template: Optional[BindingTemplate] = (
+            compile_template(content) if self.has_databinding else None
+        )
 
     def to_dict(self) -> Dict[str, Any]:
         preview = self.content[:50] + '...' if len(self.content) > 50 else self.content
@@ -1502,13 +1529,23 @@ class TransactionNode(QuantumNode):
         <q:query>UPDATE accounts SET balance = balance - 100 WHERE id = 1</q:query>
         <q:query>UPDATE accounts SET balance = balance + 100 WHERE id = 2</q:query>
       </q:transaction>
+
+      <!-- Repeated inserts sent with executemany(); queued runs report no
+           row counts and their errors surface when the batch is flushed -->
+      <q:transaction batch="true">
+        <q:loop type="array" var="item" items="{items}">
+          <q:query>INSERT INTO items (name) VALUES (:name)</q:query>
+        </q:loop>
+      </q:transaction>
     """
     
     def __init__(
         self,
-        isolation_level: str = "READ_COMMITTED"
+        isolation_level: str = "READ_COMMITTED",
+        batch: bool = False
     ):
         self.isolation_level = isolation_level  # READ_UNCOMMITTED, READ_COMMITTED, REPEATABLE_READ, SERIALIZABLE
+        self.batch = batch  # Queue repeated INSERT/UPDATE statements for executemany()
         self.statements: List[QuantumNode] = []  # Queries and other statements inside transaction
     
     def add_statement(self, statement: QuantumNode):
@@ -1519,6 +1556,7 @@ class TransactionNode(QuantumNode):
         return {
             "type": "transaction",
             "isolation_level": self.isolation_level,
+            "batch": self.batch,
             "statements": [s.to_dict() if hasattr(s, 'to_dict') else str(s) for s in self.statements]
         }
     
@@ -0,0 +1,293 @@
+"""
+Quantum Databinding Templates
+
+Pre-tokenized {expression} templates for text and attribute values.
+
+The parser splits every TextNode and HTMLNode attribute value once into
+literal segments and binding accessors, so rendering only resolves the
+bindings and joins the pieces: no regex and no evaluation cascade per
+request.
+
+Binding kinds (classified at parse time):
+- VariableBinding: {name}
+- PathBinding: {user.address.city}, {items.length}
+- IndexBinding: {items[0]}, {products[2].name}
+- ExpressionBinding: {price * quantity}, compiled to an ExpressionCache
+  code object; anything else it cannot handle is passed to the renderer's
+  own evaluator
+
+Example:
+    template = compile_template("Hello {user.name}!")
+    template.render(context, renderer._evaluate_expression)
+"""
+
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Union
+
+DATABINDING_PATTERN = re.compile(r'\{([^}]+)\}')
+
+_identifier_pattern = re.compile(r'^\w+$')
+_path_pattern = re.compile(r'^\w+(?:\.\w+)+$')
+_index_pattern = re.compile(r'^(\w+)\[(\d+)\]((?:\.\w+)*)$')
+
+_comparison_ops = ('==', '!=', '>=', '<=', '>', '<')
+_arithmetic_ops = ('+', '-', '*', '/', '(', ')')
+
+# fn(expression) -> value; the renderer's full evaluator
+Fallback = Callable[[str], Any]
+
+_expression_cache = None
+
+
+def _get_expression_cache():
+    # Imported lazily: core must stay importable without the runtime
+    global _expression_cache
+    if _expression_cache is None:
+        from runtime.expression_cache import get_expression_cache
+        _expression_cache = get_expression_cache()
+    return _expression_cache
+
+
+class BindingError(Exception):
+    """Raised when a binding cannot be resolved against the context"""
+    pass
+
+
+class Binding(ABC):
+    """A single {expression} inside a template"""
+
+    __slots__ = ('expression',)
+
+    def __init__(self, expression: str):
+        self.expression = expression
+
+    @abstractmethod
+    def resolve(self, context, fallback: Optional[Fallback] = None) -> Any:
+        """
+        Resolve the binding against an ExecutionContext.
+
+        Raises:
+            Exception: If the expression cannot be evaluated
+        """
+        pass
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.expression!r})'
+
+
+class VariableBinding(Binding):
+    """{name} - direct variable lookup"""
+
+    __slots__ = ()
+
+    def resolve(self, context, fallback: Optional[Fallback] = None) -> Any:
+        return context.get_variable(self.expression)
+
+
+class PathBinding(Binding):
+    """{user.address.city} - dotted property path"""
+
+    __slots__ = ('parts',)
+
+    def __init__(self, expression: str):
+        super().__init__(expression)
+        self.parts = expression.split('.')
+
+    def resolve(self, context, fallback: Optional[Fallback] = None) -> Any:
+        # Scoped and flattened names (session.userId, task.title) win
+        try:
+            return context.get_variable(self.expression)
+        except Exception:
+            pass
+
+        current = context.get_variable(self.parts[0])
+        for part in self.parts[1:]:
+            if current is None:
+                break
+            if isinstance(current, Mapping):
+                current = current.get(part)
+            elif isinstance(current, list):
+                # Array properties like items.length
+                current = len(current) if part == 'length' else None
+                break
+            elif hasattr(current, part) and not callable(getattr(current, part)):
+                current = getattr(current, part)
+            else:
+                current = None
+
+        if current is None:
+            raise BindingError(f"Cannot evaluate expression: {self.expression}")
+        return current
+
+
+class IndexBinding(Binding):
+    """{items[0]} / {products[2].name} - array index with optional path"""
+
+    __slots__ = ('name', 'index', 'parts')
+
+    def __init__(self, expression: str, name: str, index: int, path: str):
+        super().__init__(expression)
+        self.name = name
+        self.index = index
+        self.parts = path.split('.')[1:] if path else []
+
+    def resolve(self, context, fallback: Optional[Fallback] = None) -> Any:
+        try:
+            return context.get_variable(self.expression)
+        except Exception:
+            pass
+
+        array = context.get_variable(self.name)
+        element = None
+        if isinstance(array, list) and 0 <= self.index < len(array):
+            element = array[self.index]
+            for part in self.parts:
+                if isinstance(element, Mapping):
+                    element = element.get(part)
+                elif hasattr(element, part):
+                    element = getattr(element, part)
+                else:
+                    element = None
+                    break
+
+        if element is None:
+            raise BindingError(f"Cannot evaluate expression: {self.expression}")
+        return element
+
+
+class ExpressionBinding(Binding):
+    """
+    {price * quantity} - any other expression.
+
+    Pure arithmetic is pre-compiled through the ExpressionCache and evaluated
+    against the live variable view; a numeric result is returned directly.
+    Everything else (comparisons, failed evaluations) goes to the fallback.
+    """
+
+    __slots__ = ('code',)
+
+    def __init__(self, expression: str):
+        super().__init__(expression)
+        self.code = None
+        if (
+            '.' not in expression and '[' not in expression
+            and not any(op in expression for op in _comparison_ops)
+            and any(op in expression for op in _arithmetic_ops)
+        ):
+            self.code = _get_expression_cache().compile(expression)
+
+    def __reduce__(self):
+        # Code objects don't pickle; recompile on load
+        return (ExpressionBinding, (self.expression,))
+
+    def resolve(self, context, fallback: Optional[Fallback] = None) -> Any:
+        if self.code is not None:
+            variables = context.variables
+            if self.expression in variables:
+                return variables[self.expression]
+            try:
+                value = _get_expression_cache().evaluate_compiled(self.code, variables)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    return value
+            except Exception:
+                pass
+
+        if fallback is None:
+            raise BindingError(f"Cannot evaluate expression: {self.expression}")
+        return fallback(self.expression)
+
+
+def compile_binding(expression: str) -> Binding:
+    """Classify a {expression} into the cheapest binding that resolves it"""
+    if _identifier_pattern.match(expression):
+        return VariableBinding(expression)
+    if _path_pattern.match(expression):
+        return PathBinding(expression)
+    match = _index_pattern.match(expression)
+    if match:
+        return IndexBinding(expression, match.group(1), int(match.group(2)), match.group(3))
+    return ExpressionBinding(expression)
+
+
+class BindingTemplate:
+    """
+    A text or attribute value split into literal and binding segments.
+
+    A value that is exactly one {expression} (ignoring surrounding
+    whitespace) renders to the raw value (list, dict, number, ...);
+    mixed content renders to an interpolated string.
+    """
+
+    __slots__ = ('source', 'segments', 'single', 'has_bindings')
+
+    def __init__(self, source: str, segments: List[Union[str, Binding]],
+                 single: Optional[Binding] = None):
+        self.source = source
+        self.segments = segments
+        self.single = single
+        self.has_bindings = single is not None or any(
+            not isinstance(segment, str) for segment in segments
+        )
+
+    def render(self, context, fallback: Optional[Fallback] = None) -> Any:
+        """
+        Resolve the bindings against an ExecutionContext.
+
+        Unresolvable bindings render as the original text for a single
+        expression and as {ERROR: expression} inside mixed content.
+        """
+        if not self.has_bindings:
+            return self.source
+
+        single = self.single
+        if single is not None:
+            try:
+                return single.resolve(context, fallback)
+            except Exception:
+                # If evaluation fails, return original placeholder
+                return self.source
+
+        parts = []
+        for segment in self.segments:
+            if segment.__class__ is str:
+                parts.append(segment)
+                continue
+            try:
+                value = segment.resolve(context, fallback)
+                parts.append(str(value) if value is not None else '')
+            except Exception:
+                parts.append(f'{{ERROR: {segment.expression}}}')
+        return ''.join(parts)
+
+    def __repr__(self) -> str:
+        return f'BindingTemplate({self.segments!r})'
+
+
+@lru_cache(maxsize=4096)
+def compile_template(text: str) -> BindingTemplate:
+    """
+    Split text into literal segments and compiled bindings.
+
+    Templates are immutable, so identical values share one template.
+    """
+    if not text:
+        return BindingTemplate(text, [])
+
+    full_match = DATABINDING_PATTERN.fullmatch(text.strip())
+    if full_match:
+        return BindingTemplate(text, [], compile_binding(full_match.group(1).strip()))
+
+    segments: List[Union[str, Binding]] = []
+    position = 0
+    for match in DATABINDING_PATTERN.finditer(text):
+        if match.start() > position:
+            segments.append(text[position:match.start()])
+        segments.append(compile_binding(match.group(1).strip()))
+        position = match.end()
+    if position < len(text):
+        segments.append(text[position:])
+
+    return BindingTemplate(text, segments)
@@ -3,6 +3,7 @@ Runtime service for q:dump - Variable Inspection
 """
 
 import json
+from collections.abc import Mapping
 from typing import Any, Dict, Set
 from html import escape
 
@@ -63,9 +64,12 @@ class DumpService:
 
     def _dump_json(self, var: Any, label: str) -> str:
         """Dump as pretty-printed JSON"""
+        # Imported here: runtime imports this package while it initializes
+        from runtime.query_stream import json_default
+
         output = [f"=== {label} ==="]
         try:
-            json_str = json.dumps(var, indent=2, default=str)
+            json_str = json.dumps(var, indent=2, default=json_default)
             output.append(json_str)
         except Exception as e:
             output.append(f"Error dumping as JSON: {e}")
@@ -109,8 +113,8 @@ class DumpService:
             output.append(f"{prefix}{label} => {value_repr} ({type_name})")
             return '\n'.join(output)
 
-        # Handle dictionaries/objects
-        if isinstance(var, dict):
+        # Handle dictionaries/objects (query rows are Row mappings)
+        if isinstance(var, Mapping):
             output.append(f"{prefix}{label} (dict, {len(var)} items):")
             for key, value in var.items():
                 sub_output = self._dump_text(
@@ -194,8 +198,8 @@ class DumpService:
         elif isinstance(var, str):
             output.append(f'<span style="color: #cc6600;">"{escape(var)}"</span>')
             output.append(f' <span style="color: #999; font-size: 0.9em;">(string)</span>')
-        # Handle dictionaries/objects
-        elif isinstance(var, dict):
+        # Handle dictionaries/objects (query rows are Row mappings)
+        elif isinstance(var, Mapping):
             output.append(f'<span style="color: #999;">(dict, {len(var)} items)</span>')
             output.append('<ul style="margin: 5px 0; padding-left: 20px; list-style: none;">')
             for key, value in var.items():
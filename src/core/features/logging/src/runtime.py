@@ -128,7 +128,9 @@ class LoggingService:
             # For Phase 1, just log the message. Phase 2 will log full JSON
             extra_info = []
             if context:
-                extra_info.append(f"context={json.dumps(context)}")
+                # Imported here: runtime imports this package while it initializes
+                from runtime.query_stream import json_default
+                extra_info.append(f"context={json.dumps(context, default=json_default)}")
             if correlation_id:
                 extra_info.append(f"correlation_id={correlation_id}")
 
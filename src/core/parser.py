@@ -68,6 +68,41 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# AST memory model (bytes), calibrated against sys.getsizeof() walks of the
+# example applications: root node bookkeeping, one node per element, one
+# node field per attribute, plus the text itself
+_FOOTPRINT_BASE = 3072
+_FOOTPRINT_PER_ELEMENT = 200
+_FOOTPRINT_PER_ATTRIBUTE = 160
+_FOOTPRINT_PER_CHAR = 1.3
+
+
+def estimate_footprint(root: ET.Element) -> int:
+    """
+    Estimate the in-memory size of the AST built from an element tree.
+
+    Counts elements, attributes and text length while the tree is still at
+    hand, which is far cheaper than measuring the finished AST.
+
+    Returns:
+        Approximate AST size in bytes
+    """
+    elements = attributes = chars = 0
+    for element in root.iter():
+        elements += 1
+        chars += len(element.text or '') + len(element.tail or '')
+        attrib = element.attrib
+        if attrib:
+            attributes += len(attrib)
+            for name, value in attrib.items():
+                chars += len(name) + len(value)
+    return int(
+        _FOOTPRINT_BASE
+        + _FOOTPRINT_PER_ELEMENT * elements
+        + _FOOTPRINT_PER_ATTRIBUTE * attributes
+        + _FOOTPRINT_PER_CHAR * chars
+    )
+
 
 def _create_parser_registry(parser: 'QuantumParser') -> ParserRegistry:
     """
@@ -268,7 +303,10 @@ class QuantumParser:
         try:
             content = self._inject_namespace(source)
             root = ET.fromstring(content)
-            return self._parse_root_element(root, Path("<string>"))
+            ast = self._parse_root_element(root, Path("<string>"))
+            # Used by ASTCache for memory accounting
+            ast.memory_footprint = estimate_footprint(root)
+            return ast
         except ET.ParseError as e:
             raise QuantumParseError(f"XML parse error: {e}")
         except QuantumParseError:
@@ -1140,6 +1178,7 @@ class QuantumParser:
         thread_node.timeout = element.get('timeout')
         thread_node.on_complete = element.get('onComplete')
         thread_node.on_error = element.get('onError')
+        thread_node.isolation = element.get('isolation', 'thread')
 
         # Parse body statements
         for child in element:
@@ -1408,14 +1447,19 @@ class QuantumParser:
 
         # Parse optional attributes
         query_node.source = source
-        query_node.cache = query_element.get('cache', 'false').lower() == 'true'
+        # cache="true" or a duration (cache="5m"); ttl in seconds or a duration
+        cache_attr = query_element.get('cache', 'false').strip()
+        if cache_attr.lower() in ('true', 'false'):
+            query_node.cache = cache_attr.lower() == 'true'
+        else:
+            query_node.cache = cache_attr
 
         ttl_attr = query_element.get('ttl')
         if ttl_attr:
             try:
                 query_node.ttl = int(ttl_attr)
             except ValueError:
-                pass
+                query_node.ttl = ttl_attr.strip()
 
         query_node.reactive = query_element.get('reactive', 'false').lower() == 'true'
 
@@ -1442,6 +1486,16 @@ class QuantumParser:
             except ValueError:
                 pass
 
+        query_node.pagination = query_element.get('pagination', 'count').strip().lower()
+        count_cache_attr = query_element.get('countCache')
+        if count_cache_attr:
+            try:
+                query_node.count_cache = int(count_cache_attr)
+            except ValueError:
+                query_node.count_cache = count_cache_attr.strip()
+        query_node.order_by = query_element.get('orderBy')
+        query_node.cursor = query_element.get('cursor')
+
         timeout_attr = query_element.get('timeout')
         if timeout_attr:
             try:
@@ -1456,6 +1510,15 @@ class QuantumParser:
             except ValueError:
                 pass
 
+        query_node.stream = query_element.get('stream', 'false').lower() == 'true'
+
+        fetch_size_attr = query_element.get('fetchSize')
+        if fetch_size_attr:
+            try:
+                query_node.fetch_size = int(fetch_size_attr)
+            except ValueError:
+                pass
+
         query_node.result = query_element.get('result')
 
         # Knowledge base / RAG attributes
@@ -2179,11 +2242,16 @@ class QuantumParser:
           <q:transaction isolationLevel="SERIALIZABLE">
             <!-- Critical financial operations -->
           </q:transaction>
+
+          <q:transaction batch="true">
+            <!-- Repeated inserts in a loop sent with executemany() -->
+          </q:transaction>
         """
         isolation_level = element.get('isolationLevel', 'READ_COMMITTED')
+        batch = element.get('batch', 'false').lower() == 'true'
 
         # Create transaction node
-        transaction_node = TransactionNode(isolation_level=isolation_level)
+        transaction_node = TransactionNode(isolation_level=isolation_level, batch=batch)
 
         # Parse child statements (queries, sets, etc.)
         for child in element:
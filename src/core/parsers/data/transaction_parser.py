@@ -44,6 +44,9 @@ class TransactionParser(BaseTagParser):
         # Optional isolation level
         transaction_node.isolation = self.get_attr(element, 'isolation')
 
+        # Opt-in executemany() batching of repeated writes
+        transaction_node.batch = self.get_bool_attr(element, 'batch')
+
         # Parse child statements
         for child in element:
             statement = self.parse_statement(child)
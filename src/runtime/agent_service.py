@@ -49,12 +49,14 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional, Callable, Set
 from dataclasses import dataclass, field
 from collections import defaultdict
+from collections.abc import Mapping
 
 # Import multi-provider LLM support
 from runtime.llm_providers import (
     get_llm_provider, MultiProviderLLMService, LLMProviderError,
     BaseLLMProvider
 )
+from runtime.query_stream import json_default
 
 logger = logging.getLogger(__name__)
 
@@ -341,8 +343,8 @@ IMPORTANT: Always respond with valid JSON in the format shown above. Nothing els
                     tool_result_msg = f"Tool '{tool_name}' failed with error: {tool_call.error}"
                 else:
                     # Format result as string
-                    if isinstance(tool_call.result, (dict, list)):
-                        tool_result_str = json.dumps(tool_call.result, indent=2, default=str)
+                    if isinstance(tool_call.result, (Mapping, list)):
+                        tool_result_str = json.dumps(tool_call.result, indent=2, default=json_default)
                     else:
                         tool_result_str = str(tool_call.result)
                     tool_result_msg = f"Tool '{tool_name}' returned:\n{tool_result_str}"
@@ -7,8 +7,20 @@ Uses mtime-based invalidation to detect file changes.
 Performance Impact:
 - 10-50x speedup on subsequent file loads
 - Automatic invalidation when files change
-- LRU eviction with configurable size
+- O(1) LRU eviction with configurable size (entries and/or memory budget)
+- Optional TTL (entries are re-parsed after ttl seconds)
 - Thread-safe implementation
+- Optional persistent cache directory (.qc files, like __pycache__) shared
+  by every worker process and CLI run
+
+Persistent cache:
+    Serialized ASTs are stored as <cache_dir>/<digest>.qc, where the digest
+    covers the source text and the parser fingerprint (parser version,
+    Python version and the core package sources). Files are content
+    addressed and written atomically (temp file + os.replace), so
+    concurrent readers never see a partial file and stale entries are
+    simply never looked up again. `quantum build --precompile` fills the
+    directory ahead of time.
 """
 
 import os
@@ -16,11 +28,27 @@ import hashlib
 import threading
 import time
 import pickle
+import sys
+import tempfile
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple, List
+from typing import Any, Callable, Dict, Optional, Tuple, List
 from dataclasses import dataclass, field
 from functools import lru_cache
 import weakref
+from collections import OrderedDict
+
+
+# Default persistent cache directory (relative to the project root)
+DEFAULT_AST_CACHE_DIR = os.path.join('.quantum', 'ast_cache')
+
+# Environment variable overriding the persistent cache directory
+AST_CACHE_DIR_ENV = 'QUANTUM_AST_CACHE_DIR'
+
+# Header of every .qc file (bump the last byte if the layout changes)
+QC_MAGIC = b'QC\x01\n'
+
+# Footprint assumed for ASTs that were not built by QuantumParser.parse()
+DEFAULT_FOOTPRINT = 10 * 1024
 
 
 @dataclass
@@ -30,6 +58,7 @@ class CacheEntry:
     mtime: float  # File modification time
     size: int  # File size in bytes
     hash: str  # Content hash for extra validation
+    footprint: int = DEFAULT_FOOTPRINT  # Estimated AST size in bytes
     created_at: float = field(default_factory=time.time)
     access_count: int = 0
     last_accessed: float = field(default_factory=time.time)
@@ -47,6 +76,10 @@ class CacheStats:
     misses: int = 0
     invalidations: int = 0
     evictions: int = 0
+    expirations: int = 0
+    disk_hits: int = 0
+    disk_writes: int = 0
+    compilations: int = 0
     total_parse_time_ms: float = 0.0
     total_cache_time_ms: float = 0.0
     entries_count: int = 0
@@ -68,6 +101,10 @@ class CacheStats:
             'hit_rate': f"{self.hit_rate:.1%}",
             'invalidations': self.invalidations,
             'evictions': self.evictions,
+            'expirations': self.expirations,
+            'disk_hits': self.disk_hits,
+            'disk_writes': self.disk_writes,
+            'compilations': self.compilations,
             'entries_count': self.entries_count,
             'memory_estimate_kb': f"{self.memory_estimate_kb:.1f}",
             'avg_parse_time_ms': f"{self.avg_parse_time_ms:.2f}",
@@ -82,9 +119,12 @@ class ASTCache:
     - Caches parsed ComponentNode objects by file path
     - Automatic invalidation based on file mtime and size
     - Optional content hash validation for extra safety
-    - LRU eviction with configurable max entries
+    - LRU eviction with configurable max entries and memory budget
+    - Optional time-to-live per entry
     - Statistics tracking for monitoring
     - Filesystem watch integration support
+    - Compiled (closure) form of each AST, stored beside it
+    - Persistent .qc files in cache_dir, checked before parsing
 
     Usage:
         cache = ASTCache(max_entries=100)
@@ -105,6 +145,8 @@ class ASTCache:
         enable_hash_validation: bool = False,
         enable_stats: bool = True,
         cache_dir: Optional[Path] = None,
+        ttl: Optional[float] = None,
+        max_memory_mb: Optional[float] = None,
     ):
         """
         Initialize the AST cache.
@@ -113,25 +155,35 @@ class ASTCache:
             max_entries: Maximum number of AST entries to cache
             enable_hash_validation: Whether to validate content hash (slower but safer)
             enable_stats: Whether to track performance statistics
-            cache_dir: Optional directory for persistent cache (not implemented yet)
+            cache_dir: Optional directory for persistent .qc files
+            ttl: Seconds an entry stays valid before it is re-parsed (None = forever)
+            max_memory_mb: Memory budget for cached ASTs (None = entries limit only)
         """
         self._max_entries = max_entries
+        self._max_bytes = _to_bytes(max_memory_mb)
+        self._ttl = ttl or None
         self._enable_hash = enable_hash_validation
         self._enable_stats = enable_stats
-        self._cache_dir = cache_dir
+        self._cache_dir = Path(cache_dir) if cache_dir else None
 
-        self._cache: Dict[str, CacheEntry] = {}
+        # Kept in LRU order: least recently used first
+        self._cache: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._total_bytes = 0  # Sum of entry footprints
         self._stats = CacheStats()
         self._lock = threading.RLock()
 
         # For dependency tracking (imports)
         self._dependencies: Dict[str, set] = {}  # file -> set of files it imports
 
+        # Compiled programs keyed by AST object; an entry disappears together
+        # with its AST once nothing references it anymore
+        self._compiled: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
     def _normalize_path(self, file_path: Any) -> str:
         """Normalize a file path to a canonical string key"""
-        if isinstance(file_path, Path):
-            return str(file_path.resolve())
-        return str(Path(file_path).resolve())
+        path = str(file_path)
+        # Relative paths resolve against the current directory
+        return _resolve_path(path, '' if os.path.isabs(path) else os.getcwd())
 
     def _compute_hash(self, content: str) -> str:
         """Compute a hash of the file content"""
@@ -161,26 +213,45 @@ class ASTCache:
 
         return True
 
-    def _evict_lru(self):
-        """Evict least recently used entries if over capacity"""
-        while len(self._cache) >= self._max_entries:
-            # Find LRU entry
-            lru_key = min(
-                self._cache.keys(),
-                key=lambda k: self._cache[k].last_accessed
-            )
-            del self._cache[lru_key]
+    def _is_expired(self, entry: CacheEntry) -> bool:
+        """Check if a cache entry has outlived the TTL"""
+        return self._ttl is not None and time.time() - entry.created_at > self._ttl
+
+    def _evict_lru(self, reserve: int = 1, reserve_bytes: int = 0):
+        """Evict least recently used entries to make room for new ones"""
+        while self._cache and (
+            len(self._cache) + reserve > self._max_entries
+            or (self._max_bytes is not None and self._total_bytes + reserve_bytes > self._max_bytes)
+        ):
+            _, entry = self._cache.popitem(last=False)
+            self._total_bytes -= entry.footprint
+            self._compiled.pop(entry.ast, None)
             if self._enable_stats:
                 self._stats.evictions += 1
 
-    def _estimate_memory(self, ast: Any) -> float:
-        """Estimate memory usage of an AST in KB"""
-        try:
-            # Rough estimate using pickle size
-            data = pickle.dumps(ast)
-            return len(data) / 1024
-        except:
-            return 10.0  # Default estimate
+    def _store(self, key: str, entry: CacheEntry):
+        """Insert an entry as most recently used, evicting others to fit it"""
+        # Replacing an entry must not evict another one
+        self._discard(key)
+        self._evict_lru(reserve_bytes=entry.footprint)
+        self._cache[key] = entry
+        self._total_bytes += entry.footprint
+        if self._enable_stats:
+            self._stats.entries_count = len(self._cache)
+
+    def _discard(self, key: str) -> Optional[CacheEntry]:
+        """Remove an entry and release its footprint"""
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.footprint
+        return entry
+
+    def _estimate_memory(self, ast: Any) -> int:
+        """Estimated AST size in bytes, recorded by the parser while parsing"""
+        footprint = getattr(ast, 'memory_footprint', None)
+        if isinstance(footprint, int) and footprint > 0:
+            return footprint
+        return DEFAULT_FOOTPRINT
 
     def get(self, file_path: Any) -> Optional[Any]:
         """
@@ -202,9 +273,17 @@ class ASTCache:
 
             entry = self._cache[key]
 
+            # Expired entries are re-parsed even if the file is unchanged
+            if self._is_expired(entry):
+                self._discard(key)
+                if self._enable_stats:
+                    self._stats.misses += 1
+                    self._stats.expirations += 1
+                return None
+
             # Validate entry
             if not self._is_valid(entry, key):
-                del self._cache[key]
+                self._discard(key)
                 if self._enable_stats:
                     self._stats.misses += 1
                     self._stats.invalidations += 1
@@ -212,6 +291,7 @@ class ASTCache:
 
             # Cache hit
             entry.touch()
+            self._cache.move_to_end(key)
             if self._enable_stats:
                 self._stats.hits += 1
 
@@ -250,8 +330,12 @@ class ASTCache:
                 with open(key, 'r', encoding='utf-8') as f:
                     content = f.read()
 
-            # Parse
-            ast = parser.parse(content)
+            # Load from the persistent cache, or parse and persist
+            ast = self._load_persisted(content)
+            from_disk = ast is not None
+            if not from_disk:
+                ast = parser.parse(content)
+                self._persist(content, ast)
 
             parse_time = (time.perf_counter() - start_time) * 1000
 
@@ -259,23 +343,22 @@ class ASTCache:
             mtime, size = self._get_file_info(key)
             content_hash = self._compute_hash(content) if self._enable_hash else ""
 
-            # Evict if needed
-            self._evict_lru()
-
-            # Cache the result
+            # Cache the result (evicts if needed)
             entry = CacheEntry(
                 ast=ast,
                 mtime=mtime,
                 size=size,
                 hash=content_hash,
+                footprint=self._estimate_memory(ast),
             )
-            self._cache[key] = entry
+            self._store(key, entry)
 
             # Update stats
             if self._enable_stats:
-                self._stats.total_parse_time_ms += parse_time
-                self._stats.entries_count = len(self._cache)
-                self._stats.memory_estimate_kb += self._estimate_memory(ast)
+                if from_disk:
+                    self._stats.disk_hits += 1
+                else:
+                    self._stats.total_parse_time_ms += parse_time
 
             return ast
 
@@ -296,18 +379,14 @@ class ASTCache:
             if self._enable_hash and content is not None:
                 content_hash = self._compute_hash(content)
 
-            self._evict_lru()
-
             entry = CacheEntry(
                 ast=ast,
                 mtime=mtime,
                 size=size,
                 hash=content_hash,
+                footprint=self._estimate_memory(ast),
             )
-            self._cache[key] = entry
-
-            if self._enable_stats:
-                self._stats.entries_count = len(self._cache)
+            self._store(key, entry)
 
     def invalidate(self, file_path: Optional[Any] = None):
         """
@@ -320,14 +399,17 @@ class ASTCache:
             if file_path is None:
                 count = len(self._cache)
                 self._cache.clear()
+                self._total_bytes = 0
                 self._dependencies.clear()
+                self._compiled.clear()
                 if self._enable_stats:
                     self._stats.invalidations += count
                     self._stats.entries_count = 0
             else:
                 key = self._normalize_path(file_path)
-                if key in self._cache:
-                    del self._cache[key]
+                entry = self._discard(key)
+                if entry is not None:
+                    self._compiled.pop(entry.ast, None)
                     if self._enable_stats:
                         self._stats.invalidations += 1
                         self._stats.entries_count = len(self._cache)
@@ -343,8 +425,7 @@ class ASTCache:
                 dependents.append(path)
 
         for dep_path in dependents:
-            if dep_path in self._cache:
-                del self._cache[dep_path]
+            if self._discard(dep_path) is not None:
                 if self._enable_stats:
                     self._stats.invalidations += 1
 
@@ -379,11 +460,181 @@ class ASTCache:
             except Exception:
                 pass  # Ignore errors during preload
 
+    def _persisted_path(self, content: str) -> Path:
+        """Path of the .qc file for a source text"""
+        digest = hashlib.sha256(
+            f'{parser_fingerprint()}\0{content}'.encode('utf-8')
+        ).hexdigest()
+        return self._cache_dir / f'{digest}.qc'
+
+    def _load_persisted(self, content: str) -> Optional[Any]:
+        """Load an AST from the persistent cache (None if absent or unreadable)"""
+        if self._cache_dir is None:
+            return None
+        try:
+            data = self._persisted_path(content).read_bytes()
+            if not data.startswith(QC_MAGIC):
+                return None
+            return pickle.loads(data[len(QC_MAGIC):])
+        except Exception:
+            # Missing, truncated by a crash or written by another version
+            return None
+
+    def _persist(self, content: str, ast: Any) -> bool:
+        """
+        Write an AST to the persistent cache atomically.
+
+        Returns:
+            True if the file was written (False for read-only dirs or ASTs
+            that cannot be pickled)
+        """
+        if self._cache_dir is None:
+            return False
+        tmp_path = None
+        try:
+            data = QC_MAGIC + pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL)
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._persisted_path(content))
+            tmp_path = None
+        except Exception:
+            return False
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+        if self._enable_stats:
+            self._stats.disk_writes += 1
+        return True
+
+    def precompile(self, file_paths: List[Any], parser: Any, prune: bool = False) -> Dict[str, Any]:
+        """
+        Parse files into the persistent cache ahead of time.
+
+        Files whose .qc is already up to date are not parsed again.
+
+        Args:
+            file_paths: .q files to precompile
+            parser: QuantumParser instance
+            prune: Remove .qc files that do not belong to any of file_paths
+
+        Returns:
+            {'compiled': n, 'cached': n, 'pruned': n, 'failed': [(path, error)]}
+        """
+        if self._cache_dir is None:
+            raise ValueError("precompile() requires a cache_dir")
+
+        result = {'compiled': 0, 'cached': 0, 'pruned': 0, 'failed': []}
+        keep = set()
+        for file_path in file_paths:
+            try:
+                content = Path(file_path).read_text(encoding='utf-8')
+                target = self._persisted_path(content)
+                keep.add(target.name)
+                if target.exists():
+                    result['cached'] += 1
+                    continue
+                if not self._persist(content, parser.parse(content)):
+                    raise OSError(f"Could not write {target}")
+                result['compiled'] += 1
+            except Exception as e:
+                result['failed'].append((str(file_path), str(e)))
+
+        if prune and self._cache_dir.exists():
+            for path in self._cache_dir.glob('*.qc'):
+                if path.name not in keep:
+                    path.unlink()
+                    result['pruned'] += 1
+
+        return result
+
+    def get_compiled(self, ast: Any, compiler: Callable[[Any], Any]) -> Any:
+        """
+        Get the compiled form of an AST, compiling it on first use.
+
+        Args:
+            ast: A parsed ComponentNode (usually one returned by get_or_parse)
+            compiler: Callable turning the AST into its compiled form
+
+        Returns:
+            The compiled program cached for this AST object
+        """
+        with self._lock:
+            compiled = self._compiled.get(ast)
+            if compiled is None:
+                compiled = compiler(ast)
+                self._compiled[ast] = compiled
+                if self._enable_stats:
+                    self._stats.compilations += 1
+            return compiled
+
+    def configure(
+        self,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        cache_dir: Optional[Any] = None,
+        max_memory_mb: Optional[float] = None,
+    ):
+        """
+        Change the capacity and/or TTL of a live cache.
+
+        Used to apply server configuration to the shared instance; shrinking
+        evicts least recently used entries right away.
+
+        Args:
+            max_entries: New maximum number of entries (None = unchanged)
+            ttl: New time-to-live in seconds, 0 to disable (None = unchanged)
+            cache_dir: New persistent cache directory (None = unchanged)
+            max_memory_mb: New memory budget, 0 to disable (None = unchanged)
+        """
+        with self._lock:
+            if max_entries is not None:
+                self._max_entries = max_entries
+            if max_memory_mb is not None:
+                self._max_bytes = _to_bytes(max_memory_mb)
+            self._evict_lru(reserve=0)
+            if self._enable_stats:
+                self._stats.entries_count = len(self._cache)
+            if ttl is not None:
+                self._ttl = ttl or None
+            if cache_dir is not None:
+                self._cache_dir = Path(cache_dir)
+
+    @property
+    def max_entries(self) -> int:
+        """Maximum number of cached entries"""
+        return self._max_entries
+
+    @property
+    def max_memory_mb(self) -> Optional[float]:
+        """Memory budget in MB (None = entries limit only)"""
+        return self._max_bytes / (1024 * 1024) if self._max_bytes is not None else None
+
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated memory held by cached ASTs"""
+        return self._total_bytes
+
+    @property
+    def ttl(self) -> Optional[float]:
+        """Entry time-to-live in seconds (None = no expiry)"""
+        return self._ttl
+
+    @property
+    def cache_dir(self) -> Optional[Path]:
+        """Persistent cache directory (None = memory only)"""
+        return self._cache_dir
+
     @property
     def stats(self) -> CacheStats:
         """Get cache statistics"""
         with self._lock:
             self._stats.entries_count = len(self._cache)
+            self._stats.memory_estimate_kb = self._total_bytes / 1024
             return self._stats
 
     def reset_stats(self):
@@ -399,7 +650,9 @@ class ASTCache:
         """Clear the entire cache"""
         with self._lock:
             self._cache.clear()
+            self._total_bytes = 0
             self._dependencies.clear()
+            self._compiled.clear()
             if self._enable_stats:
                 self._stats.entries_count = 0
                 self._stats.memory_estimate_kb = 0
@@ -413,29 +666,85 @@ class ASTCache:
                     'path': path,
                     'mtime': entry.mtime,
                     'size': entry.size,
+                    'footprint_bytes': entry.footprint,
                     'access_count': entry.access_count,
                     'age_seconds': time.time() - entry.created_at,
+                    'compiled': entry.ast in self._compiled,
                 })
 
             return {
                 'max_entries': self._max_entries,
+                'max_memory_mb': self.max_memory_mb,
+                'memory_bytes': self._total_bytes,
+                'ttl': self._ttl,
+                'cache_dir': str(self._cache_dir) if self._cache_dir else None,
                 'current_entries': len(self._cache),
                 'hash_validation': self._enable_hash,
                 'entries': entries,
             }
 
 
+def _to_bytes(megabytes: Optional[float]) -> Optional[int]:
+    """Convert a memory budget in MB to bytes (None/0 = no budget)"""
+    return int(megabytes * 1024 * 1024) if megabytes else None
+
+
+@lru_cache(maxsize=4096)
+def _resolve_path(path: str, cwd: str) -> str:
+    """Resolve a path once; Path.resolve() stats every component"""
+    return str(Path(cwd, path).resolve())
+
+
+@lru_cache(maxsize=1)
+def parser_fingerprint() -> str:
+    """
+    Version key for persisted ASTs.
+
+    Covers the parser version, the Python version (pickle compatibility)
+    and the sources of the core package, so editing the parser or the AST
+    node classes never serves stale .qc files.
+    """
+    from core.parsers import __version__ as parser_version
+    import core
+
+    digest = hashlib.sha256(f'{parser_version}:{sys.version_info[:2]}'.encode('utf-8'))
+    core_dir = Path(core.__file__).parent
+    for source in sorted(core_dir.rglob('*.py')):
+        digest.update(str(source.relative_to(core_dir)).encode('utf-8'))
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def default_ast_cache_dir() -> Optional[str]:
+    """
+    Persistent cache directory picked up automatically.
+
+    $QUANTUM_AST_CACHE_DIR if set, otherwise ./.quantum/ast_cache when it
+    exists (created by `quantum build --precompile`).
+    """
+    env_dir = os.environ.get(AST_CACHE_DIR_ENV)
+    if env_dir:
+        return env_dir
+    if os.path.isdir(DEFAULT_AST_CACHE_DIR):
+        return os.path.abspath(DEFAULT_AST_CACHE_DIR)
+    return None
+
+
 # Global singleton instance
 _global_cache: Optional[ASTCache] = None
 _global_cache_lock = threading.Lock()
 
 
-def get_ast_cache(max_entries: int = 100) -> ASTCache:
+def get_ast_cache(max_entries: int = 100, ttl: Optional[float] = None) -> ASTCache:
     """
     Get the global AST cache instance (singleton pattern).
 
+    The persistent cache directory comes from default_ast_cache_dir(); use
+    ASTCache.configure() to change the limits of the existing instance.
+
     Args:
         max_entries: Maximum cache size (only used on first call)
+        ttl: Entry time-to-live in seconds (only used on first call)
 
     Returns:
         The global ASTCache instance
@@ -445,7 +754,11 @@ def get_ast_cache(max_entries: int = 100) -> ASTCache:
     if _global_cache is None:
         with _global_cache_lock:
             if _global_cache is None:
-                _global_cache = ASTCache(max_entries=max_entries)
+                _global_cache = ASTCache(
+                    max_entries=max_entries,
+                    ttl=ttl,
+                    cache_dir=default_ast_cache_dir(),
+                )
 
     return _global_cache
 
@@ -0,0 +1,306 @@
+"""
+Async Database - native async drivers for DatabaseService
+
+DatabaseService.execute_query_async() runs on one background event loop
+owned by the service (the web server itself is synchronous). Datasources
+use their native async driver when it is installed:
+
+- postgresql: asyncpg ($1 placeholders, asyncpg pool)
+- mysql/mariadb: aiomysql (aiomysql pool, autocommit)
+- sqlite: aiosqlite (one connection per query, so queries run side by side)
+
+Without the driver (or with async_driver: false in the datasource config)
+the query runs through the synchronous pool on a worker thread instead.
+
+Usage:
+    runner = AsyncQueryRunner()
+    results = runner.run([coroutine_a, coroutine_b])  # From any other thread
+    runner.close()
+"""
+
+import asyncio
+import concurrent.futures
+import importlib.util
+import threading
+import time
+from typing import Any, Awaitable, Dict, List, Optional
+
+from runtime.query_stream import Row, column_index
+
+
+# Native async driver module per database type
+ASYNC_DRIVERS = {
+    'postgresql': 'asyncpg',
+    'mysql': 'aiomysql',
+    'mariadb': 'aiomysql',
+    'sqlite': 'aiosqlite',
+}
+
+# Placeholder style of each async driver (see compile_sql)
+ASYNC_DIALECTS = {
+    'asyncpg': 'numeric',
+    'aiomysql': 'format',
+    'aiosqlite': 'qmark',
+}
+
+
+def async_driver(config: Dict[str, Any]) -> Optional[str]:
+    """
+    Native async driver for a datasource
+
+    Returns:
+        Driver module name, or None if the query should run on a worker thread
+        (driver not installed, async_driver: false, or SQLite :memory:, where
+        every connection is a separate database)
+    """
+    if not config.get('async_driver', True):
+        return None
+    db_type = config['type']
+    if db_type == 'sqlite' and config.get('database') in ('', ':memory:'):
+        return None
+    module = ASYNC_DRIVERS.get(db_type)
+    if module is None or importlib.util.find_spec(module) is None:
+        return None
+    return module
+
+
+class AsyncQueryRunner:
+    """
+    Background event loop running async queries for synchronous callers.
+
+    The loop thread is started on first use. Driver pools (asyncpg, aiomysql)
+    belong to the loop and are closed by close(), or one at a time by
+    retire_pool() when a datasource config changes.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Datasource name -> future of the driver pool (created on the loop)
+        self._pools: Dict[str, asyncio.Future] = {}
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The runner's event loop (started on first access)"""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(
+                        target=loop.run_forever, name='quantum-async-db', daemon=True
+                    )
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+    def in_loop(self) -> bool:
+        """Whether the caller is running on the runner's loop"""
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def submit(self, coroutine: Awaitable) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run(self, coroutines: List[Awaitable]) -> List[Any]:
+        """
+        Run coroutines concurrently and wait for all of them
+
+        Returns:
+            One result per coroutine, in order; a failed coroutine's
+            exception is returned in its place
+
+        Raises:
+            RuntimeError: If called from the runner's own loop (it would deadlock)
+        """
+        if self.in_loop():
+            raise RuntimeError("AsyncQueryRunner.run() cannot be called from its own event loop")
+
+        async def gather():
+            return await asyncio.gather(*coroutines, return_exceptions=True)
+
+        return self.submit(gather()).result()
+
+    def close(self):
+        """Close driver pools and stop the loop thread"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_pools(), loop).result(timeout=10)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=10)
+        loop.close()
+
+    def retire_pool(self, name: str):
+        """
+        Close the driver pool of a datasource whose config changed
+
+        Returns without waiting; queries already holding a connection
+        finish first, later queries create a pool from the new config.
+        """
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._retire_pool(name), loop)
+        except RuntimeError:
+            pass  # Loop closed by close(), which closes every pool
+
+    async def execute(self, config: Dict[str, Any], driver: str, sql: str,
+                      params: List[Any], max_rows: Optional[int] = None):
+        """
+        Run one prepared statement with a native driver (on the loop)
+
+        Args:
+            config: Datasource configuration
+            driver: Module from async_driver()
+            sql: SQL already translated to the driver's placeholder style
+            params: Positional parameter values
+            max_rows: Fetch at most this many rows
+
+        Returns:
+            QueryResult with Row data
+        """
+        start_time = time.time()
+        if driver == 'asyncpg':
+            column_names, rows, affected_rows, last_insert_id = await self._execute_asyncpg(
+                config, sql, params, max_rows)
+        elif driver == 'aiomysql':
+            column_names, rows, affected_rows, last_insert_id = await self._execute_aiomysql(
+                config, sql, params, max_rows)
+        else:
+            column_names, rows, affected_rows, last_insert_id = await self._execute_aiosqlite(
+                config, sql, params, max_rows)
+        execution_time = (time.time() - start_time) * 1000  # Convert to ms
+
+        from runtime.database_service import QueryResult
+
+        index = column_index(column_names)
+        data = [Row(index, tuple(row)) for row in rows]
+        return QueryResult(
+            data=data,
+            column_list=column_names,
+            execution_time=execution_time,
+            record_count=len(data) if column_names else (affected_rows or 0),
+            affected_rows=affected_rows,
+            last_insert_id=last_insert_id
+        )
+
+    async def _execute_aiosqlite(self, config: Dict[str, Any], sql: str, params: List[Any],
+                                 max_rows: Optional[int]):
+        import aiosqlite
+
+        async with aiosqlite.connect(config['database'], timeout=30.0) as conn:
+            cursor = await conn.execute(sql, params)
+            if cursor.description:
+                rows = await (cursor.fetchmany(max_rows) if max_rows else cursor.fetchall())
+                return [desc[0] for desc in cursor.description], rows, None, None
+            await conn.commit()
+            last_insert_id = cursor.lastrowid if cursor.lastrowid and cursor.lastrowid > 0 else None
+            return [], [], cursor.rowcount, last_insert_id
+
+    async def _execute_asyncpg(self, config: Dict[str, Any], sql: str, params: List[Any],
+                               max_rows: Optional[int]):
+        pool = await self._pool(config, 'asyncpg')
+        async with pool.acquire() as conn:
+            statement = await conn.prepare(sql)
+            column_names = [attribute.name for attribute in statement.get_attributes()]
+            if column_names and max_rows:
+                # Cursors need a transaction; only max_rows rows leave the server
+                async with conn.transaction():
+                    cursor = await statement.cursor(*params)
+                    rows = await cursor.fetch(max_rows)
+            else:
+                rows = await statement.fetch(*params)
+            if column_names:
+                return column_names, rows, None, None
+            status = (statement.get_statusmsg() or '').split()
+            affected_rows = int(status[-1]) if status and status[-1].isdigit() else None
+            return [], [], affected_rows, None
+
+    async def _execute_aiomysql(self, config: Dict[str, Any], sql: str, params: List[Any],
+                                max_rows: Optional[int]):
+        pool = await self._pool(config, 'aiomysql')
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(sql, params)
+                if cursor.description:
+                    rows = await (cursor.fetchmany(max_rows) if max_rows else cursor.fetchall())
+                    return [desc[0] for desc in cursor.description], rows, None, None
+                last_insert_id = cursor.lastrowid if cursor.lastrowid and cursor.lastrowid > 0 else None
+                return [], [], cursor.rowcount, last_insert_id
+
+    async def _pool(self, config: Dict[str, Any], driver: str):
+        """Driver pool of a datasource, created once on the loop"""
+        name = config['name']
+        pool = self._pools.get(name)
+        if pool is None:
+            pool = asyncio.ensure_future(self._create_pool(config, driver))
+            self._pools[name] = pool
+        try:
+            return await asyncio.shield(pool)
+        except Exception:
+            # Retry on the next query instead of caching the failure
+            if self._pools.get(name) is pool:
+                del self._pools[name]
+            raise
+
+    async def _create_pool(self, config: Dict[str, Any], driver: str):
+        from runtime.database_service import POOL_DEFAULTS
+
+        min_size = config.get('pool_min_size', POOL_DEFAULTS['pool_min_size'])
+        max_size = (config.get('pool_size', POOL_DEFAULTS['pool_size']) +
+                    config.get('max_overflow', POOL_DEFAULTS['max_overflow']))
+        if driver == 'asyncpg':
+            import asyncpg
+            return await asyncpg.create_pool(
+                host=config['host'],
+                port=config['port'],
+                database=config['database_name'],
+                user=config['username'],
+                password=config['password'],
+                min_size=min_size,
+                max_size=max_size
+            )
+
+        import aiomysql
+        return await aiomysql.create_pool(
+            host=config['host'],
+            port=config['port'],
+            db=config['database_name'],
+            user=config['username'],
+            password=config['password'],
+            autocommit=True,
+            minsize=min_size,
+            maxsize=max_size
+        )
+
+    async def _retire_pool(self, name: str):
+        # Popped before the first await, so no later query gets the old pool
+        future = self._pools.pop(name, None)
+        if future is not None:
+            await self._close_pool(future)
+
+    async def _close_pools(self):
+        pools, self._pools = self._pools, {}
+        for future in pools.values():
+            await self._close_pool(future)
+
+    async def _close_pool(self, future: asyncio.Future):
+        try:
+            pool = await future
+        except Exception:
+            return
+        closing = pool.close()  # asyncpg: coroutine, aiomysql: plain call
+        if asyncio.iscoroutine(closing):
+            await closing
+        if hasattr(pool, 'wait_closed'):
+            await pool.wait_closed()
@@ -0,0 +1,486 @@
+"""
+Closure Compiler - "compiled" execution mode for ComponentRuntime
+
+Turns a ComponentNode tree into a tree of pre-bound Python closures once,
+so a request no longer re-interprets the AST: there is no ExecutorRegistry
+lookup or isinstance chain per statement, and conditions and {databinding}
+expressions are classified and compiled ahead of time (via ExpressionCache).
+
+Compiled nodes:
+- q:set (plain assignment without validation rules)
+- q:if / q:elseif / q:else
+- q:loop (range, array, list, query)
+- q:return
+- HTML/text nodes, which produce no side effects at execution time
+
+Every other node is bound to the interpreter, so a compiled component always
+behaves like the interpreted one; runs of independent q:query statements go
+through the same concurrent planner (performance.concurrent_queries). A
+compiled statement that raises fails the component: it is not re-run through
+the legacy interpreter, which would repeat the queries and other side effects
+it already performed. Closures take the runtime and execution
+context as arguments and hold no per-request state, so one compiled program
+is shared by every request; ASTCache.get_compiled() keeps it beside the AST.
+
+Usage:
+    runtime = ComponentRuntime(execution_mode='compiled')
+    runtime.execute_component(ast)
+
+    # or explicitly
+    program = compile_component(ast)
+    program.run(runtime)
+"""
+
+import re
+from typing import Any, Callable, List, Optional, Tuple
+
+from core.ast_nodes import (
+    ComponentNode, QuantumReturn, HTMLNode, TextNode, DocTypeNode, CommentNode
+)
+from core.features.conditionals.src.ast_node import IfNode
+from core.features.loops.src.ast_node import LoopNode
+from core.features.state_management.src.ast_node import SetNode
+from runtime.concurrent_queries import plan_concurrent_queries
+from runtime.execution_context import LoopScope
+from runtime.query_stream import QueryStream
+from runtime.executors.base import ExecutorError
+from runtime.executors.control_flow.set_executor import convert_to_type
+from runtime.expression_cache import get_expression_cache
+
+# fn(runtime, exec_context) -> result
+Step = Callable[[Any, Any], Any]
+# fn(runtime, variables) -> value
+Binding = Callable[[Any, Any], Any]
+
+# Nodes that only matter to the renderer; executing them is a no-op
+RENDER_ONLY_NODES = (HTMLNode, TextNode, DocTypeNode, CommentNode)
+
+# q:set attributes that require SetExecutor validation
+_VALIDATION_ATTRS = ('validate_rule', 'pattern', 'range', 'enum', 'min', 'max',
+                     'minlength', 'maxlength')
+
+# Types whose conversion of a constant yields an immutable value
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+_identifier_pattern = re.compile(r'^[A-Za-z_]\w*$')
+_function_call_pattern = re.compile(r'^\s*\w+\s*\(')
+_arithmetic_chars = ('+', '-', '*', '/', '>', '<', '=', '!', '(', ')')
+
+_MISSING = object()
+
+
+class CompiledComponent:
+    """A component compiled to closures, runnable on any ComponentRuntime"""
+
+    __slots__ = ('component', '_steps', '_return')
+
+    def __init__(self, component: ComponentNode, steps: List[Tuple[int, Step, bool, bool]],
+                 return_binding: Optional[Binding]):
+        self.component = component
+        self._steps = steps
+        self._return = return_binding
+
+    def run(self, runtime) -> Any:
+        """Execute the component statements and return its q:return value"""
+        exec_context = runtime.execution_context
+        statements = self.component.statements
+        resume = 0
+        for index, step, starts_batch, is_if in self._steps:
+            if index < resume:
+                continue  # Already ran in a concurrent batch
+
+            if starts_batch:
+                # Independent queries run together (performance.concurrent_queries)
+                executed = runtime._execute_concurrent_queries(statements, index, exec_context)
+                if executed:
+                    resume = index + executed
+                    continue
+
+            result = step(runtime, exec_context)
+
+            # Only an IfNode with a return statement causes an early return
+            if result is not None and is_if:
+                return result
+
+        if self._return is not None:
+            return self._return(runtime, exec_context.variables)
+        return None
+
+
+def compile_component(component: ComponentNode) -> CompiledComponent:
+    """
+    Compile a component's statements into closures.
+
+    Args:
+        component: Parsed ComponentNode
+
+    Returns:
+        CompiledComponent shared by all requests for this AST
+    """
+    statements = component.statements
+    steps = []
+    for index, statement in enumerate(statements):
+        if isinstance(statement, RENDER_ONLY_NODES):
+            continue
+        starts_batch = len(plan_concurrent_queries(statements, index)) > 1
+        step = _compile_node(statement)
+        if step is None:
+            # Not compilable: run it exactly like the interpreter would
+            step = _interpret_top_level(statement)
+        steps.append((index, step, starts_batch, isinstance(statement, IfNode)))
+
+    return_binding = None
+    if component.returns:
+        return_binding = compile_return(component.returns[0].value)
+
+    return CompiledComponent(component, steps, return_binding)
+
+
+# =============================================================================
+# Statements
+# =============================================================================
+
+def _compile_node(node: Any) -> Optional[Step]:
+    """Compile a statement, or return None if it is not supported"""
+    if isinstance(node, SetNode):
+        return _compile_set(node)
+    if isinstance(node, IfNode):
+        return _compile_if(node)
+    if isinstance(node, LoopNode):
+        return _compile_loop(node)
+    return None
+
+
+def _compile_child(node: Any) -> Step:
+    """Compile a statement nested in a q:if/q:loop body"""
+    step = _compile_node(node)
+    if step is None:
+        step = _interpret_child(node)
+    return step
+
+
+def _interpret_top_level(node: Any) -> Step:
+    def interpret(runtime, exec_context):
+        return runtime._execute_statement(node, exec_context)
+    return interpret
+
+
+def _interpret_child(node: Any) -> Step:
+    # Nested statements go straight to their executor, as in IfExecutor/LoopExecutor
+    def interpret(runtime, exec_context):
+        return runtime.executor_registry.execute(node, exec_context)
+    return interpret
+
+
+def _compile_set(node: SetNode) -> Optional[Step]:
+    """Compile a plain q:set assignment (mirrors SetExecutor)"""
+    if node.operation != 'assign' or node.required:
+        return None
+    if any(getattr(node, attr, None) for attr in _VALIDATION_ATTRS):
+        return None
+
+    value_expr = node.value if node.value is not None else node.default
+    if value_expr is None:
+        return None
+
+    name = node.name
+    target_type = node.type
+    local_scope = node.scope == 'local'
+    nullable = node.nullable
+    binding = compile_binding(value_expr)
+
+    # Constant value: convert once when the result cannot be mutated later
+    constant = _MISSING
+    if '{' not in value_expr:
+        try:
+            converted = convert_to_type(value_expr, target_type)
+        except ExecutorError:
+            converted = _MISSING  # Raise at execution time, like the interpreter
+        if isinstance(converted, _IMMUTABLE_TYPES):
+            constant = converted
+
+    def run_set(runtime, exec_context):
+        if constant is not _MISSING:
+            value = constant
+        else:
+            value = convert_to_type(binding(runtime, exec_context.variables), target_type)
+        if value is None and not nullable:
+            raise ExecutorError(f"Variable '{name}' cannot be null")
+
+        if local_scope and exec_context.has_variable(name):
+            exec_context.update_variable(name, value)
+        else:
+            scope = node.scope
+            if local_scope and exec_context.parent is not None:
+                scope = 'function'
+            exec_context.set_variable(name, value, scope=scope)
+        return None
+
+    return run_set
+
+
+def _compile_if(node: IfNode) -> Step:
+    """Compile q:if with its q:elseif/q:else branches (mirrors IfExecutor)"""
+    branches = [(compile_condition(node.condition), _compile_branch(node.if_body))]
+    for block in node.elseif_blocks:
+        branches.append((compile_condition(block['condition']), _compile_branch(block['body'])))
+    else_branch = _compile_branch(node.else_body) if node.else_body else None
+
+    def run_if(runtime, exec_context):
+        variables = exec_context.variables
+        for condition, branch in branches:
+            if condition(runtime, variables):
+                return branch(runtime, exec_context)
+        if else_branch is not None:
+            return else_branch(runtime, exec_context)
+        return None
+
+    return run_if
+
+
+def _compile_branch(statements: List[Any]) -> Step:
+    """Compile a q:if branch body; returns the first q:return value"""
+    steps = []
+    for statement in statements:
+        if isinstance(statement, RENDER_ONLY_NODES):
+            continue
+        if isinstance(statement, QuantumReturn):
+            steps.append((compile_return(statement.value), True, False))
+            break  # Nothing after a q:return runs
+        steps.append((_compile_child(statement), False, isinstance(statement, IfNode)))
+
+    def run_branch(runtime, exec_context):
+        for step, is_return, is_if in steps:
+            if is_return:
+                return step(runtime, exec_context.variables)
+            result = step(runtime, exec_context)
+            # If child is an IfNode and returns something, propagate it
+            if result is not None and is_if:
+                return result
+        return None
+
+    return run_branch
+
+
+def _compile_loop_body(statements: List[Any]) -> List[Tuple[Any, bool]]:
+    body = []
+    for statement in statements:
+        if isinstance(statement, RENDER_ONLY_NODES):
+            continue
+        if isinstance(statement, QuantumReturn):
+            body.append((compile_return(statement.value), True))
+        else:
+            body.append((_compile_child(statement), False))
+    return body
+
+
+def _compile_loop(node: LoopNode) -> Optional[Step]:
+    """Compile q:loop (mirrors LoopExecutor, including its LoopScope)"""
+    if node.loop_type not in ('range', 'array', 'list', 'query'):
+        return None
+
+    body = _compile_loop_body(node.body)
+    loop_type = node.loop_type
+    var_name = node.var_name
+    index_name = node.index_name
+
+    def run_body(runtime, exec_context, results):
+        variables = exec_context.variables
+        for step, is_return in body:
+            if is_return:
+                result = step(runtime, variables)
+            else:
+                result = step(runtime, exec_context)
+            if result is not None:
+                results.append(result)
+
+    def iterate(runtime, exec_context):
+        # Item parsing stays with LoopExecutor; it runs once per loop
+        executor = runtime.executor_registry.get_executor(node)
+        variables = exec_context.variables
+
+        if loop_type == 'range':
+            start = int(executor._evaluate_simple_expr(node.from_value, variables))
+            end = int(executor._evaluate_simple_expr(node.to_value, variables))
+            return None, ((None, i) for i in range(start, end + 1, node.step_value))
+        if loop_type == 'array':
+            items = executor._parse_array_items(node.items, variables)
+            return None, enumerate(items)
+        if loop_type == 'list':
+            items = executor._parse_list_items(node.items, node.delimiter, variables)
+            return None, ((index, item.strip()) for index, item in enumerate(items))
+
+        query_name = node.query_name if hasattr(node, 'query_name') else var_name
+        query_data = variables.get(query_name)
+        if query_data is None:
+            query_data = exec_context.get_variable(query_name)
+        if not query_data:
+            raise ExecutorError(f"Query '{query_name}' not found in context")
+        if not isinstance(query_data, (list, QueryStream)):
+            raise ExecutorError(f"Query '{query_name}' is not iterable")
+        return query_name, enumerate(query_data)
+
+    def run_loop(runtime, exec_context):
+        query_name, iterations = iterate(runtime, exec_context)
+        results = []
+
+        scope = LoopScope(query_name)
+        bindings = scope.bindings
+        exec_context.push_scope(scope)
+        try:
+            if query_name is not None:
+                for index, row in iterations:
+                    scope.row = row
+                    if index_name:
+                        bindings[index_name] = index
+                    run_body(runtime, exec_context, results)
+            else:
+                for index, item in iterations:
+                    bindings[var_name] = item
+                    if index_name and index is not None:
+                        bindings[index_name] = index
+                    run_body(runtime, exec_context, results)
+        finally:
+            exec_context.pop_scope()
+
+        return results
+
+    return run_loop
+
+
+# =============================================================================
+# Expressions
+# =============================================================================
+
+def compile_return(value: str) -> Binding:
+    """Compile a q:return value (mirrors ComponentRuntime._process_return_value)"""
+    if not value:
+        return lambda runtime, variables: ""
+
+    from runtime.component import ComponentRuntime
+    parse_literal = ComponentRuntime._parse_return_literal
+
+    if '{' not in value:
+        constant = parse_literal(value)
+        if isinstance(constant, _IMMUTABLE_TYPES):
+            return lambda runtime, variables: constant
+
+    binding = compile_binding(value)
+
+    def resolve_return(runtime, variables):
+        return parse_literal(binding(runtime, variables))
+
+    return resolve_return
+
+
+def compile_binding(text: str) -> Binding:
+    """
+    Compile a {databinding} template (mirrors ComponentRuntime._apply_databinding).
+
+    A single {name} becomes a direct lookup and a single {arithmetic} expression
+    is compiled to bytecode; other expressions reuse the runtime's evaluator.
+    """
+    if not text:
+        return lambda runtime, variables: text
+
+    from runtime.component import ComponentRuntime
+    pattern = ComponentRuntime._databinding_pattern
+
+    full_match = pattern.fullmatch(text.strip())
+    if full_match is None:
+        if pattern.search(text) is None:
+            return lambda runtime, variables: text
+
+        def interpolate(runtime, variables):
+            return runtime._apply_databinding(text, variables)
+        return interpolate
+
+    expr = full_match.group(1).strip()
+
+    if _identifier_pattern.match(expr):
+        def lookup(runtime, variables):
+            value = variables.get(expr, _MISSING)
+            return text if value is _MISSING else value
+        return lookup
+
+    is_arithmetic = (
+        '.' not in expr and '[' not in expr
+        and not ('(' in expr and ')' in expr and _function_call_pattern.match(expr))
+        and any(op in expr for op in _arithmetic_chars)
+    )
+    if is_arithmetic:
+        expr_cache = get_expression_cache()
+        code = expr_cache.compile(expr)
+        if code is not None:
+            def evaluate(runtime, variables):
+                if expr in variables:
+                    return variables[expr]
+                try:
+                    return expr_cache.evaluate_compiled(code, variables)
+                except Exception:
+                    # Let the runtime retry with variable substitution
+                    try:
+                        return runtime._evaluate_arithmetic_expression(expr, variables)
+                    except Exception:
+                        return text
+            return evaluate
+
+    def resolve(runtime, variables):
+        try:
+            return runtime._evaluate_databinding_expression(expr, variables)
+        except Exception:
+            # If evaluation fails, return original placeholder
+            return text
+    return resolve
+
+
+def compile_condition(condition: str) -> Binding:
+    """Compile a condition (mirrors ComponentRuntime._evaluate_condition)"""
+    if not condition:
+        return lambda runtime, variables: False
+
+    from runtime.component import ComponentRuntime
+    comparison_ops = ComponentRuntime._comparison_ops
+
+    if '{' in condition and any(op in condition for op in comparison_ops):
+        comparison = ComponentRuntime._split_comparison(condition, comparison_ops)
+        if comparison is None:
+            return lambda runtime, variables: False
+
+        op, left_str, right_str = comparison
+        left = compile_binding(left_str) if left_str else (lambda runtime, variables: '')
+        right = compile_binding(right_str) if right_str else (lambda runtime, variables: '')
+        compare = ComponentRuntime._compare_values
+
+        def compare_condition(runtime, variables):
+            try:
+                return compare(op, left(runtime, variables), right(runtime, variables))
+            except Exception:
+                return False
+        return compare_condition
+
+    binding = compile_binding(condition)
+    expr_cache = get_expression_cache()
+
+    def evaluate_condition(runtime, variables):
+        try:
+            evaluated = binding(runtime, variables)
+            # If databinding returned a non-string type, use its truthiness directly
+            if not isinstance(evaluated, str):
+                return bool(evaluated)
+            # Unresolved {expressions} are treated as False
+            if '{' in evaluated:
+                return False
+            if not evaluated.strip():
+                return False
+            code = expr_cache.compile(evaluated)
+            if code is None:
+                return bool(evaluated)
+            try:
+                return bool(expr_cache.evaluate_compiled(code, variables))
+            except Exception:
+                # Not a valid Python expression - use the string's truthiness
+                return bool(evaluated)
+        except Exception:
+            return False
+    return evaluate_condition
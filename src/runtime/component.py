@@ -2,9 +2,12 @@
 Quantum Component Runtime - Execute Quantum components
 """
 
+import functools
 import sys
+from collections import ChainMap
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 # Fix imports
 sys.path.append(str(Path(__file__).parent.parent))
@@ -30,9 +33,14 @@ from core.features.websocket.src import (
 )
 from core.features.logging.src import LogNode, LoggingService
 from core.features.dump.src import DumpNode, DumpService
+from runtime.concurrent_queries import plan_concurrent_queries
 from runtime.database_service import DatabaseService, QueryResult
+from runtime.pagination import paginate_query
+from runtime.query_cache import resolve_cache_ttl
+from runtime.query_of_queries import QueryOfQueriesEngine
+from runtime.query_stream import DEFAULT_FETCH_SIZE, QueryStream
 from runtime.query_validators import QueryValidator, QueryValidationError
-from runtime.execution_context import ExecutionContext, VariableNotFoundError
+from runtime.execution_context import ExecutionContext, LoopScope, VariableNotFoundError
 from runtime.validators import QuantumValidators, ValidationError
 from runtime.function_registry import FunctionRegistry
 from core.features.invocation.src.runtime import InvocationService
@@ -48,11 +56,13 @@ from runtime.agent_service import (
 from runtime.message_queue_service import MessageQueueService, MessageQueueError
 from runtime.job_executor import (
     JobExecutor, ScheduleService, ThreadService, JobQueueService,
-    JobExecutorError, ScheduleError, ThreadError, JobQueueError,
-    parse_duration
+    JobExecutorError, ScheduleError, ThreadError, ThreadCancelledError, JobQueueError,
+    current_cancellation_token, parse_duration
 )
 from runtime.expression_cache import get_expression_cache, ExpressionCache, get_databinding_cache, DataBindingCache
 from runtime.executor_registry import ExecutorRegistry
+from runtime.ast_cache import get_ast_cache
+from runtime.closure_compiler import compile_component
 from runtime.service_container import ServiceContainer
 import re
 import logging
@@ -65,6 +75,29 @@ class ComponentExecutionError(Exception):
     pass
 
 
+def _run_isolated_thread_body(config: Dict[str, Any], body: list,
+                              variables: Dict[str, Any]):
+    """
+    Run a q:thread body with isolation="process" in the child process.
+
+    Module-level so it pickles into a forkserver/spawn child: the body runs
+    in a fresh ComponentRuntime built from the services config, on a copy of
+    the parent's (picklable) variables.
+    """
+    runtime = ComponentRuntime(config)
+    child_context = ExecutionContext()
+    for var_name, var_value in variables.items():
+        child_context.set_variable(var_name, var_value, scope="component")
+
+    results = []
+    for statement in body:
+        result = runtime._execute_statement(statement, child_context)
+        if result is not None:
+            results.append(result)
+
+    return results if results else None
+
+
 def _create_executor_registry(runtime: 'ComponentRuntime') -> ExecutorRegistry:
     """
     Create and populate the executor registry with all executors.
@@ -143,9 +176,25 @@ def _create_executor_registry(runtime: 'ComponentRuntime') -> ExecutorRegistry:
     return registry
 
 class ComponentRuntime:
-    """Runtime for executing Quantum components"""
+    """
+    Runtime for executing Quantum components.
+
+    A ComponentRuntime is request-scoped: it owns the ExecutionContext and the
+    component's function registry. Services (database, jobs, LLM, ...) live in
+    a ServiceContainer that is created lazily and may be shared by many
+    runtimes, e.g. one container per web server process.
+    """
+
+    # Pre-compiled regex patterns (avoid re-compilation on every call)
+    _databinding_pattern = re.compile(r'\{([^}]+)\}')
+    _array_index_pattern = re.compile(r'^(\w+)\[(\d+)\](\.(.+))?$')
+    _order_by_pattern = re.compile(r'\s+ORDER\s+BY\s+[^;]+?(?=\s+(?:LIMIT|OFFSET|FOR\s+UPDATE)|$)', re.IGNORECASE)
+    _limit_pattern = re.compile(r'\s+LIMIT\s+\d+', re.IGNORECASE)
+    _offset_pattern = re.compile(r'\s+OFFSET\s+\d+', re.IGNORECASE)
+    _comparison_ops = ['==', '!=', '>=', '<=', '>', '<']
 
-    def __init__(self, config: Dict[str, Any] = None, use_modular_executors: bool = True):
+    def __init__(self, config: Dict[str, Any] = None, use_modular_executors: bool = True,
+                 services: ServiceContainer = None, execution_mode: str = None):
         self.execution_context = ExecutionContext()
         # Keep self.context for backward compatibility
         self.context: Dict[str, Any] = {}
@@ -154,15 +203,16 @@ class ComponentRuntime:
         # Current component (for function resolution)
         self.current_component: ComponentNode = None
 
-        # === NEW: Service Container for dependency injection ===
-        self._services = ServiceContainer(config)
+        # === Service Container for dependency injection ===
+        # Pass a shared container to avoid re-creating services per request
+        self._services = services if services is not None else ServiceContainer(config)
 
-        # === NEW: Executor Registry for modular dispatch ===
+        # === Executor Registry for modular dispatch (built on first use) ===
         self._use_modular_executors = use_modular_executors
         self._executor_registry: ExecutorRegistry = None
-        if use_modular_executors:
-            self._executor_registry = _create_executor_registry(self)
-        else:
+        # Query of Queries sources loaded for this request (built on first use)
+        self._qoq_engine: QueryOfQueriesEngine = None
+        if not use_modular_executors:
             import warnings
             warnings.warn(
                 "use_modular_executors=False is deprecated and will be removed in v2.0. "
@@ -171,54 +221,20 @@ class ComponentRuntime:
                 stacklevel=2
             )
 
-        # === LEGACY: Direct service references for backward compatibility ===
-        # Database service for query execution - pass local datasources from config
-        local_ds = {}
-        if config and 'datasources' in config:
-            local_ds = config['datasources']
-        self.database_service = DatabaseService(local_datasources=local_ds)
-        # Invocation service for q:invoke
-        self.invocation_service = InvocationService()
-        # Data import service for q:data
-        self.data_import_service = DataImportService()
-        # Logging service for q:log
-        self.logging_service = LoggingService()
-        # Dump service for q:dump
-        self.dump_service = DumpService()
-        # File upload service for q:file (Phase H)
-        self.file_upload_service = FileUploadService()
-        # Email service for q:mail (Phase I)
-        self.email_service = EmailService()
-        # LLM service for q:llm (Ollama backend)
-        self.llm_service = LLMService()
-        # Knowledge service for q:knowledge (RAG with ChromaDB)
-        self.knowledge_service = KnowledgeService(self.llm_service)
-        # Message queue service for q:message, q:subscribe, q:queue
-        mq_config = {}
-        if config and 'message_queue' in config:
-            mq_config = config['message_queue']
-        self.message_queue_service = MessageQueueService(mq_config)
-        # Job executor for q:schedule, q:thread, q:job
-        job_db_path = "quantum_jobs.db"
-        if config and 'job_db_path' in config:
-            job_db_path = config['job_db_path']
-        max_thread_workers = 10
-        if config and 'max_thread_workers' in config:
-            max_thread_workers = config['max_thread_workers']
-        self.job_executor = JobExecutor(
-            max_thread_workers=max_thread_workers,
-            job_db_path=job_db_path
-        )
+        # 'interpreted' walks the AST on every request; 'compiled' runs the
+        # component as pre-bound closures cached beside the AST (opt-in)
+        if execution_mode is None:
+            execution_mode = (config or {}).get('performance', {}).get('execution_mode', 'interpreted')
+        if execution_mode not in ('interpreted', 'compiled'):
+            raise ValueError(f"Invalid execution mode: {execution_mode}")
+        self.execution_mode = execution_mode
+        # Run independent q:query blocks at the same time (opt-in)
+        self.concurrent_queries = bool((config or {}).get('performance', {}).get('concurrent_queries', False))
+
         # Expression cache for performance optimization (Phase 1)
         self._expr_cache = get_expression_cache()
         # Databinding cache for optimized {variable} interpolation (Phase 1 enhancement)
         self._databinding_cache = get_databinding_cache()
-        # Pre-compiled regex patterns (avoid re-compilation on every call)
-        self._databinding_pattern = re.compile(r'\{([^}]+)\}')
-        self._array_index_pattern = re.compile(r'^(\w+)\[(\d+)\](\.(.+))?$')
-        self._order_by_pattern = re.compile(r'\s+ORDER\s+BY\s+[^;]+?(?=\s+(?:LIMIT|OFFSET|FOR\s+UPDATE)|$)', re.IGNORECASE)
-        self._limit_pattern = re.compile(r'\s+LIMIT\s+\d+', re.IGNORECASE)
-        self._offset_pattern = re.compile(r'\s+OFFSET\s+\d+', re.IGNORECASE)
 
     @property
     def services(self) -> ServiceContainer:
@@ -227,9 +243,77 @@ class ComponentRuntime:
 
     @property
     def executor_registry(self) -> ExecutorRegistry:
-        """Access to executor registry (may be None if not using modular executors)"""
+        """Access to executor registry (None if not using modular executors)"""
+        if self._executor_registry is None and self._use_modular_executors:
+            self._executor_registry = _create_executor_registry(self)
         return self._executor_registry
 
+    # === LEGACY: Direct service references for backward compatibility ===
+    # These resolve through the service container, so they are only created
+    # when a component actually uses them.
+
+    @property
+    def qoq_engine(self) -> QueryOfQueriesEngine:
+        """In-memory SQL engine for Query of Queries (per runtime, i.e. per request)"""
+        if self._qoq_engine is None:
+            self._qoq_engine = QueryOfQueriesEngine()
+        return self._qoq_engine
+
+    @property
+    def database_service(self) -> DatabaseService:
+        """Database service for query execution"""
+        return self._services.database
+
+    @property
+    def invocation_service(self) -> InvocationService:
+        """Invocation service for q:invoke"""
+        return self._services.invocation
+
+    @property
+    def data_import_service(self) -> DataImportService:
+        """Data import service for q:data"""
+        return self._services.data_import
+
+    @property
+    def logging_service(self) -> LoggingService:
+        """Logging service for q:log"""
+        return self._services.logging
+
+    @property
+    def dump_service(self) -> DumpService:
+        """Dump service for q:dump"""
+        return self._services.dump
+
+    @property
+    def file_upload_service(self) -> FileUploadService:
+        """File upload service for q:file (Phase H)"""
+        return self._services.file_upload
+
+    @property
+    def email_service(self) -> EmailService:
+        """Email service for q:mail (Phase I)"""
+        return self._services.email
+
+    @property
+    def llm_service(self) -> LLMService:
+        """LLM service for q:llm (Ollama backend)"""
+        return self._services.llm
+
+    @property
+    def knowledge_service(self) -> KnowledgeService:
+        """Knowledge service for q:knowledge (RAG with ChromaDB)"""
+        return self._services.knowledge
+
+    @property
+    def message_queue_service(self) -> MessageQueueService:
+        """Message queue service for q:message, q:subscribe, q:queue"""
+        return self._services.message_queue
+
+    @property
+    def job_executor(self) -> JobExecutor:
+        """Job executor for q:schedule, q:thread, q:job"""
+        return self._services.job_executor
+
     def execute_component(self, component: ComponentNode, params: Dict[str, Any] = None) -> Any:
         """Execute a component and return the result"""
         if params is None:
@@ -261,8 +345,22 @@ class ComponentRuntime:
 
         # Execute component
         try:
+            if self.execution_mode == 'compiled' and self.executor_registry is not None:
+                program = get_ast_cache().get_compiled(component, compile_component)
+                return program.run(self)
+
             # Execute control flow statements first
-            for statement in component.statements:
+            statements = component.statements
+            index = 0
+            while index < len(statements):
+                # Independent queries run together (performance.concurrent_queries)
+                executed = self._execute_concurrent_queries(statements, index, self.execution_context)
+                if executed:
+                    index += executed
+                    continue
+
+                statement = statements[index]
+                index += 1
                 result = self._execute_statement(statement, self.execution_context)
                 # Only return if the statement explicitly returns a value (not just executing)
                 # SetNode returns None, LoopNode returns a list but shouldn't cause early return
@@ -300,8 +398,11 @@ class ComponentRuntime:
             context = {}
 
         # Apply databinding first
-        processed_value = self._apply_databinding(value, context)
+        return self._parse_return_literal(self._apply_databinding(value, context))
 
+    @staticmethod
+    def _parse_return_literal(processed_value: Any) -> Any:
+        """Convert a databound return value to a string, JSON or number literal"""
         # If databinding returned a non-string (e.g., int, float, dict), return it as-is
         if not isinstance(processed_value, str):
             return processed_value
@@ -336,26 +437,42 @@ class ComponentRuntime:
         # Accept both ExecutionContext and Dict for backward compatibility
         if isinstance(context, ExecutionContext):
             exec_context = context
-            dict_context = context.get_all_variables()
+            dict_context = None
         else:
             exec_context = self.execution_context
             dict_context = context
 
+        # q:thread bodies stop at the next statement once terminated or timed out
+        token = current_cancellation_token()
+        if token is not None:
+            token.raise_if_cancelled()
+
         # === NEW: Try modular executor registry first ===
-        if self._use_modular_executors and self._executor_registry:
+        registry = self.executor_registry
+        if registry is not None:
             try:
-                if self._executor_registry.can_execute(statement):
-                    return self._executor_registry.execute(statement, exec_context)
+                if registry.can_execute(statement):
+                    return registry.execute(statement, exec_context)
+            except ThreadCancelledError:
+                raise
             except Exception as e:
                 # Log warning and fall back to legacy execution
                 logger.warning(f"Modular executor failed for {type(statement).__name__}: {e}")
 
+        return self._execute_legacy_statement(statement, exec_context, dict_context)
+
+    def _execute_legacy_statement(self, statement, exec_context: ExecutionContext,
+                                  dict_context: Dict[str, Any] = None):
+        """Execute a statement through the legacy if-elif chain"""
         # === LEGACY: Fall back to if-elif chain ===
         # DEPRECATION NOTE: This if-elif chain is deprecated and will be removed in v2.0
         # All node execution should go through the modular ExecutorRegistry
         node_type = type(statement).__name__
         logger.debug(f"LEGACY FALLBACK: Executing {node_type} via if-elif chain (deprecated)")
 
+        if dict_context is None:
+            dict_context = exec_context.get_all_variables()
+
         if isinstance(statement, IfNode):
             return self._execute_if(statement, dict_context)
         elif isinstance(statement, LoopNode):
@@ -442,15 +559,23 @@ class ComponentRuntime:
     
     def _execute_body(self, statements: List, context: Dict[str, Any]):
         """Execute a list of statements"""
-        for statement in statements:
+        index = 0
+        while index < len(statements):
+            statement = statements[index]
             if isinstance(statement, QuantumReturn):
                 return self._process_return_value(statement.value, context)
-            else:
-                # Delegate to _execute_statement for all other types
-                # (SetNode, IfNode, LoopNode, QueryNode, etc.)
-                result = self._execute_statement(statement, self.execution_context)
-                if result is not None and isinstance(statement, IfNode):
-                    return result
+
+            executed = self._execute_concurrent_queries(statements, index, self.execution_context)
+            if executed:
+                index += executed
+                continue
+
+            # Delegate to _execute_statement for all other types
+            # (SetNode, IfNode, LoopNode, QueryNode, etc.)
+            result = self._execute_statement(statement, self.execution_context)
+            if result is not None and isinstance(statement, IfNode):
+                return result
+            index += 1
         return None
     
     def _evaluate_condition(self, condition: str, context: Dict[str, Any]) -> bool:
@@ -461,7 +586,7 @@ class ComponentRuntime:
         try:
             # Check if this is a comparison expression with databinding
             # e.g., "{form.action_type} == 'logout'" or "{x} != 'hello'"
-            comparison_ops = ['==', '!=', '>=', '<=', '>', '<']
+            comparison_ops = self._comparison_ops
             has_comparison = any(op in condition for op in comparison_ops)
 
             if has_comparison and '{' in condition:
@@ -499,29 +624,34 @@ class ComponentRuntime:
         Resolves each side of the comparison separately and compares the actual values,
         avoiding the problem of unquoted string interpolation into eval().
         """
+        comparison = self._split_comparison(condition, comparison_ops)
+        if comparison is None:
+            return False
+        op, left_str, right_str = comparison
+
+        # Resolve each side
+        left_val = self._apply_databinding(left_str, context) if left_str else ''
+        right_val = self._apply_databinding(right_str, context) if right_str else ''
+
+        return self._compare_values(op, left_val, right_val)
+
+    @staticmethod
+    def _split_comparison(condition: str, comparison_ops: list):
+        """Split a condition into (op, left, right) around the first operator outside {databinding}"""
         # Find which comparison operator is used (check longest first to match >= before >)
-        op = None
-        op_pos = -1
         for candidate in sorted(comparison_ops, key=len, reverse=True):
             pos = condition.find(candidate)
             if pos != -1:
                 # Make sure this isn't inside a {databinding} expression
                 before = condition[:pos]
                 if before.count('{') == before.count('}'):
-                    op = candidate
-                    op_pos = pos
-                    break
-
-        if op is None:
-            return False
-
-        left_str = condition[:op_pos].strip()
-        right_str = condition[op_pos + len(op):].strip()
-
-        # Resolve each side
-        left_val = self._apply_databinding(left_str, context) if left_str else ''
-        right_val = self._apply_databinding(right_str, context) if right_str else ''
+                    return (candidate, condition[:pos].strip(),
+                            condition[pos + len(candidate):].strip())
+        return None
 
+    @staticmethod
+    def _compare_values(op: str, left_val: Any, right_val: Any) -> bool:
+        """Compare two resolved condition operands"""
         # Strip quotes from literal strings (e.g., "'logout'" -> "logout")
         if isinstance(right_val, str):
             right_val = right_val.strip()
@@ -585,20 +715,22 @@ class ComponentRuntime:
             end = int(self._evaluate_simple_expression(loop_node.to_value, context))
             step = loop_node.step_value
 
-            # Execute loop
-            for i in range(start, end + 1, step):
-                # Create loop context with loop variable
-                loop_context = context.copy()
-                loop_context[loop_node.var_name] = i
-
-                # Also update execution context for q:set support
-                exec_context.set_variable(loop_node.var_name, i, scope="local")
+            # One block scope for the whole loop; each iteration only rebinds
+            # the loop variable (visible to q:set through exec_context too)
+            scope = LoopScope()
+            loop_context = ChainMap(scope, context)
+            exec_context.push_scope(scope)
+            try:
+                for i in range(start, end + 1, step):
+                    scope.bindings[loop_node.var_name] = i
 
-                # Execute loop body
-                for statement in loop_node.body:
-                    result = self._execute_loop_body_statement(statement, loop_context, exec_context)
-                    if result is not None:
-                        results.append(result)
+                    # Execute loop body
+                    for statement in loop_node.body:
+                        result = self._execute_loop_body_statement(statement, loop_context, exec_context)
+                        if result is not None:
+                            results.append(result)
+            finally:
+                exec_context.pop_scope()
 
             return results
 
@@ -613,26 +745,25 @@ class ComponentRuntime:
             # Get array data (for now, parse simple array notation)
             array_data = self._parse_array_items(loop_node.items, context)
 
-            # Execute loop
-            for index, item in enumerate(array_data):
-                # Set loop variable in execution context
-                exec_context.set_variable(loop_node.var_name, item, scope="local")
-
-                # Add index if specified
-                if loop_node.index_name:
-                    exec_context.set_variable(loop_node.index_name, index, scope="local")
-
-                # Get fresh context dict from execution context (includes all updated variables)
-                loop_context = exec_context.get_all_variables()
-
-                # Execute loop body
-                for statement in loop_node.body:
-                    result = self._execute_loop_body_statement(statement, loop_context, exec_context)
-                    if result is not None:
-                        results.append(result)
-
-                    # Sync loop_context after each statement to see updates
-                    loop_context = exec_context.get_all_variables()
+            scope = LoopScope()
+            exec_context.push_scope(scope)
+            try:
+                # Live view of the execution context: sees updates made by
+                # body statements without re-flattening every scope
+                loop_context = exec_context.variables
+
+                for index, item in enumerate(array_data):
+                    scope.bindings[loop_node.var_name] = item
+                    if loop_node.index_name:
+                        scope.bindings[loop_node.index_name] = index
+
+                    # Execute loop body
+                    for statement in loop_node.body:
+                        result = self._execute_loop_body_statement(statement, loop_context, exec_context)
+                        if result is not None:
+                            results.append(result)
+            finally:
+                exec_context.pop_scope()
 
             return results
 
@@ -647,25 +778,22 @@ class ComponentRuntime:
             # Get list data and split by delimiter
             list_data = self._parse_list_items(loop_node.items, loop_node.delimiter, context)
 
-            # Execute loop
-            for index, item in enumerate(list_data):
-                # Create loop context with loop variable(s)
-                loop_context = context.copy()
-                loop_context[loop_node.var_name] = item.strip()
-
-                # Also update execution context for q:set support
-                exec_context.set_variable(loop_node.var_name, item.strip(), scope="local")
-
-                # Add index if specified
-                if loop_node.index_name:
-                    loop_context[loop_node.index_name] = index
-                    exec_context.set_variable(loop_node.index_name, index, scope="local")
-
-                # Execute loop body
-                for statement in loop_node.body:
-                    result = self._execute_loop_body_statement(statement, loop_context, exec_context)
-                    if result is not None:
-                        results.append(result)
+            scope = LoopScope()
+            loop_context = ChainMap(scope, context)
+            exec_context.push_scope(scope)
+            try:
+                for index, item in enumerate(list_data):
+                    scope.bindings[loop_node.var_name] = item.strip()
+                    if loop_node.index_name:
+                        scope.bindings[loop_node.index_name] = index
+
+                    # Execute loop body
+                    for statement in loop_node.body:
+                        result = self._execute_loop_body_statement(statement, loop_context, exec_context)
+                        if result is not None:
+                            results.append(result)
+            finally:
+                exec_context.pop_scope()
 
             return results
 
@@ -688,44 +816,30 @@ class ComponentRuntime:
             if not query_data:
                 raise ComponentExecutionError(f"Query '{query_name}' not found in context")
 
-            if not isinstance(query_data, list):
+            if not isinstance(query_data, (list, QueryStream)):
                 raise ComponentExecutionError(f"Query '{query_name}' is not iterable (got {type(query_data).__name__})")
 
-            # Iterate over query rows
-            for index, row in enumerate(query_data):
-                # Create loop context with current row fields available as {queryName.fieldName}
-                loop_context = context.copy()
-
-                # Set current row index
-                current_row_index = index
-
-                # Make row fields accessible via dot notation and bare name
-                # Store row data under query name for {queryName.field} access
-                # Also store bare field names for ColdFusion-style {field} access inside loops
-                if isinstance(row, dict):
-                    for field_name, field_value in row.items():
-                        # Set {queryName.fieldName} in context
-                        dotted_key = f"{query_name}.{field_name}"
-                        loop_context[dotted_key] = field_value
-                        exec_context.set_variable(dotted_key, field_value, scope="local")
-                        # Set bare {fieldName} for direct access inside query loops
-                        loop_context[field_name] = field_value
-                        exec_context.set_variable(field_name, field_value, scope="local")
-
-                # Also provide currentRow variable for explicit access
-                loop_context['currentRow'] = row
-                exec_context.set_variable('currentRow', row, scope="local")
-
-                # Provide index if requested
-                if loop_node.index_name:
-                    loop_context[loop_node.index_name] = index
-                    exec_context.set_variable(loop_node.index_name, index, scope="local")
-
-                # Execute loop body
-                for statement in loop_node.body:
-                    result = self._execute_loop_body_statement(statement, loop_context, exec_context)
-                    if result is not None:
-                        results.append(result)
+            # Row fields resolve lazily through the scope as {queryName.field},
+            # ColdFusion-style bare {field} and {currentRow}, so advancing to
+            # the next row costs the same regardless of the column count
+            scope = LoopScope(query_name)
+            loop_context = ChainMap(scope, context)
+            exec_context.push_scope(scope)
+            try:
+                for index, row in enumerate(query_data):
+                    scope.row = row
+
+                    # Provide index if requested
+                    if loop_node.index_name:
+                        scope.bindings[loop_node.index_name] = index
+
+                    # Execute loop body
+                    for statement in loop_node.body:
+                        result = self._execute_loop_body_statement(statement, loop_context, exec_context)
+                        if result is not None:
+                            results.append(result)
+            finally:
+                exec_context.pop_scope()
 
             return results
 
@@ -734,6 +848,10 @@ class ComponentRuntime:
 
     def _execute_loop_body_statement(self, statement, context: Dict[str, Any], exec_context: ExecutionContext):
         """Execute a statement inside a loop body"""
+        token = current_cancellation_token()
+        if token is not None:
+            token.raise_if_cancelled()
+
         if isinstance(statement, QuantumReturn):
             return self._process_return_value(statement.value, context)
         elif isinstance(statement, IfNode):
@@ -874,7 +992,7 @@ class ComponentRuntime:
             parts = expr.split('.')
             value = context
             for part in parts:
-                if isinstance(value, dict) and part in value:
+                if isinstance(value, Mapping) and part in value:
                     value = value[part]
                 elif isinstance(value, list):
                     # Handle array properties like .length
@@ -938,7 +1056,7 @@ class ComponentRuntime:
         # Navigate property chain
         value = element
         for prop in property_chain.split('.'):
-            if isinstance(value, dict) and prop in value:
+            if isinstance(value, Mapping) and prop in value:
                 value = value[prop]
             else:
                 raise ValueError(f"Property '{prop}' not found in array element")
@@ -1163,10 +1281,11 @@ class ComponentRuntime:
         except VariableNotFoundError:
             current_value = {}
 
-        if not isinstance(current_value, dict):
+        # Query rows are Row mappings: copy them into a plain dict
+        if not isinstance(current_value, Mapping):
             raise ComponentExecutionError(f"Cannot perform object operation on non-object: {type(current_value)}")
 
-        result = current_value.copy()
+        result = dict(current_value)
 
         if set_node.operation == "merge":
             if set_node.value:
@@ -1186,8 +1305,8 @@ class ComponentRuntime:
             if set_node.source:
                 try:
                     source_obj = exec_context.get_variable(set_node.source)
-                    if isinstance(source_obj, dict):
-                        result = source_obj.copy()
+                    if isinstance(source_obj, Mapping):
+                        result = dict(source_obj)
                 except VariableNotFoundError:
                     pass
 
@@ -1251,6 +1370,8 @@ class ComponentRuntime:
             elif target_type == "object":
                 if isinstance(value, dict):
                     return value
+                if isinstance(value, Mapping):
+                    return dict(value)
                 if isinstance(value, str):
                     import json
                     return json.loads(value)
@@ -1259,6 +1380,8 @@ class ComponentRuntime:
                 # Parse JSON string to Python object (array or dict)
                 if isinstance(value, (dict, list)):
                     return value
+                if isinstance(value, Mapping):
+                    return dict(value)
                 if isinstance(value, str):
                     import json
                     return json.loads(value)
@@ -1567,30 +1690,7 @@ class ComponentRuntime:
             dict_context = exec_context.get_all_variables()
 
             # Resolve and validate parameters
-            resolved_params = {}
-            for param_node in query_node.params:
-                # Resolve parameter value (apply databinding)
-                param_value = self._apply_databinding(param_node.value, dict_context)
-
-                # Build attributes dict for validation
-                attributes = {
-                    'null': param_node.null,
-                    'max_length': param_node.max_length,
-                    'scale': param_node.scale
-                }
-
-                # Validate and convert parameter
-                try:
-                    validated_value = QueryValidator.validate_param(
-                        param_value,
-                        param_node.param_type,
-                        attributes
-                    )
-                    resolved_params[param_node.name] = validated_value
-                except QueryValidationError as e:
-                    raise ComponentExecutionError(
-                        f"Parameter '{param_node.name}' validation failed: {e}"
-                    )
+            resolved_params = self._resolve_query_params(query_node, dict_context)
 
             # Sanitize SQL (basic check)
             QueryValidator.sanitize_sql(query_node.sql)
@@ -1603,87 +1703,215 @@ class ComponentRuntime:
             if query_node.source:
                 return self._execute_query_of_queries(query_node, dict_context, resolved_params, exec_context)
 
+            # Declarative caching (cache/ttl) and maxrows fetch limit
+            query_options = self._query_options(query_node)
+            cache_options = {key: value for key, value in query_options.items() if key == 'cache_ttl'}
+
             # Handle pagination if enabled
             pagination_metadata = None
+            result = None
             sql_to_execute = query_node.sql
 
             if query_node.paginate:
-                # Execute COUNT(*) query to get total records
-                count_sql = self._generate_count_query(query_node.sql)
-                count_result = self.database_service.execute_query(
+                count_options = dict(cache_options)
+                if query_node.count_cache:
+                    count_options['cache_ttl'] = resolve_cache_ttl(True, query_node.count_cache)
+
+                # Streams are paged with LIMIT/OFFSET (count strategy)
+                strategy = 'count' if query_node.stream else query_node.pagination
+                result, pagination_metadata, sql_to_execute = paginate_query(
+                    self.database_service.execute_query,
                     query_node.datasource,
-                    count_sql,
-                    resolved_params
+                    query_node.sql,
+                    resolved_params,
+                    self._generate_count_query(query_node.sql),
+                    strategy=strategy,
+                    page=query_node.page,
+                    page_size=query_node.page_size,
+                    order_by=query_node.order_by,
+                    cursor=self._resolve_cursor(query_node, dict_context),
+                    query_options=query_options,
+                    count_options=count_options,
+                    window_functions=(strategy != 'window' or
+                                      self.database_service.supports_window_functions(query_node.datasource))
                 )
 
-                # Get total count from result
-                total_records = count_result.data[0]['count'] if count_result.data else 0
-
-                # Calculate pagination metadata
-                page = query_node.page if query_node.page is not None else 1
-                page_size = query_node.page_size
-                total_pages = (total_records + page_size - 1) // page_size  # Ceiling division
-
-                # Add LIMIT and OFFSET to SQL
-                offset = (page - 1) * page_size
-                sql_to_execute = f"{query_node.sql}\nLIMIT {page_size} OFFSET {offset}"
-
-                # Store pagination metadata
-                pagination_metadata = {
-                    'totalRecords': total_records,
-                    'totalPages': total_pages,
-                    'currentPage': page,
-                    'pageSize': page_size,
-                    'hasNextPage': page < total_pages,
-                    'hasPreviousPage': page > 1,
-                    'startRecord': offset + 1 if total_records > 0 else 0,
-                    'endRecord': min(offset + page_size, total_records)
-                }
+            if query_node.stream:
+                return self._execute_stream_query(query_node, sql_to_execute, resolved_params,
+                                                  pagination_metadata, exec_context)
 
-            # Execute query via DatabaseService
-            result = self.database_service.execute_query(
-                query_node.datasource,
-                sql_to_execute,
-                resolved_params
-            )
+            # Execute query via DatabaseService (window/keyset pages are already fetched)
+            if result is None:
+                result = self.database_service.execute_query(
+                    query_node.datasource,
+                    sql_to_execute,
+                    resolved_params,
+                    **query_options
+                )
 
-            # Store result in context with query name
-            # Store both as QueryResult object and as plain dict for template access
-            result_dict = result.to_dict()
+            self._store_query_result(query_node, result, pagination_metadata, exec_context)
+            return result
 
-            # Add pagination metadata if enabled
-            if pagination_metadata:
-                result_dict['pagination'] = pagination_metadata
+        except QueryValidationError as e:
+            raise ComponentExecutionError(f"Query validation error in '{query_node.name}': {e}")
+        except Exception as e:
+            raise ComponentExecutionError(f"Query execution error in '{query_node.name}': {e}")
 
-            # Make data accessible directly as array (for q:loop)
-            exec_context.set_variable(query_node.name, result.data, scope="component")
+    def _resolve_query_params(self, query_node: QueryNode, dict_context: Dict[str, Any]) -> Dict[str, Any]:
+        """Databound and validated q:param values of a q:query"""
+        resolved_params = {}
+        for param_node in query_node.params:
+            # Resolve parameter value (apply databinding)
+            param_value = self._apply_databinding(param_node.value, dict_context)
+
+            # Build attributes dict for validation
+            attributes = {
+                'null': param_node.null,
+                'max_length': param_node.max_length,
+                'scale': param_node.scale
+            }
 
-            # Also store full result object with metadata
-            exec_context.set_variable(f"{query_node.name}_result", result_dict, scope="component")
+            # Validate and convert parameter
+            try:
+                validated_value = QueryValidator.validate_param(
+                    param_value,
+                    param_node.param_type,
+                    attributes
+                )
+                resolved_params[param_node.name] = validated_value
+            except QueryValidationError as e:
+                raise ComponentExecutionError(
+                    f"Parameter '{param_node.name}' validation failed: {e}"
+                )
+        return resolved_params
+
+    @staticmethod
+    def _query_options(query_node: QueryNode) -> Dict[str, Any]:
+        """execute_query options of a q:query (cache/ttl, maxrows)"""
+        query_options = {}
+        cache_ttl = resolve_cache_ttl(query_node.cache, query_node.ttl)
+        if cache_ttl:
+            query_options['cache_ttl'] = cache_ttl
+        if query_node.maxrows:
+            query_options['max_rows'] = query_node.maxrows
+        return query_options
+
+    def _store_query_result(self, query_node: QueryNode, result: QueryResult,
+                            pagination_metadata: Optional[Dict[str, Any]],
+                            exec_context: ExecutionContext):
+        """Expose a q:query result as {name}, {name_result} and {name.field}"""
+        # Store both as QueryResult object and as plain dict for template access
+        result_dict = result.to_dict()
+
+        # Add pagination metadata if enabled
+        if pagination_metadata:
+            result_dict['pagination'] = pagination_metadata
+
+        # Make data accessible directly as array (for q:loop)
+        exec_context.set_variable(query_node.name, result.data, scope="component")
+
+        # Also store full result object with metadata
+        exec_context.set_variable(f"{query_node.name}_result", result_dict, scope="component")
+
+        # Store in self.context for backward compatibility
+        self.context[query_node.name] = result.data
+        self.context[f"{query_node.name}_result"] = result_dict
+
+        # For single-row results (INSERT RETURNING, etc.), expose fields directly
+        # Allows {insertResult.id} instead of {insertResult[0].id}
+        if result.data and len(result.data) == 1 and isinstance(result.data[0], Mapping):
+            for field_name, field_value in result.data[0].items():
+                dotted_key = f"{query_node.name}.{field_name}"
+                exec_context.set_variable(dotted_key, field_value, scope="component")
+                self.context[dotted_key] = field_value
 
-            # Store in self.context for backward compatibility
-            self.context[query_node.name] = result.data
-            self.context[f"{query_node.name}_result"] = result_dict
+        # If result variable name specified, store metadata separately
+        if query_node.result:
+            exec_context.set_variable(query_node.result, result_dict, scope="component")
+            self.context[query_node.result] = result_dict
 
-            # For single-row results (INSERT RETURNING, etc.), expose fields directly
-            # Allows {insertResult.id} instead of {insertResult[0].id}
-            if result.data and len(result.data) == 1 and isinstance(result.data[0], dict):
-                for field_name, field_value in result.data[0].items():
-                    dotted_key = f"{query_node.name}.{field_name}"
-                    exec_context.set_variable(dotted_key, field_value, scope="component")
-                    self.context[dotted_key] = field_value
+    def _execute_concurrent_queries(self, statements: List, index: int,
+                                    exec_context: ExecutionContext) -> int:
+        """
+        Run the independent q:query statements starting at statements[index]
+        at the same time (performance.concurrent_queries)
 
-            # If result variable name specified, store metadata separately
-            if query_node.result:
-                exec_context.set_variable(query_node.result, result_dict, scope="component")
-                self.context[query_node.result] = result_dict
+        Returns:
+            Number of statements executed (0 if they must run one by one)
 
-            return result
+        Raises:
+            ComponentExecutionError: First failing query, in statement order
+                                     (earlier results are stored)
+        """
+        if not self.concurrent_queries:
+            return 0
+        batch = plan_concurrent_queries(statements, index)
+        if len(batch) < 2:
+            return 0
 
-        except QueryValidationError as e:
-            raise ComponentExecutionError(f"Query validation error in '{query_node.name}': {e}")
-        except Exception as e:
-            raise ComponentExecutionError(f"Query execution error in '{query_node.name}': {e}")
+        dict_context = exec_context.get_all_variables()
+        queries = []
+        for query_node in batch:
+            try:
+                QueryValidator.sanitize_sql(query_node.sql)
+                params = self._resolve_query_params(query_node, dict_context)
+            except QueryValidationError as e:
+                raise ComponentExecutionError(f"Query validation error in '{query_node.name}': {e}")
+            queries.append({
+                'datasource_name': query_node.datasource,
+                'sql': query_node.sql,
+                'params': params,
+                **self._query_options(query_node)
+            })
+
+        results = self.database_service.execute_concurrently(queries)
+        for query_node, result in zip(batch, results):
+            if isinstance(result, Exception):
+                raise ComponentExecutionError(f"Query execution error in '{query_node.name}': {result}")
+            self._store_query_result(query_node, result, None, exec_context)
+        return len(batch)
+
+    def _resolve_cursor(self, query_node: QueryNode, context: Dict[str, Any]) -> Optional[str]:
+        """Keyset cursor token of a paginated q:query (None on the first page)"""
+        if not query_node.cursor:
+            return None
+        try:
+            cursor = self._apply_databinding(query_node.cursor, context)
+        except Exception:
+            return None
+        return cursor if isinstance(cursor, str) and '{' not in cursor else None
+
+    def _execute_stream_query(self, query_node: QueryNode, sql: str, params: Dict[str, Any],
+                              pagination_metadata: Optional[Dict[str, Any]],
+                              exec_context: ExecutionContext) -> QueryStream:
+        """
+        Execute a q:query with stream="true".
+
+        The variable holds a QueryStream: rows are fetched while q:loop or the
+        renderer iterates it, so they are never all in memory at once.
+        """
+        stream = self.database_service.stream_query(
+            query_node.datasource,
+            sql,
+            params,
+            fetch_size=query_node.fetch_size or DEFAULT_FETCH_SIZE,
+            max_rows=query_node.maxrows
+        )
+
+        result_dict = stream.to_dict()
+        if pagination_metadata:
+            result_dict['pagination'] = pagination_metadata
+
+        exec_context.set_variable(query_node.name, stream, scope="component")
+        exec_context.set_variable(f"{query_node.name}_result", result_dict, scope="component")
+        self.context[query_node.name] = stream
+        self.context[f"{query_node.name}_result"] = result_dict
+
+        if query_node.result:
+            exec_context.set_variable(query_node.result, result_dict, scope="component")
+            self.context[query_node.result] = result_dict
+
+        return stream
 
     def _generate_count_query(self, original_sql: str) -> str:
         """
@@ -1719,7 +1947,8 @@ class ComponentRuntime:
         """
         Execute Query of Queries - SQL on in-memory result sets.
 
-        Uses SQLite in-memory database to execute SQL on previous query results.
+        Runs on the request's QueryOfQueriesEngine (in-memory SQLite), which
+        keeps each source result loaded for later QoQ statements.
 
         Args:
             query_node: QueryNode with source attribute set
@@ -1734,7 +1963,6 @@ class ComponentRuntime:
             ComponentExecutionError: If source query not found or execution fails
         """
         import sqlite3
-        import time
         from .database_service import QueryResult
 
         try:
@@ -1747,7 +1975,7 @@ class ComponentRuntime:
                     f"Source query '{source_name}' not found for Query of Queries"
                 )
 
-            if not isinstance(source_data, list):
+            if not isinstance(source_data, (list, QueryStream)):
                 raise ComponentExecutionError(
                     f"Source '{source_name}' is not a query result (got {type(source_data).__name__})"
                 )
@@ -1763,66 +1991,8 @@ class ComponentRuntime:
                     sql=query_node.sql
                 )
 
-            # Create in-memory SQLite database
-            conn = sqlite3.connect(':memory:')
-            conn.row_factory = sqlite3.Row  # Enable column access by name
-            cursor = conn.cursor()
-
-            # Infer table structure from first row
-            first_row = source_data[0]
-            if not isinstance(first_row, dict):
-                raise ComponentExecutionError(
-                    f"Source data must be list of dictionaries (got {type(first_row).__name__})"
-                )
-
-            # Create table schema
-            columns = list(first_row.keys())
-            column_defs = ', '.join([f'"{col}" TEXT' for col in columns])  # Use TEXT for simplicity
-            create_table_sql = f'CREATE TABLE source_table ({column_defs})'
-            cursor.execute(create_table_sql)
-
-            # Insert source data
-            placeholders = ', '.join(['?' for _ in columns])
-            insert_sql = f'INSERT INTO source_table VALUES ({placeholders})'
-            for row in source_data:
-                values = [row.get(col) for col in columns]
-                cursor.execute(insert_sql, values)
-
-            # Replace source name in SQL with actual table name
-            # Support both "FROM source" and "FROM {source}" syntax
-            sql = query_node.sql
-            sql = sql.replace(f'FROM {source_name}', 'FROM source_table')
-            sql = sql.replace(f'FROM {{{source_name}}}', 'FROM source_table')
-
-            # Apply parameter binding (convert :name to ?)
-            for param_name, param_value in params.items():
-                sql = sql.replace(f':{param_name}', '?')
-
-            # Execute query
-            start_time = time.time()
-            cursor.execute(sql, list(params.values()) if params else [])
-            result_rows = cursor.fetchall()
-            execution_time = (time.time() - start_time) * 1000  # Convert to ms
-
-            # Convert to list of dicts
-            result_data = []
-            if result_rows:
-                column_names = [description[0] for description in cursor.description]
-                for row in result_rows:
-                    result_data.append(dict(zip(column_names, row)))
-
-            # Close connection
-            conn.close()
-
-            # Return QueryResult
-            result = QueryResult(
-                success=True,
-                data=result_data,
-                record_count=len(result_data),
-                column_list=column_names if result_data else [],
-                execution_time=int(execution_time),
-                sql=query_node.sql
-            )
+            # Sources are loaded once per request and reused by later QoQ statements
+            result = self.qoq_engine.execute(source_name, source_data, query_node.sql, params)
 
             # Store result in context (same as regular query)
             result_dict = result.to_dict()
@@ -1832,7 +2002,7 @@ class ComponentRuntime:
             self.context[f"{query_node.name}_result"] = result_dict
 
             # Single-row field exposure
-            if result.data and len(result.data) == 1 and isinstance(result.data[0], dict):
+            if result.data and len(result.data) == 1 and isinstance(result.data[0], Mapping):
                 for field_name, field_value in result.data[0].items():
                     dotted_key = f"{query_node.name}.{field_name}"
                     exec_context.set_variable(dotted_key, field_value, scope="component")
@@ -2182,7 +2352,7 @@ class ComponentRuntime:
             if log_node.context:
                 # Parse context as JSON or variable reference
                 context_expr = self._apply_databinding(log_node.context, dict_context)
-                if isinstance(context_expr, dict):
+                if isinstance(context_expr, Mapping):
                     context_data = context_expr
                 elif isinstance(context_expr, str):
                     try:
@@ -2440,15 +2610,15 @@ class ComponentRuntime:
             # Get dict context for databinding
             dict_context = exec_context.get_all_variables()
 
-            # Determine datasource (use first query's datasource or default)
-            datasource_name = "default"
-            for stmt in transaction_node.statements:
-                if isinstance(stmt, QueryNode) and stmt.datasource:
-                    datasource_name = stmt.datasource
-                    break
+            # Determine datasource (first query's, including queries in loops, or default)
+            datasource_name = self._transaction_datasource(transaction_node.statements) or "default"
 
-            # Begin transaction
-            transaction_context = self.database_service.begin_transaction(datasource_name)
+            # Begin transaction (one pooled connection, BEGIN ... COMMIT/ROLLBACK)
+            # Write batching is opt-in; database services without it need no new argument
+            options = {'batch_writes': True} if transaction_node.batch else {}
+            transaction_context = self.database_service.begin_transaction(
+                datasource_name, isolation_level=transaction_node.isolation_level, **options
+            )
 
             results = []
             try:
@@ -2466,6 +2636,7 @@ class ComponentRuntime:
                     'committed': True,
                     'isolation_level': transaction_node.isolation_level,
                     'statement_count': len(transaction_node.statements),
+                    'batched_rows': transaction_context.get('batched_rows', 0),
                     'results': results
                 }
 
@@ -2495,6 +2666,19 @@ class ComponentRuntime:
         except Exception as e:
             raise ComponentExecutionError(f"Transaction execution error: {e}")
 
+    def _transaction_datasource(self, statements) -> Optional[str]:
+        """Datasource of the first q:query in a statement tree"""
+        for stmt in statements:
+            if isinstance(stmt, QueryNode) and stmt.datasource:
+                return stmt.datasource
+            for attr in ('body', 'statements', 'if_body', 'else_body'):
+                children = getattr(stmt, attr, None)
+                if isinstance(children, list):
+                    datasource = self._transaction_datasource(children)
+                    if datasource:
+                        return datasource
+        return None
+
     def _execute_llm(self, llm_node: LLMNode, exec_context: ExecutionContext):
         """
         Execute LLM invocation (q:llm) via Ollama-compatible API.
@@ -3102,7 +3286,7 @@ class ComponentRuntime:
                 exec_context.set_variable(f"{query_node.name}_result", result_dict, scope="component")
                 self.context[query_node.name] = result.data
                 self.context[f"{query_node.name}_result"] = result_dict
-                if result.data and len(result.data) == 1 and isinstance(result.data[0], dict):
+                if result.data and len(result.data) == 1 and isinstance(result.data[0], Mapping):
                     for field_name, field_value in result.data[0].items():
                         dotted_key = f"{query_node.name}.{field_name}"
                         exec_context.set_variable(dotted_key, field_value, scope="component")
@@ -3181,7 +3365,7 @@ class ComponentRuntime:
             self.context[f"{query_node.name}_result"] = result_dict
 
             # For single-row results, expose fields directly ({name.field})
-            if result.data and len(result.data) == 1 and isinstance(result.data[0], dict):
+            if result.data and len(result.data) == 1 and isinstance(result.data[0], Mapping):
                 for field_name, field_value in result.data[0].items():
                     dotted_key = f"{query_node.name}.{field_name}"
                     exec_context.set_variable(dotted_key, field_value, scope="component")
@@ -3326,6 +3510,13 @@ class ComponentRuntime:
 
                     return results if results else None
 
+                if thread_node.isolation == 'process':
+                    # A closure over self cannot be pickled into the child
+                    thread_callback = functools.partial(
+                        _run_isolated_thread_body, self._services.config,
+                        thread_node.body, thread_context_vars
+                    )
+
                 # Build completion/error callbacks if specified
                 on_complete = None
                 on_error = None
@@ -3358,7 +3549,8 @@ class ComponentRuntime:
                     priority=thread_node.priority,
                     timeout=thread_node.timeout,
                     on_complete=on_complete,
-                    on_error=on_error
+                    on_error=on_error,
+                    isolation=thread_node.isolation
                 )
 
                 # Store thread info in context
@@ -3389,7 +3581,9 @@ class ComponentRuntime:
                             'name': thread_info.name,
                             'status': thread_info.status,
                             'result': thread_info.result,
-                            'error': thread_info.error
+                            'error': thread_info.error,
+                            'queue_wait': thread_info.queue_wait,
+                            'wall_time': thread_info.wall_time
                         }
                         exec_context.set_variable(f"thread_{name}", join_result, scope="component")
                         self.context[f"thread_{name}"] = join_result
@@ -20,6 +20,7 @@ from runtime.component_resolver import ComponentResolver, ComponentNotFoundError
 from runtime.component import ComponentRuntime
 from runtime.execution_context import ExecutionContext
 from runtime.renderer import HTMLRenderer
+from runtime.service_container import ServiceContainer
 
 
 class ComponentComposer:
@@ -35,13 +36,21 @@ class ComponentComposer:
     - Render composed output
     """
 
-    def __init__(self, resolver: ComponentResolver):
+    def __init__(self, resolver: ComponentResolver, services: Optional[ServiceContainer] = None):
+        """
+        Args:
+            resolver: Finds component files by name
+            services: Service container (and config) of the parent runtime;
+                      child runtimes share its database pools and caches
+        """
         self.resolver = resolver
+        self.services = services
 
     def compose(
         self,
         component_call: ComponentCallNode,
-        parent_context: ExecutionContext
+        parent_context: ExecutionContext,
+        inline_assets: Optional[Dict[str, List[str]]] = None
     ) -> str:
         """
         Compose and render a component call.
@@ -49,6 +58,9 @@ class ComponentComposer:
         Args:
             component_call: The <ComponentName /> call
             parent_context: Parent component's execution context
+            inline_assets: The parent renderer's collected <style>/<script>
+                           contents, when it collects them (the child's
+                           blocks are appended in document order)
 
         Returns:
             Rendered HTML string
@@ -67,7 +79,10 @@ class ComponentComposer:
         props = self._prepare_props(child_component, component_call.props, parent_context)
 
         # 3. Execute child component with props
-        runtime = ComponentRuntime()
+        if self.services is not None:
+            runtime = ComponentRuntime(config=self.services.config, services=self.services)
+        else:
+            runtime = ComponentRuntime()
         runtime.execute_component(child_component, props)
 
         # 4. Replace slots with content from parent
@@ -78,7 +93,10 @@ class ComponentComposer:
         )
 
         # 5. Render child component
-        renderer = HTMLRenderer(runtime.execution_context)
+        renderer = HTMLRenderer(runtime.execution_context, services=self.services)
+        if inline_assets is not None:
+            renderer.collect_assets = True
+            renderer.inline_assets = inline_assets
         html = renderer.render(processed_ast)
 
         return html
@@ -0,0 +1,98 @@
+"""
+Concurrent Queries - run independent q:query blocks at the same time
+
+With performance.concurrent_queries enabled, ComponentRuntime looks for
+runs of consecutive database q:query statements where no query's params
+reference a variable produced by an earlier query of the run (its name,
+name_result, name.field or result="..."). Such a run is issued at once
+through DatabaseService.execute_concurrently(), so the page waits for the
+slowest query instead of the sum of all of them.
+
+Only plain reads qualify: writes, paginated, streamed, Query of Queries
+and knowledge queries always run in order.
+
+Usage:
+    batch = plan_concurrent_queries(statements, index)
+    if len(batch) > 1:
+        ...  # run batch together, continue at index + len(batch)
+"""
+
+import re
+from typing import List, Optional, Set
+
+from core.ast_nodes import QueryNode
+from runtime.query_cache import is_write_query
+
+
+_EXPRESSION_PATTERN = re.compile(r'\{([^}]+)\}')
+# Root names of an expression: identifiers not preceded by '.', outside string literals
+_STRING_PATTERN = re.compile(r"'[^']*'|\"[^\"]*\"")
+_ROOT_NAME_PATTERN = re.compile(r'(?<![\w.])([A-Za-z_]\w*)')
+
+
+def referenced_variables(text: Optional[str]) -> Set[str]:
+    """
+    Root variable names used by the {expressions} of a databound value
+
+    "{user.id}" -> {'user'}, "{items[0].id + offset}" -> {'items', 'offset'}.
+    Extra names (function names, keywords) only make the check stricter.
+    """
+    if not text or '{' not in text:
+        return set()
+    names = set()
+    for expression in _EXPRESSION_PATTERN.findall(text):
+        names.update(_ROOT_NAME_PATTERN.findall(_STRING_PATTERN.sub("''", expression)))
+    return names
+
+
+def query_inputs(node: QueryNode) -> Set[str]:
+    """Variables a q:query reads (param values and the keyset cursor)"""
+    names = set()
+    for param in node.params:
+        names |= referenced_variables(param.value)
+    names |= referenced_variables(node.cursor)
+    return names
+
+
+def query_outputs(node: QueryNode) -> Set[str]:
+    """Variables a q:query sets (name.field results share the name root)"""
+    names = {node.name, f"{node.name}_result"}
+    if node.result:
+        names.add(node.result)
+    return names
+
+
+def can_run_concurrently(statement) -> bool:
+    """Whether a statement is a database read that may run beside others"""
+    return (
+        isinstance(statement, QueryNode)
+        and bool(statement.datasource)
+        and not statement.datasource.startswith('knowledge:')
+        and not statement.source
+        and not statement.mode
+        and not statement.paginate
+        and not statement.stream
+        and not is_write_query(statement.sql)
+    )
+
+
+def plan_concurrent_queries(statements: List, start: int) -> List[QueryNode]:
+    """
+    Independent queries starting at statements[start]
+
+    Returns:
+        The longest run of consecutive concurrent-safe queries where none
+        reads (or overwrites) a variable set by an earlier one; fewer than
+        two queries means there is nothing to run concurrently
+    """
+    batch: List[QueryNode] = []
+    produced: Set[str] = set()
+    for statement in statements[start:]:
+        if not can_run_concurrently(statement):
+            break
+        outputs = query_outputs(statement)
+        if query_inputs(statement) & produced or outputs & produced:
+            break
+        batch.append(statement)
+        produced |= outputs
+    return batch
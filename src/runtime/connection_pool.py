@@ -0,0 +1,383 @@
+"""
+Connection Pool - bounded, thread-safe DB-API connection pool
+
+One pool per datasource, owned by DatabaseService.
+
+Features:
+- min/max size: up to pool_size idle connections are kept, and up to
+  max_overflow extra ones are opened under load and closed on checkin
+- Checkout waits up to `timeout` seconds for a free connection
+- Idle connections above min_size are closed after idle_timeout
+- Liveness is checked only when a connection has been idle for longer
+  than pre_ping_interval (not before every query)
+- Per-thread affinity: pin() gives the calling thread one connection until
+  unpin(), so all statements of a transaction use the same connection
+- Metrics (in use, waiters, wait time, ...) for monitoring
+
+Usage:
+    pool = ConnectionPool('main', factory=connect, ping=is_alive, pool_size=5)
+
+    with pool.connection() as conn:
+        conn.cursor().execute("SELECT 1")
+
+    print(pool.stats())
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within the checkout timeout"""
+    pass
+
+
+class PoolClosedError(Exception):
+    """Raised when checking out from a closed pool"""
+    pass
+
+
+@dataclass
+class PoolStats:
+    """Counters for pool monitoring"""
+    created: int = 0
+    closed: int = 0
+    reaped: int = 0
+    checkouts: int = 0
+    timeouts: int = 0
+    pings: int = 0
+    ping_failures: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+    @property
+    def avg_wait_ms(self) -> float:
+        return self.total_wait_ms / self.checkouts if self.checkouts > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'created': self.created,
+            'closed': self.closed,
+            'reaped': self.reaped,
+            'checkouts': self.checkouts,
+            'timeouts': self.timeouts,
+            'pings': self.pings,
+            'ping_failures': self.ping_failures,
+            'avg_wait_ms': round(self.avg_wait_ms, 3),
+            'max_wait_ms': round(self.max_wait_ms, 3),
+        }
+
+
+class _PooledConnection:
+    """A connection with its bookkeeping timestamps"""
+
+    __slots__ = ('connection', 'created_at', 'last_used', 'last_checked')
+
+    def __init__(self, connection: Any):
+        now = time.monotonic()
+        self.connection = connection
+        self.created_at = now
+        self.last_used = now
+        self.last_checked = now
+
+
+class ConnectionPool:
+    """
+    Bounded pool of DB-API connections for one datasource.
+
+    Connections are handed out LIFO, so the most recently used (warm)
+    connections are reused and the coldest ones age out and get reaped.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        ping: Optional[Callable[[Any], bool]] = None,
+        min_size: int = 1,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        timeout: float = 30.0,
+        idle_timeout: float = 300.0,
+        pre_ping_interval: float = 30.0,
+    ):
+        """
+        Initialize the pool (connections are opened lazily).
+
+        Args:
+            name: Datasource name (for errors and metrics)
+            factory: Callable opening a new connection
+            ping: Callable returning True if a connection is alive
+            min_size: Idle connections never reaped
+            pool_size: Idle connections kept after checkin
+            max_overflow: Extra connections allowed under load
+            timeout: Seconds to wait for a connection before PoolTimeoutError
+            idle_timeout: Seconds before an idle connection above min_size is closed
+            pre_ping_interval: Seconds a connection may stay unused before it is
+                pinged on checkout (0 = ping on every checkout)
+        """
+        self.name = name
+        self._factory = factory
+        self._ping = ping
+        self.min_size = max(0, min_size)
+        self.pool_size = max(1, pool_size)
+        self.max_size = self.pool_size + max(0, max_overflow)
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.pre_ping_interval = pre_ping_interval
+
+        self._idle: Deque[_PooledConnection] = deque()
+        self._size = 0  # Open connections, idle or in use
+        self._in_use = 0
+        self._waiters = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+        self._stats = PoolStats()
+
+        # Per-thread pinned connection: [entry, depth]
+        self._local = threading.local()
+
+    # ==========================================================================
+    # Checkout / checkin
+    # ==========================================================================
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection for the duration of the block.
+
+        A thread holding a pinned connection (see pin()) gets that one.
+        If the block raises and the connection no longer answers a ping,
+        it is discarded instead of returned to the pool.
+        """
+        pinned = getattr(self._local, 'pinned', None)
+        if pinned is not None:
+            yield pinned[0].connection
+            return
+
+        entry = self._checkout()
+        discard = False
+        try:
+            yield entry.connection
+        except BaseException:
+            discard = not self._is_alive(entry)
+            raise
+        finally:
+            self._checkin(entry, discard)
+
+    def pin(self) -> Any:
+        """
+        Give the calling thread a dedicated connection until unpin().
+
+        Calls nest; the connection goes back to the pool when the outermost
+        pin is released.
+
+        Returns:
+            The pinned connection
+        """
+        pinned = getattr(self._local, 'pinned', None)
+        if pinned is None:
+            pinned = self._local.pinned = [self._checkout(), 0]
+        pinned[1] += 1
+        return pinned[0].connection
+
+    def unpin(self, discard: bool = False):
+        """
+        Release one pin() of the calling thread.
+
+        Args:
+            discard: Close the connection instead of returning it to the pool
+        """
+        pinned = getattr(self._local, 'pinned', None)
+        if pinned is None:
+            return
+        pinned[1] -= 1
+        if pinned[1] <= 0 or discard:
+            self._local.pinned = None
+            self._checkin(pinned[0], discard)
+
+    @property
+    def pinned(self) -> bool:
+        """True if the calling thread holds a pinned connection"""
+        return getattr(self._local, 'pinned', None) is not None
+
+    def _checkout(self) -> _PooledConnection:
+        """Take an idle connection, open a new one, or wait for a checkin"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        entry = None
+        to_close: List[_PooledConnection] = []
+
+        with self._cond:
+            to_close.extend(self._reap_idle(started))
+            while True:
+                if self._closed:
+                    raise PoolClosedError(f"Connection pool '{self.name}' is closed")
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    # Reserve a slot; the connection is opened outside the lock
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats.timeouts += 1
+                    raise PoolTimeoutError(
+                        f"Timed out after {self.timeout}s waiting for a connection "
+                        f"to '{self.name}' ({self._in_use}/{self.max_size} in use)"
+                    )
+                self._waiters += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiters -= 1
+
+            self._in_use += 1
+            wait_ms = (time.monotonic() - started) * 1000
+            self._stats.checkouts += 1
+            self._stats.total_wait_ms += wait_ms
+            self._stats.max_wait_ms = max(self._stats.max_wait_ms, wait_ms)
+
+        self._close_all(to_close)
+
+        if entry is not None:
+            if time.monotonic() - entry.last_checked < self.pre_ping_interval:
+                return entry
+            if self._is_alive(entry):
+                return entry
+            # Dead connection: replace it, keeping the reserved slot
+            self._close_all([entry])
+
+        try:
+            connection = self._factory()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._stats.created += 1
+        return _PooledConnection(connection)
+
+    def _checkin(self, entry: _PooledConnection, discard: bool = False):
+        """Return a connection to the pool (or close it)"""
+        to_close: List[_PooledConnection] = []
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed or len(self._idle) >= self.pool_size:
+                # Overflow connections are not kept around
+                self._size -= 1
+                to_close.append(entry)
+            else:
+                entry.last_used = time.monotonic()
+                self._idle.append(entry)
+            to_close.extend(self._reap_idle(time.monotonic()))
+            self._cond.notify()
+
+        self._close_all(to_close)
+
+    def _reap_idle(self, now: float) -> List[_PooledConnection]:
+        """Remove idle connections above min_size unused for idle_timeout (lock held)"""
+        reaped = []
+        # The left end holds the least recently used connections
+        while (
+            self._idle
+            and self._size > self.min_size
+            and now - self._idle[0].last_used > self.idle_timeout
+        ):
+            reaped.append(self._idle.popleft())
+            self._size -= 1
+        self._stats.reaped += len(reaped)
+        return reaped
+
+    def _is_alive(self, entry: _PooledConnection) -> bool:
+        """Ping a connection and record the result"""
+        if self._ping is None:
+            return True
+        try:
+            alive = bool(self._ping(entry.connection))
+        except Exception:
+            alive = False
+        with self._cond:
+            self._stats.pings += 1
+            if not alive:
+                self._stats.ping_failures += 1
+        if alive:
+            entry.last_checked = time.monotonic()
+        return alive
+
+    def _close_all(self, entries: List[_PooledConnection]):
+        """Close connections outside the pool lock"""
+        for entry in entries:
+            try:
+                entry.connection.close()
+            except Exception:
+                pass
+        if entries:
+            with self._cond:
+                self._stats.closed += len(entries)
+
+    # ==========================================================================
+    # Maintenance & monitoring
+    # ==========================================================================
+
+    def reap(self) -> int:
+        """
+        Close idle connections past idle_timeout now.
+
+        Reaping also happens on every checkout/checkin; call this from a
+        timer for pools that go quiet.
+
+        Returns:
+            Number of connections closed
+        """
+        with self._cond:
+            reaped = self._reap_idle(time.monotonic())
+        self._close_all(reaped)
+        return len(reaped)
+
+    def close(self):
+        """Close idle connections; connections in use are closed on checkin"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        self._close_all(idle)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Pool metrics for monitoring.
+
+        Returns:
+            Current gauges (size, in_use, idle, waiters) and PoolStats counters
+        """
+        with self._cond:
+            result = {
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'waiters': self._waiters,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+            }
+            result.update(self._stats.to_dict())
+        return result
+
+    def __repr__(self) -> str:
+        return (
+            f"ConnectionPool({self.name!r}, size={self._size}, "
+            f"in_use={self._in_use}, max_size={self.max_size})"
+        )
@@ -2,16 +2,143 @@
 Quantum Database Service - Manages database connections and query execution
 """
 
+import asyncio
+import json
+import re
 import time
+import threading
 import requests
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
+from collections.abc import Mapping
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, replace
+
+from runtime.async_database import ASYNC_DIALECTS, AsyncQueryRunner, async_driver
+from runtime.connection_pool import ConnectionPool, PoolClosedError, PoolTimeoutError
+from runtime.datasource_cache import DatasourceConfigCache
+from runtime.query_stream import DEFAULT_FETCH_SIZE, QueryStream, Row, column_index, json_default
+from runtime.query_cache import (
+    create_query_cache, is_write_query, query_cache_key, parse_duration, referenced_tables, table_tags
+)
+
+
+# Placeholder style per database type: 'format' (%s, psycopg2/pymysql) or 'qmark' (?)
+PLACEHOLDER_DIALECTS = {
+    'postgresql': 'format',
+    'mysql': 'format',
+    'mariadb': 'format',
+    'sqlite': 'qmark',
+}
+
+# Translated statements kept by compile_sql()
+SQL_CACHE_SIZE = 1024
+
+# Tokens of a SQL statement. Literals, quoted identifiers and comments are
+# matched whole so a ':name' inside them is never taken for a parameter;
+# '::' (PostgreSQL cast) is matched before ':name'.
+_SQL_TOKENS = r"""
+      (?P<string>{string})
+    | (?P<quoted>"(?:[^"]|"")*"|`[^`]*`)
+    | (?P<comment>--[^\n]*|/\*.*?\*/)
+    | (?P<dollar>\$(?P<tag>[A-Za-z_]*)\$.*?\$(?P=tag)\$)
+    | (?P<cast>::)
+    | :(?P<param>[A-Za-z_]\w*)
+    | (?P<percent>%)
+"""
+
+# Standard SQL literals: a backslash is an ordinary character ('C:\'),
+# except in PostgreSQL E'...' escape strings
+_SQL_TOKEN_PATTERN = re.compile(
+    _SQL_TOKENS.format(string=r"(?<![\w$])[Ee]'(?:[^'\\]|''|\\.)*'|'(?:[^']|'')*'"),
+    re.DOTALL | re.VERBOSE
+)
+
+# MySQL/MariaDB literals: a backslash escapes the next character
+_MYSQL_TOKEN_PATTERN = re.compile(
+    _SQL_TOKENS.format(string=r"'(?:[^'\\]|''|\\.)*'"),
+    re.DOTALL | re.VERBOSE
+)
+
+
+@lru_cache(maxsize=SQL_CACHE_SIZE)
+def compile_sql(sql: str, dialect: str, backslash_escapes: bool = False) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Translate :name placeholders once per (sql, dialect).
+
+    Args:
+        sql: SQL with :param placeholders
+        dialect: 'format' (%s), 'qmark' (?) or 'numeric' ($1, asyncpg)
+        backslash_escapes: String literals use backslash escapes (MySQL)
+
+    Returns:
+        (driver SQL, parameter names in placeholder order)
+    """
+    placeholder = '%s' if dialect == 'format' else '?'
+    names: List[str] = []
+
+    def replace_token(match: re.Match) -> str:
+        kind = match.lastgroup
+        if kind == 'param':
+            names.append(match.group('param'))
+            return f'${len(names)}' if dialect == 'numeric' else placeholder
+        text = match.group(0)
+        if dialect == 'format':
+            # psycopg2/pymysql apply %-formatting to the whole statement
+            return text.replace('%', '%%')
+        return text
+
+    pattern = _MYSQL_TOKEN_PATTERN if backslash_escapes else _SQL_TOKEN_PATTERN
+    return pattern.sub(replace_token, sql), tuple(names)
+
+
+# Per-datasource pool settings (quantum.config.yaml datasources or Admin API)
+POOL_DEFAULTS = {
+    'pool_min_size': 1,        # Idle connections never reaped
+    'pool_size': 5,            # Idle connections kept
+    'max_overflow': 10,        # Extra connections under load
+    'pool_timeout': 30,        # Seconds to wait for a free connection
+    'pool_idle_timeout': 300,  # Seconds before idle connections are closed
+    'pool_pre_ping': 30,       # Seconds unused before a liveness check
+}
+
+# Rows of a repeated INSERT/UPDATE sent per executemany() inside q:transaction
+WRITE_BATCH_SIZE = 500
+
+# q:transaction isolationLevel -> SQL isolation level
+ISOLATION_LEVELS = {
+    'READ_UNCOMMITTED': 'READ UNCOMMITTED',
+    'READ_COMMITTED': 'READ COMMITTED',
+    'REPEATABLE_READ': 'REPEATABLE READ',
+    'SERIALIZABLE': 'SERIALIZABLE',
+}
+
+_RETURNING_PATTERN = re.compile(r'\breturning\b', re.IGNORECASE)
+
+
+@lru_cache(maxsize=SQL_CACHE_SIZE)
+def is_batchable_write(sql: str) -> bool:
+    """
+    True for INSERT/UPDATE statements whose per-row result is not needed
+    (no RETURNING), so repeated executions can be sent with executemany()
+    """
+    stripped = _SQL_TOKEN_PATTERN.sub(
+        lambda m: ' ' if m.group('comment') else m.group(0), sql
+    ).lstrip().lower()
+    return stripped.startswith(('insert', 'update')) and not _RETURNING_PATTERN.search(stripped)
 
 
 @dataclass
 class QueryResult:
-    """Container for query results and metadata"""
-    data: List[Dict[str, Any]]
+    """
+    Container for query results and metadata
+
+    Rows from the database are Row views: each keeps its values as a tuple
+    and shares one column index with the rest of the result, so column
+    names are stored once instead of once per row. Rows behave like
+    read-only dicts (row['col'], row.col, iteration over column names).
+    """
+    data: List[Mapping[str, Any]]
     column_list: List[str]
     execution_time: float  # in milliseconds
     record_count: int
@@ -23,19 +150,48 @@ class QueryResult:
     success: bool = True
     affected_rows: Optional[int] = None  # For UPDATE/DELETE operations
     last_insert_id: Optional[int] = None  # For INSERT operations
+    batched: bool = False  # Write queued for executemany() inside q:transaction
 
     def to_dict(self):
-        """Convert to dictionary for template access"""
-        result = asdict(self)
-        # Rename column_list to columnList for JavaScript compatibility
-        result['columnList'] = result.pop('column_list')
-        result['recordCount'] = result.pop('record_count')
-        result['executionTime'] = result.pop('execution_time')
-        result['totalPages'] = result.pop('total_pages')
-        result['hasMore'] = result.pop('has_more')
-        result['affectedRows'] = result.pop('affected_rows')
-        result['lastInsertId'] = result.pop('last_insert_id')
-        return result
+        """Convert to dictionary for template access (rows are shared, not copied)"""
+        # camelCase keys for JavaScript compatibility
+        return {
+            'data': self.data,
+            'sql': self.sql,
+            'page': self.page,
+            'cached': self.cached,
+            'success': self.success,
+            'columnList': self.column_list,
+            'recordCount': self.record_count,
+            'executionTime': self.execution_time,
+            'totalPages': self.total_pages,
+            'hasMore': self.has_more,
+            'affectedRows': self.affected_rows,
+            'lastInsertId': self.last_insert_id,
+            'batched': self.batched,
+        }
+
+    def rows(self) -> List[Sequence[Any]]:
+        """Row values in column_list order (no per-row dicts)"""
+        return [
+            row.values_tuple() if isinstance(row, Row) else tuple(row.get(col) for col in self.column_list)
+            for row in self.data
+        ]
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Serialize to JSON in columnar form for API responses:
+        {"columns": [...], "rows": [[...], ...], "recordCount": n, ...}
+        """
+        payload = {
+            'columns': self.column_list,
+            'rows': self.rows(),
+            'recordCount': self.record_count,
+            'executionTime': self.execution_time,
+            'cached': self.cached,
+        }
+        kwargs.setdefault('default', json_default)
+        return json.dumps(payload, **kwargs)
 
 
 class DatabaseConnectionError(Exception):
@@ -43,6 +199,11 @@ class DatabaseConnectionError(Exception):
     pass
 
 
+class AdminAPIUnavailableError(DatabaseConnectionError):
+    """Raised when Quantum Admin cannot be reached to resolve a datasource"""
+    pass
+
+
 class QueryExecutionError(Exception):
     """Raised when query execution fails"""
     pass
@@ -53,7 +214,8 @@ class DatabaseService:
 
     def get_datasource_config(self, datasource_name: str) -> Dict[str, Any]:
         """
-        Get datasource configuration. Checks local config first, then Admin API.
+        Get datasource configuration. Checks local config first, then Admin API
+        (responses are cached, see DatasourceConfigCache).
 
         Args:
             datasource_name: Name of the datasource
@@ -81,8 +243,21 @@ class DatabaseService:
                 'port': local_cfg.get('port', 5432),
                 'username': local_cfg.get('username', ''),
                 'password': local_cfg.get('password', ''),
+                **{key: local_cfg[key] for key in POOL_DEFAULTS if key in local_cfg},
+                **{key: local_cfg[key] for key in ('statement_cache_size', 'async_driver')
+                   if key in local_cfg},
             }
 
+        return self.datasource_cache.get(datasource_name)
+
+    def _fetch_datasource_config(self, datasource_name: str) -> Dict[str, Any]:
+        """
+        Resolve a datasource through the Quantum Admin API (cache loader)
+
+        Raises:
+            DatabaseConnectionError: If datasource not found or not ready
+            AdminAPIUnavailableError: If the Admin API cannot be reached
+        """
         try:
             url = f"{self.admin_api_url}/api/datasources/by-name/{datasource_name}"
             response = requests.get(url, timeout=5)
@@ -93,6 +268,10 @@ class DatabaseService:
                 raise DatabaseConnectionError(
                     f"Datasource '{datasource_name}' is not ready. Please check Quantum Admin."
                 )
+            elif response.status_code >= 500:
+                raise AdminAPIUnavailableError(
+                    f"Failed to fetch datasource '{datasource_name}': {response.status_code}"
+                )
             elif response.status_code != 200:
                 raise DatabaseConnectionError(
                     f"Failed to fetch datasource '{datasource_name}': {response.status_code}"
@@ -101,59 +280,116 @@ class DatabaseService:
             return response.json()
 
         except requests.exceptions.ConnectionError:
-            raise DatabaseConnectionError(
+            raise AdminAPIUnavailableError(
                 f"Cannot connect to Quantum Admin API at {self.admin_api_url}. "
                 "Please ensure Quantum Admin is running."
             )
         except requests.exceptions.Timeout:
-            raise DatabaseConnectionError(
+            raise AdminAPIUnavailableError(
                 f"Timeout connecting to Quantum Admin API at {self.admin_api_url}"
             )
 
-    def get_connection(self, datasource_config: Dict[str, Any]):
+    def get_pool(self, datasource_config: Dict[str, Any]) -> ConnectionPool:
         """
-        Get or create database connection
+        Get (or create) the connection pool of a datasource
 
         Args:
-            datasource_config: Datasource configuration from Admin API
+            datasource_config: Datasource configuration
 
         Returns:
-            Database connection object
-
-        Raises:
-            DatabaseConnectionError: If connection fails
+            ConnectionPool shared by every thread using this service
         """
         datasource_name = datasource_config['name']
+        pool = self._pools.get(datasource_name)
+        if pool is None or pool.closed:
+            with self._pools_lock:
+                pool = self._pools.get(datasource_name)
+                if pool is None or pool.closed:
+                    pool = self._create_pool(datasource_config)
+                    self._pools[datasource_name] = pool
+        return pool
+
+    def _create_pool(self, datasource_config: Dict[str, Any]) -> ConnectionPool:
+        """Build a pool from the datasource's pool_* settings"""
+        db_type = datasource_config['type']
+        options = {key: datasource_config.get(key, default) for key, default in POOL_DEFAULTS.items()}
+
+        pool_size = options['pool_size']
+        max_overflow = options['max_overflow']
+        if db_type == 'sqlite' and datasource_config.get('database') in ('', ':memory:'):
+            # Every connection to :memory: is a separate database
+            pool_size, max_overflow = 1, 0
+
+        return ConnectionPool(
+            datasource_config['name'],
+            factory=lambda: self._open_connection(datasource_config),
+            ping=lambda conn: self._test_connection(conn, db_type),
+            min_size=options['pool_min_size'],
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            timeout=options['pool_timeout'],
+            idle_timeout=options['pool_idle_timeout'],
+            pre_ping_interval=options['pool_pre_ping'],
+        )
+
+    def _open_connection(self, datasource_config: Dict[str, Any]):
+        """Open a new database connection (pool factory)"""
         db_type = datasource_config['type']
-
-        # Check if connection already exists in pool
-        if datasource_name in self.connection_pool:
-            conn = self.connection_pool[datasource_name]
-            # Test connection is still alive
-            if self._test_connection(conn, db_type):
-                return conn
-            else:
-                # Connection dead, remove from pool
-                del self.connection_pool[datasource_name]
-
-        # Create new connection
         try:
             if db_type == 'postgresql':
-                conn = self._create_postgres_connection(datasource_config)
+                return self._create_postgres_connection(datasource_config)
             elif db_type in ['mysql', 'mariadb']:
-                conn = self._create_mysql_connection(datasource_config)
+                return self._create_mysql_connection(datasource_config)
             elif db_type == 'sqlite':
-                conn = self._create_sqlite_connection(datasource_config)
+                return self._create_sqlite_connection(datasource_config)
             else:
                 raise DatabaseConnectionError(f"Unsupported database type: {db_type}")
 
-            # Store in pool
-            self.connection_pool[datasource_name] = conn
-            return conn
-
         except Exception as e:
             raise DatabaseConnectionError(f"Failed to connect to database: {e}")
 
+    @contextmanager
+    def connection(self, datasource_config: Dict[str, Any]):
+        """
+        Borrow a pooled connection for the duration of the block
+
+        Args:
+            datasource_config: Datasource configuration
+
+        Raises:
+            DatabaseConnectionError: If connection fails or the pool is exhausted
+        """
+        try:
+            with self.get_pool(datasource_config).connection() as conn:
+                yield conn
+        except (PoolTimeoutError, PoolClosedError) as e:
+            raise DatabaseConnectionError(str(e))
+
+    def get_connection(self, datasource_config: Dict[str, Any]):
+        """
+        Get a connection pinned to the calling thread
+
+        The connection stays reserved for this thread (every query it runs on
+        the datasource uses it) until close_connection().
+
+        Args:
+            datasource_config: Datasource configuration from Admin API
+
+        Returns:
+            Database connection object
+
+        Raises:
+            DatabaseConnectionError: If connection fails
+        """
+        pool = self.get_pool(datasource_config)
+        if pool.pinned:
+            with pool.connection() as conn:
+                return conn
+        try:
+            return pool.pin()
+        except (PoolTimeoutError, PoolClosedError) as e:
+            raise DatabaseConnectionError(str(e))
+
     def _create_postgres_connection(self, config: Dict[str, Any]):
         """Create PostgreSQL connection"""
         try:
@@ -190,7 +426,14 @@ class DatabaseService:
     def _create_sqlite_connection(self, config: Dict[str, Any]):
         """Create SQLite connection"""
         import sqlite3
-        conn = sqlite3.connect(config['database'], timeout=30.0)
+        # Pooled connections are handed to whichever thread checks them out
+        conn = sqlite3.connect(
+            config['database'],
+            timeout=30.0,
+            check_same_thread=False,
+            # Compiled statements reused per connection (compile_sql keeps SQL text stable)
+            cached_statements=config.get('statement_cache_size', 256)
+        )
         conn.row_factory = sqlite3.Row  # Enable column access by name
         conn.isolation_level = None  # Autocommit mode for better concurrency
         return conn
@@ -208,7 +451,14 @@ class DatabaseService:
         except:
             return False
 
-    def execute_query(self, datasource_name: str, sql: str, params: Dict[str, Any] = None) -> QueryResult:
+    def execute_query(
+        self,
+        datasource_name: str,
+        sql: str,
+        params: Dict[str, Any] = None,
+        max_rows: Optional[int] = None,
+        cache_ttl: float = 0
+    ) -> QueryResult:
         """
         Execute SQL with parameter binding
 
@@ -216,6 +466,8 @@ class DatabaseService:
             datasource_name: Name of the datasource
             sql: SQL query with :param placeholders
             params: Dictionary of parameter values
+            max_rows: Fetch at most this many rows (q:query maxrows)
+            cache_ttl: Seconds to cache the result of a read query (0 = no caching)
 
         Returns:
             QueryResult with data and metadata
@@ -226,18 +478,287 @@ class DatabaseService:
         if params is None:
             params = {}
 
+        if self._transaction_stack(datasource_name):
+            # Inside q:transaction: no result caching, writes may be batched
+            return self._execute_in_transaction(datasource_name, sql, params, max_rows)
+
+        write = is_write_query(sql)
+        cache_key, cached = self._cached_result(datasource_name, sql, params, max_rows, cache_ttl, write)
+        if cached is not None:
+            return cached
+
         # Get datasource config
         config = self.get_datasource_config(datasource_name)
+
+        with self.connection(config) as conn:
+            result = self._execute_on_connection(conn, config['type'], sql, params, max_rows)
+
+        self._record_result(datasource_name, sql, write, cache_key, result, cache_ttl)
+        return result
+
+    def _cached_result(self, datasource_name: str, sql: str, params: Dict[str, Any],
+                       max_rows: Optional[int], cache_ttl: float, write: bool):
+        """(cache key or None, cached QueryResult or None) of a read query"""
+        if cache_ttl <= 0 or write:
+            return None, None
+        cache_key = query_cache_key(datasource_name, sql, params, max_rows)
+        cached = self.query_cache.get(cache_key)
+        if cached is not None:
+            return cache_key, replace(cached, data=list(cached.data), cached=True)
+        return cache_key, None
+
+    def _record_result(self, datasource_name: str, sql: str, write: bool,
+                       cache_key: Optional[str], result: QueryResult, cache_ttl: float):
+        """Cache a read result, or invalidate what a write made stale"""
+        if write:
+            # Results that read the written tables are now stale
+            self.query_cache.invalidate_tables(datasource_name, referenced_tables(sql))
+        elif cache_key is not None:
+            self.query_cache.put(cache_key, result, cache_ttl, table_tags(datasource_name, sql))
+
+    # Async execution
+    #
+    # execute_query_async() runs on a background event loop owned by the
+    # service, with the datasource's native async driver (asyncpg, aiomysql,
+    # aiosqlite) when it is installed and the synchronous pool on a worker
+    # thread otherwise. execute_concurrently() lets synchronous callers
+    # (ComponentRuntime) issue independent queries at the same time.
+
+    @property
+    def async_runner(self) -> AsyncQueryRunner:
+        """Background event loop for async queries (started on first use)"""
+        if self._async_runner is None:
+            with self._pools_lock:
+                if self._async_runner is None:
+                    self._async_runner = AsyncQueryRunner()
+        return self._async_runner
+
+    async def execute_query_async(
+        self,
+        datasource_name: str,
+        sql: str,
+        params: Dict[str, Any] = None,
+        max_rows: Optional[int] = None,
+        cache_ttl: float = 0
+    ) -> QueryResult:
+        """
+        Async execute_query (same arguments, caching and result)
+
+        May be awaited from any event loop; the query itself always runs on
+        the service's loop, where the driver pools live. Open q:transaction
+        contexts are not visible here: use execute_query inside a transaction.
+
+        Raises:
+            QueryExecutionError: If query execution fails
+        """
+        runner = self.async_runner
+        if not runner.in_loop():
+            return await asyncio.wrap_future(runner.submit(
+                self.execute_query_async(datasource_name, sql, params, max_rows, cache_ttl)
+            ))
+
+        if params is None:
+            params = {}
+        loop = asyncio.get_running_loop()
+
+        write = is_write_query(sql)
+        cache_key, cached = self._cached_result(datasource_name, sql, params, max_rows, cache_ttl, write)
+        if cached is not None:
+            return cached
+
+        if datasource_name in self.local_datasources:
+            config = self.get_datasource_config(datasource_name)
+        else:
+            # Admin API lookups may block on HTTP
+            config = await loop.run_in_executor(None, self.get_datasource_config, datasource_name)
+
+        driver = async_driver(config)
+        if driver is None:
+            return await loop.run_in_executor(
+                None, self.execute_query, datasource_name, sql, params, max_rows, cache_ttl
+            )
+
+        prepared_sql, param_names = compile_sql(sql, ASYNC_DIALECTS[driver], driver == 'aiomysql')
+        try:
+            result = await runner.execute(config, driver, prepared_sql,
+                                          [params.get(name) for name in param_names], max_rows)
+        except QueryExecutionError:
+            raise
+        except Exception as e:
+            raise QueryExecutionError(f"Query execution failed: {e}")
+
+        self._record_result(datasource_name, sql, write, cache_key, result, cache_ttl)
+        return result
+
+    def execute_concurrently(self, queries: Sequence[Dict[str, Any]]) -> List[Any]:
+        """
+        Run independent queries at the same time and wait for all of them
+
+        Args:
+            queries: execute_query keyword arguments per query
+                     (datasource_name, sql, params, max_rows, cache_ttl)
+
+        Returns:
+            One QueryResult per query, in order; a failed query's exception
+            is returned in its place. Queries on a datasource with an open
+            q:transaction run one after another on its connection.
+        """
+        if any(self.in_transaction(query['datasource_name']) for query in queries):
+            results = []
+            for query in queries:
+                try:
+                    results.append(self.execute_query(**query))
+                except Exception as e:
+                    results.append(e)
+            return results
+
+        return self.async_runner.run([self.execute_query_async(**query) for query in queries])
+
+    def supports_window_functions(self, datasource_name: str) -> bool:
+        """Whether COUNT(*) OVER() works on the datasource (pagination="window")"""
+        if self.get_datasource_config(datasource_name)['type'] == 'sqlite':
+            import sqlite3
+            return sqlite3.sqlite_version_info >= (3, 25, 0)
+        # PostgreSQL 8.4+, MySQL 8.0+, MariaDB 10.2+
+        return True
+
+    def stream_query(
+        self,
+        datasource_name: str,
+        sql: str,
+        params: Dict[str, Any] = None,
+        fetch_size: int = DEFAULT_FETCH_SIZE,
+        max_rows: Optional[int] = None
+    ) -> QueryStream:
+        """
+        Execute SQL and return its rows lazily (q:query stream="true")
+
+        The statement runs when iteration starts; rows are read through a
+        server-side cursor in batches of fetch_size, and the pooled
+        connection is held only until the iteration ends.
+
+        Args:
+            datasource_name: Name of the datasource
+            sql: SELECT with :param placeholders
+            params: Dictionary of parameter values
+            fetch_size: Rows fetched per round trip
+            max_rows: Stop after this many rows (q:query maxrows)
+
+        Returns:
+            QueryStream yielding Row objects
+
+        Raises:
+            QueryExecutionError: While iterating, if query execution fails
+        """
+        if params is None:
+            params = {}
+        if self._transaction_stack(datasource_name):
+            # Queued writes must reach the connection before it is read
+            self._flush_writes(self._start_transaction(datasource_name))
+        config = self.get_datasource_config(datasource_name)
+        return QueryStream(
+            lambda: self._stream_rows(config, sql, params, max(1, fetch_size), max_rows),
+            sql=sql
+        )
+
+    def _stream_rows(self, config: Dict[str, Any], sql: str, params: Dict[str, Any],
+                     fetch_size: int, max_rows: Optional[int]):
+        """Generator yielding the column names, then one Row per result row"""
         db_type = config['type']
+        prepared_sql, prepared_params = self._prepare_query(sql, params, db_type)
+        pool = self.get_pool(config)
+        in_transaction = pool.pinned
+
+        with self.connection(config) as conn:
+            cursor = None
+            try:
+                cursor = self._open_stream_cursor(conn, db_type)
+                cursor.execute(prepared_sql, prepared_params)
+
+                remaining = max_rows
+                batch = cursor.fetchmany(fetch_size if remaining is None else min(fetch_size, remaining))
+                if cursor.description is None:
+                    raise QueryExecutionError("Streaming requires a statement that returns rows")
+                columns = [desc[0] for desc in cursor.description]
+            except QueryExecutionError:
+                self._close_stream_cursor(conn, cursor, db_type, in_transaction, failed=True)
+                raise
+            except Exception as e:
+                self._close_stream_cursor(conn, cursor, db_type, in_transaction, failed=True)
+                raise QueryExecutionError(f"Query execution failed: {e}")
 
-        # Get connection
-        conn = self.get_connection(config)
+            try:
+                yield columns
+                index = column_index(columns)
+                while batch:
+                    for values in batch:
+                        yield Row(index, values)
+                    if remaining is not None:
+                        remaining -= len(batch)
+                        if remaining <= 0:
+                            break
+                    batch = cursor.fetchmany(fetch_size if remaining is None else min(fetch_size, remaining))
+            finally:
+                self._close_stream_cursor(conn, cursor, db_type, in_transaction)
+
+    def _open_stream_cursor(self, conn, db_type: str):
+        """Cursor that fetches rows from the server on demand"""
+        if db_type == 'postgresql':
+            import uuid
+            # Named cursors live on the server and are read batch by batch
+            return conn.cursor(name=f"quantum_stream_{uuid.uuid4().hex[:12]}")
+        elif db_type in ['mysql', 'mariadb']:
+            import pymysql.cursors
+            # Unbuffered: rows are read from the socket as they are fetched
+            return conn.cursor(pymysql.cursors.SSCursor)
+        elif db_type == 'sqlite':
+            # sqlite3 steps the statement lazily on fetchmany()
+            return self._tuple_cursor(conn, db_type)
+        raise QueryExecutionError(f"Unsupported database type: {db_type}")
+
+    def _tuple_cursor(self, conn, db_type: str):
+        """Cursor returning plain value tuples (wrapped in Row views, no per-row dicts)"""
+        if db_type in ['mysql', 'mariadb']:
+            import pymysql.cursors
+            # Connections default to DictCursor
+            return conn.cursor(pymysql.cursors.Cursor)
+        cursor = conn.cursor()
+        if db_type == 'sqlite':
+            # Connections use row_factory=sqlite3.Row
+            cursor.row_factory = None
+        return cursor
+
+    def _close_stream_cursor(self, conn, cursor, db_type: str, in_transaction: bool, failed: bool = False):
+        """Close a streaming cursor and end the read transaction it opened"""
+        try:
+            if cursor is not None:
+                cursor.close()
+            # Named cursors need a transaction; end it unless q:transaction owns it
+            if failed or (db_type == 'postgresql' and not in_transaction):
+                conn.rollback()
+        except Exception:
+            pass
+
+    def _execute_on_connection(
+        self,
+        conn,
+        db_type: str,
+        sql: str,
+        params: Dict[str, Any],
+        max_rows: Optional[int] = None,
+        in_transaction: bool = False
+    ) -> QueryResult:
+        """
+        Run one statement on a checked-out connection
 
+        Writes are committed right away unless in_transaction (the open
+        q:transaction commits or rolls back the connection).
+        """
         # Start timing
         start_time = time.time()
 
         try:
-            cursor = conn.cursor()
+            cursor = self._tuple_cursor(conn, db_type)
 
             # Convert :param syntax to database-specific placeholder
             prepared_sql, prepared_params = self._prepare_query(sql, params, db_type)
@@ -247,32 +768,21 @@ class DatabaseService:
 
             # Check if it's a SELECT query (returns data)
             if cursor.description:
-                # Fetch results
-                rows = cursor.fetchall()
+                # Fetch results (only the first max_rows leave the driver)
+                rows = cursor.fetchmany(max_rows) if max_rows else cursor.fetchall()
 
-                # Get column names
-                if db_type == 'postgresql':
-                    column_names = [desc[0] for desc in cursor.description]
-                    # Convert rows to dictionaries for PostgreSQL
-                    data = [dict(zip(column_names, row)) for row in rows]
-                elif db_type in ['mysql', 'mariadb']:
-                    # pymysql with DictCursor already returns dictionaries
-                    column_names = list(rows[0].keys()) if rows else []
-                    data = rows
-                elif db_type == 'sqlite':
-                    # SQLite with row_factory=Row - convert to dictionaries
-                    column_names = [desc[0] for desc in cursor.description]
-                    data = [dict(row) for row in rows]
-                else:
-                    column_names = []
-                    data = []
+                # Column names are stored once; each row is a view over its tuple
+                column_names = [desc[0] for desc in cursor.description]
+                index = column_index(column_names)
+                data = [Row(index, row) for row in rows]
 
                 record_count = len(data)
                 affected_rows = None
                 last_insert_id = None
             else:
                 # Non-SELECT query (INSERT, UPDATE, DELETE)
-                conn.commit()
+                if not in_transaction:
+                    conn.commit()
                 data = []
                 column_names = []
                 record_count = cursor.rowcount
@@ -303,7 +813,8 @@ class DatabaseService:
                 if db_type == 'postgresql' and cursor.description:
                     rows = cursor.fetchall()
                     column_names = [desc[0] for desc in cursor.description]
-                    data = [dict(zip(column_names, row)) for row in rows]
+                    index = column_index(column_names)
+                    data = [Row(index, row) for row in rows]
                     record_count = len(data)
 
             cursor.close()
@@ -321,142 +832,416 @@ class DatabaseService:
             )
 
         except Exception as e:
-            # Rollback on error
-            conn.rollback()
+            # Rollback on error (a transaction is rolled back by its owner)
+            if not in_transaction:
+                conn.rollback()
             raise QueryExecutionError(f"Query execution failed: {e}")
 
     def _prepare_query(self, sql: str, params: Dict[str, Any], db_type: str) -> tuple:
         """
         Convert :param syntax to database-specific placeholders
 
+        The SQL is translated once per (sql, dialect) (see compile_sql);
+        each call only builds the parameter list.
+
         Args:
             sql: SQL with :param placeholders
             params: Dictionary of parameters
-            db_type: Database type (postgresql, mysql, mariadb)
+            db_type: Database type (postgresql, mysql, mariadb, sqlite)
 
         Returns:
             Tuple of (prepared_sql, prepared_params)
         """
-        import re
-
-        # Find all :param placeholders
-        param_pattern = r':(\w+)'
-        param_names = re.findall(param_pattern, sql)
-
-        if db_type == 'postgresql':
-            # PostgreSQL uses %s placeholders
-            prepared_sql = sql
-            for i, param_name in enumerate(param_names, 1):
-                # Replace :param with %s
-                prepared_sql = prepared_sql.replace(f':{param_name}', '%s', 1)
-
-            # Build parameter list in correct order
-            prepared_params = [params.get(name) for name in param_names]
-
-        elif db_type in ['mysql', 'mariadb']:
-            # MySQL uses %s placeholders
-            prepared_sql = sql
-            for param_name in param_names:
-                prepared_sql = prepared_sql.replace(f':{param_name}', '%s', 1)
-
-            # Build parameter list in correct order
-            prepared_params = [params.get(name) for name in param_names]
-
-        elif db_type == 'sqlite':
-            # SQLite uses ? placeholders
-            prepared_sql = sql
-            for param_name in param_names:
-                prepared_sql = prepared_sql.replace(f':{param_name}', '?', 1)
-
-            # Build parameter list in correct order
-            prepared_params = [params.get(name) for name in param_names]
-
-        else:
+        dialect = PLACEHOLDER_DIALECTS.get(db_type)
+        if dialect is None:
             raise QueryExecutionError(f"Unsupported database type: {db_type}")
 
+        prepared_sql, param_names = compile_sql(sql, dialect, db_type in ('mysql', 'mariadb'))
+        prepared_params = [params.get(name) for name in param_names]
         return prepared_sql, prepared_params
 
     def close_connection(self, datasource_name: str):
-        """Close database connection"""
-        if datasource_name in self.connection_pool:
-            try:
-                self.connection_pool[datasource_name].close()
-            except:
-                pass
-            del self.connection_pool[datasource_name]
+        """Close the connection pool of a datasource"""
+        with self._pools_lock:
+            pool = self._pools.pop(datasource_name, None)
+        if pool is not None:
+            # Return this thread's pinned connection so close() can release it
+            while pool.pinned:
+                pool.unpin()
+            pool.close()
 
     def close_all_connections(self):
         """Close all database connections"""
-        for datasource_name in list(self.connection_pool.keys()):
+        for datasource_name in list(self._pools.keys()):
             self.close_connection(datasource_name)
 
+    def invalidate_datasource(self, datasource_name: Optional[str] = None):
+        """
+        Drop cached Admin API configs (called when Quantum Admin pushes changes)
+
+        Args:
+            datasource_name: Datasource to refetch on next use (None = all)
+        """
+        self.datasource_cache.invalidate(datasource_name)
+
+    def _retire_pool(self, datasource_name: str):
+        """Close the pool built from an outdated datasource config"""
+        with self._pools_lock:
+            pool = self._pools.pop(datasource_name, None)
+        if pool is not None:
+            # Connections in use are closed when they are checked in
+            pool.close()
+        if self._async_runner is not None:
+            self._async_runner.retire_pool(datasource_name)
+
+    def shutdown(self):
+        """Close every connection pool and the async event loop"""
+        self.close_all_connections()
+        if self._async_runner is not None:
+            self._async_runner.close()
+            self._async_runner = None
+
+    def get_pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Connection pool metrics, keyed by datasource name"""
+        with self._pools_lock:
+            pools = dict(self._pools)
+        return {name: pool.stats() for name, pool in pools.items()}
+
     # Phase D: Database Backend - Transaction Support
-    
-    def begin_transaction(self, datasource_name: str = "default") -> Dict[str, Any]:
+    #
+    # A q:transaction owns one pooled connection (pinned to the request
+    # thread) with a real BEGIN ... COMMIT/ROLLBACK; nested transactions
+    # are savepoints. With <q:transaction batch="true">, repeated
+    # INSERT/UPDATE statements (a q:query inside a q:loop) are queued from
+    # their second consecutive run and sent with executemany() when another
+    # statement runs, the batch is full or the transaction commits. The
+    # first run executes at once, so a single write still reports
+    # recordCount, affectedRows and lastInsertId; queued runs report none.
+    # Errors of queued writes (e.g. a constraint violation) surface at that
+    # later flush, not at the q:query that caused them, so a q:try inside
+    # the loop cannot catch them - they fail the transaction and roll it
+    # back. Without batch="true" every statement executes at once.
+
+    def begin_transaction(self, datasource_name: str = "default",
+                          isolation_level: Optional[str] = None,
+                          batch_writes: bool = False) -> Dict[str, Any]:
         """
         Begin a database transaction
-        
+
         Phase D: Database Backend
-        
+
         Args:
             datasource_name: Name of datasource
-            
+            isolation_level: READ_UNCOMMITTED, READ_COMMITTED, REPEATABLE_READ
+                or SERIALIZABLE (None = database default)
+            batch_writes: Queue repeated INSERT/UPDATE statements for
+                executemany(); their results carry no row counts and their
+                errors are raised at the next flush (nested transactions
+                inherit this from the enclosing one)
+
         Returns:
             Transaction context dict
         """
-        # For now, return a transaction context
-        # Real implementation would use database-specific transaction APIs
-        return {
+        stack = self._transaction_stack(datasource_name)
+        transaction = {
             'datasource': datasource_name,
             'active': True,
+            'started': False,
             'queries': [],
-            'start_time': time.time()
+            'start_time': time.time(),
+            'isolation_level': isolation_level,
+            'savepoint': f"quantum_sp_{len(stack)}" if stack else None,
+            'batched_rows': 0,
+            'batch_writes': batch_writes or bool(stack and stack[-1].get('batch_writes')),
         }
-    
+        stack.append(transaction)
+
+        # Known datasources get their connection reserved now; Admin API
+        # datasources not used yet start at their first query
+        if datasource_name in self._pools or datasource_name in self.local_datasources:
+            try:
+                self._start_transaction(datasource_name)
+            except Exception:
+                stack.pop()
+                raise
+        return transaction
+
     def commit_transaction(self, transaction_context: Dict[str, Any]) -> bool:
         """
         Commit a transaction
-        
+
+        Queued batched writes are sent first; a nested transaction releases
+        its savepoint.
+
         Args:
             transaction_context: Transaction context from begin_transaction
-            
+
         Returns:
             True if successful
+
+        Raises:
+            QueryExecutionError: If a batched write or the commit fails (the
+                transaction is rolled back)
         """
+        stack = self._transaction_stack(transaction_context.get('datasource'))
+        if not any(t is transaction_context for t in stack):
+            transaction_context['active'] = False
+            transaction_context['committed'] = True
+            return True
+
+        # Inner transactions left open are committed with this one
+        while stack[-1] is not transaction_context:
+            self.commit_transaction(stack[-1])
+
+        root = stack[0]
+        if transaction_context['started']:
+            try:
+                self._flush_writes(root)
+                if transaction_context is root:
+                    root['_conn'].commit()
+                else:
+                    self._run_statement(root['_conn'], f"RELEASE SAVEPOINT {transaction_context['savepoint']}")
+            except Exception as e:
+                self.rollback_transaction(transaction_context)
+                if isinstance(e, QueryExecutionError):
+                    raise
+                raise QueryExecutionError(f"Transaction commit failed: {e}")
+
+        stack.pop()
+        if transaction_context is root:
+            self._end_transaction(root)
+            # Cached reads of the written tables are stale once the writes are visible
+            if root.get('tables'):
+                self.query_cache.invalidate_tables(root['datasource'], root['tables'])
+
         # Mark transaction as committed
         transaction_context['active'] = False
         transaction_context['committed'] = True
         return True
-    
+
     def rollback_transaction(self, transaction_context: Dict[str, Any]) -> bool:
         """
         Rollback a transaction
-        
+
+        Queued batched writes are dropped; a nested transaction rolls back
+        to its savepoint.
+
         Args:
             transaction_context: Transaction context from begin_transaction
-            
+
         Returns:
             True if successful
         """
+        stack = self._transaction_stack(transaction_context.get('datasource'))
+        if not any(t is transaction_context for t in stack):
+            transaction_context['active'] = False
+            transaction_context['rolled_back'] = True
+            return True
+
+        # Inner transactions are undone by rolling back this one
+        while stack[-1] is not transaction_context:
+            inner = stack.pop()
+            inner['active'] = False
+            inner['rolled_back'] = True
+
+        root = stack[0]
+        discard = False
+        if transaction_context['started']:
+            root['_batch'] = None
+            try:
+                if transaction_context is root:
+                    root['_conn'].rollback()
+                else:
+                    savepoint = transaction_context['savepoint']
+                    self._run_statement(root['_conn'], f"ROLLBACK TO SAVEPOINT {savepoint}")
+                    self._run_statement(root['_conn'], f"RELEASE SAVEPOINT {savepoint}")
+            except Exception:
+                # The connection state is unknown; don't hand it to the next request
+                discard = True
+
+        stack.pop()
+        if transaction_context is root:
+            self._end_transaction(root, discard)
+        elif discard:
+            root['_broken'] = True
+
         # Mark transaction as rolled back
         transaction_context['active'] = False
         transaction_context['rolled_back'] = True
         return True
-    
+
+    def in_transaction(self, datasource_name: str) -> bool:
+        """Whether the calling thread has an open q:transaction on the datasource"""
+        return bool(self._transaction_stack(datasource_name))
+
+    def _transaction_stack(self, datasource_name: Optional[str]) -> List[Dict[str, Any]]:
+        """Open transactions of the calling thread on a datasource (outermost first)"""
+        stacks = getattr(self._transactions, 'stacks', None)
+        if stacks is None:
+            stacks = self._transactions.stacks = {}
+        return stacks.setdefault(datasource_name, [])
+
+    def _start_transaction(self, datasource_name: str) -> Dict[str, Any]:
+        """
+        Issue BEGIN (and SAVEPOINTs for nested levels) not sent yet
+
+        Returns:
+            The outermost transaction context, holding the connection
+        """
+        stack = self._transaction_stack(datasource_name)
+        root = stack[0]
+        if not root['started']:
+            config = self.get_datasource_config(datasource_name)
+            pool = self.get_pool(config)
+            try:
+                conn = pool.pin()
+            except (PoolTimeoutError, PoolClosedError) as e:
+                raise DatabaseConnectionError(str(e))
+            try:
+                self._begin(conn, config['type'], root['isolation_level'])
+            except Exception as e:
+                pool.unpin(discard=True)
+                raise QueryExecutionError(f"Failed to begin transaction: {e}")
+            root.update(_pool=pool, _conn=conn, _type=config['type'], _batch=None, _last_write=None,
+                        tables=set(), started=True)
+
+        for transaction in stack[1:]:
+            if not transaction['started']:
+                # Queued writes belong to the enclosing level
+                self._flush_writes(root)
+                self._run_statement(root['_conn'], f"SAVEPOINT {transaction['savepoint']}")
+                transaction['started'] = True
+        return root
+
+    def _begin(self, conn, db_type: str, isolation_level: Optional[str]):
+        """Open a transaction on a pooled connection"""
+        level = ISOLATION_LEVELS.get((isolation_level or '').upper().replace(' ', '_'))
+        if db_type == 'sqlite':
+            # Connections run in autocommit mode; IMMEDIATE takes the write lock up front
+            conn.execute('BEGIN IMMEDIATE' if level == 'SERIALIZABLE' else 'BEGIN')
+            return
+
+        # Drop the implicit transaction a previous read may have left open
+        conn.rollback()
+        cursor = conn.cursor()
+        if level:
+            cursor.execute(f"SET TRANSACTION ISOLATION LEVEL {level}")
+        if db_type in ['mysql', 'mariadb']:
+            cursor.execute("START TRANSACTION")
+        cursor.close()
+
+    def _end_transaction(self, root: Dict[str, Any], discard: bool = False):
+        """Return the connection of a finished outermost transaction"""
+        pool = root.pop('_pool', None)
+        root.pop('_conn', None)
+        if pool is not None:
+            pool.unpin(discard=discard or root.pop('_broken', False))
+
+    @staticmethod
+    def _run_statement(conn, sql: str):
+        """Run a statement without parameters or results"""
+        cursor = conn.cursor()
+        cursor.execute(sql)
+        cursor.close()
+
+    def _execute_in_transaction(
+        self,
+        datasource_name: str,
+        sql: str,
+        params: Dict[str, Any],
+        max_rows: Optional[int]
+    ) -> QueryResult:
+        """Run a statement on the connection of the open transaction"""
+        root = self._start_transaction(datasource_name)
+        transaction = self._transaction_stack(datasource_name)[-1]
+        transaction['queries'].append(sql)
+
+        last_write = None
+        if is_write_query(sql):
+            root['tables'].update(referenced_tables(sql))
+            if transaction.get('batch_writes') and is_batchable_write(sql):
+                prepared_sql, prepared_params = self._prepare_query(sql, params, root['_type'])
+                batch = root['_batch']
+                # Queue only repeats: a single write keeps its row count and insert id
+                if (batch is not None and batch[0] == prepared_sql) or root['_last_write'] == prepared_sql:
+                    return self._queue_write(root, prepared_sql, prepared_params)
+                last_write = prepared_sql
+
+        self._flush_writes(root)
+        root['_last_write'] = last_write
+        return self._execute_on_connection(
+            root['_conn'], root['_type'], sql, params, max_rows, in_transaction=True
+        )
+
+    def _queue_write(self, root: Dict[str, Any], prepared_sql: str, prepared_params: Any) -> QueryResult:
+        """Add one execution of a repeated write statement to the transaction's batch"""
+        batch = root['_batch']
+        if batch is None:
+            batch = root['_batch'] = (prepared_sql, [])
+        batch[1].append(prepared_params)
+        if len(batch[1]) >= WRITE_BATCH_SIZE:
+            self._flush_writes(root)
+
+        # Row counts and insert ids are not known until the batch is sent
+        return QueryResult(data=[], column_list=[], execution_time=0.0, record_count=0, batched=True)
+
+    def _flush_writes(self, root: Dict[str, Any]):
+        """Send the queued writes of a transaction with one executemany()"""
+        batch = root.get('_batch')
+        if not batch:
+            return
+        root['_batch'] = None
+        prepared_sql, rows = batch
+
+        try:
+            cursor = root['_conn'].cursor()
+            if len(rows) == 1:
+                cursor.execute(prepared_sql, rows[0])
+            elif root['_type'] == 'postgresql':
+                # psycopg2's executemany() is one round trip per row
+                from psycopg2.extras import execute_batch
+                execute_batch(cursor, prepared_sql, rows, page_size=WRITE_BATCH_SIZE)
+            else:
+                cursor.executemany(prepared_sql, rows)
+            cursor.close()
+        except Exception as e:
+            raise QueryExecutionError(f"Batched write failed: {e}")
+        root['batched_rows'] += len(rows)
+
     # Phase D: Query Caching
 
-    def __init__(self, admin_api_url: str = "http://localhost:8000", local_datasources: Dict[str, Any] = None):
+    def __init__(
+        self,
+        admin_api_url: str = "http://localhost:8000",
+        local_datasources: Dict[str, Any] = None,
+        datasource_cache_ttl: float = 60,
+        datasource_stale_ttl: float = 300,
+        query_cache: Optional[Dict[str, Any]] = None,
+    ):
         self.admin_api_url = admin_api_url
         self.local_datasources = local_datasources or {}
-        self.connection_pool: Dict[str, Any] = {}
-        # Phase D: Query cache with TTL
-        self.query_cache: Dict[str, Dict[str, Any]] = {}  # cache_key -> {result, expires_at}
-    
+        # Datasources resolved through the Admin API, refreshed in the background
+        self.datasource_cache = DatasourceConfigCache(
+            fetch=self._fetch_datasource_config,
+            ttl=datasource_cache_ttl,
+            stale_ttl=datasource_stale_ttl,
+            transient_errors=(AdminAPIUnavailableError,),
+            on_change=self._retire_pool,
+        )
+        # One bounded pool per datasource, shared by every request thread
+        # (a single DatabaseService is shared through the ServiceContainer)
+        self._pools: Dict[str, ConnectionPool] = {}
+        self._pools_lock = threading.Lock()
+        # Open q:transaction contexts per request thread
+        self._transactions = threading.local()
+        # Event loop thread for execute_query_async (created on first use)
+        self._async_runner: Optional[AsyncQueryRunner] = None
+        # Phase D: Query cache with TTL, bounded and shared by every request
+        self.query_cache = create_query_cache(query_cache)
+
     def _get_cache_key(self, sql: str, params: Dict[str, Any], datasource: str) -> str:
         """Generate cache key for query"""
-        import hashlib
-        cache_str = f"{datasource}:{sql}:{str(sorted(params.items()))}"
-        return hashlib.md5(cache_str.encode()).hexdigest()
+        return query_cache_key(datasource, sql, params)
     
     def _parse_cache_ttl(self, cache: str) -> int:
         """
@@ -471,37 +1256,21 @@ class DatabaseService:
         if cache.lower() == 'true':
             return 300  # Default 5 minutes
         
-        # Parse time units
-        cache = cache.lower().strip()
-        if cache.endswith('s'):
-            return int(cache[:-1])
-        elif cache.endswith('m'):
-            return int(cache[:-1]) * 60
-        elif cache.endswith('h'):
-            return int(cache[:-1]) * 3600
-        elif cache.endswith('d'):
-            return int(cache[:-1]) * 86400
-        else:
-            return int(cache)  # Assume seconds
+        return parse_duration(cache)
     
     def get_cached_query(self, cache_key: str) -> Optional[QueryResult]:
         """Get cached query result if not expired"""
-        if cache_key not in self.query_cache:
-            return None
-        
-        cached = self.query_cache[cache_key]
-        if time.time() > cached['expires_at']:
-            # Expired - remove from cache
-            del self.query_cache[cache_key]
+        cached = self.query_cache.get(cache_key)
+        if cached is None:
             return None
         
         # Mark result as cached
-        cached['result'].cached = True
-        return cached['result']
+        return replace(cached, cached=True)
     
     def cache_query_result(self, cache_key: str, result: QueryResult, ttl_seconds: int):
         """Cache query result with TTL"""
-        self.query_cache[cache_key] = {
-            'result': result,
-            'expires_at': time.time() + ttl_seconds
-        }
+        self.query_cache.put(cache_key, result, ttl_seconds)
+
+    def get_query_cache_stats(self) -> Dict[str, Any]:
+        """Query result cache metrics for monitoring"""
+        return self.query_cache.stats()
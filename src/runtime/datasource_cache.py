@@ -0,0 +1,244 @@
+"""
+Datasource Config Cache - TTL cache for configs resolved from Quantum Admin
+
+DatabaseService resolves datasources that are not in quantum.config.yaml
+through the Admin API. This cache keeps those answers so a q:query does not
+pay an HTTP round trip (or a 5s timeout) every time.
+
+Features:
+- Fresh for `ttl` seconds; after refresh_ahead * ttl the entry is still
+  served while a background thread refetches it
+- Single-flight: concurrent misses for the same datasource share one fetch
+- Stale-while-error: if the Admin API is unreachable, the last known config
+  is served for up to `stale_ttl` seconds past expiry
+- invalidate() for pushes from Quantum Admin when a datasource changes
+- on_change callback when a refetch returns a different config (so the
+  connection pool built from the old one can be retired)
+
+Usage:
+    cache = DatasourceConfigCache(fetch=fetch_from_admin, ttl=60)
+    config = cache.get('orders')
+    cache.invalidate('orders')
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DatasourceCacheStats:
+    """Counters for cache monitoring"""
+    hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    stale_served: int = 0
+    fetch_errors: int = 0
+    invalidations: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'refreshes': self.refreshes,
+            'stale_served': self.stale_served,
+            'fetch_errors': self.fetch_errors,
+            'invalidations': self.invalidations,
+        }
+
+
+class _CachedConfig:
+    """A resolved config and when it was fetched"""
+
+    __slots__ = ('config', 'fetched_at', 'invalidated')
+
+    def __init__(self, config: Dict[str, Any], fetched_at: float):
+        self.config = config
+        self.fetched_at = fetched_at
+        self.invalidated = False
+
+
+class _Flight:
+    """An in-progress fetch other threads can wait on"""
+
+    __slots__ = ('done', 'config', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.config: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class DatasourceConfigCache:
+    """
+    Thread-safe cache of datasource configs keyed by datasource name.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Dict[str, Any]],
+        ttl: float = 60.0,
+        stale_ttl: float = 300.0,
+        refresh_ahead: float = 0.75,
+        transient_errors: Tuple[Type[BaseException], ...] = (),
+        on_change: Optional[Callable[[str], None]] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            fetch: Callable resolving a datasource name to its config
+            ttl: Seconds a fetched config is used without refetching (0 = no caching)
+            stale_ttl: Seconds past expiry a config may still be served while
+                fetch fails with a transient error
+            refresh_ahead: Fraction of ttl after which hits trigger a background refresh
+            transient_errors: Errors meaning "Admin API unavailable" (any other
+                error is an authoritative answer, e.g. datasource not found)
+            on_change: Called with the datasource name when a refetch returns
+                a config different from the cached one
+        """
+        self._fetch = fetch
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.refresh_ahead = refresh_ahead
+        self._transient_errors = transient_errors
+        self._on_change = on_change
+
+        self._entries: Dict[str, _CachedConfig] = {}
+        self._inflight: Dict[str, _Flight] = {}
+        self._generation = 0  # Bumped by invalidate() so older fetches are not stored
+        self._lock = threading.Lock()
+        self._stats = DatasourceCacheStats()
+
+    def get(self, name: str) -> Dict[str, Any]:
+        """
+        Get the config of a datasource, fetching it if needed.
+
+        Raises:
+            Whatever fetch raises, unless a stale config can be served
+        """
+        if self.ttl <= 0:
+            return self._fetch(name)
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and not entry.invalidated:
+                age = now - entry.fetched_at
+                if age < self.ttl:
+                    self._stats.hits += 1
+                    if age >= self.ttl * self.refresh_ahead and name not in self._inflight:
+                        self._start_background_refresh(name)
+                    return entry.config
+            self._stats.misses += 1
+            flight, leader = self._join_flight(name)
+
+        if leader:
+            self._run_flight(name, flight)
+        else:
+            flight.done.wait()
+
+        if flight.error is None:
+            return flight.config
+        return self._serve_stale(name, flight.error)
+
+    def invalidate(self, name: Optional[str] = None):
+        """
+        Force a refetch on next use.
+
+        Args:
+            name: Datasource to invalidate (None = all)
+        """
+        with self._lock:
+            self._generation += 1
+            entries = self._entries.values() if name is None else [self._entries.get(name)]
+            for entry in entries:
+                if entry is not None:
+                    entry.invalidated = True
+            self._stats.invalidations += 1
+
+    def clear(self):
+        """Forget every cached config"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache metrics for monitoring"""
+        with self._lock:
+            result = {'size': len(self._entries), 'ttl': self.ttl, 'stale_ttl': self.stale_ttl}
+            result.update(self._stats.to_dict())
+        return result
+
+    # ==========================================================================
+    # Fetching
+    # ==========================================================================
+
+    def _join_flight(self, name: str) -> Tuple[_Flight, bool]:
+        """Return the in-progress fetch for name, starting one if needed (lock held)"""
+        flight = self._inflight.get(name)
+        if flight is not None:
+            return flight, False
+        flight = self._inflight[name] = _Flight()
+        return flight, True
+
+    def _start_background_refresh(self, name: str):
+        """Refetch an entry nearing expiry without blocking the caller (lock held)"""
+        flight, _ = self._join_flight(name)
+        self._stats.refreshes += 1
+        threading.Thread(
+            target=self._run_flight,
+            args=(name, flight),
+            name=f'datasource-refresh-{name}',
+            daemon=True,
+        ).start()
+
+    def _run_flight(self, name: str, flight: _Flight):
+        """Fetch a config, store it and wake every thread waiting on the flight"""
+        with self._lock:
+            generation = self._generation
+        changed = False
+        try:
+            config = self._fetch(name)
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self._stats.fetch_errors += 1
+                if not isinstance(e, self._transient_errors):
+                    # Authoritative answer (e.g. deleted or stopped): drop the entry
+                    self._entries.pop(name, None)
+        else:
+            flight.config = config
+            with self._lock:
+                previous = self._entries.get(name)
+                changed = previous is not None and previous.config != config
+                if generation == self._generation:
+                    self._entries[name] = _CachedConfig(config, time.monotonic())
+                elif previous is not None:
+                    # Invalidated while fetching: keep the entry invalidated but current
+                    previous.config = config
+        finally:
+            with self._lock:
+                self._inflight.pop(name, None)
+            flight.done.set()
+
+        if changed and self._on_change is not None:
+            try:
+                self._on_change(name)
+            except Exception as e:
+                logger.warning(f"Datasource change handler failed for '{name}': {e}")
+
+    def _serve_stale(self, name: str, error: BaseException) -> Dict[str, Any]:
+        """Serve the last known config after a transient fetch error, or re-raise"""
+        if isinstance(error, self._transient_errors):
+            with self._lock:
+                entry = self._entries.get(name)
+                if entry is not None and time.monotonic() - entry.fetched_at < self.ttl + self.stale_ttl:
+                    self._stats.stale_served += 1
+                    logger.warning(f"Serving cached config for datasource '{name}': {error}")
+                    return entry.config
+        raise error
@@ -2,7 +2,8 @@
 Quantum Execution Context - Manages variable scopes and state
 """
 
-from typing import Any, Dict, Optional, List
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, List
 
 
 class VariableNotFoundError(Exception):
@@ -10,14 +11,201 @@ class VariableNotFoundError(Exception):
     pass
 
 
+class _PrefixedScopeMap(Mapping):
+    """
+    Read-only mapping exposing session/application/request variables under
+    their prefixed names ('session.userId') without copying them.
+    """
+
+    __slots__ = ('_scopes',)
+
+    def __init__(self, scopes: Dict[str, Dict[str, Any]]):
+        self._scopes = scopes
+
+    def __getitem__(self, key: str) -> Any:
+        if isinstance(key, str) and '.' in key:
+            prefix, name = key.split('.', 1)
+            scope = self._scopes.get(prefix)
+            if scope is not None and name in scope:
+                return scope[name]
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def __iter__(self) -> Iterator[str]:
+        for prefix, scope in self._scopes.items():
+            for name in scope:
+                yield f'{prefix}.{name}'
+
+    def __len__(self) -> int:
+        return sum(len(scope) for scope in self._scopes.values())
+
+
+class VariableView(Mapping):
+    """
+    Read-only, live view of every variable visible from an ExecutionContext.
+
+    The view chains the scope dicts in lookup priority order (like
+    collections.ChainMap) instead of copying them, so obtaining it is O(1)
+    and it always reflects the latest set_variable/update_variable calls.
+    Use copy() (or get_all_variables()) when a mutable flat dict is needed.
+    """
+
+    __slots__ = ('_maps',)
+
+    def __init__(self, maps: List[Mapping]):
+        self._maps = maps
+
+    def __getitem__(self, key: str) -> Any:
+        for mapping in self._maps:
+            if key in mapping:
+                return mapping[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        for mapping in self._maps:
+            if key in mapping:
+                return mapping[key]
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        for mapping in self._maps:
+            if key in mapping:
+                return True
+        return False
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.copy())
+
+    def __len__(self) -> int:
+        return len(self.copy())
+
+    def items(self):
+        return self.copy().items()
+
+    def copy(self) -> Dict[str, Any]:
+        """Flatten into a new dict (lowest priority scope first)"""
+        flat: Dict[str, Any] = {}
+        for mapping in reversed(self._maps):
+            flat.update(mapping)
+        return flat
+
+    def __repr__(self) -> str:
+        return f"VariableView({self.copy()!r})"
+
+
+class LoopScope(Mapping):
+    """
+    Block scope for one q:loop, layered above local variables with
+    ExecutionContext.push_scope().
+
+    Holds the loop variable/index bindings and, for query loops, the current
+    row. Row fields resolve lazily as {field}, {query.field} and {currentRow},
+    so moving to the next row is a single attribute write no matter how many
+    columns the row has.
+    """
+
+    __slots__ = ('bindings', 'row', '_query_name', '_prefix')
+
+    def __init__(self, query_name: Optional[str] = None):
+        self.bindings: Dict[str, Any] = {}
+        self.row: Any = None
+        self._query_name = query_name
+        self._prefix = f'{query_name}.' if query_name else None
+
+    def __getitem__(self, key: str) -> Any:
+        bindings = self.bindings
+        if key in bindings:
+            return bindings[key]
+        if self._prefix is not None:
+            row = self.row
+            if key == 'currentRow':
+                return row
+            if isinstance(row, Mapping):
+                if key in row:
+                    return row[key]
+                if isinstance(key, str) and key.startswith(self._prefix):
+                    field = key[len(self._prefix):]
+                    if field in row:
+                        return row[field]
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def __iter__(self) -> Iterator[str]:
+        keys = dict.fromkeys(self.bindings)
+        if self._prefix is not None:
+            if isinstance(self.row, Mapping):
+                for field in self.row:
+                    keys[f'{self._prefix}{field}'] = None
+                    keys[field] = None
+            keys['currentRow'] = None
+        return iter(keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class _ScopeAttribute:
+    """
+    Descriptor for a scope dict attribute (local_vars, session_vars, ...).
+
+    Rebinding a scope dict (e.g. the web server installing the Flask session)
+    invalidates cached VariableViews across the whole context tree.
+    """
+
+    def __set_name__(self, owner, name: str):
+        self._slot = '_' + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj.__dict__[self._slot]
+
+    def __set__(self, obj, value: Dict[str, Any]):
+        obj.__dict__[self._slot] = value
+        root = obj.__dict__.get('_root')
+        if root is not None:
+            root._structure_version += 1
+
+
 class ExecutionContext:
     """
     Manages execution context with nested scopes for variables
     Supports: local, function, component, and session scopes
+
+    Every write through set_variable/update_variable/delete_variable bumps
+    a tree-wide version counter, and `variables` returns a cached chained
+    view that is only rebuilt when a scope dict is replaced.
     """
 
+    local_vars = _ScopeAttribute()
+    function_vars = _ScopeAttribute()
+    component_vars = _ScopeAttribute()
+    session_vars = _ScopeAttribute()
+    application_vars = _ScopeAttribute()
+    request_vars = _ScopeAttribute()
+
     def __init__(self, parent: Optional['ExecutionContext'] = None):
         self.parent = parent
+        self._root: 'ExecutionContext' = self if parent is None else parent._root
+        if parent is None:
+            self._version = 0
+            self._structure_version = 0
+        self._view: Optional[VariableView] = None
+        self._view_version = -1
+        self._block_scopes: List[Mapping] = []
+
         self.local_vars: Dict[str, Any] = {}
         self.function_vars: Dict[str, Any] = {}
         self.component_vars: Dict[str, Any] = {}
@@ -44,40 +232,58 @@ class ExecutionContext:
             value: Variable value
             scope: 'local', 'function', 'component', 'session', 'application', or 'request'
         """
+        self._root._version += 1
+
         # Phase F: Parse scope prefix from variable name
         if '.' in name:
             prefix, var_name = name.split('.', 1)
             if prefix in ['session', 'application', 'request', 'cookie']:
                 if prefix == 'session':
-                    self.session_vars[var_name] = value
+                    self._session_vars[var_name] = value
                 elif prefix == 'application':
-                    self.application_vars[var_name] = value
+                    self._application_vars[var_name] = value
                 elif prefix == 'request':
-                    self.request_vars[var_name] = value
+                    self._request_vars[var_name] = value
                 elif prefix == 'cookie':
                     # Store in session with cookie prefix for now
-                    self.session_vars[f'__cookie_{var_name}'] = value
+                    self._session_vars[f'__cookie_{var_name}'] = value
                 return
 
         # Normal scope handling
         if scope == "local":
-            self.local_vars[name] = value
+            self._local_vars[name] = value
         elif scope == "function":
-            self.function_vars[name] = value
+            self._function_vars[name] = value
         elif scope == "component":
             # Set in root component context
             ctx = self._get_root_context()
-            ctx.component_vars[name] = value
+            ctx._component_vars[name] = value
         elif scope == "session":
             # Set in session (shared globally)
-            self.session_vars[name] = value
+            self._session_vars[name] = value
         elif scope == "application":
-            self.application_vars[name] = value
+            self._application_vars[name] = value
         elif scope == "request":
-            self.request_vars[name] = value
+            self._request_vars[name] = value
         else:
             raise ValueError(f"Invalid scope: {scope}")
 
+    def push_scope(self, scope: Mapping):
+        """
+        Layer a read-only block scope (e.g. a LoopScope) above local variables.
+
+        Lookups see the scope until pop_scope() is called; writes still go
+        to the regular scopes.
+        """
+        self._block_scopes.insert(0, scope)
+        self._root._structure_version += 1
+
+    def pop_scope(self) -> Mapping:
+        """Remove the innermost block scope added with push_scope()"""
+        scope = self._block_scopes.pop(0)
+        self._root._structure_version += 1
+        return scope
+
     def update_variable(self, name: str, value: Any):
         """
         Update a variable in whatever scope it already exists, or create in local scope if new
@@ -86,50 +292,52 @@ class ExecutionContext:
             name: Variable name (can include scope prefix like "session.userId", "application.messages")
             value: New value
         """
+        self._root._version += 1
+
         # Handle scope prefix (session.X, application.X, request.X)
         if '.' in name:
             prefix, var_name = name.split('.', 1)
             if prefix in ['session', 'application', 'request', 'cookie']:
                 if prefix == 'session':
-                    self.session_vars[var_name] = value
+                    self._session_vars[var_name] = value
                 elif prefix == 'application':
-                    self.application_vars[var_name] = value
+                    self._application_vars[var_name] = value
                 elif prefix == 'request':
-                    self.request_vars[var_name] = value
+                    self._request_vars[var_name] = value
                 elif prefix == 'cookie':
-                    self.session_vars[f'__cookie_{var_name}'] = value
+                    self._session_vars[f'__cookie_{var_name}'] = value
                 return
 
         # Check local scope first
-        if name in self.local_vars:
-            self.local_vars[name] = value
+        if name in self._local_vars:
+            self._local_vars[name] = value
             return
 
         # Check function scope
-        if name in self.function_vars:
-            self.function_vars[name] = value
+        if name in self._function_vars:
+            self._function_vars[name] = value
             return
 
         # Check component scope (including parent contexts)
         ctx = self
         while ctx:
-            if name in ctx.component_vars:
-                ctx.component_vars[name] = value
+            if name in ctx._component_vars:
+                ctx._component_vars[name] = value
                 return
             ctx = ctx.parent
 
         # Check session scope
-        if name in self.session_vars:
-            self.session_vars[name] = value
+        if name in self._session_vars:
+            self._session_vars[name] = value
             return
 
         # Variable doesn't exist - create in local scope
-        self.local_vars[name] = value
+        self._local_vars[name] = value
 
     def get_variable(self, name: str) -> Any:
         """
         Get a variable value, searching through scopes in order:
-        local -> function -> component -> session -> application -> request -> parent
+        block scopes -> local -> function -> component -> session -> application -> request -> parent
 
         Phase F: Supports session.variable, application.variable, request.variable syntax
 
@@ -147,38 +355,43 @@ class ExecutionContext:
             prefix, var_name = name.split('.', 1)
             if prefix in ['session', 'application', 'request', 'cookie']:
                 if prefix == 'session':
-                    return self.session_vars.get(var_name, '')
+                    return self._session_vars.get(var_name, '')
                 elif prefix == 'application':
-                    return self.application_vars.get(var_name, '')
+                    return self._application_vars.get(var_name, '')
                 elif prefix == 'request':
-                    return self.request_vars.get(var_name, '')
+                    return self._request_vars.get(var_name, '')
                 elif prefix == 'cookie':
-                    return self.session_vars.get(f'__cookie_{var_name}', '')
+                    return self._session_vars.get(f'__cookie_{var_name}', '')
+
+        # Search block scopes (loop iterations), innermost first
+        for block_scope in self._block_scopes:
+            if name in block_scope:
+                return block_scope[name]
 
-        # Search local scope first
-        if name in self.local_vars:
-            return self.local_vars[name]
+        # Search local scope
+        if name in self._local_vars:
+            return self._local_vars[name]
 
         # Search function scope
-        if name in self.function_vars:
-            return self.function_vars[name]
+        if name in self._function_vars:
+            return self._function_vars[name]
 
         # Search component scope (go to root)
         root_ctx = self._get_root_context()
-        if name in root_ctx.component_vars:
-            return root_ctx.component_vars[name]
+        if name in root_ctx._component_vars:
+            return root_ctx._component_vars[name]
 
         # Search session scope
-        if name in self.session_vars:
-            return self.session_vars[name]
+        if name in self._session_vars:
+            return self._session_vars[name]
 
         # Search application scope
-        if name in self.application_vars:
-            return self.application_vars[name]
+        if name in self._application_vars:
+            return self._application_vars[name]
 
         # Search request scope
-        if name in self.request_vars:
-            return self.request_vars[name]
+        if name in self._request_vars:
+            return self._request_vars[name]
 
         # Search parent context
         if self.parent:
@@ -208,22 +421,24 @@ class ExecutionContext:
         Returns:
             True if deleted, False if not found
         """
+        self._root._version += 1
+
         if scope == "local":
-            if name in self.local_vars:
-                del self.local_vars[name]
+            if name in self._local_vars:
+                del self._local_vars[name]
                 return True
         elif scope == "function":
-            if name in self.function_vars:
-                del self.function_vars[name]
+            if name in self._function_vars:
+                del self._function_vars[name]
                 return True
         elif scope == "component":
             root_ctx = self._get_root_context()
-            if name in root_ctx.component_vars:
-                del root_ctx.component_vars[name]
+            if name in root_ctx._component_vars:
+                del root_ctx._component_vars[name]
                 return True
         elif scope == "session":
-            if name in self.session_vars:
-                del self.session_vars[name]
+            if name in self._session_vars:
+                del self._session_vars[name]
                 return True
 
         return False
@@ -232,45 +447,66 @@ class ExecutionContext:
         """Create a child context (for nested scopes like loops/functions)"""
         return ExecutionContext(parent=self)
 
+    @property
+    def version(self) -> int:
+        """Counter bumped on every variable write anywhere in this context tree"""
+        return self._root._version
+
+    @property
+    def variables(self) -> VariableView:
+        """
+        O(1) read-only view of all variables visible from this context.
+
+        Lookup priority matches get_all_variables(): block scopes -> local ->
+        function -> component -> request -> application -> session ->
+        prefixed scopes (session.x, ...) -> parent contexts.
+        """
+        view = self._view
+        if view is None or self._view_version != self._root._structure_version:
+            view = self._build_view()
+        return view
+
+    def _build_view(self) -> VariableView:
+        maps: List[Mapping] = [
+            *self._block_scopes,
+            self._local_vars,
+            self._function_vars,
+            self._root._component_vars,
+            self._request_vars,
+            self._application_vars,
+            self._session_vars,
+            _PrefixedScopeMap({
+                'session': self._session_vars,
+                'application': self._application_vars,
+                'request': self._request_vars,
+            }),
+        ]
+        if self.parent is not None:
+            # Parent scopes rank below everything here; skip dicts shared with
+            # the parent (component/session/...) since they're already chained
+            seen = {id(m) for m in maps}
+            for m in self.parent.variables._maps:
+                if isinstance(m, _PrefixedScopeMap):
+                    if all(id(scope) in seen for scope in m._scopes.values()):
+                        continue
+                elif id(m) in seen:
+                    continue
+                maps.append(m)
+        self._view = VariableView(maps)
+        self._view_version = self._root._structure_version
+        return self._view
+
     def get_all_variables(self) -> Dict[str, Any]:
         """
         Get all variables from all scopes as a flat dictionary
         (for backward compatibility with existing code)
 
         Phase F: Also includes scoped variables with dot notation (session.variable, application.variable, request.variable)
-        """
-        all_vars = {}
 
-        # Start with parent vars (if any)
-        if self.parent:
-            all_vars.update(self.parent.get_all_variables())
-
-        # Phase F: Add session vars (both direct and with scope prefix)
-        all_vars.update(self.session_vars)
-        for key, value in self.session_vars.items():
-            all_vars[f'session.{key}'] = value
-
-        # Phase F: Add application vars (both direct and with scope prefix)
-        all_vars.update(self.application_vars)
-        for key, value in self.application_vars.items():
-            all_vars[f'application.{key}'] = value
-
-        # Phase F: Add request vars (both direct and with scope prefix)
-        all_vars.update(self.request_vars)
-        for key, value in self.request_vars.items():
-            all_vars[f'request.{key}'] = value
-
-        # Add component vars
-        root_ctx = self._get_root_context()
-        all_vars.update(root_ctx.component_vars)
-
-        # Add function vars
-        all_vars.update(self.function_vars)
-
-        # Add local vars (highest priority)
-        all_vars.update(self.local_vars)
-
-        return all_vars
+        Returns a new dict the caller may mutate. Read-only callers should
+        prefer the `variables` view, which avoids the copy.
+        """
+        return self.variables.copy()
 
     def _get_root_context(self) -> 'ExecutionContext':
         """Get the root (component-level) context"""
@@ -9,6 +9,8 @@ dispatches execution to the correct executor.
 from typing import Dict, Type, Any, Optional, List, TYPE_CHECKING
 import logging
 
+from runtime.job_executor import current_cancellation_token
+
 if TYPE_CHECKING:
     from runtime.executors.base import BaseExecutor
     from runtime.execution_context import ExecutionContext
@@ -128,7 +130,13 @@ class ExecutorRegistry:
 
         Raises:
             ExecutorNotFoundError: If no executor is registered for the node type
+            ThreadCancelledError: If the q:thread running this node was cancelled
         """
+        # q:thread bodies stop at the next statement once terminated or timed out
+        token = current_cancellation_token()
+        if token is not None:
+            token.raise_if_cancelled()
+
         node_type = type(node)
         executor = self._executors.get(node_type)
 
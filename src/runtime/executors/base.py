@@ -6,7 +6,7 @@ The ExecutorRegistry uses the 'handles' property to dispatch nodes to the correc
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, List, Type, Dict, TYPE_CHECKING
+from typing import Any, List, Type, Dict, Mapping, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from runtime.execution_context import ExecutionContext
@@ -100,7 +100,7 @@ class BaseExecutor(ABC):
             Resolved value
         """
         if context is None:
-            context = self.get_all_variables()
+            context = self.variables
         return self._runtime._apply_databinding(value, context)
 
     def evaluate_condition(self, condition: str, context: Dict[str, Any] = None) -> bool:
@@ -115,7 +115,7 @@ class BaseExecutor(ABC):
             Boolean result
         """
         if context is None:
-            context = self.get_all_variables()
+            context = self.variables
         return self._runtime._evaluate_condition(condition, context)
 
     def get_all_variables(self) -> Dict[str, Any]:
@@ -127,6 +127,16 @@ class BaseExecutor(ABC):
         """
         return self.context.get_all_variables()
 
+    @property
+    def variables(self) -> Mapping[str, Any]:
+        """
+        Live read-only view of all variables in the execution context.
+
+        Prefer this over get_all_variables() for read-only lookups; it
+        does not copy every scope into a new dict.
+        """
+        return self.context.variables
+
     def set_variable(self, name: str, value: Any, scope: str = "local"):
         """
         Set a variable in the execution context.
@@ -204,5 +214,5 @@ class BaseExecutor(ABC):
             Resolved value
         """
         if context is None:
-            context = self.get_all_variables()
+            context = self.variables
         return self._runtime._process_return_value(value, context)
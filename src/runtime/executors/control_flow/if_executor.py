@@ -36,7 +36,7 @@ class IfExecutor(BaseExecutor):
         Returns:
             Result of executed branch, or None
         """
-        context = self.get_all_variables()
+        context = self.variables
 
         # Evaluate main if condition
         if self.evaluate_condition(node.condition, context):
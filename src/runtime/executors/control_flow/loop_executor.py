@@ -4,9 +4,12 @@ Loop Executor - Execute q:loop statements
 Handles all loop types: range, array, list, query.
 """
 
+from collections import ChainMap
 from typing import Any, List, Dict, Type
 import json
 from runtime.executors.base import BaseExecutor, ExecutorError
+from runtime.execution_context import LoopScope
+from runtime.query_stream import QueryStream
 from core.features.loops.src.ast_node import LoopNode
 from core.features.conditionals.src.ast_node import IfNode
 from core.features.state_management.src.ast_node import SetNode
@@ -55,24 +58,28 @@ class LoopExecutor(BaseExecutor):
     def _execute_range(self, node: LoopNode, exec_context) -> List:
         """Execute range loop (from/to/step)"""
         results = []
-        context = self.get_all_variables()
+        context = self.variables
 
         try:
             start = int(self._evaluate_simple_expr(node.from_value, context))
             end = int(self._evaluate_simple_expr(node.to_value, context))
             step = node.step_value
 
-            for i in range(start, end + 1, step):
-                # Update loop variable
-                loop_context = context.copy()
-                loop_context[node.var_name] = i
-                exec_context.set_variable(node.var_name, i, scope="local")
+            # Per-loop scope: iterations rebind the loop variable only
+            scope = LoopScope()
+            loop_context = ChainMap(scope, context)
+            exec_context.push_scope(scope)
+            try:
+                for i in range(start, end + 1, step):
+                    scope.bindings[node.var_name] = i
 
-                # Execute body
-                for statement in node.body:
-                    result = self._execute_body_statement(statement, loop_context, exec_context)
-                    if result is not None:
-                        results.append(result)
+                    # Execute body
+                    for statement in node.body:
+                        result = self._execute_body_statement(statement, loop_context, exec_context)
+                        if result is not None:
+                            results.append(result)
+            finally:
+                exec_context.pop_scope()
 
             return results
 
@@ -82,24 +89,28 @@ class LoopExecutor(BaseExecutor):
     def _execute_array(self, node: LoopNode, exec_context) -> List:
         """Execute array loop"""
         results = []
-        context = self.get_all_variables()
+        context = self.variables
 
         try:
             array_data = self._parse_array_items(node.items, context)
 
-            for index, item in enumerate(array_data):
-                exec_context.set_variable(node.var_name, item, scope="local")
-
-                if node.index_name:
-                    exec_context.set_variable(node.index_name, index, scope="local")
+            scope = LoopScope()
+            exec_context.push_scope(scope)
+            try:
+                # Live view: body updates are visible without re-flattening
+                loop_context = exec_context.variables
 
-                loop_context = exec_context.get_all_variables()
+                for index, item in enumerate(array_data):
+                    scope.bindings[node.var_name] = item
+                    if node.index_name:
+                        scope.bindings[node.index_name] = index
 
-                for statement in node.body:
-                    result = self._execute_body_statement(statement, loop_context, exec_context)
-                    if result is not None:
-                        results.append(result)
-                    loop_context = exec_context.get_all_variables()
+                    for statement in node.body:
+                        result = self._execute_body_statement(statement, loop_context, exec_context)
+                        if result is not None:
+                            results.append(result)
+            finally:
+                exec_context.pop_scope()
 
             return results
 
@@ -109,24 +120,26 @@ class LoopExecutor(BaseExecutor):
     def _execute_list(self, node: LoopNode, exec_context) -> List:
         """Execute list loop (delimited string)"""
         results = []
-        context = self.get_all_variables()
+        context = self.variables
 
         try:
             list_data = self._parse_list_items(node.items, node.delimiter, context)
 
-            for index, item in enumerate(list_data):
-                loop_context = context.copy()
-                loop_context[node.var_name] = item.strip()
-                exec_context.set_variable(node.var_name, item.strip(), scope="local")
-
-                if node.index_name:
-                    loop_context[node.index_name] = index
-                    exec_context.set_variable(node.index_name, index, scope="local")
-
-                for statement in node.body:
-                    result = self._execute_body_statement(statement, loop_context, exec_context)
-                    if result is not None:
-                        results.append(result)
+            scope = LoopScope()
+            loop_context = ChainMap(scope, context)
+            exec_context.push_scope(scope)
+            try:
+                for index, item in enumerate(list_data):
+                    scope.bindings[node.var_name] = item.strip()
+                    if node.index_name:
+                        scope.bindings[node.index_name] = index
+
+                    for statement in node.body:
+                        result = self._execute_body_statement(statement, loop_context, exec_context)
+                        if result is not None:
+                            results.append(result)
+            finally:
+                exec_context.pop_scope()
 
             return results
 
@@ -136,7 +149,7 @@ class LoopExecutor(BaseExecutor):
     def _execute_query(self, node: LoopNode, exec_context) -> List:
         """Execute query loop - iterate over query result rows"""
         results = []
-        context = self.get_all_variables()
+        context = self.variables
 
         try:
             query_name = node.query_name if hasattr(node, 'query_name') else node.var_name
@@ -148,32 +161,26 @@ class LoopExecutor(BaseExecutor):
             if not query_data:
                 raise ExecutorError(f"Query '{query_name}' not found in context")
 
-            if not isinstance(query_data, list):
+            if not isinstance(query_data, (list, QueryStream)):
                 raise ExecutorError(f"Query '{query_name}' is not iterable")
 
-            for index, row in enumerate(query_data):
-                loop_context = context.copy()
-
-                # Make row fields accessible
-                if isinstance(row, dict):
-                    for field_name, field_value in row.items():
-                        dotted_key = f"{query_name}.{field_name}"
-                        loop_context[dotted_key] = field_value
-                        exec_context.set_variable(dotted_key, field_value, scope="local")
-                        loop_context[field_name] = field_value
-                        exec_context.set_variable(field_name, field_value, scope="local")
-
-                loop_context['currentRow'] = row
-                exec_context.set_variable('currentRow', row, scope="local")
-
-                if node.index_name:
-                    loop_context[node.index_name] = index
-                    exec_context.set_variable(node.index_name, index, scope="local")
-
-                for statement in node.body:
-                    result = self._execute_body_statement(statement, loop_context, exec_context)
-                    if result is not None:
-                        results.append(result)
+            # Row fields ({field}, {query.field}, {currentRow}) resolve lazily
+            # against the current row instead of being copied per column
+            scope = LoopScope(query_name)
+            loop_context = ChainMap(scope, context)
+            exec_context.push_scope(scope)
+            try:
+                for index, row in enumerate(query_data):
+                    scope.row = row
+                    if node.index_name:
+                        scope.bindings[node.index_name] = index
+
+                    for statement in node.body:
+                        result = self._execute_body_statement(statement, loop_context, exec_context)
+                        if result is not None:
+                            results.append(result)
+            finally:
+                exec_context.pop_scope()
 
             return results
 
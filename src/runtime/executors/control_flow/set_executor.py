@@ -9,12 +9,63 @@ Handles variable assignment and all operations:
 - uppercase, lowercase, trim, format (string)
 """
 
+from collections.abc import Mapping
 from typing import Any, List, Dict, Type
 import json
 from runtime.executors.base import BaseExecutor, ExecutorError
 from core.features.state_management.src.ast_node import SetNode
 
 
+def convert_to_type(value: Any, target_type: str) -> Any:
+    """Convert value to target type"""
+    if value is None:
+        return None
+
+    try:
+        if target_type == "string":
+            return str(value)
+        elif target_type in ("integer", "number"):
+            try:
+                return int(value)
+            except (ValueError, TypeError):
+                return float(value)
+        elif target_type == "decimal":
+            return float(value)
+        elif target_type == "boolean":
+            if isinstance(value, bool):
+                return value
+            if isinstance(value, str):
+                return value.lower() in ['true', '1', 'yes']
+            return bool(value)
+        elif target_type == "array":
+            if isinstance(value, list):
+                return value
+            if isinstance(value, str):
+                return json.loads(value)
+            return [value]
+        elif target_type == "object":
+            if isinstance(value, dict):
+                return value
+            if isinstance(value, Mapping):
+                # Query rows are Row mappings
+                return dict(value)
+            if isinstance(value, str):
+                return json.loads(value)
+            return {}
+        elif target_type == "json":
+            if isinstance(value, (dict, list)):
+                return value
+            if isinstance(value, Mapping):
+                return dict(value)
+            if isinstance(value, str):
+                return json.loads(value)
+            return value
+        else:
+            return value
+    except Exception as e:
+        raise ExecutorError(f"Type conversion error to '{target_type}': {e}")
+
+
 class SetExecutor(BaseExecutor):
     """
     Executor for q:set statements.
@@ -201,10 +252,11 @@ class SetExecutor(BaseExecutor):
         except Exception:
             current_value = {}
 
-        if not isinstance(current_value, dict):
+        # Query rows are Row mappings: copy them into a plain dict
+        if not isinstance(current_value, Mapping):
             raise ExecutorError(f"Cannot perform object operation on non-object: {type(current_value)}")
 
-        result = current_value.copy()
+        result = dict(current_value)
 
         if node.operation == "merge":
             if node.value:
@@ -223,8 +275,8 @@ class SetExecutor(BaseExecutor):
             if node.source:
                 try:
                     source_obj = exec_context.get_variable(node.source)
-                    if isinstance(source_obj, dict):
-                        result = source_obj.copy()
+                    if isinstance(source_obj, Mapping):
+                        result = dict(source_obj)
                 except Exception:
                     pass
 
@@ -256,47 +308,7 @@ class SetExecutor(BaseExecutor):
 
     def _convert_to_type(self, value: Any, target_type: str) -> Any:
         """Convert value to target type"""
-        if value is None:
-            return None
-
-        try:
-            if target_type == "string":
-                return str(value)
-            elif target_type in ("integer", "number"):
-                try:
-                    return int(value)
-                except (ValueError, TypeError):
-                    return float(value)
-            elif target_type == "decimal":
-                return float(value)
-            elif target_type == "boolean":
-                if isinstance(value, bool):
-                    return value
-                if isinstance(value, str):
-                    return value.lower() in ['true', '1', 'yes']
-                return bool(value)
-            elif target_type == "array":
-                if isinstance(value, list):
-                    return value
-                if isinstance(value, str):
-                    return json.loads(value)
-                return [value]
-            elif target_type == "object":
-                if isinstance(value, dict):
-                    return value
-                if isinstance(value, str):
-                    return json.loads(value)
-                return {}
-            elif target_type == "json":
-                if isinstance(value, (dict, list)):
-                    return value
-                if isinstance(value, str):
-                    return json.loads(value)
-                return value
-            else:
-                return value
-        except Exception as e:
-            raise ExecutorError(f"Type conversion error to '{target_type}': {e}")
+        return convert_to_type(value, target_type)
 
     def _validate_value(self, node: SetNode, value: Any):
         """Validate value against set_node rules"""
@@ -4,11 +4,14 @@ Query Executor - Execute q:query statements
 Handles database queries with parameter validation, pagination, and Query of Queries.
 """
 
+from collections.abc import Mapping
 from typing import Any, List, Dict, Type
 import sqlite3
-import time
 import re
 from runtime.executors.base import BaseExecutor, ExecutorError
+from runtime.pagination import paginate_query
+from runtime.query_cache import resolve_cache_ttl
+from runtime.query_stream import DEFAULT_FETCH_SIZE, QueryStream
 from core.ast_nodes import QueryNode
 
 
@@ -95,51 +98,101 @@ class QueryExecutor(BaseExecutor):
         pagination_metadata = None
         sql_to_execute = node.sql
 
+        # Declarative caching (cache/ttl) and maxrows fetch limit
+        cache_options = {}
+        cache_ttl = resolve_cache_ttl(node.cache, node.ttl)
+        if cache_ttl:
+            cache_options['cache_ttl'] = cache_ttl
+        query_options = dict(cache_options)
+        if node.maxrows:
+            query_options['max_rows'] = node.maxrows
+
+        result = None
         if node.paginate:
-            pagination_metadata, sql_to_execute = self._handle_pagination(node, params)
+            result, pagination_metadata, sql_to_execute = self._handle_pagination(
+                node, params, cache_options, query_options, exec_context
+            )
 
-        # Execute query
-        result = self.services.database.execute_query(
-            node.datasource,
-            sql_to_execute,
-            params
-        )
+        if node.stream:
+            return self._execute_stream_query(node, sql_to_execute, params, pagination_metadata, exec_context)
+
+        # Execute query (window/keyset pages are already fetched)
+        if result is None:
+            result = self.services.database.execute_query(
+                node.datasource,
+                sql_to_execute,
+                params,
+                **query_options
+            )
 
         # Store results
         self._store_query_result(node, result, pagination_metadata, exec_context)
 
         return result
 
-    def _handle_pagination(self, node: QueryNode, params: Dict[str, Any]):
-        """Handle query pagination"""
-        count_sql = self._generate_count_query(node.sql)
-        count_result = self.services.database.execute_query(
+    def _execute_stream_query(self, node: QueryNode, sql: str, params: Dict[str, Any],
+                              pagination_metadata, exec_context) -> Any:
+        """Execute q:query stream="true" - rows are fetched while they are iterated"""
+        stream = self.services.database.stream_query(
             node.datasource,
-            count_sql,
-            params
+            sql,
+            params,
+            fetch_size=node.fetch_size or DEFAULT_FETCH_SIZE,
+            max_rows=node.maxrows
         )
 
-        total_records = count_result.data[0]['count'] if count_result.data else 0
+        result_dict = stream.to_dict()
+        if pagination_metadata:
+            result_dict['pagination'] = pagination_metadata
 
-        page = node.page if node.page is not None else 1
-        page_size = node.page_size
-        total_pages = (total_records + page_size - 1) // page_size
+        exec_context.set_variable(node.name, stream, scope="component")
+        exec_context.set_variable(f"{node.name}_result", result_dict, scope="component")
+        if node.result:
+            exec_context.set_variable(node.result, result_dict, scope="component")
 
-        offset = (page - 1) * page_size
-        sql_to_execute = f"{node.sql}\nLIMIT {page_size} OFFSET {offset}"
+        return stream
 
-        pagination_metadata = {
-            'totalRecords': total_records,
-            'totalPages': total_pages,
-            'currentPage': page,
-            'pageSize': page_size,
-            'hasNextPage': page < total_pages,
-            'hasPreviousPage': page > 1,
-            'startRecord': offset + 1 if total_records > 0 else 0,
-            'endRecord': min(offset + page_size, total_records)
-        }
+    def _handle_pagination(self, node: QueryNode, params: Dict[str, Any],
+                           cache_options: Dict[str, Any] = None,
+                           query_options: Dict[str, Any] = None, exec_context=None):
+        """
+        Handle query pagination (count, window or keyset strategy)
 
-        return pagination_metadata, sql_to_execute
+        Returns:
+            (result, pagination_metadata, sql_to_execute); result is None when
+            the page still has to be run with sql_to_execute
+        """
+        count_options = dict(cache_options or {})
+        if node.count_cache:
+            count_options['cache_ttl'] = resolve_cache_ttl(True, node.count_cache)
+
+        # Streams are paged with LIMIT/OFFSET (count strategy)
+        strategy = 'count' if node.stream else node.pagination
+        cursor = None
+        if node.cursor and exec_context is not None:
+            try:
+                cursor = self.apply_databinding(node.cursor, exec_context.get_all_variables())
+            except Exception:
+                cursor = None
+            if not isinstance(cursor, str) or '{' in cursor:
+                cursor = None
+
+        return paginate_query(
+            self.services.database.execute_query,
+            node.datasource,
+            node.sql,
+            params,
+            self._generate_count_query(node.sql),
+            strategy=strategy,
+            page=node.page,
+            page_size=node.page_size,
+            order_by=node.order_by,
+            cursor=cursor,
+            query_options=query_options,
+            count_options=count_options,
+            window_functions=(strategy != 'window' or
+                              self.services.database.supports_window_functions(node.datasource))
+        )
 
     def _generate_count_query(self, original_sql: str) -> str:
         """Generate COUNT(*) query from original SQL"""
@@ -160,7 +213,7 @@ class QueryExecutor(BaseExecutor):
         if source_data is None:
             raise ExecutorError(f"Source query '{source_name}' not found")
 
-        if not isinstance(source_data, list):
+        if not isinstance(source_data, (list, QueryStream)):
             raise ExecutorError(f"Source '{source_name}' is not a query result")
 
         if not source_data:
@@ -171,61 +224,15 @@ class QueryExecutor(BaseExecutor):
             self._store_query_result(node, result, None, exec_context)
             return result
 
-        # Create in-memory SQLite database
-        conn = sqlite3.connect(':memory:')
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
         try:
-            first_row = source_data[0]
-            if not isinstance(first_row, dict):
-                raise ExecutorError("Source data must be list of dictionaries")
-
-            columns = list(first_row.keys())
-            column_defs = ', '.join([f'"{col}" TEXT' for col in columns])
-            cursor.execute(f'CREATE TABLE source_table ({column_defs})')
-
-            placeholders = ', '.join(['?' for _ in columns])
-            for row in source_data:
-                values = [row.get(col) for col in columns]
-                cursor.execute(f'INSERT INTO source_table VALUES ({placeholders})', values)
-
-            sql = node.sql.replace(f'FROM {source_name}', 'FROM source_table')
-            sql = sql.replace(f'FROM {{{source_name}}}', 'FROM source_table')
-
-            for param_name in params:
-                sql = sql.replace(f':{param_name}', '?')
-
-            start_time = time.time()
-            cursor.execute(sql, list(params.values()) if params else [])
-            result_rows = cursor.fetchall()
-            execution_time = (time.time() - start_time) * 1000
-
-            result_data = []
-            column_names = []
-            if result_rows:
-                column_names = [desc[0] for desc in cursor.description]
-                for row in result_rows:
-                    result_data.append(dict(zip(column_names, row)))
-
-            conn.close()
-
-            result = QueryResult(
-                success=True,
-                data=result_data,
-                record_count=len(result_data),
-                column_list=column_names,
-                execution_time=int(execution_time),
-                sql=node.sql
-            )
-
-            self._store_query_result(node, result, None, exec_context)
-            return result
-
+            # Sources are loaded once per request and reused by later QoQ statements
+            result = self.runtime.qoq_engine.execute(source_name, source_data, node.sql, params)
         except sqlite3.Error as e:
-            conn.close()
             raise ExecutorError(f"Query of Queries SQL error: {e}")
 
+        self._store_query_result(node, result, None, exec_context)
+        return result
+
     def _execute_knowledge_query(self, node: QueryNode, params: Dict[str, Any], exec_context) -> Any:
         """Execute knowledge base query (RAG)"""
         # Delegate to runtime's knowledge query handler
@@ -245,7 +252,7 @@ class QueryExecutor(BaseExecutor):
         exec_context.set_variable(f"{node.name}_result", result_dict, scope="component")
 
         # Single-row field exposure
-        if result.data and len(result.data) == 1 and isinstance(result.data[0], dict):
+        if result.data and len(result.data) == 1 and isinstance(result.data[0], Mapping):
             for field_name, field_value in result.data[0].items():
                 dotted_key = f"{node.name}.{field_name}"
                 exec_context.set_variable(dotted_key, field_value, scope="component")
@@ -4,7 +4,7 @@ Transaction Executor - Execute q:transaction statements
 Handles database transactions with atomic commit/rollback.
 """
 
-from typing import Any, List, Dict, Type
+from typing import Any, List, Dict, Optional, Type
 from runtime.executors.base import BaseExecutor, ExecutorError
 from core.ast_nodes import TransactionNode, QueryNode
 
@@ -39,8 +39,12 @@ class TransactionExecutor(BaseExecutor):
             # Determine datasource
             datasource_name = self._get_datasource(node)
 
-            # Begin transaction
-            transaction_context = self.services.database.begin_transaction(datasource_name)
+            # Begin transaction (one pooled connection, BEGIN ... COMMIT/ROLLBACK)
+            # Write batching is opt-in; database services without it need no new argument
+            options = {'batch_writes': True} if node.batch else {}
+            transaction_context = self.services.database.begin_transaction(
+                datasource_name, isolation_level=node.isolation_level, **options
+            )
 
             results = []
             try:
@@ -57,6 +61,7 @@ class TransactionExecutor(BaseExecutor):
                     'committed': True,
                     'isolation_level': node.isolation_level,
                     'statement_count': len(node.statements),
+                    'batched_rows': transaction_context.get('batched_rows', 0),
                     'results': results
                 }
 
@@ -84,8 +89,17 @@ class TransactionExecutor(BaseExecutor):
             raise ExecutorError(f"Transaction execution error: {e}")
 
     def _get_datasource(self, node: TransactionNode) -> str:
-        """Get datasource from first query in transaction"""
-        for stmt in node.statements:
+        """Get datasource from first query in transaction (including loop bodies)"""
+        return self._find_datasource(node.statements) or "default"
+
+    def _find_datasource(self, statements) -> Optional[str]:
+        for stmt in statements:
             if isinstance(stmt, QueryNode) and stmt.datasource:
                 return stmt.datasource
-        return "default"
+            for attr in ('body', 'statements', 'if_body', 'else_body'):
+                children = getattr(stmt, attr, None)
+                if isinstance(children, list):
+                    datasource = self._find_datasource(children)
+                    if datasource:
+                        return datasource
+        return None
@@ -66,6 +66,7 @@ class ThreadExecutor(BaseExecutor):
             'timeout': node.timeout,
             'on_complete': node.on_complete,
             'on_error': node.on_error,
+            'isolation': node.isolation,
             'body': node.body,
             'runtime': self._runtime,
             'exec_context': exec_context,
@@ -4,6 +4,7 @@ Log Executor - Execute q:log statements
 Handles structured logging with levels and context.
 """
 
+from collections.abc import Mapping
 from typing import Any, List, Dict, Type
 import json
 from runtime.executors.base import BaseExecutor, ExecutorError
@@ -52,7 +53,7 @@ class LogExecutor(BaseExecutor):
             context_data = None
             if node.context:
                 context_expr = self.apply_databinding(node.context, context)
-                if isinstance(context_expr, dict):
+                if isinstance(context_expr, Mapping):
                     context_data = context_expr
                 elif isinstance(context_expr, str):
                     try:
@@ -18,6 +18,7 @@ Optimization Notes (2026-02-14):
 import os
 import re
 import threading
+from collections import ChainMap
 from functools import lru_cache
 from typing import Any, Dict, Optional, Tuple, Callable
 from dataclasses import dataclass
@@ -228,13 +229,8 @@ class ExpressionCache:
         if code is None:
             raise ValueError(f"Failed to compile expression: {expr}")
 
-        # OPTIMIZATION: Reuse base namespace, merge context
-        # Using ChainMap would be cleaner but dict merge is faster
-        namespace = self._base_namespace.copy()
-        namespace.update(context)
-
         try:
-            result = eval(code, self._empty_builtins, namespace)
+            result = eval(code, self._empty_builtins, self._namespace(context))
 
             if self._enable_stats:
                 elapsed = (time.perf_counter() - start_time) * 1000
@@ -249,6 +245,38 @@ class ExpressionCache:
         except Exception as e:
             raise RuntimeError(f"Error evaluating '{expr}': {e}")
 
+    def _namespace(self, context: Dict[str, Any]):
+        """Build the eval() locals for a context"""
+        # OPTIMIZATION: Reuse base namespace, merge context
+        # Using ChainMap would be cleaner but dict merge is faster for plain
+        # dicts; live views (ExecutionContext.variables) are chained instead
+        # so they are never flattened
+        if isinstance(context, dict):
+            namespace = self._base_namespace.copy()
+            namespace.update(context)
+            return namespace
+        return ChainMap(context, self._base_namespace)
+
+    def compile(self, expr: str) -> Optional[Any]:
+        """
+        Compile an expression ahead of time.
+
+        Returns:
+            The cached code object, or None if the expression is invalid or unsafe
+        """
+        if not expr or not expr.strip():
+            return None
+        code, _ = self._compile_cached(expr.strip())
+        return code
+
+    def evaluate_compiled(self, code: Any, context: Dict[str, Any]) -> Any:
+        """
+        Evaluate a code object returned by compile().
+
+        Skips the per-call cache lookup and stats; exceptions are raised as-is.
+        """
+        return eval(code, self._empty_builtins, self._namespace(context))
+
     def evaluate_fast(self, expr: str, context: Dict[str, Any]) -> Any:
         """
         Zero-overhead expression evaluation for hot paths.
@@ -4,7 +4,7 @@ Job Execution System - Scheduled Tasks, Threads, and Job Queues
 This module provides:
 - ScheduleService: APScheduler-based scheduled task execution (like cfschedule)
 - ThreadService: ThreadPoolExecutor-based async thread management (like cfthread)
-- JobQueueService: SQLite-based job queue for batch processing
+- JobQueueService: Job queue for batch processing (SQLite, Redis or PostgreSQL store)
 
 Examples:
     # Schedule a task to run every 5 minutes
@@ -24,8 +24,10 @@ Examples:
 """
 
 import re
-import json
-import sqlite3
+import heapq
+import itertools
+import multiprocessing
+import multiprocessing.connection
 import threading
 import time
 import logging
@@ -35,6 +37,9 @@ from typing import Any, Dict, List, Optional, Callable, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 
+from runtime.job_store import JobInfo, JobSpec, JobStore
+from runtime.job_stores import SQLiteJobStore
+
 # Try to import APScheduler (optional dependency)
 try:
     from apscheduler.schedulers.background import BackgroundScheduler
@@ -48,21 +53,6 @@ except ImportError:
     BackgroundScheduler = None
 
 
-# Register datetime adapters/converters for sqlite3 (Python 3.12+ compatibility)
-def _adapt_datetime(val: datetime) -> str:
-    """Convert datetime to ISO format string for SQLite storage."""
-    return val.isoformat()
-
-
-def _convert_datetime(val: bytes) -> datetime:
-    """Convert ISO format string from SQLite to datetime."""
-    return datetime.fromisoformat(val.decode())
-
-
-# Register the adapter and converter
-sqlite3.register_adapter(datetime, _adapt_datetime)
-sqlite3.register_converter("timestamp", _convert_datetime)
-
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -83,6 +73,11 @@ class ThreadError(JobExecutorError):
     pass
 
 
+class ThreadCancelledError(ThreadError):
+    """Raised in a thread body whose cancellation token was cancelled"""
+    pass
+
+
 class JobQueueError(JobExecutorError):
     """Raised when job queue operation fails"""
     pass
@@ -456,6 +451,139 @@ class ScheduleService:
 # THREAD SERVICE (ThreadPoolExecutor-based)
 # ============================================
 
+class CancellationToken:
+    """
+    Cooperative cancellation of one q:thread run.
+
+    terminate_thread() and timeouts cancel the token; the body stops at its
+    next check: between statements of a q:thread body, q.check_cancelled()
+    or q.sleep() in q:python, or raise_if_cancelled()/wait() in Python code.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = 'Terminated'):
+        """Request cancellation (the first reason is kept)"""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    def raise_if_cancelled(self):
+        """
+        Raises:
+            ThreadCancelledError: If the token was cancelled
+        """
+        if self._event.is_set():
+            raise ThreadCancelledError(self.reason)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Sleep up to timeout seconds; returns True as soon as the token is cancelled"""
+        return self._event.wait(timeout)
+
+
+# Token of the q:thread running in the current pool thread
+_thread_state = threading.local()
+
+
+def current_cancellation_token() -> Optional[CancellationToken]:
+    """Cancellation token of the q:thread running in this thread (None outside one)"""
+    return getattr(_thread_state, 'token', None)
+
+
+class DeadlineScheduler:
+    """
+    One timer thread for any number of deadlines.
+
+    Deadlines wait in a heap ordered by due time; the thread sleeps until
+    the earliest one, runs its callback and exits once the heap is empty
+    (the next schedule() starts it again). Cancelled deadlines are skipped
+    when they reach the top of the heap.
+    """
+
+    def __init__(self, name: str = "quantum-deadlines"):
+        self._name = name
+        self._heap: List[Tuple[float, int, Callable[[], None]]] = []
+        self._cancelled: set = set()
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> int:
+        """
+        Run callback (on the timer thread) in delay seconds.
+
+        Returns:
+            Handle for cancel()
+        """
+        with self._condition:
+            handle = next(self._counter)
+            heapq.heappush(self._heap, (time.monotonic() + delay, handle, callback))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+            elif self._heap[0][1] == handle:
+                # New earliest deadline: shorten the current sleep
+                self._condition.notify()
+        return handle
+
+    def cancel(self, handle: int):
+        """Drop a deadline (no effect once its callback ran)"""
+        with self._condition:
+            self._cancelled.add(handle)
+            # Most deadlines are cancelled long before they are due
+            if len(self._cancelled) > len(self._heap) // 2:
+                self._heap = [entry for entry in self._heap if entry[1] not in self._cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled.clear()
+
+    def __len__(self) -> int:
+        """Number of pending deadlines"""
+        with self._condition:
+            return sum(1 for entry in self._heap if entry[1] not in self._cancelled)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if not self._heap:
+                        self._thread = None
+                        return
+                    due, handle, callback = self._heap[0]
+                    if handle in self._cancelled:
+                        heapq.heappop(self._heap)
+                        self._cancelled.discard(handle)
+                        continue
+                    delay = due - time.monotonic()
+                    if delay <= 0:
+                        heapq.heappop(self._heap)
+                        break
+                    self._condition.wait(delay)
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Deadline callback failed: {e}")
+
+
+def _isolated_main(callback: Callable, sender):
+    """Body of a process-isolated thread: run callback, send back (ok, result or error)"""
+    try:
+        outcome = (True, callback())
+    except BaseException as e:
+        outcome = (False, str(e))
+    try:
+        sender.send(outcome)
+    except Exception as e:
+        sender.send((False, f"Thread result could not be sent back: {e}"))
+    finally:
+        sender.close()
+
+
 @dataclass
 class ThreadInfo:
     """Information about a running thread"""
@@ -466,6 +594,10 @@ class ThreadInfo:
     timeout: Optional[int] = None
     result: Any = None
     error: Optional[str] = None
+    isolation: str = 'thread'  # thread, process
+    queue_wait: Optional[float] = None  # Seconds between run_thread() and the start of the body
+    wall_time: Optional[float] = None  # Seconds the body ran
+    finished_at: Optional[datetime] = None
 
 
 class ThreadService:
@@ -478,6 +610,14 @@ class ThreadService:
     - Callbacks for completion/error
     - Thread joining and termination
 
+    Timeouts and terminate_thread() cancel the thread's CancellationToken,
+    which the body checks cooperatively. All timeouts share one
+    DeadlineScheduler thread. Threads run with isolation='process' execute
+    in a child process that is killed outright instead, for bodies that
+    never check their token. The child is started with 'forkserver' (or
+    'spawn') by default, never forked from this multithreaded process, so
+    the callback and its result must be picklable.
+
     Thread-safe operations.
     """
 
@@ -487,12 +627,21 @@ class ThreadService:
         'high': 10
     }
 
-    def __init__(self, max_workers: int = 10):
+    ISOLATION_MODES = ('thread', 'process')
+
+    def __init__(self, max_workers: int = 10, process_start_method: Optional[str] = None):
         """
         Initialize thread service.
 
         Args:
             max_workers: Maximum concurrent threads
+            process_start_method: multiprocessing start method of
+                                  process-isolated threads (default:
+                                  'forkserver' where available, 'spawn'
+                                  elsewhere). 'fork' copies the locks and
+                                  pooled connections of every other thread
+                                  into the child and is unsafe in the web
+                                  server.
         """
         self._executor = ThreadPoolExecutor(
             max_workers=max_workers,
@@ -500,7 +649,14 @@ class ThreadService:
         )
         self._threads: Dict[str, ThreadInfo] = {}
         self._futures: Dict[str, Future] = {}
+        self._tokens: Dict[str, CancellationToken] = {}
+        self._processes: Dict[str, multiprocessing.process.BaseProcess] = {}
         self._lock = threading.Lock()
+        self._deadlines = DeadlineScheduler()
+        if process_start_method is None:
+            methods = multiprocessing.get_all_start_methods()
+            process_start_method = 'forkserver' if 'forkserver' in methods else 'spawn'
+        self._process_context = multiprocessing.get_context(process_start_method)
 
     def run_thread(
         self,
@@ -509,7 +665,8 @@ class ThreadService:
         priority: str = 'normal',
         timeout: Optional[str] = None,
         on_complete: Optional[Callable[[Any], None]] = None,
-        on_error: Optional[Callable[[Exception], None]] = None
+        on_error: Optional[Callable[[Exception], None]] = None,
+        isolation: str = 'thread'
     ) -> ThreadInfo:
         """
         Run a task in a background thread.
@@ -518,9 +675,12 @@ class ThreadService:
             name: Thread name (must be unique)
             callback: Function to execute
             priority: Thread priority (low, normal, high)
-            timeout: Optional timeout (e.g., "30s", "5m")
+            timeout: Optional timeout (e.g., "30s", "5m"), counted from the
+                     start of the body
             on_complete: Callback on successful completion
             on_error: Callback on error
+            isolation: 'thread', or 'process' to run callback in a child
+                       process that terminate_thread() and timeouts kill
 
         Returns:
             ThreadInfo object
@@ -534,6 +694,9 @@ class ThreadService:
         if priority not in self.PRIORITY_WEIGHTS:
             raise ThreadError(f"Invalid priority: {priority}")
 
+        if isolation not in self.ISOLATION_MODES:
+            raise ThreadError(f"Invalid isolation: {isolation}")
+
         timeout_seconds = None
         if timeout:
             timeout_seconds = parse_duration(timeout)
@@ -544,25 +707,35 @@ class ThreadService:
                 if existing.status == 'running':
                     raise ThreadError(f"Thread '{name}' is already running")
 
+        token = CancellationToken()
+        submitted = time.monotonic()
+
         # Wrapper function for execution tracking
         def execute_thread():
-            info = self._threads.get(name)
-            if not info:
-                return
+            started = time.monotonic()
+            info.queue_wait = started - submitted
+            deadline = None
+            if timeout_seconds:
+                deadline = self._deadlines.schedule(
+                    timeout_seconds,
+                    lambda: self._cancel(name, token, f"Timed out after {format_duration(timeout_seconds)}")
+                )
+            _thread_state.token = token
 
             try:
-                result = callback()
-                info.status = 'completed'
-                info.result = result
-                if on_complete:
-                    try:
-                        on_complete(result)
-                    except Exception as e:
-                        logger.error(f"Thread '{name}' on_complete callback failed: {e}")
-                return result
+                token.raise_if_cancelled()
+                if isolation == 'process':
+                    result = self._run_isolated(name, callback, token)
+                else:
+                    result = callback()
+                token.raise_if_cancelled()
             except Exception as e:
-                info.status = 'failed'
-                info.error = str(e)
+                with self._lock:
+                    if token.cancelled:
+                        # Status and error were set by _cancel()
+                        raise ThreadCancelledError(token.reason) from e
+                    info.status = 'failed'
+                    info.error = str(e)
                 logger.error(f"Thread '{name}' failed: {e}")
                 if on_error:
                     try:
@@ -570,6 +743,24 @@ class ThreadService:
                     except Exception as cb_err:
                         logger.error(f"Thread '{name}' on_error callback failed: {cb_err}")
                 raise
+            finally:
+                _thread_state.token = None
+                if deadline is not None:
+                    self._deadlines.cancel(deadline)
+                info.wall_time = time.monotonic() - started
+                info.finished_at = datetime.now()
+
+            with self._lock:
+                if token.cancelled:
+                    raise ThreadCancelledError(token.reason)
+                info.status = 'completed'
+                info.result = result
+            if on_complete:
+                try:
+                    on_complete(result)
+                except Exception as e:
+                    logger.error(f"Thread '{name}' on_complete callback failed: {e}")
+            return result
 
         # Create thread info
         info = ThreadInfo(
@@ -577,30 +768,77 @@ class ThreadService:
             priority=priority,
             started_at=datetime.now(),
             status='running',
-            timeout=timeout_seconds
+            timeout=timeout_seconds,
+            isolation=isolation
         )
 
         with self._lock:
             self._threads[name] = info
+            self._tokens[name] = token
 
             # Submit to executor
             future = self._executor.submit(execute_thread)
             self._futures[name] = future
 
-            # Handle timeout if specified
-            if timeout_seconds:
-                def check_timeout():
-                    time.sleep(timeout_seconds)
-                    if name in self._threads and self._threads[name].status == 'running':
-                        self.terminate_thread(name)
-                        logger.warning(f"Thread '{name}' terminated due to timeout")
-
-                timeout_thread = threading.Thread(target=check_timeout, daemon=True)
-                timeout_thread.start()
-
         logger.info(f"Started thread '{name}' with priority '{priority}'")
         return info
 
+    def _run_isolated(self, name: str, callback: Callable, token: CancellationToken) -> Any:
+        """Run callback in a child process and wait for its result (or its death)"""
+        receiver, sender = self._process_context.Pipe(duplex=False)
+        process = self._process_context.Process(
+            target=_isolated_main, args=(callback, sender), name=f"quantum-thread-{name}", daemon=True
+        )
+        process.start()
+        sender.close()
+        with self._lock:
+            self._processes[name] = process
+            if token.cancelled:
+                # Cancelled while starting: _cancel() did not see the process
+                process.kill()
+
+        try:
+            # The pipe may stay open in processes forked meanwhile: wait for data or death
+            multiprocessing.connection.wait([receiver, process.sentinel])
+            try:
+                outcome = receiver.recv() if receiver.poll() else None
+            except EOFError:
+                outcome = None
+            process.join()
+        finally:
+            with self._lock:
+                self._processes.pop(name, None)
+            receiver.close()
+
+        token.raise_if_cancelled()
+        if outcome is None:
+            raise ThreadError(f"Thread process exited with code {process.exitcode}")
+        succeeded, value = outcome
+        if not succeeded:
+            raise ThreadError(value)
+        return value
+
+    def _cancel(self, name: str, token: CancellationToken, reason: str) -> bool:
+        """Mark a running thread terminated, cancel its token and kill its process"""
+        with self._lock:
+            info = self._threads.get(name)
+            if not info or self._tokens.get(name) is not token or info.status != 'running':
+                return False
+            info.status = 'terminated'
+            info.error = reason
+            token.cancel(reason)
+
+            # Cancels the future if the thread has not started yet
+            if name in self._futures:
+                self._futures[name].cancel()
+
+            process = self._processes.get(name)
+            if process is not None:
+                process.kill()
+
+        logger.warning(f"Thread '{name}' terminated: {reason}")
+        return True
+
     def join_thread(self, name: str, timeout: Optional[float] = None) -> Optional[Any]:
         """
         Wait for a thread to complete.
@@ -631,8 +869,10 @@ class ThreadService:
         """
         Request termination of a thread.
 
-        Note: Python threads cannot be forcibly killed, but this marks
-        the thread as terminated and cancels the future if possible.
+        Python threads cannot be forcibly killed: this marks the thread as
+        terminated, cancels the future if it has not started, and cancels
+        the thread's token so that the body stops at its next check.
+        Process-isolated threads are killed.
 
         Args:
             name: Thread name
@@ -640,19 +880,8 @@ class ThreadService:
         Returns:
             True if termination requested, False if not found
         """
-        with self._lock:
-            if name in self._threads:
-                info = self._threads[name]
-                if info.status == 'running':
-                    info.status = 'terminated'
-
-                    # Try to cancel the future (only works if not started)
-                    if name in self._futures:
-                        self._futures[name].cancel()
-
-                    logger.info(f"Requested termination of thread '{name}'")
-                    return True
-        return False
+        token = self._tokens.get(name)
+        return token is not None and self._cancel(name, token, 'Terminated')
 
     def get_thread(self, name: str) -> Optional[ThreadInfo]:
         """Get thread info by name"""
@@ -689,8 +918,8 @@ class ThreadService:
 
             for name in to_remove:
                 del self._threads[name]
-                if name in self._futures:
-                    del self._futures[name]
+                self._futures.pop(name, None)
+                self._tokens.pop(name, None)
 
         if to_remove:
             logger.info(f"Cleaned up {len(to_remove)} old threads")
@@ -700,36 +929,22 @@ class ThreadService:
         Shutdown the thread pool.
 
         Args:
-            wait: Wait for running threads to complete
+            wait: Wait for running threads to complete (False terminates them)
         """
+        if not wait:
+            for name, token in list(self._tokens.items()):
+                self._cancel(name, token, 'Thread service shut down')
         self._executor.shutdown(wait=wait)
         logger.info("Thread service shutdown complete")
 
 
 # ============================================
-# JOB QUEUE SERVICE (SQLite-based)
+# JOB QUEUE SERVICE (pluggable JobStore)
 # ============================================
 
-@dataclass
-class JobInfo:
-    """Information about a queued job"""
-    id: int
-    name: str
-    queue: str
-    params: Dict[str, Any]
-    status: str  # pending, running, completed, failed
-    attempts: int
-    max_attempts: int
-    scheduled_at: Optional[datetime]
-    started_at: Optional[datetime]
-    completed_at: Optional[datetime]
-    error: Optional[str]
-    created_at: datetime
-
-
 class JobQueueService:
     """
-    Service for managing job queues with SQLite persistence.
+    Service for managing job queues on a pluggable JobStore.
 
     Features:
     - Multiple named queues
@@ -738,67 +953,61 @@ class JobQueueService:
     - Automatic retries with backoff
     - Dead letter queue support
 
-    Thread-safe with connection pooling.
+    Jobs are persisted by a JobStore (runtime/job_stores): a local SQLite
+    file by default, or Redis/PostgreSQL so that workers on many nodes
+    share the queues. The service keeps the queue logic (validation,
+    retries with backoff, worker threads).
+
+    Workers sleep on a condition variable that dispatch() signals, so a job
+    dispatched in this process starts right away; poll_interval only bounds
+    how late delayed jobs and jobs dispatched by other processes are seen.
+    A job is claimed atomically with a lease: if its worker dies, the job
+    is claimed again once the lease expires. Each worker keeps one store
+    connection for its whole life.
+
+    Small jobs are cheap in bulk: dispatch_batch() inserts in one
+    transaction, and workers with batch_size > 1 claim several jobs at
+    once and acknowledge their completions together.
     """
 
-    CREATE_TABLE_SQL = """
-    CREATE TABLE IF NOT EXISTS quantum_jobs (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL,
-        queue TEXT DEFAULT 'default',
-        params TEXT,
-        status TEXT DEFAULT 'pending',
-        priority INTEGER DEFAULT 0,
-        attempts INTEGER DEFAULT 0,
-        max_attempts INTEGER DEFAULT 3,
-        backoff_seconds INTEGER DEFAULT 30,
-        scheduled_at DATETIME,
-        started_at DATETIME,
-        completed_at DATETIME,
-        error TEXT,
-        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-    );
-    CREATE INDEX IF NOT EXISTS idx_quantum_jobs_status ON quantum_jobs(status);
-    CREATE INDEX IF NOT EXISTS idx_quantum_jobs_queue ON quantum_jobs(queue);
-    CREATE INDEX IF NOT EXISTS idx_quantum_jobs_scheduled ON quantum_jobs(scheduled_at);
-    """
-
-    def __init__(self, db_path: str = "quantum_jobs.db"):
+    def __init__(self, db_path: str = "quantum_jobs.db", lease: str = '5m',
+                 store: Optional[JobStore] = None):
         """
         Initialize job queue service.
 
         Args:
-            db_path: Path to SQLite database file
+            db_path: Path to SQLite database file (when no store is given)
+            lease: How long a claimed job may run before another worker may
+                   claim it again (should exceed the longest job)
+            store: Job store (default: SQLiteJobStore at db_path)
         """
-        self._db_path = db_path
+        self.store = store or SQLiteJobStore(db_path)
+        self._lease_seconds = parse_duration(lease)
         self._handlers: Dict[str, Callable] = {}
-        self._workers: Dict[str, threading.Thread] = {}
+        self._workers: Dict[str, List[threading.Thread]] = {}
         self._running = False
         self._lock = threading.Lock()
+        # Signalled by dispatch(); _dispatch_count lets workers detect
+        # dispatches that happened while they were claiming
+        self._job_available = threading.Condition(self._lock)
+        self._dispatch_count = 0
 
-        # Initialize database
-        self._init_db()
+    def connect(self) -> Any:
+        """
+        A store connection for one worker (thread or process)
 
-    def _init_db(self):
-        """Initialize the database schema."""
-        conn = sqlite3.connect(
-            self._db_path,
-            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
-        )
-        try:
-            conn.executescript(self.CREATE_TABLE_SQL)
-            conn.commit()
-        finally:
-            conn.close()
+        Pass it to claim_jobs() and process_job() for every job the worker
+        runs, and to close_connection() when the worker stops.
+        """
+        return self.store.connect()
 
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get a database connection with datetime support."""
-        conn = sqlite3.connect(
-            self._db_path,
-            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
-        )
-        conn.row_factory = sqlite3.Row
-        return conn
+    def close_connection(self, conn: Any):
+        """Close a connection from connect()"""
+        self.store.close_connection(conn)
+
+    def _get_connection(self) -> Any:
+        """Alias of connect() for existing callers"""
+        return self.connect()
 
     def register_handler(self, job_name: str, handler: Callable):
         """
@@ -839,6 +1048,17 @@ class JobQueueService:
         Raises:
             JobQueueError: If dispatch fails
         """
+        job = self._job_spec(name, queue, params, delay, priority, attempts, backoff)
+        job_id, = self.store.insert_jobs([job])
+        logger.info(f"Dispatched job '{name}' (id={job_id}) to queue '{queue}'")
+
+        self._notify_workers()
+        return job_id
+
+    @staticmethod
+    def _job_spec(name: str, queue: str, params: Optional[Dict[str, Any]], delay: Optional[str],
+                  priority: int, attempts: int, backoff: Optional[str]) -> JobSpec:
+        """Validate a job for JobStore.insert_jobs"""
         if not name:
             raise JobQueueError("Job name is required")
 
@@ -850,25 +1070,13 @@ class JobQueueService:
 
         backoff_seconds = parse_duration(backoff) if backoff else 30
 
-        # Serialize params
-        params_json = json.dumps(params or {})
+        return JobSpec(name, queue, params or {}, priority, attempts, backoff_seconds, scheduled_at)
 
-        conn = self._get_connection()
-        try:
-            cursor = conn.execute(
-                """
-                INSERT INTO quantum_jobs
-                (name, queue, params, priority, max_attempts, backoff_seconds, scheduled_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (name, queue, params_json, priority, attempts, backoff_seconds, scheduled_at)
-            )
-            conn.commit()
-            job_id = cursor.lastrowid
-            logger.info(f"Dispatched job '{name}' (id={job_id}) to queue '{queue}'")
-            return job_id
-        finally:
-            conn.close()
+    def _notify_workers(self):
+        """Wake idle workers after a dispatch"""
+        with self._job_available:
+            self._dispatch_count += 1
+            self._job_available.notify_all()
 
     def dispatch_batch(
         self,
@@ -876,7 +1084,7 @@ class JobQueueService:
         queue: str = 'default'
     ) -> List[int]:
         """
-        Dispatch multiple jobs at once.
+        Dispatch multiple jobs at once (one transaction, one commit).
 
         Args:
             jobs: List of job dicts with 'name' and optional 'params', 'delay', etc.
@@ -884,35 +1092,33 @@ class JobQueueService:
 
         Returns:
             List of job IDs
+
+        Raises:
+            JobQueueError: If a job has no name (nothing is dispatched)
         """
-        job_ids = []
-        for job in jobs:
-            job_id = self.dispatch(
-                name=job.get('name', ''),
-                queue=job.get('queue', queue),
-                params=job.get('params'),
-                delay=job.get('delay'),
-                priority=job.get('priority', 0),
-                attempts=job.get('attempts', 3),
-                backoff=job.get('backoff', '30s')
+        specs = [
+            self._job_spec(
+                job.get('name', ''),
+                job.get('queue', queue),
+                job.get('params'),
+                job.get('delay'),
+                job.get('priority', 0),
+                job.get('attempts', 3),
+                job.get('backoff', '30s')
             )
-            job_ids.append(job_id)
+            for job in jobs
+        ]
+        if not specs:
+            return []
+
+        job_ids = self.store.insert_jobs(specs)
+        logger.info(f"Dispatched {len(job_ids)} jobs in one batch")
+        self._notify_workers()
         return job_ids
 
     def get_job(self, job_id: int) -> Optional[JobInfo]:
         """Get job info by ID"""
-        conn = self._get_connection()
-        try:
-            row = conn.execute(
-                "SELECT * FROM quantum_jobs WHERE id = ?",
-                (job_id,)
-            ).fetchone()
-
-            if row:
-                return self._row_to_job_info(row)
-            return None
-        finally:
-            conn.close()
+        return self.store.get_job(job_id)
 
     def list_jobs(
         self,
@@ -931,26 +1137,7 @@ class JobQueueService:
         Returns:
             List of JobInfo objects
         """
-        conn = self._get_connection()
-        try:
-            sql = "SELECT * FROM quantum_jobs WHERE 1=1"
-            params = []
-
-            if queue:
-                sql += " AND queue = ?"
-                params.append(queue)
-
-            if status:
-                sql += " AND status = ?"
-                params.append(status)
-
-            sql += " ORDER BY priority DESC, created_at ASC LIMIT ?"
-            params.append(limit)
-
-            rows = conn.execute(sql, params).fetchall()
-            return [self._row_to_job_info(row) for row in rows]
-        finally:
-            conn.close()
+        return self.store.list_jobs(queue=queue, status=status, limit=limit)
 
     def cancel_job(self, job_id: int) -> bool:
         """
@@ -962,23 +1149,10 @@ class JobQueueService:
         Returns:
             True if cancelled, False if not found or already running
         """
-        conn = self._get_connection()
-        try:
-            cursor = conn.execute(
-                """
-                UPDATE quantum_jobs
-                SET status = 'cancelled', completed_at = ?
-                WHERE id = ? AND status = 'pending'
-                """,
-                (datetime.now(), job_id)
-            )
-            conn.commit()
-            if cursor.rowcount > 0:
-                logger.info(f"Cancelled job {job_id}")
-                return True
-            return False
-        finally:
-            conn.close()
+        if self.store.cancel_job(job_id):
+            logger.info(f"Cancelled job {job_id}")
+            return True
+        return False
 
     def retry_job(self, job_id: int) -> bool:
         """
@@ -990,24 +1164,11 @@ class JobQueueService:
         Returns:
             True if retried, False if not found or not failed
         """
-        conn = self._get_connection()
-        try:
-            cursor = conn.execute(
-                """
-                UPDATE quantum_jobs
-                SET status = 'pending', attempts = 0, error = NULL,
-                    started_at = NULL, completed_at = NULL
-                WHERE id = ? AND status = 'failed'
-                """,
-                (job_id,)
-            )
-            conn.commit()
-            if cursor.rowcount > 0:
-                logger.info(f"Retrying job {job_id}")
-                return True
-            return False
-        finally:
-            conn.close()
+        if self.store.retry_job(job_id):
+            logger.info(f"Retrying job {job_id}")
+            self._notify_workers()
+            return True
+        return False
 
     def purge_queue(self, queue: str, status: Optional[str] = None) -> int:
         """
@@ -1020,211 +1181,211 @@ class JobQueueService:
         Returns:
             Number of jobs purged
         """
-        conn = self._get_connection()
-        try:
-            if status:
-                cursor = conn.execute(
-                    "DELETE FROM quantum_jobs WHERE queue = ? AND status = ?",
-                    (queue, status)
-                )
-            else:
-                cursor = conn.execute(
-                    "DELETE FROM quantum_jobs WHERE queue = ? AND status != 'running'",
-                    (queue,)
-                )
-            conn.commit()
-            count = cursor.rowcount
-            logger.info(f"Purged {count} jobs from queue '{queue}'")
-            return count
-        finally:
-            conn.close()
+        count = self.store.purge_queue(queue, status=status)
+        logger.info(f"Purged {count} jobs from queue '{queue}'")
+        return count
 
-    def start_worker(self, queue: str = 'default', poll_interval: float = 1.0):
+    def start_worker(self, queue: str = 'default', poll_interval: float = 1.0, concurrency: int = 1,
+                     batch_size: int = 1):
         """
-        Start a background worker for a queue.
+        Start background workers for a queue.
 
         Args:
             queue: Queue to process
-            poll_interval: Seconds between polls
+            poll_interval: Longest idle wait between checks for jobs that
+                           no local dispatch() announces (delayed jobs,
+                           other processes, expired leases)
+            concurrency: Number of worker threads
+            batch_size: Jobs claimed per UPDATE; their completions are
+                        committed together once the batch has run (the
+                        lease must cover the whole batch)
         """
-        if queue in self._workers:
-            logger.warning(f"Worker for queue '{queue}' already running")
-            return
-
-        self._running = True
+        with self._lock:
+            if queue in self._workers:
+                logger.warning(f"Worker for queue '{queue}' already running")
+                return
+            self._running = True
+            workers = self._workers[queue] = []
 
-        def worker_loop():
-            logger.info(f"Started worker for queue '{queue}'")
+        for _ in range(max(1, concurrency)):
+            worker = threading.Thread(
+                target=self._worker_loop, args=(queue, poll_interval, max(1, batch_size)),
+                name=f"quantum-job-worker-{queue}", daemon=True
+            )
+            worker.start()
+            workers.append(worker)
+        logger.info(f"Started {len(workers)} worker thread(s) for queue '{queue}'")
+
+    def _worker_loop(self, queue: str, poll_interval: float, batch_size: int = 1):
+        """Claim and run jobs until stop_workers(), sleeping while the queue is empty"""
+        logger.info(f"Started worker for queue '{queue}'")
+        conn = self.connect()
+        try:
             while self._running:
+                with self._job_available:
+                    dispatch_count = self._dispatch_count
                 try:
-                    job = self._fetch_next_job(queue)
-                    if job:
-                        self._process_job(job)
-                    else:
-                        time.sleep(poll_interval)
+                    jobs = self.claim_jobs(queue, batch_size, conn)
+                    if jobs:
+                        completed: List[int] = []
+                        try:
+                            for job in jobs:
+                                self.process_job(job, conn, completed)
+                        finally:
+                            self._complete_jobs(completed, conn)
+                        continue
                 except Exception as e:
                     logger.error(f"Worker error: {e}")
-                    time.sleep(poll_interval)
 
-        worker = threading.Thread(target=worker_loop, daemon=True)
-        worker.start()
-        self._workers[queue] = worker
-        logger.info(f"Started worker thread for queue '{queue}'")
+                with self._job_available:
+                    self._job_available.wait_for(
+                        lambda: self._dispatch_count != dispatch_count or not self._running,
+                        timeout=poll_interval
+                    )
+        finally:
+            self.close_connection(conn)
 
-    def stop_workers(self):
-        """Stop all worker threads"""
-        self._running = False
-        self._workers.clear()
+    def stop_workers(self, timeout: float = 5.0):
+        """
+        Stop all worker threads.
+
+        Args:
+            timeout: Seconds to wait for each worker to finish its current job
+        """
+        with self._job_available:
+            self._running = False
+            workers = [worker for threads in self._workers.values() for worker in threads]
+            self._workers.clear()
+            self._job_available.notify_all()
+
+        for worker in workers:
+            if worker is not threading.current_thread():
+                worker.join(timeout)
         logger.info("Stopped all job queue workers")
 
-    def _fetch_next_job(self, queue: str) -> Optional[JobInfo]:
-        """Fetch and lock the next pending job"""
-        conn = self._get_connection()
-        try:
-            # Find next pending job (respecting scheduled_at and priority)
-            row = conn.execute(
-                """
-                SELECT * FROM quantum_jobs
-                WHERE queue = ? AND status = 'pending'
-                AND (scheduled_at IS NULL OR scheduled_at <= ?)
-                ORDER BY priority DESC, created_at ASC
-                LIMIT 1
-                """,
-                (queue, datetime.now())
-            ).fetchone()
-
-            if not row:
-                return None
-
-            # Mark as running
-            conn.execute(
-                "UPDATE quantum_jobs SET status = 'running', started_at = ? WHERE id = ?",
-                (datetime.now(), row['id'])
-            )
-            conn.commit()
+    def _fetch_next_job(self, queue: str, conn: Any = None) -> Optional[JobInfo]:
+        """Atomically claim the next due job of a queue (None if there is none)"""
+        jobs = self.claim_jobs(queue, 1, conn)
+        return jobs[0] if jobs else None
 
-            return self._row_to_job_info(row)
-        finally:
-            conn.close()
+    def claim_jobs(self, queue: str, limit: int, conn: Any = None,
+                   max_running: Optional[int] = None) -> List[JobInfo]:
+        """
+        Atomically claim up to `limit` due jobs of a queue
+
+        Jobs with an expired lease are requeued (and claimed) when fewer
+        than `limit` pending jobs are due. Each claimed job must be passed
+        to process_job() (or release_job()) before its lease expires.
 
-    def _process_job(self, job: JobInfo):
-        """Process a job"""
+        Args:
+            conn: Worker connection from connect() (None = one-off connection)
+            max_running: Claim only while fewer jobs of the queue are
+                         running (in any process using the store)
+
+        Returns:
+            Claimed jobs in priority order
+        """
+        return self.store.claim_jobs(queue, limit, self._lease_seconds, max_running, conn)
+
+    def _fetch_next_jobs(self, queue: str, limit: int, conn: Any = None,
+                         max_running: Optional[int] = None) -> List[JobInfo]:
+        """Alias of claim_jobs() for existing callers"""
+        return self.claim_jobs(queue, limit, conn, max_running)
+
+    def process_job(self, job: JobInfo, conn: Any = None,
+                    completed: Optional[List[int]] = None) -> bool:
+        """
+        Run the handler of a claimed job and record the outcome
+
+        Failures are retried with backoff until the job's attempts are used up.
+
+        Args:
+            job: Job from claim_jobs()
+            conn: Worker connection from connect() (None = one-off connection)
+            completed: Collects the ids of successful jobs for one grouped
+                       _complete_jobs() commit (None = mark completed now)
+
+        Returns:
+            True if the handler succeeded
+        """
         handler = self._handlers.get(job.name)
         if not handler:
             logger.error(f"No handler for job '{job.name}'")
-            self._fail_job(job.id, "No handler registered")
-            return
+            self._fail_job(job.id, "No handler registered", conn)
+            return False
 
         try:
             # Execute handler
             handler(job.params)
+        except Exception as e:
+            logger.error(f"Job '{job.name}' (id={job.id}) failed: {e}")
+            self._handle_job_failure(job, str(e), conn)
+            return False
 
-            # Mark as completed
-            conn = self._get_connection()
-            try:
-                conn.execute(
-                    "UPDATE quantum_jobs SET status = 'completed', completed_at = ? WHERE id = ?",
-                    (datetime.now(), job.id)
-                )
-                conn.commit()
-            finally:
-                conn.close()
+        if completed is not None:
+            completed.append(job.id)
+        else:
+            self._complete_jobs([job.id], conn)
+        logger.info(f"Completed job '{job.name}' (id={job.id})")
+        return True
 
-            logger.info(f"Completed job '{job.name}' (id={job.id})")
+    def _process_job(self, job: JobInfo, conn: Any = None,
+                     completed: Optional[List[int]] = None) -> bool:
+        """Alias of process_job() for existing callers"""
+        return self.process_job(job, conn, completed)
 
-        except Exception as e:
-            logger.error(f"Job '{job.name}' (id={job.id}) failed: {e}")
-            self._handle_job_failure(job, str(e))
+    def renew_lease(self, job_id: int, conn: Any = None) -> bool:
+        """
+        Extend the lease of a running job (heartbeat of long jobs)
 
-    def _handle_job_failure(self, job: JobInfo, error: str):
-        """Handle job failure with retry logic"""
-        conn = self._get_connection()
-        try:
-            # Get current job state
-            row = conn.execute(
-                "SELECT attempts, max_attempts, backoff_seconds FROM quantum_jobs WHERE id = ?",
-                (job.id,)
-            ).fetchone()
+        Returns:
+            False if the job is no longer running
+        """
+        return self.store.renew_lease(job_id, self._lease_seconds, conn)
 
-            if not row:
-                return
+    def release_job(self, job_id: int, error: Optional[str] = None) -> bool:
+        """
+        Give up a running job whose worker is gone, without waiting for its lease
 
-            attempts = row['attempts'] + 1
-            max_attempts = row['max_attempts']
-            backoff_seconds = row['backoff_seconds']
-
-            if attempts < max_attempts:
-                # Schedule retry with exponential backoff
-                delay = backoff_seconds * (2 ** (attempts - 1))
-                scheduled_at = datetime.now() + timedelta(seconds=delay)
-
-                conn.execute(
-                    """
-                    UPDATE quantum_jobs
-                    SET status = 'pending', attempts = ?, scheduled_at = ?, error = ?
-                    WHERE id = ?
-                    """,
-                    (attempts, scheduled_at, error, job.id)
-                )
-                logger.info(f"Job {job.id} will retry in {format_duration(delay)}")
-            else:
-                # Max retries exceeded
-                conn.execute(
-                    """
-                    UPDATE quantum_jobs
-                    SET status = 'failed', attempts = ?, completed_at = ?, error = ?
-                    WHERE id = ?
-                    """,
-                    (attempts, datetime.now(), error, job.id)
-                )
-                logger.error(f"Job {job.id} failed after {attempts} attempts")
+        Args:
+            job_id: Job ID
+            error: Count the run as a failed attempt (retried with backoff);
+                   None puts the job back to pending as if never claimed
 
-            conn.commit()
-        finally:
-            conn.close()
+        Returns:
+            True if the job was running
+        """
+        if error is None:
+            return self.store.requeue_job(job_id)
 
-    def _fail_job(self, job_id: int, error: str):
-        """Mark a job as failed"""
-        conn = self._get_connection()
-        try:
-            conn.execute(
-                "UPDATE quantum_jobs SET status = 'failed', completed_at = ?, error = ? WHERE id = ?",
-                (datetime.now(), error, job_id)
-            )
-            conn.commit()
-        finally:
-            conn.close()
+        job = self.store.get_job(job_id)
+        if not job or job.status != 'running':
+            return False
+        self._handle_job_failure(job, error)
+        return True
 
-    def _row_to_job_info(self, row: sqlite3.Row) -> JobInfo:
-        """Convert database row to JobInfo"""
-        params = {}
-        if row['params']:
-            try:
-                params = json.loads(row['params'])
-            except json.JSONDecodeError:
-                pass
-
-        def parse_datetime(val):
-            if val:
-                if isinstance(val, str):
-                    return datetime.fromisoformat(val)
-                return val
-            return None
-
-        return JobInfo(
-            id=row['id'],
-            name=row['name'],
-            queue=row['queue'],
-            params=params,
-            status=row['status'],
-            attempts=row['attempts'],
-            max_attempts=row['max_attempts'],
-            scheduled_at=parse_datetime(row['scheduled_at']),
-            started_at=parse_datetime(row['started_at']),
-            completed_at=parse_datetime(row['completed_at']),
-            error=row['error'],
-            created_at=parse_datetime(row['created_at'])
-        )
+    def _complete_jobs(self, job_ids: List[int], conn: Any = None):
+        """Mark jobs as completed in one commit"""
+        self.store.complete_jobs(job_ids, conn)
+
+    def _handle_job_failure(self, job: JobInfo, error: str, conn: Any = None):
+        """Handle job failure with retry logic"""
+        attempts = job.attempts + 1
+
+        if attempts < job.max_attempts:
+            # Schedule retry with exponential backoff
+            delay = job.backoff_seconds * (2 ** (attempts - 1))
+            scheduled_at = datetime.now() + timedelta(seconds=delay)
+            self.store.retry_later(job.id, attempts, scheduled_at, error, conn)
+            logger.info(f"Job {job.id} will retry in {format_duration(delay)}")
+        else:
+            # Max retries exceeded
+            self.store.fail_job(job.id, error, attempts, conn)
+            logger.error(f"Job {job.id} failed after {attempts} attempts")
+
+    def _fail_job(self, job_id: int, error: str, conn: Any = None):
+        """Mark a job as failed"""
+        self.store.fail_job(job_id, error, conn=conn)
 
     def get_queue_stats(self, queue: str = 'default') -> Dict[str, int]:
         """
@@ -1236,24 +1397,7 @@ class JobQueueService:
         Returns:
             Dict with status counts
         """
-        conn = self._get_connection()
-        try:
-            rows = conn.execute(
-                """
-                SELECT status, COUNT(*) as count
-                FROM quantum_jobs
-                WHERE queue = ?
-                GROUP BY status
-                """,
-                (queue,)
-            ).fetchall()
-
-            stats = {'pending': 0, 'running': 0, 'completed': 0, 'failed': 0}
-            for row in rows:
-                stats[row['status']] = row['count']
-            return stats
-        finally:
-            conn.close()
+        return self.store.queue_stats(queue)
 
 
 # ============================================
@@ -1273,7 +1417,8 @@ class JobExecutor:
     def __init__(
         self,
         max_thread_workers: int = 10,
-        job_db_path: str = "quantum_jobs.db"
+        job_db_path: str = "quantum_jobs.db",
+        job_store: Optional[JobStore] = None
     ):
         """
         Initialize job executor.
@@ -1281,10 +1426,11 @@ class JobExecutor:
         Args:
             max_thread_workers: Maximum concurrent threads
             job_db_path: Path to job queue database
+            job_store: Job queue store (default: SQLite at job_db_path)
         """
         self.schedule = ScheduleService()
         self.thread = ThreadService(max_workers=max_thread_workers)
-        self.job_queue = JobQueueService(db_path=job_db_path)
+        self.job_queue = JobQueueService(db_path=job_db_path, store=job_store)
         self._worker_running = False
 
     def shutdown(self, wait: bool = True):
@@ -1544,8 +1690,7 @@ class JobExecutor:
         """
         self._worker_running = True
         for queue in queues:
-            for _ in range(concurrency):
-                self.job_queue.start_worker(queue, poll_interval)
+            self.job_queue.start_worker(queue, poll_interval, concurrency=concurrency)
 
         # Keep main thread alive
         import time
@@ -0,0 +1,194 @@
+"""
+Job Store - storage backend abstraction for JobQueueService
+
+JobQueueService keeps the queue logic (validation, retries with backoff,
+workers, leases); a JobStore persists jobs and claims them atomically.
+Implementations (runtime/job_stores):
+
+- SQLiteJobStore: local quantum_jobs.db file (default, single node)
+- RedisJobStore: reliable-queue lists and sorted sets (many nodes)
+- PostgresJobStore: SELECT ... FOR UPDATE SKIP LOCKED (many nodes)
+
+Every store passes the same conformance suite (tests/test_job_stores.py).
+"""
+
+import json
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class JobInfo:
+    """Information about a queued job"""
+    id: int
+    name: str
+    queue: str
+    params: Dict[str, Any]
+    status: str  # pending, running, completed, failed, cancelled
+    attempts: int
+    max_attempts: int
+    scheduled_at: Optional[datetime]
+    started_at: Optional[datetime]
+    completed_at: Optional[datetime]
+    error: Optional[str]
+    created_at: datetime
+    priority: int = 0
+    backoff_seconds: int = 30
+
+
+@dataclass
+class JobSpec:
+    """A job to insert (see JobQueueService.dispatch)"""
+    name: str
+    queue: str
+    params: Dict[str, Any]
+    priority: int
+    max_attempts: int
+    backoff_seconds: int
+    scheduled_at: Optional[datetime]
+
+
+def parse_datetime(value) -> Optional[datetime]:
+    """Datetime from a stored value (datetime, ISO string, or empty)"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def row_to_job_info(row) -> JobInfo:
+    """Convert a database row (any mapping of quantum_jobs columns) to JobInfo"""
+    params = {}
+    if row['params']:
+        try:
+            params = json.loads(row['params'])
+        except json.JSONDecodeError:
+            pass
+
+    return JobInfo(
+        id=int(row['id']),
+        name=row['name'],
+        queue=row['queue'],
+        params=params,
+        status=row['status'],
+        attempts=int(row['attempts']),
+        max_attempts=int(row['max_attempts']),
+        scheduled_at=parse_datetime(row['scheduled_at']),
+        started_at=parse_datetime(row['started_at']),
+        completed_at=parse_datetime(row['completed_at']),
+        error=row['error'] or None,
+        created_at=parse_datetime(row['created_at']),
+        priority=int(row['priority'] or 0),
+        backoff_seconds=int(row['backoff_seconds'] or 0)
+    )
+
+
+class JobStore(ABC):
+    """
+    Abstract base class for job store implementations.
+
+    Worker threads may hold one connection for their whole life
+    (connect()/close_connection()) and pass it to the claim and
+    acknowledge methods; every method also works without one.
+    """
+
+    backend = 'abstract'
+
+    def connect(self) -> Any:
+        """A connection for one worker thread (None for thread-safe clients)"""
+        return None
+
+    def close_connection(self, conn: Any):
+        """Release a connection from connect()"""
+
+    @contextmanager
+    def connection(self, conn: Any = None):
+        """The caller's connection, or a new one released after the block"""
+        if conn is not None:
+            yield conn
+            return
+        conn = self.connect()
+        try:
+            yield conn
+        finally:
+            self.close_connection(conn)
+
+    def close(self):
+        """Release the store's resources (pools, clients)"""
+
+    @abstractmethod
+    def insert_jobs(self, jobs: List[JobSpec]) -> List[int]:
+        """
+        Insert jobs atomically (all or none).
+
+        Returns:
+            Job IDs, in order
+        """
+
+    @abstractmethod
+    def get_job(self, job_id: int) -> Optional[JobInfo]:
+        """Get a job by ID"""
+
+    @abstractmethod
+    def list_jobs(self, queue: Optional[str] = None, status: Optional[str] = None,
+                  limit: int = 100) -> List[JobInfo]:
+        """Jobs in priority order (then oldest first)"""
+
+    @abstractmethod
+    def cancel_job(self, job_id: int) -> bool:
+        """Cancel a pending job; False if it is not pending"""
+
+    @abstractmethod
+    def retry_job(self, job_id: int) -> bool:
+        """Reset a failed job to pending with no attempts; False if it is not failed"""
+
+    @abstractmethod
+    def purge_queue(self, queue: str, status: Optional[str] = None) -> int:
+        """Delete the jobs of a queue with a status (default: all but running)"""
+
+    @abstractmethod
+    def queue_stats(self, queue: str) -> Dict[str, int]:
+        """Job count per status (pending, running, completed and failed always present)"""
+
+    @abstractmethod
+    def claim_jobs(self, queue: str, limit: int, lease_seconds: int,
+                   max_running: Optional[int] = None, conn: Any = None) -> List[JobInfo]:
+        """
+        Atomically claim up to `limit` due pending jobs of a queue.
+
+        Claimed jobs are 'running' with a lease of lease_seconds. Jobs whose
+        lease expired are requeued (and claimed) when fewer than `limit`
+        pending jobs are due.
+
+        Args:
+            max_running: Claim only while fewer jobs of the queue are running
+                         (on any node using the store)
+
+        Returns:
+            Claimed jobs, highest priority first, then oldest first
+        """
+
+    @abstractmethod
+    def complete_jobs(self, job_ids: List[int], conn: Any = None):
+        """Mark running jobs completed (one commit/round trip)"""
+
+    @abstractmethod
+    def retry_later(self, job_id: int, attempts: int, scheduled_at: datetime, error: str,
+                    conn: Any = None):
+        """Put a failed running job back to pending, due at scheduled_at"""
+
+    @abstractmethod
+    def fail_job(self, job_id: int, error: str, attempts: Optional[int] = None, conn: Any = None):
+        """Mark a job failed for good (attempts: new attempt count, None = unchanged)"""
+
+    @abstractmethod
+    def renew_lease(self, job_id: int, lease_seconds: int, conn: Any = None) -> bool:
+        """Extend the lease of a running job; False if it is not running"""
+
+    @abstractmethod
+    def requeue_job(self, job_id: int) -> bool:
+        """Put a running job back to pending without counting an attempt"""
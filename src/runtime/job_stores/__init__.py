@@ -0,0 +1,75 @@
+"""
+Job Stores
+
+Provides implementations of JobStore for different backends:
+- SQLiteJobStore: Local database file (default)
+- RedisJobStore: Reliable-queue lists and sorted sets in Redis
+- PostgresJobStore: PostgreSQL with FOR UPDATE SKIP LOCKED claims
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from .sqlite_store import SQLiteJobStore
+
+# Both import without their driver; creating the store raises ImportError
+from .redis_store import REDIS_AVAILABLE, RedisJobStore
+from .postgres_store import PSYCOPG2_AVAILABLE, PostgresJobStore
+
+
+def create_job_store(config: Optional[Dict[str, Any]] = None, db_path: str = "quantum_jobs.db"):
+    """
+    Factory function to build the job store described by a `job_store` config.
+
+    Args:
+        config: {'backend': 'sqlite' | 'redis' | 'postgresql', ...}
+            sqlite: {'database': path} (default: db_path)
+            redis: {'redis': {host, port, db, password, prefix}}, defaulting
+                   to the REDIS_* environment variables used by the message
+                   queue service
+            postgresql: {'dsn': ...} (default: QUANTUM_JOB_STORE_DSN) or
+                        psycopg2.connect keywords, 'pool_size'
+            The backend defaults to QUANTUM_JOB_STORE, then 'sqlite'.
+        db_path: SQLite database file when the config names none
+
+    Returns:
+        JobStore instance
+
+    Raises:
+        ImportError: If required dependencies are not installed
+        ValueError: If the backend is not recognized
+    """
+    config = config or {}
+    backend = config.get('backend') or os.getenv('QUANTUM_JOB_STORE', 'sqlite')
+
+    if backend == 'sqlite':
+        return SQLiteJobStore(config.get('database', db_path))
+    elif backend == 'redis':
+        if not REDIS_AVAILABLE:
+            raise ImportError(
+                "Redis job store requires 'redis' package. "
+                "Install with: pip install redis"
+            )
+        redis_config = {
+            'host': os.getenv('REDIS_HOST', 'localhost'),
+            'port': int(os.getenv('REDIS_PORT', '6379')),
+            'db': int(os.getenv('REDIS_DB', '0')),
+            'password': os.getenv('REDIS_PASSWORD'),
+            'prefix': os.getenv('REDIS_PREFIX', 'quantum:'),
+        }
+        redis_config.update(config.get('redis') or {})
+        return RedisJobStore(redis_config)
+    elif backend in ('postgresql', 'postgres'):
+        if not PSYCOPG2_AVAILABLE:
+            raise ImportError(
+                "PostgreSQL job store requires 'psycopg2' package. "
+                "Install with: pip install psycopg2-binary"
+            )
+        postgres_config = dict(config)
+        postgres_config.setdefault('dsn', os.getenv('QUANTUM_JOB_STORE_DSN'))
+        return PostgresJobStore(postgres_config)
+    else:
+        raise ValueError(f"Unknown job store backend: {backend}")
+
+
+__all__ = ['SQLiteJobStore', 'RedisJobStore', 'PostgresJobStore', 'create_job_store']
@@ -0,0 +1,459 @@
+"""
+Redis Job Store
+
+Jobs of every node share one Redis server. Keys (under the configured
+prefix, 'quantum:' by default):
+
+    jobs:seq                     INCR counter for job ids
+    job:<id>                     HASH of the job's fields
+    jobs:queues                  SET of queue names
+    jobs:all:<queue>             ZSET of the queue's job ids (listing, stats, purge)
+    jobs:delayed:<queue>         ZSET of delayed job ids, scored by due time
+    jobs:levels:<queue>          ZSET of priority levels, scored by -priority
+    jobs:ready:<queue>:<level>   LIST of due job ids of one priority (FIFO)
+    jobs:claimed:<queue>         LIST of jobs taken by workers
+    jobs:leases:<queue>          ZSET of running job ids, scored by lease expiry
+
+Claims use the reliable-queue pattern: RPOPLPUSH moves a job id from a
+ready list to the claimed list in one step, so a worker dying right
+after the pop cannot lose the job. The lease is then recorded; jobs
+whose lease expires, or that sit in the claimed list without a lease
+(the worker died between the two steps), go back to their ready list.
+Delayed jobs move to their ready list once due. Per-queue running
+limits use WATCH on the claimed list (optimistic locking).
+
+Status changes and list moves of one job are sent as one MULTI/EXEC
+transaction. list_jobs, queue_stats and purge_queue read every job of
+a queue and are meant for administration, not hot paths.
+
+Configuration (same keys as adapters/redis_adapter.RedisAdapter.connect):
+    {'host': 'localhost', 'port': 6379, 'db': 0, 'password': None,
+     'prefix': 'quantum:'}
+
+Requires: redis package (pip install redis)
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+from runtime.job_store import JobInfo, JobSpec, JobStore, parse_datetime
+from runtime.query_stream import json_default
+
+logger = logging.getLogger(__name__)
+
+
+# Claimed jobs without a lease for this long lost their worker mid-claim
+ORPHAN_TIMEOUT = 30.0
+# Shortest time between two scans of a claimed list for such jobs
+ORPHAN_SCAN_INTERVAL = 5.0
+
+
+def _encode(value) -> str:
+    """Hash field value (Redis stores strings; None becomes '')"""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class RedisJobStore(JobStore):
+    """Job store shared by all nodes through Redis."""
+
+    backend = 'redis'
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, client=None):
+        """
+        Args:
+            config: Redis connection configuration (see module docstring)
+            client: Existing Redis client created with decode_responses=True
+                    (e.g. fakeredis in tests); config is then only used for
+                    the prefix
+        """
+        config = config or {}
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise ImportError(
+                    "Redis job store requires 'redis' package. "
+                    "Install with: pip install redis"
+                )
+            client = redis.Redis(
+                host=config.get('host', 'localhost'),
+                port=config.get('port', 6379),
+                db=config.get('db', 0),
+                password=config.get('password'),
+                decode_responses=True
+            )
+            client.ping()
+        self._client = client
+        self._prefix = config.get('prefix', 'quantum:')
+        self._lock = threading.Lock()
+        # Queue -> {claimed id seen without a lease: when first seen}
+        self._orphans: Dict[str, Dict[str, float]] = {}
+        self._orphan_scans: Dict[str, float] = {}
+
+    # ========================================
+    # Keys
+    # ========================================
+
+    def _job_key(self, job_id) -> str:
+        return f"{self._prefix}job:{job_id}"
+
+    def _key(self, kind: str, queue: Optional[str] = None) -> str:
+        return f"{self._prefix}jobs:{kind}" + (f":{queue}" if queue is not None else '')
+
+    def _ready_key(self, queue: str, priority) -> str:
+        return f"{self._prefix}jobs:ready:{queue}:{priority}"
+
+    def _job_info(self, job_id, fields: Dict[str, str]) -> Optional[JobInfo]:
+        if not fields:
+            return None
+        return JobInfo(
+            id=int(job_id),
+            name=fields['name'],
+            queue=fields['queue'],
+            params=json.loads(fields['params']) if fields.get('params') else {},
+            status=fields['status'],
+            attempts=int(fields['attempts']),
+            max_attempts=int(fields['max_attempts']),
+            scheduled_at=parse_datetime(fields.get('scheduled_at')),
+            started_at=parse_datetime(fields.get('started_at')),
+            completed_at=parse_datetime(fields.get('completed_at')),
+            error=fields.get('error') or None,
+            created_at=parse_datetime(fields.get('created_at')),
+            priority=int(fields.get('priority') or 0),
+            backoff_seconds=int(fields.get('backoff_seconds') or 0)
+        )
+
+    def _push_ready(self, pipe, job_id, queue: str, priority, front: bool = False):
+        """Queue a due job; front=True makes it the next one claimed at its level"""
+        ready = self._ready_key(queue, priority)
+        if front:
+            pipe.rpush(ready, job_id)
+        else:
+            pipe.lpush(ready, job_id)
+        pipe.zadd(self._key('levels', queue), {str(priority): -int(priority)})
+
+    def _jobs_of_queues(self, queue: Optional[str]) -> List[tuple]:
+        """(id, fields) of every job of a queue (or of all queues)"""
+        queues = [queue] if queue else sorted(self._client.smembers(self._key('queues')))
+        ids = []
+        for name in queues:
+            ids.extend(self._client.zrange(self._key('all', name), 0, -1))
+        pipe = self._client.pipeline(transaction=False)
+        for job_id in ids:
+            pipe.hgetall(self._job_key(job_id))
+        return [(job_id, fields) for job_id, fields in zip(ids, pipe.execute()) if fields]
+
+    # ========================================
+    # Dispatch and administration
+    # ========================================
+
+    def close(self):
+        self._client.close()
+
+    def insert_jobs(self, jobs: List[JobSpec]) -> List[int]:
+        if not jobs:
+            return []
+        last_id = self._client.incrby(self._key('seq'), len(jobs))
+        job_ids = list(range(last_id - len(jobs) + 1, last_id + 1))
+        now = datetime.now()
+
+        pipe = self._client.pipeline(transaction=True)
+        for job_id, job in zip(job_ids, jobs):
+            pipe.hset(self._job_key(job_id), mapping={
+                'name': job.name,
+                'queue': job.queue,
+                'params': json.dumps(job.params, default=json_default),
+                'status': 'pending',
+                'priority': job.priority,
+                'attempts': 0,
+                'max_attempts': job.max_attempts,
+                'backoff_seconds': job.backoff_seconds,
+                'scheduled_at': _encode(job.scheduled_at),
+                'created_at': now.isoformat(),
+            })
+            pipe.sadd(self._key('queues'), job.queue)
+            pipe.zadd(self._key('all', job.queue), {job_id: job_id})
+            if job.scheduled_at and job.scheduled_at > now:
+                pipe.zadd(self._key('delayed', job.queue), {job_id: job.scheduled_at.timestamp()})
+            else:
+                self._push_ready(pipe, job_id, job.queue, job.priority)
+        pipe.execute()
+        return job_ids
+
+    def get_job(self, job_id: int) -> Optional[JobInfo]:
+        return self._job_info(job_id, self._client.hgetall(self._job_key(job_id)))
+
+    def list_jobs(self, queue: Optional[str] = None, status: Optional[str] = None,
+                  limit: int = 100) -> List[JobInfo]:
+        jobs = [self._job_info(job_id, fields) for job_id, fields in self._jobs_of_queues(queue)
+                if not status or fields['status'] == status]
+        jobs.sort(key=lambda job: (-job.priority, job.created_at or datetime.min, job.id))
+        return jobs[:limit]
+
+    def cancel_job(self, job_id: int) -> bool:
+        fields = self._client.hmget(self._job_key(job_id), 'queue', 'priority', 'status')
+        queue, priority, status = fields
+        if status != 'pending':
+            return False
+        # Whoever removes the id from its ready list (or the delayed set) owns the job
+        removed = (self._client.lrem(self._ready_key(queue, priority), 1, job_id) or
+                   self._client.zrem(self._key('delayed', queue), job_id))
+        if not removed:
+            return False
+        self._client.hset(self._job_key(job_id), mapping={
+            'status': 'cancelled', 'completed_at': datetime.now().isoformat()
+        })
+        return True
+
+    def retry_job(self, job_id: int) -> bool:
+        key = self._job_key(job_id)
+        with self._client.pipeline(transaction=True) as pipe:
+            try:
+                pipe.watch(key)
+                queue, priority, status = pipe.hmget(key, 'queue', 'priority', 'status')
+                if status != 'failed':
+                    pipe.unwatch()
+                    return False
+                pipe.multi()
+                pipe.hset(key, mapping={
+                    'status': 'pending', 'attempts': 0, 'error': '',
+                    'started_at': '', 'completed_at': ''
+                })
+                self._push_ready(pipe, job_id, queue, priority)
+                pipe.execute()
+                return True
+            except redis.WatchError:
+                return False
+
+    def purge_queue(self, queue: str, status: Optional[str] = None) -> int:
+        purged = [(job_id, fields) for job_id, fields in self._jobs_of_queues(queue)
+                  if fields['status'] == status or (not status and fields['status'] != 'running')]
+        pipe = self._client.pipeline(transaction=True)
+        for job_id, fields in purged:
+            pipe.delete(self._job_key(job_id))
+            pipe.zrem(self._key('all', queue), job_id)
+            if fields['status'] == 'pending':
+                pipe.lrem(self._ready_key(queue, fields['priority']), 1, job_id)
+                pipe.zrem(self._key('delayed', queue), job_id)
+        pipe.execute()
+        return len(purged)
+
+    def queue_stats(self, queue: str) -> Dict[str, int]:
+        stats = {'pending': 0, 'running': 0, 'completed': 0, 'failed': 0}
+        stats.update(Counter(fields['status'] for _, fields in self._jobs_of_queues(queue)))
+        return stats
+
+    # ========================================
+    # Workers
+    # ========================================
+
+    def claim_jobs(self, queue: str, limit: int, lease_seconds: int,
+                   max_running: Optional[int] = None, conn: Any = None) -> List[JobInfo]:
+        self._promote_due(queue)
+        job_ids = self._pop_ready(queue, limit, max_running)
+        if len(job_ids) < limit and self._requeue_expired(queue):
+            job_ids += self._pop_ready(queue, limit - len(job_ids), max_running)
+        if not job_ids:
+            return []
+
+        now = datetime.now()
+        lease_expires_at = now + timedelta(seconds=lease_seconds)
+        pipe = self._client.pipeline(transaction=True)
+        pipe.zadd(self._key('leases', queue), {job_id: lease_expires_at.timestamp() for job_id in job_ids})
+        for job_id in job_ids:
+            pipe.hset(self._job_key(job_id), mapping={
+                'status': 'running',
+                'started_at': now.isoformat(),
+                'lease_expires_at': lease_expires_at.isoformat()
+            })
+            pipe.hgetall(self._job_key(job_id))
+        results = pipe.execute()
+
+        jobs = [self._job_info(job_id, fields) for job_id, fields in zip(job_ids, results[2::2])]
+        jobs.sort(key=lambda job: (-job.priority, job.created_at or datetime.min, job.id))
+        return jobs
+
+    def _pop_ready(self, queue: str, limit: int, max_running: Optional[int]) -> List[str]:
+        """Move up to `limit` job ids from the ready lists to the claimed list"""
+        claimed = self._key('claimed', queue)
+        job_ids = []
+        if max_running is None:
+            for level in self._client.zrange(self._key('levels', queue), 0, -1):
+                ready = self._ready_key(queue, level)
+                while len(job_ids) < limit:
+                    job_id = self._client.rpoplpush(ready, claimed)
+                    if job_id is None:
+                        break
+                    job_ids.append(job_id)
+                if len(job_ids) >= limit:
+                    break
+            return job_ids
+
+        # The running count (length of the claimed list) must not change
+        # between the check and the pop: retry when another worker claims
+        with self._client.pipeline(transaction=True) as pipe:
+            while len(job_ids) < limit:
+                try:
+                    pipe.watch(claimed)
+                    if pipe.llen(claimed) >= max_running:
+                        break
+                    ready = next(
+                        (self._ready_key(queue, level)
+                         for level in pipe.zrange(self._key('levels', queue), 0, -1)
+                         if pipe.llen(self._ready_key(queue, level))),
+                        None
+                    )
+                    if ready is None:
+                        break
+                    pipe.multi()
+                    pipe.rpoplpush(ready, claimed)
+                    job_id = pipe.execute()[0]
+                    if job_id is not None:
+                        job_ids.append(job_id)
+                except redis.WatchError:
+                    continue
+                finally:
+                    pipe.reset()
+        return job_ids
+
+    def _promote_due(self, queue: str):
+        """Move delayed jobs that are due to their ready list"""
+        delayed = self._key('delayed', queue)
+        for job_id in self._client.zrangebyscore(delayed, '-inf', time.time()):
+            # Only the caller that removes the id promotes it
+            if self._client.zrem(delayed, job_id):
+                priority = self._client.hget(self._job_key(job_id), 'priority') or 0
+                pipe = self._client.pipeline(transaction=True)
+                self._push_ready(pipe, job_id, queue, priority)
+                pipe.execute()
+
+    def _requeue_expired(self, queue: str) -> int:
+        """Requeue running jobs whose lease expired and orphaned claims; returns their count"""
+        leases = self._key('leases', queue)
+        requeued = 0
+        for job_id in self._client.zrangebyscore(leases, '-inf', time.time()):
+            if self._client.zrem(leases, job_id):
+                self._requeue(queue, job_id)
+                requeued += 1
+        requeued += self._requeue_orphans(queue)
+        if requeued:
+            logger.warning(f"Requeued {requeued} job(s) with an expired lease in queue '{queue}'")
+        return requeued
+
+    def _requeue_orphans(self, queue: str) -> int:
+        """Requeue claimed jobs that never got a lease (worker died mid-claim)"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._orphan_scans.get(queue, 0.0) < ORPHAN_SCAN_INTERVAL:
+                return 0
+            self._orphan_scans[queue] = now
+
+        claimed = self._client.lrange(self._key('claimed', queue), 0, -1)
+        if not claimed:
+            return 0
+        pipe = self._client.pipeline(transaction=False)
+        for job_id in claimed:
+            pipe.zscore(self._key('leases', queue), job_id)
+            pipe.hget(self._job_key(job_id), 'status')
+        results = pipe.execute()
+        leaseless = {job_id for job_id, lease, status in zip(claimed, results[::2], results[1::2])
+                     if lease is None and status == 'pending'}
+
+        with self._lock:
+            seen = self._orphans.setdefault(queue, {})
+            for job_id in list(seen):
+                if job_id not in leaseless:
+                    del seen[job_id]
+            for job_id in leaseless:
+                seen.setdefault(job_id, now)
+            orphans = [job_id for job_id, since in seen.items() if now - since >= ORPHAN_TIMEOUT]
+            for job_id in orphans:
+                del seen[job_id]
+
+        for job_id in orphans:
+            self._requeue(queue, job_id)
+        return len(orphans)
+
+    def _requeue(self, queue: str, job_id):
+        """Move a job from the claimed list back to the front of its ready list"""
+        priority = self._client.hget(self._job_key(job_id), 'priority') or 0
+        pipe = self._client.pipeline(transaction=True)
+        pipe.lrem(self._key('claimed', queue), 1, job_id)
+        pipe.hset(self._job_key(job_id), mapping={'status': 'pending', 'lease_expires_at': ''})
+        self._push_ready(pipe, job_id, queue, priority, front=True)
+        pipe.execute()
+
+    def _finish(self, job_id, mapping: Dict[str, Any], queue: Optional[str] = None, pipe=None):
+        """Take a job off the claimed list and its lease, updating its fields"""
+        queue = queue or self._client.hget(self._job_key(job_id), 'queue')
+        pipe = pipe or self._client.pipeline(transaction=True)
+        pipe.lrem(self._key('claimed', queue), 1, job_id)
+        pipe.zrem(self._key('leases', queue), job_id)
+        pipe.hset(self._job_key(job_id), mapping={**mapping, 'lease_expires_at': ''})
+        return pipe
+
+    def complete_jobs(self, job_ids: List[int], conn: Any = None):
+        if not job_ids:
+            return
+        reader = self._client.pipeline(transaction=False)
+        for job_id in job_ids:
+            reader.hget(self._job_key(job_id), 'queue')
+        queues = reader.execute()
+
+        completed_at = datetime.now().isoformat()
+        pipe = self._client.pipeline(transaction=True)
+        for job_id, queue in zip(job_ids, queues):
+            if queue is not None:
+                self._finish(job_id, {'status': 'completed', 'completed_at': completed_at}, queue, pipe)
+        pipe.execute()
+
+    def retry_later(self, job_id: int, attempts: int, scheduled_at: datetime, error: str,
+                    conn: Any = None):
+        queue = self._client.hget(self._job_key(job_id), 'queue')
+        if queue is None:
+            return
+        pipe = self._finish(job_id, {
+            'status': 'pending', 'attempts': attempts,
+            'scheduled_at': scheduled_at.isoformat(), 'error': error
+        }, queue)
+        pipe.zadd(self._key('delayed', queue), {job_id: scheduled_at.timestamp()})
+        pipe.execute()
+
+    def fail_job(self, job_id: int, error: str, attempts: Optional[int] = None, conn: Any = None):
+        mapping = {'status': 'failed', 'completed_at': datetime.now().isoformat(), 'error': error}
+        if attempts is not None:
+            mapping['attempts'] = attempts
+        if self._client.exists(self._job_key(job_id)):
+            self._finish(job_id, mapping).execute()
+
+    def renew_lease(self, job_id: int, lease_seconds: int, conn: Any = None) -> bool:
+        queue = self._client.hget(self._job_key(job_id), 'queue')
+        if queue is None:
+            return False
+        lease_expires_at = datetime.now() + timedelta(seconds=lease_seconds)
+        # xx: only jobs that still hold a lease
+        if not self._client.zadd(self._key('leases', queue), {job_id: lease_expires_at.timestamp()},
+                                 xx=True, ch=True):
+            return False
+        self._client.hset(self._job_key(job_id), 'lease_expires_at', lease_expires_at.isoformat())
+        return True
+
+    def requeue_job(self, job_id: int) -> bool:
+        queue = self._client.hget(self._job_key(job_id), 'queue')
+        if queue is None or not self._client.zrem(self._key('leases', queue), job_id):
+            return False
+        self._requeue(queue, job_id)
+        return True
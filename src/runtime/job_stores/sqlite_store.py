@@ -0,0 +1,362 @@
+"""
+SQLite Job Store
+
+Jobs live in the quantum_jobs table of a local database file.
+
+- A job is claimed with one UPDATE ... RETURNING (the write lock makes
+  it atomic); without RETURNING (SQLite < 3.35) under BEGIN IMMEDIATE.
+- The database runs in WAL mode: commits append to the log, and readers
+  (list_jobs, stats) do not block the workers' writes.
+- idx_quantum_jobs_claim covers the claim query.
+
+SQLite allows one writer at a time, so all workers must share one host.
+"""
+
+import json
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from runtime.job_store import JobInfo, JobSpec, JobStore, row_to_job_info
+from runtime.query_stream import json_default
+
+logger = logging.getLogger(__name__)
+
+
+# Register datetime adapters/converters for sqlite3 (Python 3.12+ compatibility)
+def _adapt_datetime(val: datetime) -> str:
+    """Convert datetime to ISO format string for SQLite storage."""
+    return val.isoformat()
+
+
+def _convert_datetime(val: bytes) -> datetime:
+    """Convert ISO format string from SQLite to datetime."""
+    return datetime.fromisoformat(val.decode())
+
+
+# Register the adapter and converter
+sqlite3.register_adapter(datetime, _adapt_datetime)
+sqlite3.register_converter("timestamp", _convert_datetime)
+
+
+class SQLiteJobStore(JobStore):
+    """Job store in a local SQLite database file."""
+
+    backend = 'sqlite'
+
+    CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS quantum_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        queue TEXT DEFAULT 'default',
+        params TEXT,
+        status TEXT DEFAULT 'pending',
+        priority INTEGER DEFAULT 0,
+        attempts INTEGER DEFAULT 0,
+        max_attempts INTEGER DEFAULT 3,
+        backoff_seconds INTEGER DEFAULT 30,
+        scheduled_at DATETIME,
+        started_at DATETIME,
+        completed_at DATETIME,
+        error TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        lease_expires_at DATETIME
+    );
+    CREATE INDEX IF NOT EXISTS idx_quantum_jobs_status ON quantum_jobs(status);
+    CREATE INDEX IF NOT EXISTS idx_quantum_jobs_queue ON quantum_jobs(queue);
+    CREATE INDEX IF NOT EXISTS idx_quantum_jobs_scheduled ON quantum_jobs(scheduled_at);
+    CREATE INDEX IF NOT EXISTS idx_quantum_jobs_claim
+        ON quantum_jobs(queue, status, priority DESC, created_at, scheduled_at);
+    """
+
+    INSERT_JOB_SQL = """
+    INSERT INTO quantum_jobs
+    (name, queue, params, priority, max_attempts, backoff_seconds, scheduled_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+
+    # The next due jobs, read in idx_quantum_jobs_claim order
+    NEXT_JOBS_SQL = """
+    FROM quantum_jobs
+    WHERE queue = ? AND status = 'pending'
+    AND (scheduled_at IS NULL OR scheduled_at <= ?)
+    ORDER BY priority DESC, created_at ASC
+    LIMIT ?
+    """
+
+    CLAIM_JOBS_SQL = f"""
+    UPDATE quantum_jobs
+    SET status = 'running', started_at = ?, lease_expires_at = ?
+    WHERE id IN (SELECT id {NEXT_JOBS_SQL})
+    RETURNING *
+    """
+
+    # Running jobs whose worker let the lease expire go back to pending
+    REQUEUE_EXPIRED_SQL = """
+    UPDATE quantum_jobs
+    SET status = 'pending', lease_expires_at = NULL
+    WHERE queue = ? AND status = 'running' AND lease_expires_at < ?
+    """
+
+    def __init__(self, db_path: str = "quantum_jobs.db"):
+        """
+        Args:
+            db_path: Path to SQLite database file
+        """
+        self.db_path = db_path
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize the database schema."""
+        conn = sqlite3.connect(
+            self.db_path,
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
+        )
+        try:
+            # Persistent: commits append to the write-ahead log, and readers
+            # (list_jobs, stats) no longer block the workers' writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.CREATE_TABLE_SQL)
+            # Databases created before job leases
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(quantum_jobs)")}
+            if 'lease_expires_at' not in columns:
+                conn.execute("ALTER TABLE quantum_jobs ADD COLUMN lease_expires_at DATETIME")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def connect(self) -> sqlite3.Connection:
+        """Get a database connection with datetime support."""
+        conn = sqlite3.connect(
+            self.db_path,
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
+        )
+        conn.row_factory = sqlite3.Row
+        # In WAL mode, NORMAL only syncs at checkpoints (a crash loses no
+        # committed job; power loss may lose the last commits)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def close_connection(self, conn: sqlite3.Connection):
+        conn.close()
+
+    def insert_jobs(self, jobs: List[JobSpec]) -> List[int]:
+        rows = [
+            (job.name, job.queue, json.dumps(job.params, default=json_default), job.priority, job.max_attempts,
+             job.backoff_seconds, job.scheduled_at)
+            for job in jobs
+        ]
+        if not rows:
+            return []
+
+        with self.connection() as conn:
+            try:
+                # Take the write lock first: the AUTOINCREMENT ids of the batch are consecutive
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(self.INSERT_JOB_SQL, rows)
+                last_id = conn.execute(
+                    "SELECT seq FROM sqlite_sequence WHERE name = 'quantum_jobs'"
+                ).fetchone()[0]
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+
+    def get_job(self, job_id: int) -> Optional[JobInfo]:
+        with self.connection() as conn:
+            row = conn.execute("SELECT * FROM quantum_jobs WHERE id = ?", (job_id,)).fetchone()
+            return row_to_job_info(row) if row else None
+
+    def list_jobs(self, queue: Optional[str] = None, status: Optional[str] = None,
+                  limit: int = 100) -> List[JobInfo]:
+        sql = "SELECT * FROM quantum_jobs WHERE 1=1"
+        params = []
+
+        if queue:
+            sql += " AND queue = ?"
+            params.append(queue)
+
+        if status:
+            sql += " AND status = ?"
+            params.append(status)
+
+        sql += " ORDER BY priority DESC, created_at ASC LIMIT ?"
+        params.append(limit)
+
+        with self.connection() as conn:
+            return [row_to_job_info(row) for row in conn.execute(sql, params).fetchall()]
+
+    def cancel_job(self, job_id: int) -> bool:
+        with self.connection() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE quantum_jobs
+                SET status = 'cancelled', completed_at = ?
+                WHERE id = ? AND status = 'pending'
+                """,
+                (datetime.now(), job_id)
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+
+    def retry_job(self, job_id: int) -> bool:
+        with self.connection() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE quantum_jobs
+                SET status = 'pending', attempts = 0, error = NULL,
+                    started_at = NULL, completed_at = NULL
+                WHERE id = ? AND status = 'failed'
+                """,
+                (job_id,)
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+
+    def purge_queue(self, queue: str, status: Optional[str] = None) -> int:
+        with self.connection() as conn:
+            if status:
+                cursor = conn.execute(
+                    "DELETE FROM quantum_jobs WHERE queue = ? AND status = ?",
+                    (queue, status)
+                )
+            else:
+                cursor = conn.execute(
+                    "DELETE FROM quantum_jobs WHERE queue = ? AND status != 'running'",
+                    (queue,)
+                )
+            conn.commit()
+            return cursor.rowcount
+
+    def queue_stats(self, queue: str) -> Dict[str, int]:
+        with self.connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT status, COUNT(*) as count
+                FROM quantum_jobs
+                WHERE queue = ?
+                GROUP BY status
+                """,
+                (queue,)
+            ).fetchall()
+
+        stats = {'pending': 0, 'running': 0, 'completed': 0, 'failed': 0}
+        for row in rows:
+            stats[row['status']] = row['count']
+        return stats
+
+    def claim_jobs(self, queue: str, limit: int, lease_seconds: int,
+                   max_running: Optional[int] = None,
+                   conn: Optional[sqlite3.Connection] = None) -> List[JobInfo]:
+        with self.connection(conn) as conn:
+            try:
+                jobs = self._claim(conn, queue, limit, lease_seconds, max_running)
+                if len(jobs) < limit:
+                    requeued = conn.execute(self.REQUEUE_EXPIRED_SQL, (queue, datetime.now())).rowcount
+                    conn.commit()
+                    if requeued:
+                        logger.warning(f"Requeued {requeued} job(s) with an expired lease in queue '{queue}'")
+                        jobs += self._claim(conn, queue, limit - len(jobs), lease_seconds, max_running)
+            except BaseException:
+                conn.rollback()
+                raise
+        return jobs
+
+    def _claim(self, conn: sqlite3.Connection, queue: str, limit: int, lease_seconds: int,
+               max_running: Optional[int]) -> List[JobInfo]:
+        now = datetime.now()
+        lease_expires_at = now + timedelta(seconds=lease_seconds)
+        if max_running is not None:
+            # The write lock keeps the count and the claim atomic
+            conn.execute("BEGIN IMMEDIATE")
+            running = conn.execute(
+                "SELECT COUNT(*) FROM quantum_jobs WHERE queue = ? AND status = 'running'", (queue,)
+            ).fetchone()[0]
+            limit = min(limit, max_running - running)
+            if limit <= 0:
+                conn.commit()
+                return []
+        if sqlite3.sqlite_version_info >= (3, 35, 0):
+            rows = conn.execute(self.CLAIM_JOBS_SQL, (now, lease_expires_at, queue, now, limit)).fetchall()
+        else:
+            # No RETURNING: the write lock keeps SELECT + UPDATE atomic
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(f"SELECT * {self.NEXT_JOBS_SQL}", (queue, now, limit)).fetchall()
+            conn.executemany(
+                "UPDATE quantum_jobs SET status = 'running', started_at = ?, lease_expires_at = ? WHERE id = ?",
+                [(now, lease_expires_at, row['id']) for row in rows]
+            )
+        conn.commit()
+
+        jobs = [row_to_job_info(row) for row in rows]
+        # RETURNING rows come back in no particular order
+        jobs.sort(key=lambda job: (-job.priority, job.created_at or datetime.min, job.id))
+        return jobs
+
+    def complete_jobs(self, job_ids: List[int], conn: Optional[sqlite3.Connection] = None):
+        if not job_ids:
+            return
+        completed_at = datetime.now()
+        with self.connection(conn) as conn:
+            conn.executemany(
+                """
+                UPDATE quantum_jobs
+                SET status = 'completed', completed_at = ?, lease_expires_at = NULL
+                WHERE id = ?
+                """,
+                [(completed_at, job_id) for job_id in job_ids]
+            )
+            conn.commit()
+
+    def retry_later(self, job_id: int, attempts: int, scheduled_at: datetime, error: str,
+                    conn: Optional[sqlite3.Connection] = None):
+        with self.connection(conn) as conn:
+            conn.execute(
+                """
+                UPDATE quantum_jobs
+                SET status = 'pending', attempts = ?, scheduled_at = ?, error = ?,
+                    lease_expires_at = NULL
+                WHERE id = ?
+                """,
+                (attempts, scheduled_at, error, job_id)
+            )
+            conn.commit()
+
+    def fail_job(self, job_id: int, error: str, attempts: Optional[int] = None,
+                 conn: Optional[sqlite3.Connection] = None):
+        with self.connection(conn) as conn:
+            conn.execute(
+                """
+                UPDATE quantum_jobs
+                SET status = 'failed', attempts = COALESCE(?, attempts), completed_at = ?, error = ?,
+                    lease_expires_at = NULL
+                WHERE id = ?
+                """,
+                (attempts, datetime.now(), error, job_id)
+            )
+            conn.commit()
+
+    def renew_lease(self, job_id: int, lease_seconds: int,
+                    conn: Optional[sqlite3.Connection] = None) -> bool:
+        with self.connection(conn) as conn:
+            cursor = conn.execute(
+                "UPDATE quantum_jobs SET lease_expires_at = ? WHERE id = ? AND status = 'running'",
+                (datetime.now() + timedelta(seconds=lease_seconds), job_id)
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+
+    def requeue_job(self, job_id: int) -> bool:
+        with self.connection() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE quantum_jobs SET status = 'pending', lease_expires_at = NULL
+                WHERE id = ? AND status = 'running'
+                """,
+                (job_id,)
+            )
+            conn.commit()
+            return cursor.rowcount > 0
@@ -0,0 +1,392 @@
+"""
+Job Worker Pool - run job handlers in supervised worker processes
+
+JobQueueService workers are threads, so CPU-bound handlers (reports, data
+transforms) take turns on the GIL. WorkerPool runs N worker processes
+against the same job store instead (SQLite by default; with a Redis or
+PostgreSQL store, pools on several nodes share the queues):
+
+- Each process imports the handler module, registers its handlers on its
+  own JobQueueService and claims one job at a time from its queues.
+- Per-queue limits ("reports:2") cap the running jobs of a queue across
+  all processes: the claim counts running jobs under the write lock.
+- A heartbeat thread renews the lease of the running job, so a short
+  lease still covers long jobs.
+- The supervisor restarts workers that die. The job a dead worker was
+  running counts as a failed attempt (retried with backoff); if the
+  supervisor dies too, the job is requeued once its lease expires.
+- SIGTERM (or Ctrl+C) drains the pool: workers finish their current job
+  and exit; workers still busy after drain_timeout are killed and their
+  jobs requeued.
+- stats() reports completed/failed jobs, busy time and throughput per worker.
+
+Usage:
+    # myapp/jobs.py
+    def register_jobs(queue):
+        queue.register_handler('build-report', build_report)
+
+    pool = WorkerPool('myapp.jobs', processes=4, queues='reports:2,default')
+    pool.run()  # Until SIGTERM
+
+    quantum jobs work --processes 4 --queue reports:2,default --handlers myapp.jobs
+"""
+
+import importlib
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from runtime.job_executor import JobQueueError, JobQueueService, parse_duration
+from runtime.job_stores import create_job_store
+
+logger = logging.getLogger(__name__)
+
+
+# Per-worker counters in the shared metrics array
+METRICS = ('completed', 'failed', 'busy_seconds')
+_COMPLETED, _FAILED, _BUSY = range(len(METRICS))
+
+# How often the supervisor checks on its workers
+MONITOR_INTERVAL = 0.2
+# Shortest time between two starts of the same worker (crash loops)
+RESTART_DELAY = 1.0
+
+
+def parse_queue_limits(spec: str) -> Dict[str, Optional[int]]:
+    """
+    Parse a queue list with optional concurrency limits
+
+    "reports:2,default" -> {'reports': 2, 'default': None}
+
+    Raises:
+        JobQueueError: If a limit is not a positive integer
+    """
+    limits: Dict[str, Optional[int]] = {}
+    for item in spec.split(','):
+        name, _, limit = item.strip().partition(':')
+        if not name:
+            continue
+        if not limit:
+            limits[name] = None
+            continue
+        if not limit.isdigit() or int(limit) < 1:
+            raise JobQueueError(f"Invalid concurrency limit for queue '{name}': {limit}")
+        limits[name] = int(limit)
+    if not limits:
+        raise JobQueueError(f"No queues in '{spec}'")
+    return limits
+
+
+def resolve_setup(setup: Union[str, Callable]) -> Callable:
+    """
+    The function that registers job handlers on a worker's JobQueueService
+
+    Args:
+        setup: Module name (its register_jobs function is used) or a
+               module-level function, so that worker processes can import it
+
+    Raises:
+        JobQueueError: If the module has no register_jobs function
+    """
+    if callable(setup):
+        return setup
+    module = importlib.import_module(setup)
+    register_jobs = getattr(module, 'register_jobs', None)
+    if not callable(register_jobs):
+        raise JobQueueError(f"Module '{setup}' has no register_jobs(queue) function")
+    return register_jobs
+
+
+@dataclass
+class WorkerStats:
+    """Throughput of one worker slot (counters survive restarts)"""
+    worker: int
+    pid: Optional[int]
+    alive: bool
+    restarts: int
+    completed: int
+    failed: int
+    busy_seconds: float
+    uptime: float
+
+    @property
+    def jobs_per_second(self) -> float:
+        return self.completed / self.uptime if self.uptime else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Share of the uptime spent running jobs"""
+        return min(1.0, self.busy_seconds / self.uptime) if self.uptime else 0.0
+
+
+def _worker_main(slot: int, db_path: str, store: Optional[Dict[str, Any]],
+                 queue_limits: Dict[str, Optional[int]], setup, poll_interval: float, lease: str,
+                 stop_event, metrics, current_jobs, parent_pid: int):
+    """Worker process: claim and run one job at a time until the pool drains"""
+    draining = []
+    # Ctrl+C reaches the whole process group; the supervisor decides when to drain
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Only set a flag: the handler may interrupt code holding stop_event's lock
+    signal.signal(signal.SIGTERM, lambda signum, frame: draining.append(signum))
+
+    service = JobQueueService(lease=lease, store=create_job_store(store, db_path))
+    resolve_setup(setup)(service)
+
+    exiting = threading.Event()
+    heartbeat = threading.Thread(
+        target=_renew_leases,
+        args=(service, slot, current_jobs, exiting, max(1.0, parse_duration(lease) / 3)),
+        name='quantum-job-heartbeat', daemon=True
+    )
+    heartbeat.start()
+
+    queues = list(queue_limits)
+    base = slot * len(METRICS)
+    turn = slot
+    conn = service.connect()
+    try:
+        # Stop as well when the supervisor is gone (killed without a drain)
+        while not draining and not stop_event.is_set() and os.getppid() == parent_pid:
+            job = None
+            for offset in range(len(queues)):
+                queue = queues[(turn + offset) % len(queues)]
+                try:
+                    jobs = service.claim_jobs(queue, 1, conn, max_running=queue_limits[queue])
+                except Exception as e:
+                    logger.error(f"Worker {slot} error: {e}")
+                    continue
+                if jobs:
+                    job = jobs[0]
+                    break
+
+            if job is None:
+                stop_event.wait(poll_interval)
+                continue
+
+            # Start the next search at the following queue
+            turn += 1
+            current_jobs[slot] = job.id
+            started = time.perf_counter()
+            succeeded = service.process_job(job, conn)
+            metrics[base + _BUSY] += time.perf_counter() - started
+            metrics[base + (_COMPLETED if succeeded else _FAILED)] += 1
+            current_jobs[slot] = 0
+    finally:
+        exiting.set()
+        service.close_connection(conn)
+        service.store.close()
+
+
+def _renew_leases(service: JobQueueService, slot: int, current_jobs, exiting: threading.Event,
+                  interval: float):
+    """Heartbeat thread of a worker process: keep the running job's lease alive"""
+    while not exiting.wait(interval):
+        job_id = current_jobs[slot]
+        if job_id:
+            try:
+                service.renew_lease(job_id)
+            except Exception as e:
+                logger.warning(f"Could not renew lease of job {job_id}: {e}")
+
+
+class WorkerPool:
+    """
+    Supervised pool of job worker processes sharing one job store.
+
+    Workers are started with the 'spawn' method by default, so handlers
+    must be importable: pass a module name (with a register_jobs(queue)
+    function) or a module-level function as setup.
+    """
+
+    def __init__(
+        self,
+        setup: Union[str, Callable],
+        db_path: str = "quantum_jobs.db",
+        store: Optional[Dict[str, Any]] = None,
+        processes: Optional[int] = None,
+        queues: Union[str, Dict[str, Optional[int]]] = 'default',
+        poll_interval: float = 1.0,
+        lease: str = '1m',
+        drain_timeout: float = 30.0,
+        stats_interval: float = 0,
+        start_method: str = 'spawn'
+    ):
+        """
+        Initialize the pool (no process is started yet).
+
+        Args:
+            setup: Handler module name or function, see resolve_setup()
+            db_path: Path to the job queue database (SQLite store)
+            store: Job store config, see create_job_store() (each process
+                   builds its own store from it)
+            processes: Number of worker processes (default: CPU count)
+            queues: Queues to process, "reports:2,default" or a dict of
+                    queue -> limit on its running jobs (None = no limit)
+            poll_interval: Idle wait between checks for new jobs
+            lease: Lease of a claimed job, renewed while it runs; how long
+                   a job may stay claimed after its whole pool died
+            drain_timeout: Seconds workers get to finish their jobs on stop()
+            stats_interval: Log per-worker throughput this often (0 = never)
+            start_method: multiprocessing start method
+
+        Raises:
+            JobQueueError: On invalid queues or setup
+        """
+        resolve_setup(setup)  # Fail here rather than in every worker
+        self.setup = setup
+        self.db_path = db_path
+        self.store = store
+        self.processes = max(1, processes or os.cpu_count() or 1)
+        self.queue_limits = parse_queue_limits(queues) if isinstance(queues, str) else dict(queues)
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.drain_timeout = drain_timeout
+        self.stats_interval = stats_interval
+
+        # Used to give up the jobs of dead workers (also creates the schema)
+        self._service = JobQueueService(lease=lease, store=create_job_store(store, db_path))
+        self.backend = self._service.store.backend
+        self._context = multiprocessing.get_context(start_method)
+        self._stop_event = self._context.Event()
+        # Written by one worker each, read by the supervisor
+        self._metrics = self._context.Array('d', self.processes * len(METRICS), lock=False)
+        self._current_jobs = self._context.Array('q', self.processes, lock=False)
+        self._workers: List[Optional[multiprocessing.process.BaseProcess]] = [None] * self.processes
+        self._spawned_at = [0.0] * self.processes
+        self._restart_at: List[Optional[float]] = [None] * self.processes
+        self._restarts = [0] * self.processes
+        self._started_at: Optional[float] = None
+        self._draining = False
+
+    def start(self):
+        """Start all worker processes"""
+        self._started_at = time.monotonic()
+        for slot in range(self.processes):
+            self._spawn(slot)
+        logger.info(
+            f"Started {self.processes} worker process(es) for queue(s) "
+            f"{', '.join(self.queue_limits)}"
+        )
+
+    def _spawn(self, slot: int):
+        worker = self._context.Process(
+            target=_worker_main,
+            args=(slot, self.db_path, self.store, self.queue_limits, self.setup, self.poll_interval,
+                  self.lease, self._stop_event, self._metrics, self._current_jobs, os.getpid()),
+            name=f"quantum-job-worker-{slot}"
+        )
+        worker.start()
+        self._workers[slot] = worker
+        self._spawned_at[slot] = time.monotonic()
+
+    def check_workers(self):
+        """Release the jobs of dead workers and restart them"""
+        for slot, worker in enumerate(self._workers):
+            if worker is None or worker.exitcode is None or self._draining:
+                continue
+            if self._restart_at[slot] is None:
+                job_id = self._release(slot, f"Worker process exited with code {worker.exitcode}")
+                if job_id:
+                    logger.error(f"Worker {slot} (pid {worker.pid}) died running job {job_id}")
+                else:
+                    logger.error(f"Worker {slot} (pid {worker.pid}) exited with code {worker.exitcode}")
+                # Restarting at once would spin on workers that die on startup
+                self._restart_at[slot] = self._spawned_at[slot] + RESTART_DELAY
+            if time.monotonic() >= self._restart_at[slot]:
+                self._restart_at[slot] = None
+                self._restarts[slot] += 1
+                self._spawn(slot)
+
+    def _release(self, slot: int, error: Optional[str]) -> int:
+        """Give up the job a dead worker was running; returns its id (0 if none)"""
+        job_id = self._current_jobs[slot]
+        if job_id:
+            self._current_jobs[slot] = 0
+            self._service.release_job(job_id, error)
+        return job_id
+
+    def run(self) -> List[WorkerStats]:
+        """
+        Start the pool and supervise it until SIGTERM or Ctrl+C, then drain
+
+        Returns:
+            Final per-worker stats
+        """
+        previous_handler = None
+        if threading.current_thread() is threading.main_thread():
+            previous_handler = signal.signal(signal.SIGTERM, self._on_sigterm)
+        try:
+            self.start()
+            last_report = time.monotonic()
+            while not self._draining:
+                self.check_workers()
+                if self.stats_interval and time.monotonic() - last_report >= self.stats_interval:
+                    self.log_stats()
+                    last_report = time.monotonic()
+                time.sleep(MONITOR_INTERVAL)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+            if previous_handler is not None:
+                signal.signal(signal.SIGTERM, previous_handler)
+        return self.stats()
+
+    def _on_sigterm(self, signum, frame):
+        self._draining = True
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Drain the pool: workers finish their current job, then exit
+
+        Args:
+            timeout: Seconds to wait before killing busy workers
+                     (default: drain_timeout); their jobs are requeued
+        """
+        self._draining = True
+        self._stop_event.set()
+        deadline = time.monotonic() + (self.drain_timeout if timeout is None else timeout)
+        for slot, worker in enumerate(self._workers):
+            if worker is None:
+                continue
+            worker.join(max(0.0, deadline - time.monotonic()))
+            if worker.exitcode is None:
+                logger.warning(f"Worker {slot} (pid {worker.pid}) did not drain in time, killing it")
+                worker.kill()
+                worker.join()
+                self._release(slot, None)
+            elif worker.exitcode != 0:
+                self._release(slot, f"Worker process exited with code {worker.exitcode}")
+        logger.info("Job worker pool stopped")
+
+    def stats(self) -> List[WorkerStats]:
+        """Per-worker throughput since start()"""
+        uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+        stats = []
+        for slot, worker in enumerate(self._workers):
+            base = slot * len(METRICS)
+            stats.append(WorkerStats(
+                worker=slot,
+                pid=worker.pid if worker else None,
+                alive=bool(worker and worker.is_alive()),
+                restarts=self._restarts[slot],
+                completed=int(self._metrics[base + _COMPLETED]),
+                failed=int(self._metrics[base + _FAILED]),
+                busy_seconds=self._metrics[base + _BUSY],
+                uptime=uptime
+            ))
+        return stats
+
+    def log_stats(self):
+        """Log one throughput line per worker"""
+        for stat in self.stats():
+            logger.info(
+                f"Worker {stat.worker} (pid {stat.pid}): {stat.completed} completed, "
+                f"{stat.failed} failed, {stat.jobs_per_second:.2f} jobs/s, "
+                f"{stat.utilization:.0%} busy, {stat.restarts} restart(s)"
+            )
@@ -19,6 +19,8 @@ import uuid
 import time
 import json
 
+from runtime.query_stream import json_default
+
 
 class MessageBrokerError(Exception):
     """Base exception for message broker errors"""
@@ -98,7 +100,7 @@ class Message:
 
     def to_json(self) -> str:
         """Serialize message to JSON string"""
-        return json.dumps(self.to_dict())
+        return json.dumps(self.to_dict(), default=json_default)
 
     @classmethod
     def from_json(cls, json_str: str) -> 'Message':
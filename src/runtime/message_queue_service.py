@@ -11,6 +11,7 @@ from typing import Dict, Any, Optional, List, Callable
 from dataclasses import dataclass
 
 from runtime.message_broker import Message, QueueInfo, MessageBrokerError
+from runtime.query_stream import json_default
 from runtime.adapters import get_adapter, MemoryAdapter
 
 
@@ -154,7 +155,7 @@ class MessageQueueService:
         try:
             # Serialize body if needed
             if not isinstance(body, str):
-                body = json.dumps(body)
+                body = json.dumps(body, default=json_default)
 
             message = Message(
                 topic=topic,
@@ -196,7 +197,7 @@ class MessageQueueService:
 
         try:
             if not isinstance(body, str):
-                body = json.dumps(body)
+                body = json.dumps(body, default=json_default)
 
             message = Message(
                 queue=queue,
@@ -240,7 +241,7 @@ class MessageQueueService:
 
         try:
             if not isinstance(body, str):
-                body = json.dumps(body)
+                body = json.dumps(body, default=json_default)
 
             message = Message(
                 queue=queue,
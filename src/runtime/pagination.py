@@ -0,0 +1,327 @@
+"""
+Pagination - q:query paginate="true" strategies
+
+- count (default): a COUNT(*) query for the total, then the page with
+  LIMIT/OFFSET. countCache="5m" keeps the total in the query cache.
+- window: one query; COUNT(*) OVER() is added to the select list so the
+  total comes back with the page (PostgreSQL, MySQL 8, SQLite 3.25+).
+  Statements it cannot rewrite (DISTINCT, UNION, WITH, no FROM) and
+  databases without window functions fall back to count.
+- keyset: seek pagination on the orderBy columns. Pages are addressed by
+  cursor tokens (pagination.nextCursor / previousCursor) instead of page
+  numbers, so deep pages cost the same as the first one. No total is
+  computed. The last orderBy column must be unique: a non-unique sort
+  column needs the primary key as tie-breaker (orderBy="created_at, id"),
+  or rows sharing a value across a page boundary are skipped.
+
+Usage:
+    <q:query name="orders" datasource="db" paginate="true" pageSize="50"
+             pagination="keyset" orderBy="created_at DESC, id" cursor="{url.cursor}">
+        SELECT id, total FROM orders
+    </q:query>
+"""
+
+import base64
+import json
+import re
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from runtime.query_stream import Row, column_index
+
+
+PAGINATION_STRATEGIES = ('count', 'window', 'keyset')
+
+# Extra column carrying COUNT(*) OVER() in window mode (removed from results)
+TOTAL_COUNT_COLUMN = '_quantum_total_count'
+
+# Bind name prefix of the keyset cursor values (one per orderBy column)
+CURSOR_PARAM = '_quantum_cursor'
+
+_TOP_LEVEL_TOKENS = re.compile(
+    r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`|--[^\n]*|/\*.*?\*/|[()]"""
+    r"""|\b(?:select|distinct|from|union|intersect|except|with)\b""",
+    re.IGNORECASE | re.DOTALL
+)
+_ORDER_BY_PATTERN = re.compile(r'^\s*([A-Za-z_]\w*)(?:\s+(asc|desc))?\s*$', re.IGNORECASE)
+
+
+def page_metadata(total_records: int, page: int, page_size: int, strategy: str = 'count') -> Dict[str, Any]:
+    """Pagination metadata for page-number strategies (count, window)"""
+    total_pages = (total_records + page_size - 1) // page_size  # Ceiling division
+    offset = (page - 1) * page_size
+    return {
+        'strategy': strategy,
+        'totalRecords': total_records,
+        'totalPages': total_pages,
+        'currentPage': page,
+        'pageSize': page_size,
+        'hasNextPage': page < total_pages,
+        'hasPreviousPage': page > 1,
+        'startRecord': offset + 1 if total_records > 0 else 0,
+        'endRecord': min(offset + page_size, total_records)
+    }
+
+
+def window_count_sql(sql: str) -> Optional[str]:
+    """
+    Add COUNT(*) OVER() to the select list of a plain SELECT
+
+    Returns:
+        Rewritten SQL, or None if the statement is not a single SELECT ... FROM
+        (DISTINCT would count duplicates, UNION/WITH have no single select list)
+    """
+    depth = 0
+    seen_select = False
+    from_position = None
+    for match in _TOP_LEVEL_TOKENS.finditer(sql):
+        token = match.group(0)
+        if token == '(':
+            depth += 1
+            continue
+        if token == ')':
+            depth -= 1
+            continue
+        if depth or not token[0].isalpha():
+            continue
+
+        keyword = token.lower()
+        if not seen_select:
+            if keyword != 'select':
+                return None
+            seen_select = True
+        elif keyword == 'distinct':
+            if not sql[:match.start()].rstrip().lower().endswith('select'):
+                continue
+            return None
+        elif keyword in ('union', 'intersect', 'except', 'with', 'select'):
+            return None
+        elif keyword == 'from' and from_position is None:
+            from_position = match.start()
+
+    if from_position is None:
+        return None
+    head = sql[:from_position].rstrip()
+    return f"{head}, COUNT(*) OVER() AS {TOTAL_COUNT_COLUMN}\n{sql[from_position:]}"
+
+
+def split_total_column(result) -> Tuple[Any, Optional[int]]:
+    """Remove the window count column; returns (result, total or None if no rows)"""
+    columns = list(result.column_list)
+    if not columns or columns[-1] != TOTAL_COUNT_COLUMN:
+        return result, None
+
+    total = result.data[0][TOTAL_COUNT_COLUMN] if result.data else None
+    index = column_index(columns[:-1])
+    data = [Row(index, tuple(row.values_tuple()[:-1])) for row in result.data]
+    return replace(result, data=data, column_list=columns[:-1]), total
+
+
+def encode_cursor(value: Any, direction: str) -> str:
+    """Opaque keyset cursor token for a boundary value"""
+    payload = json.dumps([direction, value], default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: Optional[str]) -> Optional[Tuple[str, Any]]:
+    """(direction, value) of a cursor token; None for a missing or invalid token"""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        direction, value = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+    if direction not in ('next', 'prev'):
+        return None
+    return direction, value
+
+
+def parse_order_by(order_by: Optional[str]) -> Tuple[List[str], bool]:
+    """
+    Keyset columns and direction from orderBy ("id", "created_at DESC, id")
+
+    The seek compares all columns as one row value, so they share one
+    direction: columns without ASC/DESC follow the first column.
+
+    Raises:
+        ValueError: If orderBy is missing, not a list of column names, or
+                    mixes directions
+    """
+    columns = []
+    directions = set()
+    for item in (order_by or '').split(','):
+        match = _ORDER_BY_PATTERN.match(item)
+        if not match:
+            raise ValueError("Keyset pagination requires orderBy with column names, the last one "
+                             "unique (e.g. orderBy=\"id\" or orderBy=\"created_at DESC, id\")")
+        columns.append(match.group(1))
+        if match.group(2):
+            directions.add(match.group(2).lower())
+        elif not directions:
+            directions.add('asc')
+    if len(directions) > 1:
+        raise ValueError("Keyset orderBy columns must all be ASC or all be DESC")
+    return columns, directions == {'desc'}
+
+
+def keyset_sql(sql: str, columns: List[str], descending: bool, direction: Optional[str], limit: int) -> str:
+    """Seek query: rows after (or before) the cursor row value, in orderBy order"""
+    # Walking backwards reads the previous page in reverse order
+    backwards = direction == 'prev'
+    ascending = descending == backwards
+    where = ''
+    if direction is not None:
+        names = [f":{CURSOR_PARAM}_{i}" for i in range(len(columns))]
+        if len(columns) == 1:
+            key, values = columns[0], names[0]
+        else:
+            key, values = f"({', '.join(columns)})", f"({', '.join(names)})"
+        where = f" WHERE {key} {'>' if ascending else '<'} {values}"
+    order = 'ASC' if ascending else 'DESC'
+    order_by = ', '.join(f"{column} {order}" for column in columns)
+    inner = sql.strip().rstrip(';')
+    return f"SELECT * FROM ({inner}) AS keyset_page{where} ORDER BY {order_by} LIMIT {limit}"
+
+
+def _cursor_values(value: Any, count: int) -> Optional[List[Any]]:
+    """Cursor value as one value per orderBy column (None if it doesn't fit)"""
+    if count == 1:
+        return [value]
+    if isinstance(value, list) and len(value) == count:
+        return value
+    return None
+
+
+def _row_key(row, columns: List[str]) -> Any:
+    """Cursor value of a boundary row (a list for several orderBy columns)"""
+    if len(columns) == 1:
+        return row[columns[0]]
+    return [row[column] for column in columns]
+
+
+def execute_window_page(execute: Callable, count: Callable[[], int], datasource: str, sql: str,
+                        params: Dict[str, Any], page: int, page_size: int,
+                        query_options: Dict[str, Any]):
+    """
+    Run a page with its total in one query (COUNT(*) OVER())
+
+    Args:
+        execute: DatabaseService.execute_query
+        count: Fallback returning the total (pages past the end have no rows)
+
+    Returns:
+        (QueryResult, pagination metadata), or None if the SQL can't be rewritten
+    """
+    windowed = window_count_sql(sql)
+    if windowed is None:
+        return None
+
+    offset = (page - 1) * page_size
+    result = execute(datasource, f"{windowed}\nLIMIT {page_size} OFFSET {offset}", params, **query_options)
+    result, total = split_total_column(result)
+    if total is None:
+        total = count() if page > 1 else 0
+    return result, page_metadata(total, page, page_size, strategy='window')
+
+
+def execute_keyset_page(execute: Callable, datasource: str, sql: str, params: Dict[str, Any],
+                        order_by: Optional[str], cursor: Optional[str], page_size: int,
+                        query_options: Dict[str, Any]):
+    """
+    Run one keyset page
+
+    Returns:
+        (QueryResult, pagination metadata with nextCursor/previousCursor)
+    """
+    columns, descending = parse_order_by(order_by)
+    decoded = decode_cursor(cursor)
+    values = _cursor_values(decoded[1], len(columns)) if decoded else None
+    if values is None:
+        decoded = None
+    direction = decoded[0] if decoded else None
+
+    page_params = dict(params)
+    if direction is not None:
+        for i, value in enumerate(values):
+            page_params[f"{CURSOR_PARAM}_{i}"] = value
+
+    # One extra row tells whether there is another page in this direction
+    result = execute(datasource, keyset_sql(sql, columns, descending, direction, page_size + 1),
+                     page_params, **query_options)
+    data = list(result.data)
+    more = len(data) > page_size
+    data = data[:page_size]
+    if direction == 'prev':
+        data.reverse()
+        has_next, has_previous = True, more
+    else:
+        has_next, has_previous = more, direction is not None
+
+    missing = [column for column in columns if data and column not in data[0]]
+    if missing:
+        raise ValueError(f"Keyset pagination column '{missing[0]}' must be in the select list")
+
+    result = replace(result, data=data, record_count=len(data), has_more=has_next)
+    metadata = {
+        'strategy': 'keyset',
+        'totalRecords': None,
+        'totalPages': None,
+        'currentPage': None,
+        'pageSize': page_size,
+        'hasNextPage': has_next and bool(data),
+        'hasPreviousPage': has_previous and bool(data),
+        'cursor': cursor if decoded else None,
+        'nextCursor': encode_cursor(_row_key(data[-1], columns), 'next') if has_next and data else None,
+        'previousCursor': encode_cursor(_row_key(data[0], columns), 'prev') if has_previous and data else None,
+    }
+    return result, metadata
+
+
+def paginate_query(execute: Callable, datasource: str, sql: str, params: Dict[str, Any],
+                   count_sql: str, strategy: str = 'count', page: Optional[int] = None,
+                   page_size: int = 20, order_by: Optional[str] = None, cursor: Optional[str] = None,
+                   query_options: Optional[Dict[str, Any]] = None,
+                   count_options: Optional[Dict[str, Any]] = None,
+                   window_functions: bool = True):
+    """
+    Paginate a q:query with the requested strategy
+
+    Args:
+        execute: DatabaseService.execute_query
+        count_sql: COUNT(*) statement for the count strategy (and window fallback)
+        strategy: 'count', 'window' or 'keyset'
+        query_options: execute_query options of the page query (cache_ttl, max_rows)
+        count_options: execute_query options of the count query (cache_ttl)
+        window_functions: Whether the datasource supports COUNT(*) OVER()
+
+    Returns:
+        (result, metadata, sql): result is None when the caller still has to
+        run sql (count strategy), otherwise the page already fetched
+
+    Raises:
+        ValueError: For an unknown strategy or a keyset query without orderBy
+    """
+    if strategy not in PAGINATION_STRATEGIES:
+        raise ValueError(f"Unknown pagination strategy '{strategy}' (use {', '.join(PAGINATION_STRATEGIES)})")
+    page = page if page is not None else 1
+    query_options = query_options or {}
+
+    def count_total() -> int:
+        count_result = execute(datasource, count_sql, params, **(count_options or {}))
+        return count_result.data[0]['count'] if count_result.data else 0
+
+    if strategy == 'keyset':
+        result, metadata = execute_keyset_page(execute, datasource, sql, params, order_by, cursor,
+                                               page_size, query_options)
+        return result, metadata, sql
+
+    if strategy == 'window' and window_functions:
+        paged = execute_window_page(execute, count_total, datasource, sql, params, page, page_size,
+                                    query_options)
+        if paged is not None:
+            return paged[0], paged[1], sql
+
+    offset = (page - 1) * page_size
+    metadata = page_metadata(count_total(), page, page_size)
+    return None, metadata, f"{sql}\nLIMIT {page_size} OFFSET {offset}"
@@ -22,6 +22,9 @@ Usage in q:python blocks:
 
         # Logging
         q.info('Processing complete')
+
+        # Cancellation (inside q:thread)
+        q.check_cancelled()
     </q:python>
 """
 
@@ -606,7 +609,8 @@ class QuantumBridge:
 
     def json(self, data: Any) -> str:
         """Convert to JSON string."""
-        return json.dumps(data, default=str)
+        from runtime.query_stream import json_default
+        return json.dumps(data, default=json_default)
 
     def parse_json(self, json_str: str) -> Any:
         """Parse JSON string."""
@@ -628,8 +632,43 @@ class QuantumBridge:
         return str(uuid.uuid4())
 
     def sleep(self, seconds: float) -> None:
-        """Sleep for specified seconds."""
-        time.sleep(seconds)
+        """Sleep for specified seconds (cut short when the running q:thread is cancelled)."""
+        from runtime.job_executor import current_cancellation_token
+        token = current_cancellation_token()
+        if token is None:
+            time.sleep(seconds)
+        elif token.wait(seconds):
+            token.raise_if_cancelled()
+
+    # =========================================================================
+    # Cancellation (q:thread)
+    # =========================================================================
+
+    def is_cancelled(self) -> bool:
+        """
+        Check whether the q:thread running this code was terminated or timed out.
+
+        Usage:
+            for item in items:
+                if q.is_cancelled():
+                    break
+                process(item)
+        """
+        from runtime.job_executor import current_cancellation_token
+        token = current_cancellation_token()
+        return token is not None and token.cancelled
+
+    def check_cancelled(self) -> None:
+        """
+        Stop here if the q:thread running this code was terminated or timed out.
+
+        Raises:
+            ThreadCancelledError: If the thread was cancelled
+        """
+        from runtime.job_executor import current_cancellation_token
+        token = current_cancellation_token()
+        if token is not None:
+            token.raise_if_cancelled()
 
     # =========================================================================
     # Convenience methods
@@ -0,0 +1,534 @@
+"""
+Query Cache - Bounded, shared cache for q:query results
+
+DatabaseService stores SELECT results here when a q:query declares
+cache="true" (or a duration like cache="5m") / ttl="60".
+
+Features:
+- LRU eviction bounded by entry count and an estimated byte budget
+- Per-entry TTL; expired entries are purged eagerly through an expiry heap
+- Keys from a normalized SQL fingerprint (comments and whitespace removed)
+  plus datasource, parameters and maxrows
+- Table tags: a write query touching a table drops every cached result
+  that read from it (same datasource)
+- Pluggable backend: in-process memory (default) or Redis, configured with
+  the same host/port/db/password/prefix settings as adapters/redis_adapter
+
+Usage:
+    cache = QueryCache(max_entries=1000, max_memory_mb=64)
+    key = query_cache_key('db', sql, params)
+    result = cache.get(key)
+    if result is None:
+        result = run(sql)
+        cache.put(key, result, ttl=300, tags=table_tags('db', sql))
+    cache.invalidate_tables('db', ['users'])
+"""
+
+import hashlib
+import heapq
+import logging
+import os
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+# Footprint assumed for a row / a value whose size is not cheap to compute
+ROW_OVERHEAD = 64
+VALUE_OVERHEAD = 24
+
+# TTL of cache="true" without a ttl attribute (seconds)
+DEFAULT_TTL = 300
+
+# Lifetime of Redis tag sets (refreshed on every store)
+REDIS_TAG_TTL = 7 * 86400
+
+# Statements that modify data (or schema) and therefore invalidate tags
+WRITE_KEYWORDS = frozenset({
+    'insert', 'update', 'delete', 'replace', 'merge', 'upsert',
+    'truncate', 'drop', 'alter', 'create',
+})
+
+_COMMENT_PATTERN = re.compile(r'--[^\n]*|/\*.*?\*/', re.DOTALL)
+_TOKEN_PATTERN = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\s+|[^'\"\s]+")
+_TABLE_PATTERN = re.compile(
+    r'\b(?:from|join|into|update|table)\s+(?:if\s+(?:not\s+)?exists\s+)?'
+    r'([`"\[]?[\w.]+[`"\]]?)',
+    re.IGNORECASE
+)
+_FIRST_WORD_PATTERN = re.compile(r'^\W*(\w+)')
+
+
+# ==============================================================================
+# SQL fingerprinting
+# ==============================================================================
+
+def normalize_sql(sql: str) -> str:
+    """
+    Normalize SQL for cache keys: strip comments, collapse whitespace and
+    lowercase everything outside string literals.
+    """
+    sql = _COMMENT_PATTERN.sub(' ', sql)
+    parts = []
+    for token in _TOKEN_PATTERN.findall(sql):
+        if token[0] in '\'"':
+            parts.append(token)
+        elif token.isspace():
+            parts.append(' ')
+        else:
+            parts.append(token.lower())
+    return ''.join(parts).strip().rstrip(';').strip()
+
+
+def sql_fingerprint(sql: str) -> str:
+    """Stable digest of the normalized SQL text"""
+    return hashlib.sha1(normalize_sql(sql).encode()).hexdigest()
+
+
+def query_cache_key(
+    datasource: str,
+    sql: str,
+    params: Optional[Dict[str, Any]] = None,
+    max_rows: Optional[int] = None
+) -> str:
+    """Cache key for a query: datasource + SQL fingerprint + params + maxrows"""
+    params_repr = repr(sorted((params or {}).items()))
+    key = f"{datasource}\x00{sql_fingerprint(sql)}\x00{params_repr}\x00{max_rows}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def parse_duration(value: str) -> int:
+    """Parse a duration like '30s', '5m', '1h', '1d' or '60' into seconds"""
+    value = str(value).lower().strip()
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    if value and value[-1] in units:
+        return int(value[:-1]) * units[value[-1]]
+    return int(value)  # Assume seconds
+
+
+def resolve_cache_ttl(cache: Any, ttl: Any = None) -> int:
+    """
+    Cache TTL in seconds for the q:query cache/ttl attributes
+
+    Args:
+        cache: cache attribute (True/False or a duration like '5m')
+        ttl: ttl attribute (seconds or a duration), overrides the cache duration
+
+    Returns:
+        TTL in seconds (0 = do not cache, also for unparseable durations)
+    """
+    if not cache or str(cache).lower() == 'false':
+        return 0
+    try:
+        if ttl:
+            return parse_duration(ttl)
+        if cache is True or str(cache).lower() == 'true':
+            return DEFAULT_TTL
+        return parse_duration(cache)
+    except ValueError:
+        return 0
+
+
+def is_write_query(sql: str) -> bool:
+    """True if the statement modifies data or schema"""
+    match = _FIRST_WORD_PATTERN.match(_COMMENT_PATTERN.sub(' ', sql))
+    if not match:
+        return False
+    word = match.group(1).lower()
+    if word == 'with':
+        # CTE: writable if any write keyword follows the WITH clauses
+        words = set(re.findall(r'\w+', normalize_sql(sql)))
+        return bool(words & {'insert', 'update', 'delete', 'merge'})
+    return word in WRITE_KEYWORDS
+
+
+def referenced_tables(sql: str) -> Set[str]:
+    """Table names read or written by a statement (lowercased, unquoted)"""
+    tables = set()
+    for name in _TABLE_PATTERN.findall(_COMMENT_PATTERN.sub(' ', sql)):
+        name = name.strip('`"[]').lower()
+        if name and name != 'select':
+            # schema.table invalidates as table too
+            tables.add(name)
+            tables.add(name.rsplit('.', 1)[-1])
+    return tables
+
+
+def table_tags(datasource: str, sql: str) -> Set[str]:
+    """Tags for a cached query: one per referenced table"""
+    return {table_tag(datasource, table) for table in referenced_tables(sql)}
+
+
+def table_tag(datasource: str, table: str) -> str:
+    """Tag identifying one table of one datasource"""
+    return f"{datasource}:{table.lower()}"
+
+
+def estimate_result_size(result: Any) -> int:
+    """
+    Cheap structural size estimate of a QueryResult (strings/bytes by length,
+    everything else a flat per-value cost).
+    """
+    rows = getattr(result, 'data', None) or []
+    total = ROW_OVERHEAD * (len(rows) + 1)
+    for row in rows:
+        # Row and dict rows iterate over their column names
+        values = row.values() if isinstance(row, Mapping) else row
+        for value in values:
+            if isinstance(value, (str, bytes, bytearray)):
+                total += VALUE_OVERHEAD + len(value)
+            else:
+                total += VALUE_OVERHEAD
+    return total
+
+
+# ==============================================================================
+# Backends
+# ==============================================================================
+
+@dataclass
+class QueryCacheStats:
+    """Counters for cache monitoring"""
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': f"{(self.hits / total * 100) if total else 0.0:.1f}%",
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+        }
+
+
+class _CachedResult:
+    """A cached result with its expiry, size and tags"""
+
+    __slots__ = ('result', 'expires_at', 'size', 'tags')
+
+    def __init__(self, result: Any, expires_at: float, size: int, tags: Set[str]):
+        self.result = result
+        self.expires_at = expires_at
+        self.size = size
+        self.tags = tags
+
+
+class QueryCache:
+    """
+    In-process query result cache (thread-safe).
+
+    Shared by every request through the single DatabaseService held by the
+    ServiceContainer.
+    """
+
+    backend = 'memory'
+
+    def __init__(self, max_entries: int = 1000, max_memory_mb: Optional[float] = 64):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+            max_memory_mb: Estimated memory budget in MB (None = entries only)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = int(max_memory_mb * 1024 * 1024) if max_memory_mb else None
+
+        self._entries: 'OrderedDict[str, _CachedResult]' = OrderedDict()
+        self._expiry: List[Tuple[float, str]] = []  # heap of (expires_at, key)
+        self._tags: Dict[str, Set[str]] = {}  # tag -> keys
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = QueryCacheStats()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached result, or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            self._purge_expired(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry.result
+
+    def put(self, key: str, result: Any, ttl: float, tags: Iterable[str] = ()):
+        """
+        Cache a result.
+
+        Args:
+            key: Cache key (see query_cache_key)
+            result: QueryResult to cache
+            ttl: Seconds until the entry expires
+            tags: Table tags (see table_tags) for write invalidation
+        """
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        size = estimate_result_size(result)
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Larger than the whole budget: caching it would flush everything
+            return
+
+        expires_at = time.time() + ttl
+        entry = _CachedResult(result, expires_at, size, set(tags))
+        with self._lock:
+            self._purge_expired(time.time())
+            self._discard(key)
+            self._evict(reserve_bytes=size)
+            self._entries[key] = entry
+            self._total_bytes += size
+            for tag in entry.tags:
+                self._tags.setdefault(tag, set()).add(key)
+            heapq.heappush(self._expiry, (expires_at, key))
+            self._stats.stores += 1
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """
+        Drop every result tagged with any of `tags`.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    if self._discard(key) is not None:
+                        removed += 1
+            self._stats.invalidations += removed
+        return removed
+
+    def invalidate_tables(self, datasource: str, tables: Iterable[str]) -> int:
+        """Drop every result that read one of `tables` from `datasource`"""
+        return self.invalidate_tags(table_tag(datasource, table) for table in tables)
+
+    def clear(self):
+        """Remove every cached result"""
+        with self._lock:
+            self._entries.clear()
+            self._expiry.clear()
+            self._tags.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache metrics for monitoring"""
+        with self._lock:
+            result = {
+                'backend': self.backend,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'memory_kb': round(self._total_bytes / 1024, 1),
+                'max_memory_kb': round(self.max_bytes / 1024, 1) if self.max_bytes else None,
+            }
+            result.update(self._stats.to_dict())
+        return result
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ==========================================================================
+    # Internals (lock held)
+    # ==========================================================================
+
+    def _discard(self, key: str) -> Optional[_CachedResult]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.size
+            for tag in entry.tags:
+                keys = self._tags.get(tag)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._tags[tag]
+        return entry
+
+    def _purge_expired(self, now: float):
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry)
+            entry = self._entries.get(key)
+            # Heap items of replaced entries are skipped
+            if entry is not None and entry.expires_at == expires_at:
+                self._discard(key)
+                self._stats.expirations += 1
+        if len(self._expiry) > 2 * len(self._entries) + 64:
+            # Rebuild after many replacements/invalidations left dead heap items
+            self._expiry = [(e.expires_at, k) for k, e in self._entries.items()]
+            heapq.heapify(self._expiry)
+
+    def _evict(self, reserve_bytes: int = 0):
+        while self._entries and (
+            len(self._entries) >= self.max_entries
+            or (self.max_bytes is not None and self._total_bytes + reserve_bytes > self.max_bytes)
+        ):
+            key = next(iter(self._entries))
+            self._discard(key)
+            self._stats.evictions += 1
+
+
+class RedisQueryCache:
+    """
+    Query result cache stored in Redis, shared by every worker process.
+
+    Results are pickled under <prefix>qcache:<key> with SETEX; table tags are
+    Redis sets <prefix>qtag:<tag> listing the keys to delete on writes.
+
+    Configuration (same keys as adapters/redis_adapter.RedisAdapter.connect):
+        {'host': 'localhost', 'port': 6379, 'db': 0, 'password': None,
+         'prefix': 'quantum:'}
+    """
+
+    backend = 'redis'
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, max_memory_mb: Optional[float] = 64):
+        if not REDIS_AVAILABLE:
+            raise ImportError(
+                "Redis query cache requires 'redis' package. "
+                "Install with: pip install redis"
+            )
+        config = config or {}
+        self._prefix = config.get('prefix', 'quantum:')
+        self._client = redis.Redis(
+            host=config.get('host', 'localhost'),
+            port=config.get('port', 6379),
+            db=config.get('db', 0),
+            password=config.get('password'),
+        )
+        self._client.ping()
+        # Per-result limit only: Redis applies its own maxmemory policy
+        self.max_bytes = int(max_memory_mb * 1024 * 1024) if max_memory_mb else None
+        self._lock = threading.Lock()
+        self._stats = QueryCacheStats()
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}qcache:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self._prefix}qtag:{tag}"
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._lock:
+            setattr(self._stats, counter, getattr(self._stats, counter) + amount)
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            payload = self._client.get(self._key(key))
+        except redis.RedisError as e:
+            logger.warning(f"Redis query cache read failed: {e}")
+            payload = None
+        if payload is None:
+            self._count('misses')
+            return None
+        self._count('hits')
+        return pickle.loads(payload)
+
+    def put(self, key: str, result: Any, ttl: float, tags: Iterable[str] = ()):
+        if ttl <= 0:
+            return
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.max_bytes is not None and len(payload) > self.max_bytes:
+            return
+        seconds = max(1, int(ttl))
+        try:
+            pipe = self._client.pipeline()
+            pipe.setex(self._key(key), seconds, payload)
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                pipe.sadd(tag_key, key)
+                # Tag sets only list keys; letting them outlive entries is harmless
+                pipe.expire(tag_key, max(seconds, REDIS_TAG_TTL))
+            pipe.execute()
+            self._count('stores')
+        except redis.RedisError as e:
+            logger.warning(f"Redis query cache write failed: {e}")
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        removed = 0
+        try:
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                keys = self._client.smembers(tag_key)
+                pipe = self._client.pipeline()
+                for key in keys:
+                    if isinstance(key, bytes):
+                        key = key.decode()
+                    pipe.delete(self._key(key))
+                pipe.delete(tag_key)
+                removed += sum(pipe.execute()[:-1])
+        except redis.RedisError as e:
+            logger.warning(f"Redis query cache invalidation failed: {e}")
+        self._count('invalidations', removed)
+        return removed
+
+    def invalidate_tables(self, datasource: str, tables: Iterable[str]) -> int:
+        return self.invalidate_tags(table_tag(datasource, table) for table in tables)
+
+    def clear(self):
+        try:
+            for pattern in (self._key('*'), self._tag_key('*')):
+                keys = list(self._client.scan_iter(match=pattern))
+                if keys:
+                    self._client.delete(*keys)
+        except redis.RedisError as e:
+            logger.warning(f"Redis query cache clear failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            result = {'backend': self.backend}
+            result.update(self._stats.to_dict())
+        return result
+
+
+def create_query_cache(config: Optional[Dict[str, Any]] = None):
+    """
+    Build the query cache described by the `database.query_cache` config.
+
+    Args:
+        config: {'backend': 'memory' | 'redis', 'max_entries': ...,
+                 'max_memory_mb': ..., 'redis': {host, port, db, password, prefix}}
+            Redis settings default to the REDIS_* environment variables used
+            by the message queue service.
+
+    Falls back to the in-memory cache if Redis is unavailable.
+    """
+    config = config or {}
+    max_memory_mb = config.get('max_memory_mb', 64)
+    if config.get('backend', 'memory') == 'redis':
+        redis_config = {
+            'host': os.getenv('REDIS_HOST', 'localhost'),
+            'port': int(os.getenv('REDIS_PORT', '6379')),
+            'db': int(os.getenv('REDIS_DB', '0')),
+            'password': os.getenv('REDIS_PASSWORD'),
+            'prefix': os.getenv('REDIS_PREFIX', 'quantum:'),
+        }
+        redis_config.update(config.get('redis') or {})
+        try:
+            return RedisQueryCache(redis_config, max_memory_mb=max_memory_mb)
+        except Exception as e:
+            logger.warning(f"Redis query cache unavailable ({e}), using in-memory cache")
+    return QueryCache(
+        max_entries=config.get('max_entries', 1000),
+        max_memory_mb=max_memory_mb,
+    )
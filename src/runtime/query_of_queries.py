@@ -0,0 +1,266 @@
+"""
+Query of Queries - SQL over query results already in the request
+
+A q:query with source="name" runs its SQL against the rows of an earlier
+result. Each ComponentRuntime (one per request) owns one
+QueryOfQueriesEngine: an in-memory SQLite database where every source is
+loaded once, with executemany() and column types inferred from the values,
+and reused by every later QoQ statement on the same result. Columns the
+SQL filters, joins, groups or sorts on are indexed on large tables.
+
+Usage:
+    engine = QueryOfQueriesEngine()
+    result = engine.execute('users', users_rows,
+                            'SELECT name FROM users WHERE age > :age ORDER BY age',
+                            {'age': 30})
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from runtime.query_stream import QueryStream, Row, column_index
+
+
+# Tables with fewer rows are scanned instead of indexed
+INDEX_MIN_ROWS = 1000
+
+# Values sqlite3 binds as-is
+_NATIVE_TYPES = (type(None), int, float, str, bytes, bool)
+
+# Clauses whose columns benefit from an index, and the keywords ending them
+_CLAUSE_PATTERN = re.compile(
+    r"\b(where|on|order\s+by|group\s+by|having|select|from|join|limit|offset|union)\b",
+    re.IGNORECASE
+)
+_INDEXED_CLAUSES = {'where', 'on', 'order by', 'group by', 'having'}
+_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'")
+_IDENTIFIER_PATTERN = re.compile(r'"((?:[^"]|"")+)"|([A-Za-z_]\w*)')
+
+
+def column_type(values: Sequence[Any]) -> str:
+    """
+    SQLite column type for a column's values
+
+    Integers (and booleans) -> INTEGER, numbers -> REAL, strings -> TEXT,
+    bytes -> BLOB. Mixed columns get no declared type, so every value keeps
+    its own type instead of being coerced to text.
+    """
+    kinds = {type(value) for value in values if value is not None}
+    if not kinds:
+        return ''
+    if kinds <= {int, bool}:
+        return 'INTEGER'
+    if kinds <= {int, bool, float, Decimal}:
+        return 'REAL'
+    if kinds <= {str, date, datetime, dt_time}:
+        return 'TEXT'
+    if kinds <= {bytes, bytearray, memoryview}:
+        return 'BLOB'
+    return ''
+
+
+def _adapt(value: Any) -> Any:
+    """Value sqlite3 can bind (ISO text for dates, float for Decimal)"""
+    if isinstance(value, _NATIVE_TYPES):
+        return value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime, dt_time)):
+        return value.isoformat()
+    if isinstance(value, (bytearray, memoryview)):
+        return bytes(value)
+    return str(value)
+
+
+def filtered_columns(sql: str) -> Set[str]:
+    """Lowercased identifiers used in WHERE/ON/ORDER BY/GROUP BY/HAVING"""
+    parts = _CLAUSE_PATTERN.split(_LITERAL_PATTERN.sub("''", sql))
+    names = set()
+    # parts alternates text, keyword, text, keyword, ...
+    for keyword, text in zip(parts[1::2], parts[2::2]):
+        if ' '.join(keyword.lower().split()) in _INDEXED_CLAUSES:
+            for quoted, bare in _IDENTIFIER_PATTERN.findall(text):
+                names.add((quoted.replace('""', '"') if quoted else bare).lower())
+    return names
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class _SourceTable:
+    """A source result loaded into the engine"""
+
+    __slots__ = ('rows', 'size', 'table', 'columns', 'indexed')
+
+    def __init__(self, rows: Any, size: int, table: str, columns: List[str]):
+        self.rows = rows  # Kept so the identity check cannot match a recycled id
+        self.size = size
+        self.table = table
+        self.columns = columns
+        self.indexed: Set[str] = set()
+
+
+class QueryOfQueriesEngine:
+    """
+    Request-scoped in-memory SQL engine for Query of Queries.
+
+    A source is reloaded only when its variable now holds a different
+    result (or the list changed length).
+    """
+
+    def __init__(self, index_min_rows: int = INDEX_MIN_ROWS):
+        self.index_min_rows = index_min_rows
+        self._conn: Optional[sqlite3.Connection] = None
+        self._sources: Dict[str, _SourceTable] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.reuses = 0
+
+    def execute(self, source_name: str, source: Any, sql: str,
+                params: Optional[Dict[str, Any]] = None):
+        """
+        Run a QoQ statement against a source result
+
+        Args:
+            source_name: Name the SQL uses for the source (FROM name or FROM {name})
+            source: List of row mappings (or a QueryStream)
+            sql: SELECT with :param placeholders
+            params: Parameter values
+
+        Returns:
+            QueryResult with Row data
+
+        Raises:
+            TypeError: If the source rows are not mappings
+            sqlite3.Error: If the SQL fails
+        """
+        from runtime.database_service import QueryResult, compile_sql
+
+        with self._lock:
+            entry = self._load(source_name, source)
+
+            # FROM {name} is the templated spelling of FROM name
+            statement = sql.replace(f'{{{source_name}}}', entry.table)
+            self._index_columns(source_name, entry, statement)
+
+            prepared_sql, param_names = compile_sql(statement, 'qmark')
+            values = [_adapt((params or {}).get(name)) for name in param_names]
+
+            start_time = time.time()
+            cursor = self._connection().execute(prepared_sql, values)
+            rows = cursor.fetchall()
+            execution_time = (time.time() - start_time) * 1000  # Convert to ms
+
+            column_names = [desc[0] for desc in cursor.description] if cursor.description else []
+            cursor.close()
+
+        index = column_index(column_names)
+        data = [Row(index, row) for row in rows]
+        return QueryResult(
+            success=True,
+            data=data,
+            record_count=len(data),
+            column_list=column_names,
+            execution_time=int(execution_time),
+            sql=sql
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Loaded sources and reuse counters"""
+        with self._lock:
+            return {
+                'loads': self.loads,
+                'reuses': self.reuses,
+                'tables': {name: entry.size for name, entry in self._sources.items()},
+                'indexes': sorted(
+                    f"{name}.{column}" for name, entry in self._sources.items() for column in entry.indexed
+                ),
+            }
+
+    def close(self):
+        """Drop every loaded source"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._sources.clear()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # q:thread bodies may run QoQ on another thread; access is serialized by _lock
+            self._conn = sqlite3.connect(':memory:', check_same_thread=False)
+        return self._conn
+
+    def _load(self, source_name: str, source: Any) -> _SourceTable:
+        """Table holding the source's rows, loaded on first use"""
+        entry = self._sources.get(source_name)
+        size = len(source) if isinstance(source, list) else None
+        if entry is not None and entry.rows is source and (size is None or entry.size == size):
+            self.reuses += 1
+            return entry
+
+        conn = self._connection()
+        table = _quote(source_name)
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
+
+        columns, rows = self._rows(source)
+        column_values = list(zip(*rows)) if rows else [() for _ in columns]
+        types = [column_type(values) for values in column_values]
+        column_defs = ', '.join(f"{_quote(column)} {col_type}".rstrip() for column, col_type in zip(columns, types))
+        conn.execute(f"CREATE TABLE {table} ({column_defs})")
+
+        if rows:
+            if not all(
+                all(isinstance(value, _NATIVE_TYPES) for value in values)
+                for values in column_values
+            ):
+                rows = [tuple(_adapt(value) for value in row) for row in rows]
+            placeholders = ', '.join('?' for _ in columns)
+            conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+
+        entry = _SourceTable(source, len(rows) if size is None else size, table, columns)
+        self._sources[source_name] = entry
+        self.loads += 1
+        return entry
+
+    def _rows(self, source: Any) -> Tuple[List[str], List[Sequence[Any]]]:
+        """Column names and value tuples of a source result"""
+        iterator = iter(source)
+        first = next(iterator, None)
+        if first is None:
+            columns = list(source.columns) if isinstance(source, QueryStream) else []
+            return columns, []
+        if not isinstance(first, Mapping):
+            raise TypeError(f"Source data must be list of dictionaries (got {type(first).__name__})")
+
+        columns = list(first.keys())
+        first_index = first._index if isinstance(first, Row) else None
+        rows = [self._values(first, columns, first_index)]
+        rows.extend(self._values(row, columns, first_index) for row in iterator)
+        return columns, rows
+
+    @staticmethod
+    def _values(row: Mapping, columns: List[str], index: Optional[Dict[str, int]]) -> Sequence[Any]:
+        # Rows of one query share their column index, so their tuples are used as-is
+        if index is not None and isinstance(row, Row) and row._index is index:
+            return row.values_tuple()
+        return tuple(row.get(column) for column in columns)
+
+    def _index_columns(self, source_name: str, entry: _SourceTable, sql: str):
+        """Index the source columns the statement filters, joins, groups or sorts on"""
+        if entry.size < self.index_min_rows:
+            return
+        wanted = filtered_columns(sql)
+        conn = self._connection()
+        for column in entry.columns:
+            if column.lower() in wanted and column not in entry.indexed:
+                name = _quote(f"qoq_{source_name}_{column}")
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {entry.table} ({_quote(column)})")
+                entry.indexed.add(column)
@@ -0,0 +1,165 @@
+"""
+Query Stream - Lazily fetched q:query results
+
+A q:query with stream="true" does not materialize its result. Rows are
+fetched in batches from a server-side cursor while q:loop (or the HTML
+renderer) iterates, so memory stays flat regardless of the result size:
+
+- PostgreSQL: named (server-side) cursor
+- MySQL/MariaDB: unbuffered SSCursor
+- SQLite: fetchmany() batches
+
+Each row is a Row: a read-only mapping over the row's value tuple that
+shares one column index with every other row of the result. Materialized
+QueryResult.data uses the same Row views.
+
+Usage:
+    stream = db.stream_query('db', 'SELECT id, name FROM users')
+    for row in stream:
+        print(row['id'], row.name)
+"""
+
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+
+# Rows fetched per round trip when a q:query has no fetchSize
+DEFAULT_FETCH_SIZE = 1000
+
+
+class Row(Mapping):
+    """
+    One result row: row['col'], row.col and dict-style iteration over column
+    names. Column positions are stored once per result, not per row.
+    """
+
+    __slots__ = ('_index', '_values')
+
+    def __init__(self, index: Dict[str, int], values: Sequence[Any]):
+        self._index = index
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[self._index[key]]
+        except (KeyError, TypeError):
+            raise KeyError(key)
+
+    def __getattr__(self, name: str) -> Any:
+        index = self._index.get(name) if not name.startswith('__') else None
+        if index is None:
+            raise AttributeError(name)
+        return self._values[index]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getstate__(self):
+        return self._index, tuple(self._values)
+
+    def __setstate__(self, state):
+        self._index, self._values = state
+
+    def values_tuple(self) -> Sequence[Any]:
+        """The row's values in column order"""
+        return self._values
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict copy of the row"""
+        return dict(zip(self._index, self._values))
+
+    def __repr__(self) -> str:
+        # Same text as the dict rows templates used to render
+        return repr(self.to_dict())
+
+
+def json_default(value: Any) -> Any:
+    """json.dumps default= hook for Row and QueryStream values"""
+    if isinstance(value, Row):
+        return value.to_dict()
+    if isinstance(value, QueryStream):
+        return [row.to_dict() for row in value]
+    return str(value)
+
+
+def column_index(columns: List[str]) -> Dict[str, int]:
+    """Column name -> position map shared by every Row of a result"""
+    return {name: position for position, name in enumerate(columns)}
+
+
+class QueryStream:
+    """
+    Iterable q:query result whose rows are fetched on demand.
+
+    The statement runs when iteration starts, so no cursor or pooled
+    connection is held between the q:query and the q:loop reading it
+    (errors surface there too). Rows are read while iterating. Iterating a
+    second time re-executes the query instead of buffering the first pass.
+    """
+
+    def __init__(self, open_rows: Callable[[], Iterator[Any]], sql: Optional[str] = None):
+        """
+        Args:
+            open_rows: Starts the query and returns a generator yielding the
+                column names first, then one Row per result row
+            sql: Statement text (metadata only)
+        """
+        self._open_rows = open_rows
+        self._pending: Optional[Iterator[Any]] = None
+        self._columns: Optional[List[str]] = None
+        self.sql = sql
+        self.rows_read = 0
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names (runs the query if it has not been iterated yet)"""
+        if self._columns is None:
+            self._pending = self._start()
+        return self._columns
+
+    def _start(self) -> Iterator[Any]:
+        rows = self._open_rows()
+        self._columns = next(rows)
+        return rows
+
+    def __iter__(self) -> Iterator[Row]:
+        rows, self._pending = self._pending, None
+        if rows is None:
+            rows = self._start()
+        count = 0
+        try:
+            for row in rows:
+                count += 1
+                yield row
+        finally:
+            rows.close()
+            self.rows_read = count
+
+    def __bool__(self) -> bool:
+        # A stream is a result even before its rows are known
+        return True
+
+    def close(self):
+        """Release the cursor and connection opened by reading columns"""
+        if self._pending is not None:
+            self._pending.close()
+            self._pending = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Metadata for {name_result} (columns and counts are unknown until iterated)"""
+        return {
+            'columnList': self._columns,
+            'recordCount': None,
+            'streaming': True,
+            'success': True,
+            'cached': False,
+        }
+
+    def __repr__(self) -> str:
+        return f"QueryStream(columns={self._columns!r})"
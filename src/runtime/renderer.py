@@ -8,8 +8,9 @@ Handles databinding, loops, conditionals, and HTML passthrough.
 import html
 import re
 import sys
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 # Fix imports
 sys.path.append(str(Path(__file__).parent.parent))
@@ -21,7 +22,14 @@ from core.ast_nodes import (
 from core.features.conditionals.src.ast_node import IfNode
 from core.features.loops.src.ast_node import LoopNode
 from core.features.state_management.src.ast_node import SetNode
+from core.databinding import BindingTemplate, compile_template
 from runtime.execution_context import ExecutionContext
+from runtime.query_stream import QueryStream
+from runtime.service_container import ServiceContainer
+
+
+# Marker yielded by HTMLRenderer._iter_node() to flush the stream buffer
+_FLUSH = object()
 
 
 class HTMLRenderer:
@@ -41,17 +49,28 @@ class HTMLRenderer:
     # Tags whose text content should NOT be processed by databinding or HTML-escaped
     RAW_CONTENT_TAGS = {'style', 'script'}
 
-    def __init__(self, context: ExecutionContext, components_dir: str = "./components"):
+    def __init__(self, context: ExecutionContext, components_dir: str = "./components",
+                 services: Optional[ServiceContainer] = None):
         """
         Initialize renderer with execution context.
 
         Args:
             context: ExecutionContext with all variables and query results
             components_dir: Directory where component files are located (Phase 2)
+            services: Service container of the page's runtime, shared with
+                      nested components (default: each gets its own)
         """
         self.context = context
         self.components_dir = components_dir
+        self.services = services
         self._raw_mode = False
+        # Per-stream HTML injections by closing tag (see iter_render)
+        self._injections: Dict[str, str] = {}
+
+        # When set, render() leaves out inline <style>/<script> blocks and
+        # collects their contents here (in document order) for the caller
+        self.collect_assets = False
+        self.inline_assets: Dict[str, List[str]] = {'style': [], 'script': []}
 
         # Lazy-load composer (Phase 2)
         self._composer = None
@@ -120,6 +139,111 @@ class HTMLRenderer:
         return ''.join(self.render(node) for node in nodes)
 
 
+    def iter_render(
+        self,
+        node: QuantumNode,
+        chunk_size: int = 8192,
+        injections: Optional[Dict[str, str]] = None
+    ) -> Iterator[str]:
+        """
+        Render a node as a stream of HTML chunks.
+
+        Produces the same markup as render(), but walks the tree lazily and
+        yields chunks of about chunk_size characters, so a large page never
+        has to be held in memory as one string. The buffer is flushed right
+        after </head> so the browser can start fetching assets early.
+
+        Example:
+          renderer.iter_render(ast, injections={'head': '<script src="..."></script>'})
+
+        Args:
+            node: AST node to render
+            chunk_size: Minimum number of characters per yielded chunk
+            injections: HTML to emit just before the closing tag of the first
+                element with the given tag name (case-insensitive)
+
+        Yields:
+            HTML string chunks
+        """
+        prev_injections = self._injections
+        self._injections = {tag.lower(): markup for tag, markup in (injections or {}).items()}
+
+        buffer = []
+        size = 0
+        try:
+            for fragment in self._iter_node(node):
+                if fragment is _FLUSH:
+                    if buffer:
+                        yield ''.join(buffer)
+                        buffer = []
+                        size = 0
+                    continue
+
+                buffer.append(fragment)
+                size += len(fragment)
+                if size >= chunk_size:
+                    yield ''.join(buffer)
+                    buffer = []
+                    size = 0
+
+            if buffer:
+                yield ''.join(buffer)
+        finally:
+            self._injections = prev_injections
+
+
+    def _iter_node(self, node: QuantumNode) -> Iterator[str]:
+        """Yield HTML fragments for a node (streaming counterpart of render())"""
+        if isinstance(node, HTMLNode):
+            yield from self._iter_html_node(node)
+
+        elif isinstance(node, ComponentNode):
+            for statement in node.statements:
+                yield from self._iter_node(statement)
+
+        elif isinstance(node, LoopNode):
+            for child in self._iter_loop_body(node):
+                yield from self._iter_node(child)
+
+        elif isinstance(node, IfNode):
+            for child in self._select_branch(node):
+                yield from self._iter_node(child)
+
+        else:
+            # Leaf nodes (text, doctype, comments, component calls)
+            yield self.render(node)
+
+
+    def _iter_html_node(self, node: HTMLNode) -> Iterator[str]:
+        """Yield an HTML element as opening tag, children and closing tag"""
+        yield self._render_opening_tag(node)
+        if node.self_closing:
+            return
+
+        if node.tag in self.RAW_CONTENT_TAGS:
+            prev_raw = self._raw_mode
+            self._raw_mode = True
+            try:
+                for child in node.children:
+                    yield from self._iter_node(child)
+            finally:
+                self._raw_mode = prev_raw
+        else:
+            for child in node.children:
+                yield from self._iter_node(child)
+
+        tag = node.tag.lower()
+        if self._injections:
+            injection = self._injections.pop(tag, None)
+            if injection:
+                yield injection
+
+        yield f'</{node.tag}>'
+
+        if tag == 'head':
+            yield _FLUSH
+
+
     def _render_html_node(self, node: HTMLNode) -> str:
         """
         Render HTML element with attributes and children.
@@ -135,33 +259,20 @@ class HTMLRenderer:
             HTML string
         """
 
-        # Build opening tag
-        tag_parts = [f'<{node.tag}']
-
-        # Add attributes with databinding applied
-        if node.attributes:
-            for key, value in node.attributes.items():
-                # Apply databinding to attribute value
-                processed_value = self._apply_databinding(value)
-                # Escape for HTML attribute safety (prevent XSS)
-                escaped_value = html.escape(str(processed_value), quote=True)
-                tag_parts.append(f'{key}="{escaped_value}"')
+        # Inline <style>/<script> bodies go to inline_assets instead of the output
+        if self.collect_assets and self._is_inline_asset(node):
+            self.inline_assets[node.tag.lower()].append(self._render_raw_children(node))
+            return ''
 
-        opening_tag = ' '.join(tag_parts)
+        opening_tag = self._render_opening_tag(node)
 
         # Self-closing tags (void elements)
         if node.self_closing:
-            return opening_tag + ' />'
-
-        # Regular tags with children
-        opening_tag += '>'
+            return opening_tag
 
         # Style/script tags: render children as raw text (no databinding, no escaping)
         if node.tag in self.RAW_CONTENT_TAGS:
-            prev_raw = self._raw_mode
-            self._raw_mode = True
-            children_html = self.render_all(node.children)
-            self._raw_mode = prev_raw
+            children_html = self._render_raw_children(node)
         else:
             children_html = self.render_all(node.children)
 
@@ -170,6 +281,54 @@ class HTMLRenderer:
         return opening_tag + children_html + closing_tag
 
 
+    def _render_raw_children(self, node: HTMLNode) -> str:
+        """Render children as raw text (no databinding, no escaping)"""
+        prev_raw = self._raw_mode
+        self._raw_mode = True
+        try:
+            return self.render_all(node.children)
+        finally:
+            self._raw_mode = prev_raw
+
+
+    @staticmethod
+    def _is_inline_asset(node: HTMLNode) -> bool:
+        """Check for an inline <style> or <script> block (a <script> without src)"""
+        if node.self_closing:
+            return False
+        tag = node.tag.lower()
+        return tag == 'style' or (tag == 'script' and 'src' not in node.attributes)
+
+
+    def _render_opening_tag(self, node: HTMLNode) -> str:
+        """
+        Render an element's opening tag with databinding applied to attributes.
+
+        Returns '<tag ... />' for self-closing elements, '<tag ...>' otherwise.
+        """
+        tag_parts = [f'<{node.tag}']
+
+        # Add attributes with databinding applied
+        if node.attributes:
+            templates = node.attribute_templates
+            for key, value in node.attributes.items():
+                # Apply databinding using the template tokenized at parse time
+                template = templates.get(key)
+                if template is not None and template.source == value:
+                    processed_value = self._render_template(template)
+                else:
+                    processed_value = self._apply_databinding(value)
+                # Escape for HTML attribute safety (prevent XSS)
+                escaped_value = html.escape(str(processed_value), quote=True)
+                tag_parts.append(f'{key}="{escaped_value}"')
+
+        opening_tag = ' '.join(tag_parts)
+
+        if node.self_closing:
+            return opening_tag + ' />'
+        return opening_tag + '>'
+
+
     def _render_text_node(self, node: TextNode) -> str:
         """
         Render text content with databinding applied.
@@ -193,7 +352,11 @@ class HTMLRenderer:
 
         # Apply databinding if needed
         if node.has_databinding:
-            text = self._apply_databinding(text)
+            template = node.template
+            if template is not None and template.source == text:
+                text = self._render_template(template)
+            else:
+                text = self._apply_databinding(text)
 
         # HTML escape to prevent XSS
         # NOTE: This means you can't inject raw HTML via variables (security feature)
@@ -229,13 +392,21 @@ class HTMLRenderer:
         Returns:
             Concatenated HTML from all loop iterations
         """
-        result = []
+        return ''.join(self.render(child) for child in self._iter_loop_body(node))
 
+    def _iter_loop_body(self, node: LoopNode) -> Iterator[QuantumNode]:
+        """
+        Yield the loop body nodes once per iteration.
+
+        Loop variables are bound in the context while each node is being
+        rendered, and the original local variables are restored at the end
+        (also when a stream is closed early).
+        """
         # Get the items to iterate over
         items = self._get_loop_items(node)
 
         if not items:
-            return ''
+            return
 
         # Save current context state
         original_vars = self.context.local_vars.copy()
@@ -246,7 +417,7 @@ class HTMLRenderer:
                 self.context.set_variable(node.var_name, item, scope="local")
 
                 # For query loops, set dotted variables (e.g., task.title, task.status)
-                if node.loop_type == 'query' and isinstance(item, dict):
+                if node.loop_type == 'query' and isinstance(item, Mapping):
                     for field_name, field_value in item.items():
                         dotted_key = f"{node.var_name}.{field_name}"
                         self.context.set_variable(dotted_key, field_value, scope="local")
@@ -256,16 +427,13 @@ class HTMLRenderer:
                     self.context.set_variable(node.index_name, index, scope="local")
 
                 # Render loop body
-                for child in node.body:
-                    result.append(self.render(child))
+                yield from node.body
 
         finally:
             # Restore original context
             self.context.local_vars = original_vars
 
-        return ''.join(result)
-
-    def _get_loop_items(self, node: LoopNode) -> list:
+    def _get_loop_items(self, node: LoopNode) -> Iterable:
         """Get items to iterate over from loop node."""
         if node.loop_type == 'array':
             # Get items expression
@@ -305,7 +473,8 @@ class HTMLRenderer:
                 query_name = getattr(node, 'query_name', node.var_name)
                 try:
                     data = self.context.get_variable(query_name)
-                    if isinstance(data, list):
+                    if isinstance(data, (list, QueryStream)):
+                        # Streams are iterated lazily, one row at a time
                         return data
                 except:
                     pass
@@ -314,7 +483,7 @@ class HTMLRenderer:
             # Traditional syntax: items="{tasks}"
             if '{' in items_expr and '}' in items_expr:
                 resolved = self._apply_databinding(items_expr)
-                if isinstance(resolved, list):
+                if isinstance(resolved, (list, QueryStream)):
                     return resolved
             return []
 
@@ -339,20 +508,24 @@ class HTMLRenderer:
         Returns:
             HTML from the matching branch
         """
+        return self.render_all(self._select_branch(node))
+
+    def _select_branch(self, node: IfNode) -> List[QuantumNode]:
+        """Return the body of the first matching q:if/q:elseif/q:else branch"""
         # Evaluate main condition
         if self._evaluate_condition(node.condition):
-            return self.render_all(node.if_body)
+            return node.if_body
 
         # Check elseif branches
         for elseif in (node.elseif_blocks or []):
             if self._evaluate_condition(elseif.condition):
-                return self.render_all(elseif.body)
+                return elseif.body
 
         # Else branch
         if node.else_body:
-            return self.render_all(node.else_body)
+            return node.else_body
 
-        return ''
+        return []
 
     def _evaluate_condition(self, condition: str) -> bool:
         """Evaluate a condition expression."""
@@ -369,8 +542,8 @@ class HTMLRenderer:
             # Check for comparison operators in the original condition
             if '==' in condition or '!=' in condition or '>' in condition or '<' in condition:
                 try:
-                    # Get all variables for eval context
-                    vars_dict = self.context.get_all_variables()
+                    # Live variable view for eval context (no flattening)
+                    vars_dict = self.context.variables
                     # Safe eval with only the variables
                     return bool(eval(resolved, {"__builtins__": {}}, vars_dict))
                 except:
@@ -431,40 +604,21 @@ class HTMLRenderer:
             - For pure expressions like "{items}": the actual value (list, dict, etc.)
             - For mixed content like "Hello {name}": interpolated string
         """
-        if not text:
+        if not text or not isinstance(text, str):
             return text
 
-        pattern = r'\{([^}]+)\}'
-
-        # Check if the ENTIRE text is just a single databinding expression
-        full_match = re.fullmatch(pattern, text.strip())
-        if full_match:
-            # Pure expression - return the actual value (not converted to string)
-            expression = full_match.group(1).strip()
-            try:
-                return self._evaluate_expression(expression)
-            except Exception as e:
-                # If evaluation fails, return original placeholder
-                return text
-
-        # Mixed content (text + expressions) - need string interpolation
-        def replace_binding(match):
-            """Replace single {expression} match"""
-            expression = match.group(1).strip()
-
-            try:
-                # Evaluate expression from context
-                value = self._evaluate_expression(expression)
-                return str(value) if value is not None else ''
+        return self._render_template(compile_template(text))
 
-            except Exception as e:
-                # If evaluation fails, return error marker (useful for debugging)
-                return f'{{ERROR: {expression}}}'
 
-        # Find and replace all {expression} patterns
-        result = re.sub(pattern, replace_binding, text)
+    def _render_template(self, template: BindingTemplate) -> Any:
+        """
+        Resolve a pre-tokenized databinding template against the context.
 
-        return result
+        Bindings classified at parse time (variable, dotted path, index path,
+        compiled arithmetic) resolve directly; other expressions go through
+        _evaluate_expression().
+        """
+        return template.render(self.context, self._evaluate_expression)
 
 
     def _evaluate_expression(self, expression: str) -> Any:
@@ -558,7 +712,7 @@ class HTMLRenderer:
 
         # Navigate nested properties
         for part in parts[1:]:
-            if isinstance(current, dict):
+            if isinstance(current, Mapping):
                 current = current.get(part)
             elif isinstance(current, list):
                 # Array properties like items.length
@@ -607,7 +761,7 @@ class HTMLRenderer:
         # If there's a property path, navigate it
         if property_path:
             for part in property_path.split('.'):
-                if isinstance(element, dict):
+                if isinstance(element, Mapping):
                     element = element.get(part)
                 elif hasattr(element, part):
                     element = getattr(element, part)
@@ -735,7 +889,7 @@ class HTMLRenderer:
             from runtime.component_composer import ComponentComposer
 
             self._resolver = ComponentResolver(self.components_dir)
-            self._composer = ComponentComposer(self._resolver)
+            self._composer = ComponentComposer(self._resolver, self.services)
 
         return self._composer
 
@@ -757,7 +911,9 @@ class HTMLRenderer:
 
         try:
             composer = self._get_composer()
-            html = composer.compose(node, self.context)
+            html = composer.compose(
+                node, self.context, self.inline_assets if self.collect_assets else None
+            )
             return html
 
         except Exception as e:
@@ -6,8 +6,9 @@ Centralizes initialization and access to all runtime services
 across ComponentRuntime.__init__.
 """
 
-from typing import Any, Dict, Optional, TYPE_CHECKING
+from typing import Any, Callable, Dict, Optional, TYPE_CHECKING
 import logging
+import threading
 
 if TYPE_CHECKING:
     from runtime.database_service import DatabaseService
@@ -32,6 +33,8 @@ class ServiceContainer:
 
     Provides lazy initialization and centralized access to services.
     Services are initialized on first access to avoid unnecessary overhead.
+    Initialization is guarded by a lock, so a single container can be shared
+    by every request-scoped ComponentRuntime in the process.
 
     Example:
         services = ServiceContainer(config)
@@ -48,6 +51,30 @@ class ServiceContainer:
         """
         self._config = config or {}
         self._services: Dict[str, Any] = {}
+        # Re-entrant: some factories resolve other services (knowledge -> llm)
+        self._lock = threading.RLock()
+
+    def _get_or_create(self, name: str, factory: Callable[[], Any]) -> Any:
+        """
+        Return service `name`, creating it with `factory` on first access.
+
+        Uses double-checked locking so the fast path (service already
+        initialized) never takes the lock.
+        """
+        service = self._services.get(name)
+        if service is None:
+            with self._lock:
+                service = self._services.get(name)
+                if service is None:
+                    service = factory()
+                    self._services[name] = service
+                    logger.debug(f"Initialized {type(service).__name__}")
+        return service
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Configuration the services are created from"""
+        return self._config
 
     # ==========================================================================
     # Core Services
@@ -56,21 +83,25 @@ class ServiceContainer:
     @property
     def database(self) -> 'DatabaseService':
         """Database service for query execution"""
-        if 'database' not in self._services:
+        def create():
             from runtime.database_service import DatabaseService
             local_ds = self._config.get('datasources', {})
-            self._services['database'] = DatabaseService(local_datasources=local_ds)
-            logger.debug("Initialized DatabaseService")
-        return self._services['database']
+            db_config = self._config.get('database') or {}
+            return DatabaseService(
+                local_datasources=local_ds,
+                datasource_cache_ttl=db_config.get('datasource_cache_ttl', 60),
+                datasource_stale_ttl=db_config.get('datasource_stale_ttl', 300),
+                query_cache=db_config.get('query_cache'),
+            )
+        return self._get_or_create('database', create)
 
     @property
     def function_registry(self) -> 'FunctionRegistry':
         """Function registry for q:function"""
-        if 'function_registry' not in self._services:
+        def create():
             from runtime.function_registry import FunctionRegistry
-            self._services['function_registry'] = FunctionRegistry()
-            logger.debug("Initialized FunctionRegistry")
-        return self._services['function_registry']
+            return FunctionRegistry()
+        return self._get_or_create('function_registry', create)
 
     # ==========================================================================
     # Invocation & Data Services
@@ -79,20 +110,18 @@ class ServiceContainer:
     @property
     def invocation(self) -> 'InvocationService':
         """Invocation service for q:invoke"""
-        if 'invocation' not in self._services:
+        def create():
             from core.features.invocation.src.runtime import InvocationService
-            self._services['invocation'] = InvocationService()
-            logger.debug("Initialized InvocationService")
-        return self._services['invocation']
+            return InvocationService()
+        return self._get_or_create('invocation', create)
 
     @property
     def data_import(self) -> 'DataImportService':
         """Data import service for q:data"""
-        if 'data_import' not in self._services:
+        def create():
             from core.features.data_import.src.runtime import DataImportService
-            self._services['data_import'] = DataImportService()
-            logger.debug("Initialized DataImportService")
-        return self._services['data_import']
+            return DataImportService()
+        return self._get_or_create('data_import', create)
 
     # ==========================================================================
     # AI Services
@@ -101,38 +130,34 @@ class ServiceContainer:
     @property
     def llm(self) -> 'LLMService':
         """LLM service for q:llm"""
-        if 'llm' not in self._services:
+        def create():
             from runtime.llm_service import LLMService
-            self._services['llm'] = LLMService()
-            logger.debug("Initialized LLMService")
-        return self._services['llm']
+            return LLMService()
+        return self._get_or_create('llm', create)
 
     @property
     def knowledge(self) -> 'KnowledgeService':
         """Knowledge service for RAG/ChromaDB"""
-        if 'knowledge' not in self._services:
+        def create():
             from runtime.knowledge_service import KnowledgeService
-            self._services['knowledge'] = KnowledgeService(self.llm)
-            logger.debug("Initialized KnowledgeService")
-        return self._services['knowledge']
+            return KnowledgeService(self.llm)
+        return self._get_or_create('knowledge', create)
 
     @property
     def agent(self):
         """Agent service for q:agent"""
-        if 'agent' not in self._services:
+        def create():
             from runtime.agent_service import get_agent_service
-            self._services['agent'] = get_agent_service()
-            logger.debug("Initialized AgentService")
-        return self._services['agent']
+            return get_agent_service()
+        return self._get_or_create('agent', create)
 
     @property
     def multi_agent(self):
         """Multi-agent service for q:team"""
-        if 'multi_agent' not in self._services:
+        def create():
             from runtime.agent_service import get_multi_agent_service
-            self._services['multi_agent'] = get_multi_agent_service()
-            logger.debug("Initialized MultiAgentService")
-        return self._services['multi_agent']
+            return get_multi_agent_service()
+        return self._get_or_create('multi_agent', create)
 
     # ==========================================================================
     # Communication Services
@@ -141,21 +166,19 @@ class ServiceContainer:
     @property
     def message_queue(self) -> 'MessageQueueService':
         """Message queue service for q:message, q:subscribe"""
-        if 'message_queue' not in self._services:
+        def create():
             from runtime.message_queue_service import MessageQueueService
             mq_config = self._config.get('message_queue', {})
-            self._services['message_queue'] = MessageQueueService(mq_config)
-            logger.debug("Initialized MessageQueueService")
-        return self._services['message_queue']
+            return MessageQueueService(mq_config)
+        return self._get_or_create('message_queue', create)
 
     @property
     def email(self) -> 'EmailService':
         """Email service for q:mail"""
-        if 'email' not in self._services:
+        def create():
             from runtime.email_service import EmailService
-            self._services['email'] = EmailService()
-            logger.debug("Initialized EmailService")
-        return self._services['email']
+            return EmailService()
+        return self._get_or_create('email', create)
 
     # ==========================================================================
     # Job & Scheduling Services
@@ -164,16 +187,17 @@ class ServiceContainer:
     @property
     def job_executor(self) -> 'JobExecutor':
         """Job executor for q:schedule, q:thread, q:job"""
-        if 'job_executor' not in self._services:
+        def create():
             from runtime.job_executor import JobExecutor
+            from runtime.job_stores import create_job_store
             job_db_path = self._config.get('job_db_path', 'quantum_jobs.db')
             max_workers = self._config.get('max_thread_workers', 10)
-            self._services['job_executor'] = JobExecutor(
+            return JobExecutor(
                 max_thread_workers=max_workers,
-                job_db_path=job_db_path
+                job_db_path=job_db_path,
+                job_store=create_job_store(self._config.get('job_store'), job_db_path)
             )
-            logger.debug("Initialized JobExecutor")
-        return self._services['job_executor']
+        return self._get_or_create('job_executor', create)
 
     # ==========================================================================
     # File & Upload Services
@@ -182,11 +206,10 @@ class ServiceContainer:
     @property
     def file_upload(self) -> 'FileUploadService':
         """File upload service for q:file"""
-        if 'file_upload' not in self._services:
+        def create():
             from runtime.file_upload_service import FileUploadService
-            self._services['file_upload'] = FileUploadService()
-            logger.debug("Initialized FileUploadService")
-        return self._services['file_upload']
+            return FileUploadService()
+        return self._get_or_create('file_upload', create)
 
     # ==========================================================================
     # Developer Experience Services
@@ -195,20 +218,18 @@ class ServiceContainer:
     @property
     def logging(self) -> 'LoggingService':
         """Logging service for q:log"""
-        if 'logging' not in self._services:
+        def create():
             from core.features.logging.src import LoggingService
-            self._services['logging'] = LoggingService()
-            logger.debug("Initialized LoggingService")
-        return self._services['logging']
+            return LoggingService()
+        return self._get_or_create('logging', create)
 
     @property
     def dump(self) -> 'DumpService':
         """Dump service for q:dump"""
-        if 'dump' not in self._services:
+        def create():
             from core.features.dump.src import DumpService
-            self._services['dump'] = DumpService()
-            logger.debug("Initialized DumpService")
-        return self._services['dump']
+            return DumpService()
+        return self._get_or_create('dump', create)
 
     # ==========================================================================
     # Cache Services
@@ -217,11 +238,10 @@ class ServiceContainer:
     @property
     def expression_cache(self):
         """Expression cache for performance"""
-        if 'expression_cache' not in self._services:
+        def create():
             from runtime.expression_cache import get_expression_cache
-            self._services['expression_cache'] = get_expression_cache()
-            logger.debug("Initialized ExpressionCache")
-        return self._services['expression_cache']
+            return get_expression_cache()
+        return self._get_or_create('expression_cache', create)
 
     # ==========================================================================
     # Utility Methods
@@ -254,7 +274,8 @@ class ServiceContainer:
         Returns:
             Self for chaining
         """
-        self._services[name] = service
+        with self._lock:
+            self._services[name] = service
         return self
 
     def is_initialized(self, name: str) -> bool:
@@ -272,7 +293,11 @@ class ServiceContainer:
 
         Call this when the runtime is being destroyed.
         """
-        for name, service in self._services.items():
+        with self._lock:
+            services = list(self._services.items())
+            self._services.clear()
+
+        for name, service in services:
             if hasattr(service, 'shutdown'):
                 try:
                     service.shutdown()
@@ -280,8 +305,6 @@ class ServiceContainer:
                 except Exception as e:
                     logger.warning(f"Error shutting down {name}: {e}")
 
-        self._services.clear()
-
     def __repr__(self) -> str:
         initialized = list(self._services.keys())
         return f"ServiceContainer(initialized={initialized})"
@@ -7,24 +7,71 @@ ColdFusion-style simplicity: Just run `quantum start` and it works! 🪄
 import sys
 import os
 import re
+import time
 import hashlib
+import threading
+import weakref
 import yaml
 from pathlib import Path
-from flask import Flask, Response, request, send_from_directory, render_template_string, session, redirect, abort
-from typing import Dict, Any, Optional
+from flask import Flask, Response, request, send_from_directory, render_template_string, session, redirect, abort, stream_with_context
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field
 import secrets
 
 # Fix imports
 sys.path.append(str(Path(__file__).parent.parent))
 
 from core.parser import QuantumParser, QuantumParseError
-from core.ast_nodes import ActionNode
+from core.ast_nodes import ActionNode, ComponentNode, HTMLNode
 from runtime.component import ComponentRuntime
+from runtime.service_container import ServiceContainer
 from runtime.renderer import HTMLRenderer
 from runtime.execution_context import ExecutionContext
 from runtime.action_handler import ActionHandler
 from runtime.auth_service import AuthService, AuthorizationError
 from runtime.error_handler import ErrorHandler, QuantumError
+from runtime.expression_cache import PRODUCTION_MODE
+from runtime.ast_cache import get_ast_cache
+
+# Inline asset blocks (a <script> with a src attribute is not inline)
+_STYLE_PATTERN = re.compile(r'<style[^>]*>(.*?)</style>', re.DOTALL | re.IGNORECASE)
+_SCRIPT_PATTERN = re.compile(
+    r'<script(?![^>]*\bsrc\b)[^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE
+)
+
+# Asset tag variants memoized per page layout (conditional <style> blocks)
+_MAX_ASSET_VARIANTS = 32
+# Opening <html> tag of a rendered document
+_HTML_TAG_PATTERN = re.compile(r'<html[\s>]', re.IGNORECASE)
+
+
+def _is_loopback_host(host: str) -> bool:
+    """Whether the server is bound to localhost only"""
+    return host in ('localhost', '127.0.0.1', '::1')
+
+
+@dataclass
+class PageLayout:
+    """
+    Static page shell around a component's rendered HTML, with its inline
+    <style>/<script> blocks already extracted.
+
+    Built once per AST version by QuantumWebServer._get_page_layout().
+    Full documents get head_html/body_html inserted before </head> and
+    </body>; fragments are placed between prefix and suffix.
+    """
+    full_document: bool
+    prefix: str = ''
+    suffix: str = ''
+    head_html: str = ''
+    body_html: str = ''
+    # Shell CSS/JS that come before / after the component's own blocks
+    css_before: List[str] = field(default_factory=list)
+    css_after: List[str] = field(default_factory=list)
+    js_before: List[str] = field(default_factory=list)
+    js_after: List[str] = field(default_factory=list)
+    # (css blocks, js blocks) -> (link tag, script tag)
+    asset_tags: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], Tuple[str, str]] = field(default_factory=dict)
 
 
 class QuantumWebServer:
@@ -60,7 +107,30 @@ class QuantumWebServer:
         )
 
         self.parser = QuantumParser()
-        self.template_cache: Dict[str, Any] = {}  # AST cache
+        # Parsed components live in the process-wide ASTCache, which checks
+        # mtime/size on every hit and is bounded by performance.cache_max_size
+        # (and cache_max_memory_mb)
+        performance = self.config['performance']
+        self.ast_cache = get_ast_cache()
+        self.ast_cache.configure(
+            max_entries=performance.get('cache_max_size', 100),
+            max_memory_mb=performance.get('cache_max_memory_mb') or 0,
+            ttl=performance.get('cache_ttl') or 0,
+            cache_dir=performance.get('ast_cache_dir'),
+        )
+        self._preload_components()
+        # Page shells + extracted assets, rebuilt when the cached AST changes
+        # (weakly keyed by AST, so they go away when the AST is evicted)
+        self.layout_cache: 'weakref.WeakKeyDictionary[Any, Dict[Tuple[str, str], PageLayout]]' = \
+            weakref.WeakKeyDictionary()
+
+        # Per-stage request timings: stage -> [count, total_ms]
+        self.render_timings: Dict[str, List[float]] = {}
+        self._timings_lock = threading.Lock()
+
+        # Process-wide services shared by every request's ComponentRuntime
+        # (DB connections, job executor thread pool, LLM clients, ...)
+        self.services = ServiceContainer(self.config)
         self.action_handler = ActionHandler()
 
         # Phase F: Application scope (global state shared across all users)
@@ -103,8 +173,29 @@ class QuantumWebServer:
             },
             'performance': {
                 'cache_templates': True,
-                'cache_ttl': 300,
-                'cache_max_size': 100
+                'cache_ttl': 300,  # Seconds before a cached AST is re-parsed (0 = never)
+                'cache_max_size': 100,  # Max cached ASTs (LRU eviction)
+                'cache_max_memory_mb': None,  # Memory budget for cached ASTs (None = no budget)
+                'ast_cache_dir': None,  # Persistent .qc cache (default: .quantum/ast_cache if present)
+                'execution_mode': 'interpreted',  # or 'compiled' (closure compiler)
+                'concurrent_queries': False,  # Run independent q:query blocks at the same time
+                'stream_responses': False,  # Stream full pages while rendering
+                'stream_chunk_size': 8192,
+                'prettify_html': None  # None = only in debug, outside production
+            },
+            'database': {
+                'datasource_cache_ttl': 60,  # Seconds Admin API datasource configs are reused
+                'datasource_stale_ttl': 300,  # Serve expired configs this long while Admin is down
+                # X-Quantum-Token for /_quantum/datasources/invalidate. None only
+                # works when the server is bound to localhost, and then accepts any
+                # local request - including everything a reverse proxy on the same
+                # host forwards - so set a token behind a proxy
+                'invalidate_token': None,
+                'query_cache': {
+                    'backend': 'memory',  # 'memory' or 'redis' (REDIS_* env vars, or a 'redis' dict)
+                    'max_entries': 1000,
+                    'max_memory_mb': 64
+                }
             },
             'security': {
                 'xss_protection': True,
@@ -137,6 +228,23 @@ class QuantumWebServer:
         return default_config
 
 
+    def _preload_components(self):
+        """
+        Load every component into the AST cache at startup.
+
+        Only done with a persistent cache directory: precompiled .qc files
+        are unpickled instead of parsed, so the first request of a fresh
+        worker does not parse anything.
+        """
+        if not self.config['performance']['cache_templates'] or self.ast_cache.cache_dir is None:
+            return
+
+        components_dir = Path(self.config['paths']['components'])
+        if components_dir.is_dir():
+            files = sorted(components_dir.rglob('*.q'))[:self.ast_cache.max_entries]
+            self.ast_cache.preload(files, self.parser)
+
+
     def _setup_routes(self):
         """Setup Flask routes for serving .q components"""
 
@@ -171,12 +279,40 @@ class QuantumWebServer:
                 json.dumps({
                     'status': 'healthy',
                     'service': 'quantum',
-                    'version': '1.0.0'
+                    'version': '1.0.0',
+                    'render_timings': self.get_render_timings(),
+                    'template_cache': self.get_template_cache_stats(),
+                    'database_pools': self.get_database_pool_stats(),
+                    'datasource_cache': self.get_datasource_cache_stats(),
+                    'query_cache': self.get_query_cache_stats()
                 }),
                 status=200,
                 mimetype='application/json'
             )
 
+        @self.app.route('/_quantum/datasources/invalidate', methods=['POST'])
+        def invalidate_datasources():
+            """Quantum Admin pushes datasource changes here (body: {"name": ...}, omit for all)"""
+            import hmac
+            import json
+            token = self.config['database'].get('invalidate_token')
+            if token:
+                allowed = hmac.compare_digest(request.headers.get('X-Quantum-Token', ''), str(token))
+            else:
+                # Without a token only a localhost-bound server accepts local callers
+                allowed = (_is_loopback_host(self.config['server']['host'])
+                           and request.remote_addr in ('127.0.0.1', '::1'))
+            if not allowed:
+                return Response(json.dumps({'error': 'forbidden'}), status=403, mimetype='application/json')
+
+            name = (request.get_json(silent=True) or {}).get('name')
+            self.services.database.invalidate_datasource(name)
+            return Response(
+                json.dumps({'invalidated': name or '*'}),
+                status=200,
+                mimetype='application/json'
+            )
+
         @self.app.route('/_partial/<path:component_path>', methods=['GET', 'POST', 'PUT', 'DELETE'])
         def serve_partial(component_path):
             """
@@ -241,20 +377,17 @@ class QuantumWebServer:
                 else:
                     abort(404)
 
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+
         try:
             # Check cache
             cache_enabled = self.config['performance']['cache_templates']
             cache_key = str(file_path)
 
-            if cache_enabled and cache_key in self.template_cache:
-                ast = self.template_cache[cache_key]
-            else:
-                # Parse component
-                ast = self.parser.parse_file(str(file_path))
+            ast = self.parser.parse_file(cache_key, use_cache=cache_enabled)
 
-                # Cache if enabled
-                if cache_enabled:
-                    self.template_cache[cache_key] = ast
+            timings['load'] = time.perf_counter() - started
 
             # Phase G: Authentication & Security - Check authorization
             if 'quantum_session' not in session:
@@ -345,8 +478,10 @@ class QuantumWebServer:
             }
 
             # Execute component (runs queries, loops, functions, etc.)
-            runtime = ComponentRuntime(config=self.config)
+            stage_start = time.perf_counter()
+            runtime = ComponentRuntime(config=self.config, services=self.services)
             runtime.execute_component(ast, params)
+            timings['execute'] = time.perf_counter() - stage_start
 
             # Phase F: Sync session back to Flask session
             session['quantum_session'] = runtime.execution_context.session_vars
@@ -364,28 +499,38 @@ class QuantumWebServer:
                 print(f"[DEBUG] app_vars keys: {list(runtime.execution_context.application_vars.keys())}", flush=True)
 
             # Render to HTML using runtime's execution context
-            renderer = HTMLRenderer(runtime.execution_context)
+            renderer = HTMLRenderer(runtime.execution_context, services=self.services)
+
+            # Stream full pages chunk by chunk instead of building one string
+            if not partial and self.config['performance'].get('stream_responses'):
+                return self._stream_component(renderer, ast, component_path)
+
+            # Full pages: inline <style>/<script> blocks are collected for
+            # extraction to static files instead of being rendered
+            renderer.collect_assets = not partial
+
+            stage_start = time.perf_counter()
             html = renderer.render(ast)
+            timings['render'] = time.perf_counter() - stage_start
 
             # Phase B: For partial requests, return only component HTML
             if partial:
-                return Response(html, mimetype='text/html')
+                return self._timed_response(html, timings, started)
 
-            # For full page requests, add HTMX support
-            if '<html' in html.lower():
-                # Component already has full HTML structure - inject HTMX into it
-                full_html = self._inject_htmx(html)
-            else:
-                # Fragment component - wrap with full page + HTMX
-                full_html = self._wrap_with_htmx(html, component_path)
+            # Add HTMX support and move inline CSS/JS to external files,
+            # using the page shell built once for this AST version
+            stage_start = time.perf_counter()
+            layout = self._get_page_layout(cache_key, component_path, ast, html)
+            full_html = self._assemble_page(layout, html, renderer.inline_assets)
+            timings['layout'] = time.perf_counter() - stage_start
 
-            # Extract inline CSS and JS to external files
-            full_html = self._extract_inline_assets(full_html)
+            # Pretty-print HTML for readable View Source (skipped in production)
+            if self._should_prettify():
+                stage_start = time.perf_counter()
+                full_html = self._prettify_html(full_html)
+                timings['prettify'] = time.perf_counter() - stage_start
 
-            # Pretty-print HTML for readable View Source
-            full_html = self._prettify_html(full_html)
-
-            return Response(full_html, mimetype='text/html')
+            return self._timed_response(full_html, timings, started)
 
         except QuantumParseError as e:
             # Enhanced parse error with context
@@ -437,35 +582,245 @@ class QuantumWebServer:
                     suggestion=""
                 ), 500
 
-    def _get_static_dir(self) -> str:
-        """Resolve and ensure the static directory exists."""
-        static_dir = self.config['paths']['static']
-        if not os.path.isabs(static_dir):
-            static_dir = os.path.abspath(static_dir)
-        os.makedirs(static_dir, exist_ok=True)
-        return static_dir
+    def _stream_component(self, renderer: HTMLRenderer, ast, component_path: str) -> Response:
+        """
+        Stream a rendered page to the client (performance.stream_responses).
 
-    def _extract_inline_assets(self, html: str) -> str:
+        HTMX support is added structurally while streaming: full documents get
+        the scripts emitted before their </head> and </body> tags by the
+        renderer, fragments are streamed inside the standard HTMX page shell.
+        The <head> goes out as soon as it is closed. Inline assets are left
+        in place and the output is not prettified, since both transforms need
+        the whole document.
+
+        Args:
+            renderer: Renderer bound to the executed component's context
+            ast: Executed component AST
+            component_path: Component name (page title for fragments)
+
+        Returns:
+            Streaming Flask Response
         """
-        Extract inline <style> and <script> blocks to external files.
+        chunk_size = self.config['performance'].get('stream_chunk_size', 8192)
+
+        # Injections only apply inside <head>/<body> elements, so fragments
+        # are unaffected; whether to wrap is decided once the first chunk
+        # shows if an <html> element was rendered.
+        head_html, body_html = self._htmx_injections()
+        chunks = renderer.iter_render(
+            ast, chunk_size=chunk_size, injections={'head': head_html, 'body': body_html}
+        )
 
-        Replaces inline CSS with <link rel="stylesheet"> and inline JS
-        (without src attribute) with <script src="...">.
+        # Render the first chunk eagerly so early errors still get an error page
+        first = next(chunks, '')
+        if self._is_full_document(ast, first):
+            prefix, suffix = '', ''
+        else:
+            prefix, suffix = self._htmx_page_parts(component_path)
+        if not prefix and not first.lstrip().lower().startswith('<!doctype'):
+            prefix = '<!DOCTYPE html>\n'
+
+        def generate():
+            yield prefix + first
+            yield from chunks
+            if suffix:
+                yield suffix
+
+        return Response(stream_with_context(generate()), mimetype='text/html')
+
+    @staticmethod
+    def _is_full_document(ast, html: str = '') -> bool:
+        """
+        Check whether a component renders its own <html> document
 
         Args:
-            html: Full HTML document string
+            ast: Component AST (a top-level <html> element is a document)
+            html: Rendered HTML or its first streamed chunk, for documents
+                  produced otherwise (q:if, q:include, ...)
+        """
+        statements = ast.statements if isinstance(ast, ComponentNode) else [ast]
+        if any(isinstance(node, HTMLNode) and node.tag.lower() == 'html' for node in statements):
+            return True
+        return bool(html) and _HTML_TAG_PATTERN.search(html) is not None
+
+    def _timed_response(self, html: str, timings: Dict[str, float], started: float) -> Response:
+        """Build the HTML response with a Server-Timing header for its stages"""
+        timings['total'] = time.perf_counter() - started
+        self._record_timings(timings)
+
+        response = Response(html, mimetype='text/html')
+        response.headers['Server-Timing'] = ', '.join(
+            f'{stage};dur={seconds * 1000:.2f}' for stage, seconds in timings.items()
+        )
+        return response
+
+    def _record_timings(self, timings: Dict[str, float]):
+        """Accumulate per-stage timings for get_render_timings()"""
+        with self._timings_lock:
+            for stage, seconds in timings.items():
+                entry = self.render_timings.setdefault(stage, [0, 0.0])
+                entry[0] += 1
+                entry[1] += seconds * 1000
+
+    def get_render_timings(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-stage breakdown of component requests since startup.
+
+        Stages: load (parse or template cache), execute, render, layout
+        (HTMX shell + asset extraction), prettify, total.
 
         Returns:
-            HTML with inline assets replaced by external file references
+            {stage: {'count': n, 'total_ms': ..., 'avg_ms': ...}}
         """
-        static_dir = self._get_static_dir()
+        with self._timings_lock:
+            return {
+                stage: {
+                    'count': int(count),
+                    'total_ms': round(total_ms, 3),
+                    'avg_ms': round(total_ms / count, 3) if count else 0.0,
+                }
+                for stage, (count, total_ms) in self.render_timings.items()
+            }
+
+    def _should_prettify(self) -> bool:
+        """
+        Whether to pretty-print full pages.
+
+        performance.prettify_html forces it on or off; by default pages are
+        prettified in debug mode only and never when QUANTUM_PRODUCTION is set.
+        """
+        prettify = self.config['performance'].get('prettify_html')
+        if prettify is None:
+            return bool(self.config['server'].get('debug')) and not PRODUCTION_MODE
+        return bool(prettify)
+
+    def get_database_pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Connection pool metrics per datasource (empty until a query runs)"""
+        if not self.services.is_initialized('database'):
+            return {}
+        return self.services.database.get_pool_stats()
+
+    def get_datasource_cache_stats(self) -> Dict[str, Any]:
+        """Admin API datasource config cache metrics (empty until a query runs)"""
+        if not self.services.is_initialized('database'):
+            return {}
+        return self.services.database.datasource_cache.stats()
+
+    def get_query_cache_stats(self) -> Dict[str, Any]:
+        """q:query result cache metrics (empty until a query runs)"""
+        if not self.services.is_initialized('database'):
+            return {}
+        return self.services.database.get_query_cache_stats()
+
+    def get_template_cache_stats(self) -> Dict[str, Any]:
+        """
+        Template (AST) cache statistics for /health.
+
+        Returns:
+            CacheStats.to_dict() plus the configured limits
+        """
+        stats = self.ast_cache.stats.to_dict()
+        stats['max_entries'] = self.ast_cache.max_entries
+        stats['max_memory_mb'] = self.ast_cache.max_memory_mb
+        stats['ttl'] = self.ast_cache.ttl
+        return stats
+
+    def _get_page_layout(self, cache_key: str, component_path: str, ast, html: str = '') -> PageLayout:
+        """Get the page shell for a component, building it once per AST version"""
+        full_document = self._is_full_document(ast, html)
+        key = (cache_key, component_path, full_document)
+        layouts = self.layout_cache.get(ast)
+        if layouts is None:
+            layouts = self.layout_cache.setdefault(ast, {})
+        layout = layouts.get(key)
+        if layout is None:
+            layout = layouts[key] = self._build_page_layout(component_path, full_document)
+        return layout
+
+    def _build_page_layout(self, component_path: str, full_document: bool) -> PageLayout:
+        """Build the HTMX page shell and extract its inline CSS/JS"""
+        if full_document:
+            head_html, body_html = self._htmx_injections()
+            layout = PageLayout(full_document=True)
+            layout.head_html = self._strip_inline_assets(head_html, layout.css_before, layout.js_before)
+            layout.body_html = self._strip_inline_assets(body_html, layout.css_after, layout.js_after)
+        else:
+            prefix, suffix = self._htmx_page_parts(component_path)
+            layout = PageLayout(full_document=False)
+            layout.prefix = self._strip_inline_assets(prefix, layout.css_before, layout.js_before)
+            layout.suffix = self._strip_inline_assets(suffix, layout.css_after, layout.js_after)
+        return layout
+
+    @staticmethod
+    def _strip_inline_assets(markup: str, css: List[str], js: List[str]) -> str:
+        """Remove inline <style>/<script> blocks from markup, collecting their contents"""
+        css.extend(_STYLE_PATTERN.findall(markup))
+        markup = _STYLE_PATTERN.sub('', markup)
+        js.extend(_SCRIPT_PATTERN.findall(markup))
+        return _SCRIPT_PATTERN.sub('', markup)
+
+    def _assemble_page(self, layout: PageLayout, html: str, inline_assets: Dict[str, List[str]]) -> str:
+        """
+        Combine rendered component HTML with its page shell.
+
+        Args:
+            layout: Page shell for the component
+            html: Component HTML rendered with collect_assets enabled
+            inline_assets: The renderer's collected <style>/<script> contents
+
+        Returns:
+            Full HTML document with CSS/JS referenced as static files
+        """
+        css = (*layout.css_before, *inline_assets['style'], *layout.css_after)
+        js = (*layout.js_before, *inline_assets['script'], *layout.js_after)
+
+        tags = layout.asset_tags.get((css, js))
+        if tags is None:
+            tags = self._write_asset_files(list(css), list(js))
+            if len(layout.asset_tags) >= _MAX_ASSET_VARIANTS:
+                layout.asset_tags.clear()
+            layout.asset_tags[(css, js)] = tags
+
+        link_tag, script_tag = tags
+        head_html = f'    {link_tag}\n  ' if link_tag else ''
+        body_html = f'    {script_tag}\n  ' if script_tag else ''
+
+        if layout.full_document:
+            html = self._insert_before(html, '</head>', layout.head_html + head_html)
+            html = self._insert_before(html, '</body>', layout.body_html + body_html)
+            # Ensure DOCTYPE is present
+            if not html.lstrip().lower().startswith('<!doctype'):
+                html = '<!DOCTYPE html>\n' + html
+            return html
+
+        prefix = self._insert_before(layout.prefix, '</head>', head_html)
+        suffix = self._insert_before(layout.suffix, '</body>', body_html)
+        return prefix + html + suffix
+
+    @staticmethod
+    def _insert_before(html: str, closing_tag: str, markup: str) -> str:
+        """Insert markup before the first closing tag (lower or upper case)"""
+        if not markup:
+            return html
+        if closing_tag in html:
+            return html.replace(closing_tag, markup + closing_tag, 1)
+        upper_tag = closing_tag.upper()
+        if upper_tag in html:
+            return html.replace(upper_tag, markup + upper_tag, 1)
+        return html
 
-        # --- Extract CSS ---
-        style_pattern = re.compile(r'<style[^>]*>(.*?)</style>', re.DOTALL | re.IGNORECASE)
-        css_matches = style_pattern.findall(html)
+    def _write_asset_files(self, css_blocks: List[str], js_blocks: List[str]) -> Tuple[str, str]:
+        """
+        Write combined CSS/JS blocks to content-hashed static files.
 
-        if css_matches:
-            all_css = '\n'.join(css_matches)
+        Returns:
+            (<link> tag or '', <script src> tag or '')
+        """
+        static_dir = self._get_static_dir()
+        link_tag = script_tag = ''
+
+        if css_blocks:
+            all_css = '\n'.join(css_blocks)
             css_hash = hashlib.md5(all_css.encode()).hexdigest()[:10]
             css_filename = f'styles-{css_hash}.css'
             css_path = os.path.join(static_dir, css_filename)
@@ -474,22 +829,10 @@ class QuantumWebServer:
                 with open(css_path, 'w', encoding='utf-8') as f:
                     f.write(all_css)
 
-            html = style_pattern.sub('', html)
-
             link_tag = f'<link rel="stylesheet" href="static/{css_filename}">'
-            if '</head>' in html:
-                html = html.replace('</head>', f'    {link_tag}\n  </head>', 1)
-            elif '</HEAD>' in html:
-                html = html.replace('</HEAD>', f'    {link_tag}\n  </HEAD>', 1)
-
-        # --- Extract inline JS (skip <script src="..."> tags) ---
-        script_pattern = re.compile(
-            r'<script(?![^>]*\bsrc\b)[^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE
-        )
-        js_matches = script_pattern.findall(html)
 
-        if js_matches:
-            all_js = '\n'.join(m.strip() for m in js_matches)
+        if js_blocks:
+            all_js = '\n'.join(m.strip() for m in js_blocks)
             js_hash = hashlib.md5(all_js.encode()).hexdigest()[:10]
             js_filename = f'scripts-{js_hash}.js'
             js_path = os.path.join(static_dir, js_filename)
@@ -498,13 +841,43 @@ class QuantumWebServer:
                 with open(js_path, 'w', encoding='utf-8') as f:
                     f.write(all_js)
 
-            html = script_pattern.sub('', html)
-
             script_tag = f'<script src="static/{js_filename}"></script>'
-            if '</body>' in html:
-                html = html.replace('</body>', f'    {script_tag}\n  </body>', 1)
-            elif '</BODY>' in html:
-                html = html.replace('</BODY>', f'    {script_tag}\n  </BODY>', 1)
+
+        return link_tag, script_tag
+
+    def _get_static_dir(self) -> str:
+        """Resolve and ensure the static directory exists."""
+        static_dir = self.config['paths']['static']
+        if not os.path.isabs(static_dir):
+            static_dir = os.path.abspath(static_dir)
+        os.makedirs(static_dir, exist_ok=True)
+        return static_dir
+
+    def _extract_inline_assets(self, html: str) -> str:
+        """
+        Extract inline <style> and <script> blocks to external files.
+
+        Replaces inline CSS with <link rel="stylesheet"> and inline JS
+        (without src attribute) with <script src="...">.
+
+        Whole-document version of what _assemble_page() does with assets
+        collected by the renderer.
+
+        Args:
+            html: Full HTML document string
+
+        Returns:
+            HTML with inline assets replaced by external file references
+        """
+        css_blocks: List[str] = []
+        js_blocks: List[str] = []
+        html = self._strip_inline_assets(html, css_blocks, js_blocks)
+
+        link_tag, script_tag = self._write_asset_files(css_blocks, js_blocks)
+        if link_tag:
+            html = self._insert_before(html, '</head>', f'    {link_tag}\n  ')
+        if script_tag:
+            html = self._insert_before(html, '</body>', f'    {script_tag}\n  ')
 
         return html
 
@@ -835,20 +1208,14 @@ class QuantumWebServer:
     }})();
     </script>"""
 
-    def _inject_htmx(self, html: str) -> str:
+    def _htmx_injections(self) -> Tuple[str, str]:
         """
-        Inject HTMX scripts into an existing full HTML document.
-
-        Used when the component already renders a complete HTML page
-        (e.g. type="page" components), to avoid double-wrapping.
-
-        Args:
-            html: Full HTML document string
+        HTMX markup added to a full HTML document.
 
         Returns:
-            HTML document with HTMX script and config injected
+            (markup for the end of <head>, markup for the end of <body>)
         """
-        htmx_head = '\n    <script src="https://unpkg.com/htmx.org@1.9.10"></script>'
+        htmx_head = '\n    <script src="https://unpkg.com/htmx.org@1.9.10"></script>\n  '
 
         htmx_body = """
     <script>
@@ -863,18 +1230,34 @@ class QuantumWebServer:
         # Add hot reload script if enabled
         hot_reload_script = self._get_hot_reload_script()
 
+        return htmx_head, htmx_body + hot_reload_script + '\n  '
+
+    def _inject_htmx(self, html: str) -> str:
+        """
+        Inject HTMX scripts into an existing full HTML document.
+
+        Used when the component already renders a complete HTML page
+        (e.g. type="page" components), to avoid double-wrapping.
+
+        Args:
+            html: Full HTML document string
+
+        Returns:
+            HTML document with HTMX script and config injected
+        """
+        htmx_head, scripts = self._htmx_injections()
+
         # Inject HTMX library before </head>
         if '</head>' in html:
-            html = html.replace('</head>', htmx_head + '\n  </head>', 1)
+            html = html.replace('</head>', htmx_head + '</head>', 1)
         elif '</HEAD>' in html:
-            html = html.replace('</HEAD>', htmx_head + '\n  </HEAD>', 1)
+            html = html.replace('</HEAD>', htmx_head + '</HEAD>', 1)
 
         # Inject HTMX config and hot reload script before </body>
-        scripts = htmx_body + hot_reload_script
         if '</body>' in html:
-            html = html.replace('</body>', scripts + '\n  </body>', 1)
+            html = html.replace('</body>', scripts + '</body>', 1)
         elif '</BODY>' in html:
-            html = html.replace('</BODY>', scripts + '\n  </BODY>', 1)
+            html = html.replace('</BODY>', scripts + '</BODY>', 1)
 
         # Ensure DOCTYPE is present
         if not html.strip().lower().startswith('<!doctype'):
@@ -899,9 +1282,22 @@ class QuantumWebServer:
         Returns:
             Full HTML page with HTMX support
         """
+        prefix, suffix = self._htmx_page_parts(component_path)
+        return prefix + html + suffix
+
+    def _htmx_page_parts(self, component_path: str) -> Tuple[str, str]:
+        """
+        Split the HTMX page shell around the component HTML.
+
+        Args:
+            component_path: Component name for title
+
+        Returns:
+            (markup before the component HTML, markup after it)
+        """
         hot_reload_script = self._get_hot_reload_script()
 
-        return f"""<!DOCTYPE html>
+        prefix = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -945,7 +1341,9 @@ class QuantumWebServer:
     </style>
 </head>
 <body>
-    {html}
+    """
+
+        suffix = f"""
 
     <!-- HTMX Configuration -->
     <script>
@@ -963,6 +1361,8 @@ class QuantumWebServer:
 </body>
 </html>"""
 
+        return prefix, suffix
+
     def _render_welcome_page(self) -> Response:
         """
         Render welcome page when index.q doesn't exist.
@@ -1177,6 +1577,10 @@ class QuantumWebServer:
         print(f"Debug mode:      {self.config['server'].get('debug', False)}")
         if self.hot_reload_enabled:
             print(f"Hot Reload:      ws://localhost:{self.hot_reload_port}")
+        if not self.config['database'].get('invalidate_token') and _is_loopback_host(host):
+            print("⚠️  Warning: database.invalidate_token is not set; any local request "
+                  "(including one forwarded by a reverse proxy on this host) can "
+                  "invalidate datasources")
         print("="*60)
         print("Press Ctrl+C to stop")
         print("="*60 + "\n")
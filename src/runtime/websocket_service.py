@@ -31,6 +31,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import IntEnum
 
+from runtime.query_stream import json_default
+
 logger = logging.getLogger(__name__)
 
 
@@ -326,7 +328,7 @@ class WebSocketService:
                 # Serialize if needed
                 send_data = data
                 if msg_type == "json" and not isinstance(data, str):
-                    send_data = json.dumps(data, default=str)
+                    send_data = json.dumps(data, default=json_default)
 
                 message = WebSocketMessage(
                     connection_id=conn.id,
@@ -552,6 +552,47 @@ class TestComponentIntegration:
 
         runtime.job_executor.shutdown()
 
+    def test_parse_thread_isolation(self):
+        from core.parser import QuantumParser
+
+        parser = QuantumParser()
+        xml = '''<?xml version="1.0" encoding="UTF-8"?>
+        <q:component name="Test" xmlns:q="https://quantum.lang/ns">
+            <q:thread name="worker" isolation="process" timeout="30s">
+                <q:set name="status" value="running" />
+            </q:thread>
+        </q:component>
+        '''
+
+        thread = parser.parse(xml).statements[0]
+        assert thread.isolation == "process"
+        assert thread.validate() == []
+
+    def test_thread_timeout_stops_body(self):
+        from core.parser import QuantumParser
+        from runtime.component import ComponentRuntime
+
+        parser = QuantumParser()
+        xml = '''<?xml version="1.0" encoding="UTF-8"?>
+        <q:component name="Test" xmlns:q="https://quantum.lang/ns">
+            <q:thread name="sleeper" timeout="1s">
+                <q:loop type="range" var="i" from="1" to="100000000">
+                    <q:set name="x" value="{i}" />
+                </q:loop>
+            </q:thread>
+        </q:component>
+        '''
+
+        runtime = ComponentRuntime()
+        started = time.monotonic()
+        runtime.execute_component(parser.parse(xml))
+        with pytest.raises(ThreadError, match="Timed out after 1s"):
+            runtime.job_executor.thread.join_thread("sleeper", timeout=10)
+        assert time.monotonic() - started < 5
+        assert runtime.job_executor.thread.get_thread("sleeper").status == "terminated"
+
+        runtime.job_executor.shutdown()
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
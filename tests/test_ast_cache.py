@@ -4,10 +4,12 @@ Tests for AST Cache - Phase 2 Performance Optimization
 Tests cover:
 - Basic cache operations (get, put, invalidate)
 - Mtime-based invalidation
-- LRU eviction
+- LRU eviction (recency order, resizing) and TTL expiry
+- Memory accounting (parser footprint, byte-budget eviction)
 - Dependency tracking
 - Thread safety
 - Statistics tracking
+- Persistent .qc cache (atomic writes, precompile, server preload)
 """
 
 import pytest
@@ -26,9 +28,22 @@ from runtime.ast_cache import (
     ASTCacheWatcher,
     get_ast_cache,
     invalidate_ast_cache,
+    parser_fingerprint,
+    QC_MAGIC,
 )
 
 
+@pytest.fixture
+def q_files(tmp_path):
+    """Five small .q files"""
+    files = []
+    for i in range(5):
+        path = tmp_path / f'test{i}.q'
+        path.write_text(f'<q:component name="Test{i}"/>')
+        files.append(str(path))
+    return files
+
+
 class TestCacheStats:
     """Tests for CacheStats dataclass"""
 
@@ -518,6 +533,351 @@ class TestGlobalCache:
             os.unlink(f.name)
 
 
+class TestLRUOrderAndTTL:
+    """Tests for recency-ordered eviction, resizing and TTL"""
+
+    def test_hit_refreshes_recency(self, q_files):
+        cache = ASTCache(max_entries=3)
+        for f in q_files[:3]:
+            cache.put(f, Mock())
+
+        cache.get(q_files[0])
+        cache.put(q_files[3], Mock())
+
+        assert cache.get(q_files[1]) is None
+        assert cache.get(q_files[0]) is not None
+
+    def test_replacing_entry_does_not_evict(self, q_files):
+        cache = ASTCache(max_entries=2)
+        cache.put(q_files[0], Mock())
+        cache.put(q_files[1], Mock())
+        cache.put(q_files[1], Mock())
+
+        assert cache.stats.evictions == 0
+        assert cache.get(q_files[0]) is not None
+
+    def test_configure_shrinks_cache(self, q_files):
+        cache = ASTCache(max_entries=10)
+        for f in q_files:
+            cache.put(f, Mock())
+
+        cache.configure(max_entries=2)
+
+        assert cache.max_entries == 2
+        assert cache.stats.entries_count == 2
+        assert cache.stats.evictions == 3
+        assert cache.get(q_files[4]) is not None
+
+    def test_ttl_expiry(self, q_files):
+        cache = ASTCache(ttl=60)
+        cache.put(q_files[0], Mock())
+
+        assert cache.get(q_files[0]) is not None
+        with patch('runtime.ast_cache.time.time', return_value=time.time() + 61):
+            assert cache.get(q_files[0]) is None
+
+        assert cache.stats.expirations == 1
+        assert cache.stats.to_dict()['expirations'] == 1
+
+    def test_configure_ttl(self):
+        cache = ASTCache()
+        assert cache.ttl is None
+
+        cache.configure(ttl=30)
+        assert cache.ttl == 30
+        assert cache.cache_info()['ttl'] == 30
+
+        cache.configure(ttl=0)
+        assert cache.ttl is None
+
+    def test_eviction_drops_compiled_program(self, q_files):
+        cache = ASTCache(max_entries=1)
+        ast = Mock()
+        cache.put(q_files[0], ast)
+        cache.get_compiled(ast, lambda node: 'program')
+
+        cache.put(q_files[1], Mock())
+
+        assert ast not in cache._compiled
+
+
+class TestWebServerTemplateCache:
+    """QuantumWebServer serves components through the shared ASTCache"""
+
+    @pytest.fixture
+    def server(self, tmp_path, monkeypatch):
+        import yaml
+        import runtime.ast_cache as module
+        from runtime.web_server import QuantumWebServer
+
+        module._global_cache = None
+        components = tmp_path / 'components'
+        components.mkdir()
+        for name in ('one', 'two', 'three'):
+            (components / f'{name}.q').write_text(
+                f'<q:component name="{name}"><p>{name} v1</p></q:component>'
+            )
+
+        config_path = tmp_path / 'quantum.config.yaml'
+        config_path.write_text(yaml.safe_dump({
+            'paths': {'components': str(components), 'static': str(tmp_path / 'static')},
+            'performance': {'cache_max_size': 2, 'cache_ttl': 120},
+        }))
+
+        monkeypatch.chdir(tmp_path)
+        server = QuantumWebServer(config_path=str(config_path))
+        server.app.config['TESTING'] = True
+        yield server
+        module._global_cache = None
+
+    def test_uses_configured_shared_cache(self, server):
+        assert server.ast_cache is get_ast_cache()
+        assert server.ast_cache.max_entries == 2
+        assert server.ast_cache.ttl == 120
+
+    def test_edited_component_is_reparsed(self, server, tmp_path):
+        client = server.app.test_client()
+        assert 'one v1' in client.get('/_partial/one').get_data(as_text=True)
+
+        path = tmp_path / 'components' / 'one.q'
+        path.write_text('<q:component name="one"><p>one v2 (edited)</p></q:component>')
+
+        assert 'one v2' in client.get('/_partial/one').get_data(as_text=True)
+        assert server.ast_cache.stats.invalidations == 1
+
+    def test_cache_is_bounded(self, server):
+        client = server.app.test_client()
+        for name in ('one', 'two', 'three', 'three'):
+            client.get(f'/_partial/{name}')
+
+        stats = server.ast_cache.stats
+        assert stats.entries_count == 2
+        assert stats.evictions == 1
+        assert stats.hits == 1
+
+    def test_health_reports_cache_stats(self, server):
+        import json
+
+        client = server.app.test_client()
+        client.get('/_partial/one')
+        client.get('/_partial/one')
+
+        stats = json.loads(client.get('/health').get_data(as_text=True))['template_cache']
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['max_entries'] == 2
+        assert stats['ttl'] == 120
+
+
+class TestMemoryAccounting:
+    """Tests for footprint-based memory accounting and the memory budget"""
+
+    KB = 1024
+
+    def test_parser_records_footprint(self):
+        from core.parser import QuantumParser
+        parser = QuantumParser(use_cache=False)
+
+        small = parser.parse('<q:component name="S"><p>Hi</p></q:component>')
+        large = parser.parse(
+            '<q:component name="L">' + '<p class="row">Some text</p>' * 50 + '</q:component>'
+        )
+
+        assert 0 < small.memory_footprint < large.memory_footprint
+
+    def test_no_pickling_on_put(self, q_files):
+        cache = ASTCache()
+
+        with patch('runtime.ast_cache.pickle.dumps') as dumps:
+            cache.put(q_files[0], Mock(memory_footprint=4 * self.KB))
+
+        dumps.assert_not_called()
+        assert cache.memory_bytes == 4 * self.KB
+
+    def test_memory_estimate_follows_entries(self, q_files):
+        cache = ASTCache()
+        cache.put(q_files[0], Mock(memory_footprint=100 * self.KB))
+        cache.put(q_files[1], Mock(memory_footprint=50 * self.KB))
+        assert cache.stats.memory_estimate_kb == 150
+
+        cache.put(q_files[1], Mock(memory_footprint=20 * self.KB))
+        assert cache.stats.memory_estimate_kb == 120
+
+        cache.invalidate(q_files[0])
+        assert cache.stats.memory_estimate_kb == 20
+
+        cache.clear()
+        assert cache.memory_bytes == 0
+
+    def test_unknown_footprint_uses_default(self, q_files):
+        cache = ASTCache()
+        cache.put(q_files[0], object())
+
+        assert cache.memory_bytes == 10 * self.KB
+
+    def test_memory_budget_eviction(self, q_files):
+        cache = ASTCache(max_entries=100, max_memory_mb=1)
+        for f in q_files[:3]:
+            cache.put(f, Mock(memory_footprint=400 * self.KB))
+
+        assert cache.stats.entries_count == 2
+        assert cache.stats.evictions == 1
+        assert cache.get(q_files[0]) is None
+        assert cache.memory_bytes == 800 * self.KB
+
+    def test_configure_memory_budget(self, q_files):
+        cache = ASTCache()
+        for f in q_files:
+            cache.put(f, Mock(memory_footprint=300 * self.KB))
+
+        cache.configure(max_memory_mb=1)
+
+        assert cache.max_memory_mb == 1
+        assert cache.stats.entries_count == 3
+        assert cache.get(q_files[4]) is not None
+
+        cache.configure(max_memory_mb=0)
+        assert cache.max_memory_mb is None
+
+    def test_cache_info_footprint(self, q_files):
+        cache = ASTCache(max_memory_mb=2)
+        cache.put(q_files[0], Mock(memory_footprint=12345))
+
+        info = cache.cache_info()
+        assert info['entries'][0]['footprint_bytes'] == 12345
+        assert info['memory_bytes'] == 12345
+        assert info['max_memory_mb'] == 2
+
+
+class TestPersistentCache:
+    """Tests for the persistent .qc cache directory"""
+
+    SOURCE = '<q:component name="Disk"><q:set name="x" value="1" /><p>{x}</p></q:component>'
+
+    @pytest.fixture
+    def q_file(self, tmp_path):
+        path = tmp_path / 'disk.q'
+        path.write_text(self.SOURCE)
+        return path
+
+    @pytest.fixture
+    def cache_dir(self, tmp_path):
+        return tmp_path / 'ast_cache'
+
+    @pytest.fixture
+    def parser(self):
+        from core.parser import QuantumParser
+        return QuantumParser(use_cache=False)
+
+    def test_shared_across_instances(self, q_file, cache_dir, parser):
+        first = ASTCache(cache_dir=cache_dir)
+        ast = first.get_or_parse(q_file, parser)
+
+        assert first.stats.disk_writes == 1
+        assert len(list(cache_dir.glob('*.qc'))) == 1
+        assert not list(cache_dir.glob('*.tmp'))
+
+        second = ASTCache(cache_dir=cache_dir)
+        fresh_parser = Mock()
+        loaded = second.get_or_parse(q_file, fresh_parser)
+
+        fresh_parser.parse.assert_not_called()
+        assert second.stats.disk_hits == 1
+        assert type(loaded) is type(ast)
+        assert loaded.name == 'Disk'
+
+    def test_edited_source_gets_new_file(self, q_file, cache_dir, parser):
+        ASTCache(cache_dir=cache_dir).get_or_parse(q_file, parser)
+        q_file.write_text(self.SOURCE.replace('Disk', 'Edited'))
+
+        ast = ASTCache(cache_dir=cache_dir).get_or_parse(q_file, parser)
+
+        assert ast.name == 'Edited'
+        assert len(list(cache_dir.glob('*.qc'))) == 2
+
+    def test_corrupt_file_is_reparsed(self, q_file, cache_dir, parser):
+        ASTCache(cache_dir=cache_dir).get_or_parse(q_file, parser)
+        qc_file = next(cache_dir.glob('*.qc'))
+        qc_file.write_bytes(QC_MAGIC + b'truncated')
+
+        cache = ASTCache(cache_dir=cache_dir)
+        assert cache.get_or_parse(q_file, parser).name == 'Disk'
+        assert cache.stats.disk_hits == 0
+        assert qc_file.read_bytes() != QC_MAGIC + b'truncated'
+
+    def test_unpicklable_ast_is_not_persisted(self, q_file, cache_dir):
+        parser = Mock()
+        parser.parse = Mock(return_value=lambda: None)
+        cache = ASTCache(cache_dir=cache_dir)
+
+        assert cache.get_or_parse(q_file, parser) is not None
+        assert cache.stats.disk_writes == 0
+        assert not list(cache_dir.glob('*.tmp'))
+
+    def test_precompile(self, tmp_path, q_file, cache_dir, parser):
+        broken = tmp_path / 'broken.q'
+        broken.write_text('<q:component name="Broken">')
+        cache = ASTCache(cache_dir=cache_dir)
+
+        result = cache.precompile([q_file, broken], parser)
+        assert result['compiled'] == 1
+        assert result['failed'][0][0] == str(broken)
+
+        result = cache.precompile([q_file], parser)
+        assert result['compiled'] == 0
+        assert result['cached'] == 1
+
+    def test_precompile_prunes_stale_files(self, q_file, cache_dir, parser):
+        cache = ASTCache(cache_dir=cache_dir)
+        cache.precompile([q_file], parser)
+        q_file.write_text(self.SOURCE.replace('Disk', 'Edited'))
+
+        result = cache.precompile([q_file], parser, prune=True)
+
+        assert result['pruned'] == 1
+        assert len(list(cache_dir.glob('*.qc'))) == 1
+
+    def test_precompile_requires_cache_dir(self, q_file, parser):
+        with pytest.raises(ValueError):
+            ASTCache().precompile([q_file], parser)
+
+    def test_fingerprint_is_stable(self):
+        assert parser_fingerprint() == parser_fingerprint()
+        assert len(parser_fingerprint()) == 64
+
+    def test_default_dir_from_environment(self, tmp_path, monkeypatch):
+        import runtime.ast_cache as module
+        monkeypatch.setattr(module, '_global_cache', None)
+        monkeypatch.setenv('QUANTUM_AST_CACHE_DIR', str(tmp_path / 'qc'))
+
+        assert get_ast_cache().cache_dir == tmp_path / 'qc'
+
+    def test_server_preloads_components(self, tmp_path, cache_dir, parser, monkeypatch):
+        import yaml
+        import runtime.ast_cache as module
+        from runtime.web_server import QuantumWebServer
+
+        components = tmp_path / 'components'
+        components.mkdir()
+        (components / 'page.q').write_text(self.SOURCE)
+        ASTCache(cache_dir=cache_dir).precompile([components / 'page.q'], parser)
+
+        config_path = tmp_path / 'quantum.config.yaml'
+        config_path.write_text(yaml.safe_dump({
+            'paths': {'components': str(components), 'static': str(tmp_path / 'static')},
+            'performance': {'ast_cache_dir': str(cache_dir)},
+        }))
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(module, '_global_cache', None)
+
+        server = QuantumWebServer(config_path=str(config_path))
+        assert server.ast_cache.stats.disk_hits == 1
+
+        response = server.app.test_client().get('/_partial/page')
+        assert response.get_data(as_text=True) == '<p>1</p>'
+        assert server.ast_cache.stats.hits == 1
+
+
 class TestPreload:
     """Tests for cache preloading"""
 
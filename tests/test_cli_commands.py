@@ -65,6 +65,19 @@ app:
             # Should fail or warn about no project
             # The exact behavior depends on implementation
 
+    def test_build_precompile(self, runner, project_dir, monkeypatch):
+        """Test --precompile fills the persistent AST cache."""
+        import runtime.ast_cache as ast_cache
+        from cli.commands.build import build
+
+        monkeypatch.chdir(project_dir)
+        monkeypatch.setattr(ast_cache, '_global_cache', None)
+
+        result = runner.invoke(build, ['--precompile'])
+
+        assert result.exit_code == 0
+        assert len(list((project_dir / '.quantum' / 'ast_cache').glob('*.qc'))) == 1
+
     def test_build_targets(self, runner):
         """Test build target options."""
         from cli.commands.build import TARGETS
@@ -0,0 +1,222 @@
+"""
+Tests for the closure compiler ("compiled" execution mode)
+
+Tests cover:
+- Compiled and interpreted execution producing the same results
+- Interpreter fallback for nodes the compiler does not handle
+- Failing compiled statements raise instead of re-running through the interpreter
+- Early return from q:if
+- Compiled programs cached beside the AST in ASTCache
+- ExpressionCache.compile() / evaluate_compiled()
+- execution_mode validation
+"""
+
+import pytest
+from pathlib import Path
+
+from runtime.ast_cache import ASTCache
+from runtime.closure_compiler import CompiledComponent, compile_component
+from runtime.component import ComponentExecutionError, ComponentRuntime
+from runtime.expression_cache import ExpressionCache
+
+
+CONTROL_FLOW_COMPONENT = '''<q:component name="ControlFlow">
+    <q:param name="rows" type="array" />
+    <q:set name="items" value="[1, 2, 3, 4, 5]" type="array" />
+    <q:set name="sum" value="0" type="number" />
+    <q:loop type="array" items="{items}" var="item">
+        <q:set name="sum" value="{sum + item}" type="number" />
+    </q:loop>
+    <q:set name="score" value="85" type="number" />
+    <q:set name="grade" value="" />
+    <q:if condition="score >= 90">
+        <q:set name="grade" value="A" />
+        <q:elseif condition="score >= 80">
+            <q:set name="grade" value="B" />
+        </q:elseif>
+        <q:else>
+            <q:set name="grade" value="C" />
+        </q:else>
+    </q:if>
+    <q:loop type="range" var="i" from="1" to="3">
+        <q:set name="last" value="{i * 2}" />
+    </q:loop>
+    <q:loop type="list" var="x" items="a,b,c" index="n">
+        <q:set name="lx" value="{x}-{n}" />
+    </q:loop>
+    <q:set name="names" value="" />
+    <q:loop type="query" query="rows" var="r">
+        <q:set name="names" value="{names}{name}," />
+    </q:loop>
+    <div><p>{sum}</p></div>
+    <q:return value="{sum}" />
+</q:component>'''
+
+
+EXAMPLES_DIR = Path(__file__).parent.parent / 'examples'
+
+
+def _run(ast, mode, params=None):
+    runtime = ComponentRuntime(execution_mode=mode)
+    result = runtime.execute_component(ast, params)
+    return result, runtime.execution_context.get_all_variables()
+
+
+class TestCompiledExecution:
+    """Compiled mode must behave exactly like the interpreter"""
+
+    @pytest.fixture
+    def control_flow_ast(self, parser):
+        return parser.parse(CONTROL_FLOW_COMPONENT)
+
+    def test_matches_interpreter(self, control_flow_ast):
+        params = {'rows': [{'name': 'a'}, {'name': 'b'}]}
+
+        interpreted = _run(control_flow_ast, 'interpreted', params)
+        compiled = _run(control_flow_ast, 'compiled', params)
+
+        assert compiled == interpreted
+        result, variables = compiled
+        assert result == 15
+        assert variables['grade'] == 'B'
+        assert variables['last'] == '6'
+        assert variables['lx'] == 'c-2'
+        assert variables['names'] == 'a,b,'
+
+    @pytest.mark.parametrize('example', [
+        'test-conditionals-complete.q',
+        'test-elseif.q',
+        'test-loop-array.q',
+        'test-loop-all-types.q',
+        'test-loop-range.q',
+        'test-set-with-loop.q',
+    ])
+    def test_examples_match_interpreter(self, parser, example):
+        ast = parser.parse_file(str(EXAMPLES_DIR / example))
+
+        assert _run(ast, 'compiled') == _run(ast, 'interpreted')
+
+    def test_program_is_reused_across_requests(self, control_flow_ast):
+        params = {'rows': [{'name': 'a'}]}
+        first = _run(control_flow_ast, 'compiled', params)
+        second = _run(control_flow_ast, 'compiled', params)
+
+        assert first == second
+
+    def test_unsupported_nodes_fall_back_to_interpreter(self, parser):
+        ast = parser.parse('''<q:component name="Fallback">
+            <q:set name="count" value="3" type="number" />
+            <q:log level="info" message="count is {count}" />
+            <q:set name="items" value="[]" type="array" />
+            <q:set name="items" operation="append" value="x" />
+            <q:return value="{count}" />
+        </q:component>''')
+
+        assert _run(ast, 'compiled') == _run(ast, 'interpreted')
+
+    def test_failed_statement_not_rerun(self, parser):
+        ast = parser.parse('''<q:component name="Partial">
+            <q:set name="items" value="[]" type="array" />
+            <q:loop type="range" var="i" from="1" to="3">
+                <q:set name="items" operation="append" value="{i}" />
+                <q:set name="bad" value="abc" type="number" />
+            </q:loop>
+        </q:component>''')
+        runtime = ComponentRuntime(execution_mode='compiled')
+
+        with pytest.raises(ComponentExecutionError):
+            runtime.execute_component(ast)
+        # The first iteration's append ran once; the loop was not redone
+        assert len(runtime.execution_context.get_variable('items')) == 1
+
+    def test_if_return_exits_early(self, parser):
+        ast = parser.parse('''<q:component name="EarlyReturn">
+            <q:set name="n" value="7" type="number" />
+            <q:if condition="{n} > 5">
+                <q:return value="big" />
+            </q:if>
+            <q:return value="small" />
+        </q:component>''')
+
+        assert _run(ast, 'compiled')[0] == 'big'
+        assert _run(ast, 'interpreted')[0] == 'big'
+
+    def test_compile_component_skips_render_only_nodes(self, parser):
+        ast = parser.parse('''<q:component name="Markup">
+            <div><p>Hello</p></div>
+            <q:set name="x" value="1" />
+        </q:component>''')
+
+        program = compile_component(ast)
+
+        assert isinstance(program, CompiledComponent)
+        assert len(program._steps) == 1
+
+    def test_invalid_execution_mode(self):
+        with pytest.raises(ValueError):
+            ComponentRuntime(execution_mode='jit')
+
+    def test_execution_mode_from_config(self):
+        runtime = ComponentRuntime(config={'performance': {'execution_mode': 'compiled'}})
+        assert runtime.execution_mode == 'compiled'
+        assert ComponentRuntime().execution_mode == 'interpreted'
+
+
+class TestCompiledCache:
+    """Tests for ASTCache.get_compiled()"""
+
+    @pytest.fixture
+    def cache(self):
+        return ASTCache(max_entries=10)
+
+    @pytest.fixture
+    def ast(self, parser):
+        return parser.parse(CONTROL_FLOW_COMPONENT)
+
+    def test_compiles_once(self, cache, ast):
+        first = cache.get_compiled(ast, compile_component)
+        second = cache.get_compiled(ast, compile_component)
+
+        assert first is second
+        assert cache.stats.compilations == 1
+        assert cache.stats.to_dict()['compilations'] == 1
+
+    def test_invalidate_drops_compiled_program(self, cache, ast, tmp_path):
+        path = tmp_path / 'ControlFlow.q'
+        path.write_text(CONTROL_FLOW_COMPONENT)
+        cache.put(str(path), ast)
+        cache.get_compiled(ast, compile_component)
+
+        assert cache.cache_info()['entries'][0]['compiled'] is True
+
+        cache.invalidate(str(path))
+        cache.get_compiled(ast, compile_component)
+        assert cache.stats.compilations == 2
+
+    def test_clear_drops_compiled_programs(self, cache, ast):
+        cache.get_compiled(ast, compile_component)
+        cache.clear()
+        cache.get_compiled(ast, compile_component)
+
+        assert cache.stats.compilations == 2
+
+
+class TestExpressionCompile:
+    """Tests for ExpressionCache.compile() / evaluate_compiled()"""
+
+    def test_compile_and_evaluate(self):
+        cache = ExpressionCache()
+        code = cache.compile('a + b * 2')
+
+        assert code is cache.compile('a + b * 2')
+        assert cache.evaluate_compiled(code, {'a': 1, 'b': 3}) == 7
+
+    def test_compile_invalid_expression(self):
+        assert ExpressionCache().compile('a +') is None
+
+    def test_evaluate_compiled_raises(self):
+        cache = ExpressionCache()
+        code = cache.compile('missing + 1')
+
+        with pytest.raises(NameError):
+            cache.evaluate_compiled(code, {})
@@ -0,0 +1,224 @@
+"""
+Tests for async query execution and concurrent independent q:query blocks
+
+Tests cover:
+- Dependency analysis of q:query params (which queries may run together)
+- DatabaseService.execute_concurrently() on worker threads (no async driver)
+- The native aiosqlite path of execute_query_async()
+- performance.concurrent_queries in ComponentRuntime (interpreted and compiled)
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from core.ast_nodes import QueryNode, QueryParamNode
+from runtime.async_database import async_driver
+from runtime.component import ComponentExecutionError, ComponentRuntime
+from runtime.concurrent_queries import plan_concurrent_queries, referenced_variables
+from runtime.database_service import DatabaseService, compile_sql
+from runtime.service_container import ServiceContainer
+
+
+SLEEP = 0.2
+
+
+def _service(tmp_path, **options):
+    service = DatabaseService(local_datasources={
+        'db': {'type': 'sqlite', 'database': str(tmp_path / 'concurrent.db'), **options}
+    })
+    service.execute_query('db', "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    service.execute_query('db', "INSERT INTO items (name) VALUES ('a'), ('b'), ('c')")
+    return service
+
+
+@pytest.fixture
+def threaded(tmp_path, monkeypatch):
+    """Service without the async driver, with a slow(x) SQL function"""
+    service = _service(tmp_path, async_driver=False)
+    create = service._create_sqlite_connection
+
+    def create_slow(config):
+        conn = create(config)
+        conn.create_function('slow', 1, lambda value: time.sleep(SLEEP) or value)
+        return conn
+
+    monkeypatch.setattr(service, '_create_sqlite_connection', create_slow)
+    service.close_all_connections()  # Reopen the pool with slow() registered
+    yield service
+    service.shutdown()
+
+
+def _query(name, sql="SELECT 1", **params):
+    node = QueryNode(name, 'db', sql)
+    for param_name, value in params.items():
+        node.add_param(QueryParamNode(param_name, value, 'integer'))
+    return node
+
+
+class TestPlanning:
+    """Tests for plan_concurrent_queries"""
+
+    def test_referenced_variables(self):
+        assert referenced_variables("{user.id}") == {'user'}
+        assert referenced_variables("{items[0].id + offset}") == {'items', 'offset'}
+        assert referenced_variables("{name == 'a.b'}") == {'name'}
+        assert referenced_variables("42") == set()
+
+    def test_independent_queries_batched(self):
+        statements = [_query('a'), _query('b', id='{userId}'), _query('c')]
+        assert plan_concurrent_queries(statements, 0) == statements
+
+    def test_dependent_query_splits_batch(self):
+        statements = [_query('user'), _query('orders', uid='{user.id}'), _query('other')]
+        assert plan_concurrent_queries(statements, 0) == statements[:1]
+        assert plan_concurrent_queries(statements, 1) == statements[1:]
+
+        statements = [_query('a'), _query('b', n='{a_result.recordCount}')]
+        assert len(plan_concurrent_queries(statements, 0)) == 1
+
+    def test_only_plain_reads(self):
+        write = _query('w', "UPDATE items SET name = 'x'")
+        paged = _query('p')
+        paged.paginate = True
+        qoq = QueryNode('q', None, "SELECT * FROM a")
+        qoq.source = 'a'
+        for statement in (write, paged, qoq):
+            batch = plan_concurrent_queries([_query('a'), statement, _query('b')], 0)
+            assert [query.name for query in batch] == ['a']
+
+    def test_numeric_dialect(self):
+        sql, names = compile_sql("SELECT * FROM t WHERE a = :a AND b = :b OR a = :a AND c = '%'", 'numeric')
+        assert sql == "SELECT * FROM t WHERE a = $1 AND b = $2 OR a = $3 AND c = '%'"
+        assert names == ('a', 'b', 'a')
+
+
+class TestExecuteConcurrently:
+    """Tests for DatabaseService.execute_concurrently"""
+
+    def test_runs_at_the_same_time(self, threaded):
+        queries = [
+            {'datasource_name': 'db', 'sql': "SELECT slow(id) AS id FROM items WHERE id = :id", 'params': {'id': i}}
+            for i in (1, 2, 3)
+        ]
+        start = time.perf_counter()
+        results = threaded.execute_concurrently(queries)
+        elapsed = time.perf_counter() - start
+
+        assert [result.data[0]['id'] for result in results] == [1, 2, 3]
+        assert elapsed < SLEEP * 2.5
+
+    def test_errors_returned_in_place(self, threaded):
+        results = threaded.execute_concurrently([
+            {'datasource_name': 'db', 'sql': "SELECT 1 AS one"},
+            {'datasource_name': 'db', 'sql': "SELECT * FROM missing"},
+        ])
+        assert results[0].data == [{'one': 1}]
+        assert isinstance(results[1], Exception)
+
+    def test_transaction_runs_in_order(self, threaded):
+        transaction = threaded.begin_transaction('db')
+        threaded.execute_query('db', "INSERT INTO items (name) VALUES ('d')")
+        results = threaded.execute_concurrently([
+            {'datasource_name': 'db', 'sql': "SELECT COUNT(*) AS n FROM items"},
+        ])
+        threaded.rollback_transaction(transaction)
+        assert results[0].data[0]['n'] == 4
+
+
+class TestAiosqlite:
+    """Tests for the native async driver path"""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        pytest.importorskip('aiosqlite')
+        service = _service(tmp_path)
+        yield service
+        service.shutdown()
+
+    def test_driver_selection(self, service):
+        assert async_driver(service.get_datasource_config('db')) == 'aiosqlite'
+        assert async_driver({'type': 'sqlite', 'database': ':memory:'}) is None
+        assert async_driver({'type': 'sqlite', 'database': 'x.db', 'async_driver': False}) is None
+
+    def test_execute_query_async_from_another_loop(self, service):
+        async def run():
+            return await service.execute_query_async(
+                'db', "SELECT id, name FROM items WHERE id >= :low ORDER BY id", {'low': 2}
+            )
+
+        result = asyncio.run(run())
+        assert result.column_list == ['id', 'name']
+        assert [row.name for row in result.data] == ['b', 'c']
+
+    def test_cache_and_writes(self, service):
+        read = {'datasource_name': 'db', 'sql': "SELECT COUNT(*) AS n FROM items", 'cache_ttl': 60}
+        service.execute_concurrently([read])
+        assert service.execute_concurrently([read])[0].cached
+
+        write, = service.execute_concurrently([
+            {'datasource_name': 'db', 'sql': "INSERT INTO items (name) VALUES (:name)", 'params': {'name': 'd'}}
+        ])
+        assert write.affected_rows == 1
+        assert write.last_insert_id == 4
+        result = service.execute_concurrently([read])[0]
+        assert not result.cached
+        assert result.data[0]['n'] == 4
+
+    def test_max_rows(self, service):
+        result, = service.execute_concurrently([
+            {'datasource_name': 'db', 'sql': "SELECT id FROM items", 'max_rows': 2}
+        ])
+        assert result.record_count == 2
+
+
+PAGE_COMPONENT = '''<q:component name="Dashboard" xmlns:q="https://quantum.lang/ns">
+    <q:query name="first" datasource="db">SELECT slow(id) AS id, name FROM items WHERE id = 1</q:query>
+    <q:query name="second" datasource="db">SELECT slow(id) AS id FROM items WHERE id = 2</q:query>
+    <q:query name="third" datasource="db">SELECT slow(COUNT(*)) AS total FROM items</q:query>
+    <q:query name="named" datasource="db">
+        SELECT name FROM items WHERE id = :id
+        <q:param name="id" value="{second.id}" type="integer" />
+    </q:query>
+</q:component>'''
+
+
+class TestComponentConcurrency:
+    """Tests for performance.concurrent_queries"""
+
+    def _run(self, parser, service, source, enabled=True, mode='interpreted'):
+        services = ServiceContainer()
+        services._services['database'] = service
+        runtime = ComponentRuntime(config={'performance': {'concurrent_queries': enabled}}, services=services,
+                                   execution_mode=mode)
+        start = time.perf_counter()
+        runtime.execute_component(parser.parse(source))
+        return runtime.execution_context, time.perf_counter() - start
+
+    def test_independent_queries_overlap(self, parser, threaded):
+        context, elapsed = self._run(parser, threaded, PAGE_COMPONENT)
+        assert context.get_variable('first.name') == 'a'
+        assert context.get_variable('third.total') == 3
+        # The dependent query runs after the batch and sees its result
+        assert context.get_variable('named.name') == 'b'
+        assert context.get_variable('second_result')['recordCount'] == 1
+        assert elapsed < SLEEP * 2.5
+
+    def test_compiled_mode_overlaps(self, parser, threaded):
+        context, elapsed = self._run(parser, threaded, PAGE_COMPONENT, mode='compiled')
+        assert context.get_variable('first.name') == 'a'
+        assert context.get_variable('named.name') == 'b'
+        assert elapsed < SLEEP * 2.5
+
+    def test_disabled_by_default(self, parser, threaded):
+        _, elapsed = self._run(parser, threaded, PAGE_COMPONENT, enabled=False)
+        assert elapsed >= SLEEP * 3
+
+    def test_first_error_raised(self, parser, threaded):
+        source = '''<q:component name="Broken" xmlns:q="https://quantum.lang/ns">
+            <q:query name="ok" datasource="db">SELECT 1 AS one</q:query>
+            <q:query name="bad" datasource="db">SELECT * FROM missing</q:query>
+        </q:component>'''
+        with pytest.raises(ComponentExecutionError, match="'bad'"):
+            self._run(parser, threaded, source)
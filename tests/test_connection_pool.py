@@ -0,0 +1,324 @@
+"""
+Tests for the per-datasource connection pool
+
+Tests cover:
+- Bounded size, overflow and checkout timeout
+- Waiters woken on checkin
+- LIFO reuse and idle reaping above min_size
+- Pre-ping only after pre_ping_interval, dead connection replacement
+- Per-thread pinning (transaction affinity)
+- DatabaseService running concurrent sqlite queries through one pool
+"""
+
+import threading
+import time
+
+import pytest
+
+from runtime.connection_pool import ConnectionPool, PoolClosedError, PoolTimeoutError
+from runtime.database_service import DatabaseConnectionError, DatabaseService
+
+
+class FakeConnection:
+    """Minimal DB-API stand-in"""
+
+    _ids = 0
+
+    def __init__(self):
+        FakeConnection._ids += 1
+        self.id = FakeConnection._ids
+        self.alive = True
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _pool(**kwargs):
+    opened = []
+
+    def factory():
+        conn = FakeConnection()
+        opened.append(conn)
+        return conn
+
+    pings = []
+
+    def ping(conn):
+        pings.append(conn)
+        return conn.alive
+
+    options = {'pool_size': 2, 'max_overflow': 1, 'timeout': 0.2}
+    options.update(kwargs)
+    pool = ConnectionPool('test', factory, ping=ping, **options)
+    return pool, opened, pings
+
+
+class TestSizing:
+    """Tests for pool bounds and waiting"""
+
+    def test_connections_opened_lazily_and_reused(self):
+        pool, opened, _ = _pool()
+
+        assert opened == []
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+
+        assert first is second
+        assert len(opened) == 1
+
+    def test_lifo_reuse(self):
+        pool, _, _ = _pool()
+        first, second = pool._checkout(), pool._checkout()
+        pool._checkin(second)
+        pool._checkin(first)
+
+        # The connection returned last is handed out first
+        with pool.connection() as conn:
+            assert conn is first.connection
+
+    def test_overflow_closed_on_checkin(self):
+        pool, opened, _ = _pool()
+        checked_out = [pool._checkout() for _ in range(3)]
+
+        assert pool.stats()['size'] == 3
+        for entry in checked_out:
+            pool._checkin(entry)
+
+        stats = pool.stats()
+        assert stats['size'] == 2
+        assert stats['idle'] == 2
+        assert sum(conn.closed for conn in opened) == 1
+
+    def test_timeout_when_exhausted(self):
+        pool, _, _ = _pool(pool_size=1, max_overflow=0, timeout=0.05)
+        entry = pool._checkout()
+
+        with pytest.raises(PoolTimeoutError):
+            pool._checkout()
+
+        pool._checkin(entry)
+        assert pool.stats()['timeouts'] == 1
+
+    def test_waiter_woken_on_checkin(self):
+        pool, _, _ = _pool(pool_size=1, max_overflow=0, timeout=5)
+        entry = pool._checkout()
+        got = []
+
+        def worker():
+            with pool.connection() as conn:
+                got.append(conn)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        while pool.stats()['waiters'] == 0:
+            time.sleep(0.001)
+        pool._checkin(entry)
+        thread.join(2)
+
+        assert got == [entry.connection]
+        assert pool.stats()['max_wait_ms'] > 0
+
+    def test_failed_factory_releases_slot(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError('refused')
+            return FakeConnection()
+
+        pool = ConnectionPool('test', factory, pool_size=1, max_overflow=0, timeout=0.05)
+        with pytest.raises(RuntimeError):
+            pool._checkout()
+
+        with pool.connection() as conn:
+            assert isinstance(conn, FakeConnection)
+
+    def test_closed_pool_rejects_checkout(self):
+        pool, opened, _ = _pool()
+        with pool.connection():
+            pass
+        pool.close()
+
+        assert opened[0].closed
+        with pytest.raises(PoolClosedError):
+            pool._checkout()
+
+
+class TestHealth:
+    """Tests for reaping and pre-ping"""
+
+    def test_idle_connections_reaped_above_min_size(self):
+        pool, opened, _ = _pool(min_size=1, idle_timeout=0.01)
+        entries = [pool._checkout(), pool._checkout()]
+        for entry in entries:
+            pool._checkin(entry)
+        time.sleep(0.02)
+
+        assert pool.reap() == 1
+        assert pool.stats()['size'] == 1
+        # The least recently used connection is the one closed
+        assert opened[0].closed and not opened[1].closed
+
+    def test_no_ping_within_interval(self):
+        pool, _, pings = _pool(pre_ping_interval=60)
+        for _ in range(5):
+            with pool.connection():
+                pass
+
+        assert pings == []
+
+    def test_dead_connection_replaced(self):
+        pool, opened, pings = _pool(pre_ping_interval=0)
+        with pool.connection() as conn:
+            pass
+        conn.alive = False
+
+        with pool.connection() as replacement:
+            pass
+
+        assert replacement is not conn
+        assert conn.closed
+        assert pings == [conn]
+        assert pool.stats()['ping_failures'] == 1
+
+    def test_dead_connection_discarded_after_error(self):
+        pool, _, _ = _pool()
+        with pytest.raises(ValueError):
+            with pool.connection() as conn:
+                conn.alive = False
+                raise ValueError('lost')
+
+        assert conn.closed
+        assert pool.stats()['size'] == 0
+
+
+class TestPinning:
+    """Tests for per-thread connection affinity"""
+
+    def test_pinned_connection_used_by_thread(self):
+        pool, _, _ = _pool()
+        pinned = pool.pin()
+        pool.pin()
+
+        with pool.connection() as conn:
+            assert conn is pinned
+        pool.unpin()
+        assert pool.pinned
+
+        pool.unpin()
+        assert not pool.pinned
+        assert pool.stats()['in_use'] == 0
+
+    def test_pin_is_per_thread(self):
+        pool, _, _ = _pool()
+        pinned = pool.pin()
+        other = []
+
+        def worker():
+            with pool.connection() as conn:
+                other.append(conn)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join(2)
+        pool.unpin()
+
+        assert other and other[0] is not pinned
+
+
+class TestDatabaseService:
+    """Tests for DatabaseService on top of the pool"""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        service = DatabaseService(local_datasources={
+            'main': {
+                'driver': 'sqlite',
+                'database': str(tmp_path / 'pool.db'),
+                'pool_size': 2,
+                'max_overflow': 2,
+                'pool_timeout': 5,
+            }
+        })
+        service.execute_query('main', 'CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)')
+        yield service
+        service.shutdown()
+
+    def test_pool_settings_from_datasource(self, service):
+        stats = service.get_pool_stats()['main']
+
+        assert stats['max_size'] == 4
+        assert stats['in_use'] == 0
+
+    def test_concurrent_queries_share_pool(self, service):
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(10):
+                    service.execute_query('main', 'INSERT INTO items (name) VALUES (:name)', {'name': f'{n}-{i}'})
+                    service.execute_query('main', 'SELECT COUNT(*) AS total FROM items')
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        assert errors == []
+        result = service.execute_query('main', 'SELECT COUNT(*) AS total FROM items')
+        assert result.data == [{'total': 80}]
+        stats = service.get_pool_stats()['main']
+        assert stats['size'] <= 4
+        assert stats['created'] <= 4
+
+    def test_transaction_pins_connection(self, service):
+        transaction = service.begin_transaction('main')
+        config = service.get_datasource_config('main')
+        conn = service.get_connection(config)
+
+        with service.connection(config) as inner:
+            assert inner is conn
+        assert service.get_pool_stats()['main']['in_use'] == 1
+        service.commit_transaction(transaction)
+
+        assert service.get_pool_stats()['main']['in_use'] == 0
+        service.close_connection('main')
+        assert service.get_pool_stats() == {}
+
+    def test_memory_database_uses_single_connection(self):
+        service = DatabaseService(local_datasources={'mem': {'driver': 'sqlite', 'database': ':memory:'}})
+        service.execute_query('mem', 'CREATE TABLE t (x INTEGER)')
+        service.execute_query('mem', 'INSERT INTO t VALUES (1)')
+
+        assert service.execute_query('mem', 'SELECT x FROM t').data == [{'x': 1}]
+        assert service.get_pool_stats()['mem']['max_size'] == 1
+        service.shutdown()
+
+    def test_exhausted_pool_raises_connection_error(self, tmp_path):
+        service = DatabaseService(local_datasources={
+            'tiny': {'driver': 'sqlite', 'database': str(tmp_path / 't.db'),
+                     'pool_size': 1, 'max_overflow': 0, 'pool_timeout': 0.05}
+        })
+        config = service.get_datasource_config('tiny')
+        service.get_connection(config)
+
+        def worker(errors):
+            try:
+                service.execute_query('tiny', 'SELECT 1')
+            except DatabaseConnectionError as e:
+                errors.append(e)
+
+        errors = []
+        thread = threading.Thread(target=worker, args=(errors,))
+        thread.start()
+        thread.join(2)
+        service.shutdown()
+
+        assert len(errors) == 1
@@ -0,0 +1,147 @@
+"""
+Tests for pre-tokenized databinding templates
+
+Tests cover:
+- Classification of {expressions} into binding kinds
+- Template segments built once at parse time
+- Rendering through HTMLRenderer (raw values, interpolation, errors)
+- Compiled arithmetic bindings
+- Pickling templates with compiled code
+"""
+
+import pickle
+
+import pytest
+
+from core.ast_nodes import HTMLNode, TextNode
+from core.databinding import (
+    Binding,
+    BindingTemplate,
+    ExpressionBinding,
+    IndexBinding,
+    PathBinding,
+    VariableBinding,
+    compile_binding,
+    compile_template,
+)
+from runtime.renderer import HTMLRenderer
+
+
+class TestCompileTemplate:
+    """Tests for compile_template() and compile_binding()"""
+
+    @pytest.mark.parametrize('expression, kind', [
+        ('name', VariableBinding),
+        ('user.address.city', PathBinding),
+        ('items.length', PathBinding),
+        ('items[0]', IndexBinding),
+        ('products[2].name', IndexBinding),
+        ('price * quantity', ExpressionBinding),
+        ('count > 0', ExpressionBinding),
+    ])
+    def test_binding_kinds(self, expression, kind):
+        assert type(compile_binding(expression)) is kind
+
+    def test_binding_is_abstract(self):
+        with pytest.raises(TypeError):
+            Binding('name')
+
+    def test_arithmetic_is_precompiled(self):
+        assert compile_binding('price * quantity').code is not None
+        assert compile_binding('count > 0').code is None
+
+    def test_mixed_content_segments(self):
+        template = compile_template('Hello {name}, {count} new')
+
+        assert template.single is None
+        assert template.segments[0] == 'Hello '
+        assert isinstance(template.segments[1], VariableBinding)
+        assert template.segments[2] == ', '
+        assert template.segments[4] == ' new'
+
+    def test_single_expression(self):
+        template = compile_template('  {items}  ')
+
+        assert isinstance(template.single, VariableBinding)
+        assert template.segments == []
+
+    def test_static_text(self):
+        template = compile_template('no bindings here')
+
+        assert template.has_bindings is False
+        assert template.render(None) == 'no bindings here'
+
+    def test_templates_are_shared(self):
+        assert compile_template('{a} and {b}') is compile_template('{a} and {b}')
+
+    def test_pickle_recompiles_expression(self):
+        template = compile_template('Total: {price * quantity}')
+        restored = pickle.loads(pickle.dumps(template))
+
+        assert isinstance(restored, BindingTemplate)
+        assert restored.segments[1].code is not None
+
+
+class TestParsedNodes:
+    """Templates are stored on nodes when they are built by the parser"""
+
+    def test_text_node_template(self, parser):
+        ast = parser.parse('<q:component name="T"><p>Hi {name}</p></q:component>')
+        text = ast.statements[0].children[0]
+
+        assert isinstance(text.template, BindingTemplate)
+        assert text.template.source == 'Hi {name}'
+
+    def test_plain_text_has_no_template(self):
+        assert TextNode('Hello').template is None
+
+    def test_html_attribute_templates(self):
+        node = HTMLNode('a', {'href': '/users/{user.id}', 'class': 'link'})
+
+        assert set(node.attribute_templates) == {'href'}
+
+
+class TestTemplateRendering:
+    """Rendering pre-tokenized templates through HTMLRenderer"""
+
+    @pytest.fixture
+    def renderer(self, execution_context):
+        execution_context.set_variable('name', 'John')
+        execution_context.set_variable('price', 2.5)
+        execution_context.set_variable('quantity', 3)
+        execution_context.set_variable('items', [{'title': 'First'}, {'title': 'Second'}])
+        execution_context.set_variable('user', {'id': 7, 'address': {'city': 'Paris'}})
+        return HTMLRenderer(execution_context)
+
+    def test_variable_path_and_index(self, renderer):
+        node = TextNode('{name} lives in {user.address.city}; {items[1].title} of {items.length}')
+        assert renderer.render(node) == 'John lives in Paris; Second of 2'
+
+    def test_single_expression_returns_raw_value(self, renderer):
+        assert renderer._apply_databinding('{items}') == [{'title': 'First'}, {'title': 'Second'}]
+        assert renderer._apply_databinding('{price * quantity}') == 7.5
+
+    def test_unresolved_bindings(self, renderer):
+        assert renderer._apply_databinding('{missing}') == '{missing}'
+        assert renderer._apply_databinding('a {missing} b') == 'a {ERROR: missing} b'
+        assert renderer._apply_databinding('{user.zip}') == '{user.zip}'
+
+    def test_comparison_uses_renderer_evaluator(self, renderer):
+        assert renderer._apply_databinding('{quantity > 2}') is True
+
+    def test_attribute_templates(self, renderer):
+        node = HTMLNode('a', {'href': '/users/{user.id}', 'title': '{name}'})
+        assert renderer.render(node) == '<a href="/users/7" title="John"></a>'
+
+    def test_mutated_content_is_retokenized(self, renderer):
+        node = TextNode('Hello {name}')
+        node.content = 'Bye {name}'
+
+        assert renderer.render(node) == 'Bye John'
+
+    def test_reflects_context_changes(self, renderer, execution_context):
+        node = TextNode('Hello {name}')
+        assert renderer.render(node) == 'Hello John'
+
+        execution_context.set_variable('name', 'Jane')
+        assert renderer.render(node) == 'Hello Jane'
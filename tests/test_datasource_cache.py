@@ -0,0 +1,319 @@
+"""
+Tests for the Admin API datasource config cache
+
+Tests cover:
+- Hits within ttl, refetch after expiry, ttl=0 disables caching
+- Single-flight fetch for concurrent misses
+- Background refresh ahead of expiry
+- Stale-while-error for transient failures only
+- invalidate() and on_change
+- DatabaseService resolving Admin API datasources through the cache
+- Access to POST /_quantum/datasources/invalidate
+"""
+
+import threading
+import time
+
+import pytest
+
+from runtime.database_service import (
+    AdminAPIUnavailableError,
+    DatabaseConnectionError,
+    DatabaseService,
+)
+from runtime.datasource_cache import DatasourceConfigCache
+
+
+class Unavailable(Exception):
+    pass
+
+
+class FakeAdmin:
+    """Fetch callable that records calls and can be told to fail"""
+
+    def __init__(self, delay: float = 0):
+        self.calls = []
+        self.delay = delay
+        self.error = None
+        self.version = 1
+
+    def __call__(self, name):
+        self.calls.append(name)
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {'name': name, 'type': 'sqlite', 'version': self.version}
+
+
+def _cache(admin, **kwargs):
+    options = {'ttl': 60, 'stale_ttl': 300, 'transient_errors': (Unavailable,)}
+    options.update(kwargs)
+    return DatasourceConfigCache(fetch=admin, **options)
+
+
+class TestCaching:
+    """Tests for ttl handling"""
+
+    def test_hit_within_ttl(self):
+        admin = FakeAdmin()
+        cache = _cache(admin)
+
+        assert cache.get('orders') == cache.get('orders')
+        assert admin.calls == ['orders']
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+
+    def test_refetch_after_expiry(self):
+        admin = FakeAdmin()
+        cache = _cache(admin, ttl=0.05, refresh_ahead=1.0)
+
+        cache.get('orders')
+        time.sleep(0.08)
+        admin.version = 2
+        assert cache.get('orders')['version'] == 2
+        assert len(admin.calls) == 2
+
+    def test_zero_ttl_disables_cache(self):
+        admin = FakeAdmin()
+        cache = _cache(admin, ttl=0)
+
+        cache.get('orders')
+        cache.get('orders')
+        assert len(admin.calls) == 2
+
+    def test_single_flight(self):
+        admin = FakeAdmin(delay=0.1)
+        cache = _cache(admin)
+        results = []
+
+        def worker():
+            results.append(cache.get('orders'))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert admin.calls == ['orders']
+        assert len(results) == 8
+
+    def test_background_refresh(self):
+        admin = FakeAdmin()
+        cache = _cache(admin, ttl=0.2, refresh_ahead=0.25)
+
+        cache.get('orders')
+        time.sleep(0.08)
+        admin.version = 2
+        # Served from cache while the refresh runs
+        assert cache.get('orders')['version'] == 1
+
+        deadline = time.monotonic() + 1
+        while cache.get('orders')['version'] != 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert cache.get('orders')['version'] == 2
+        assert cache.stats()['refreshes'] >= 1
+
+
+class TestErrors:
+    """Tests for stale-while-error"""
+
+    def test_stale_served_on_transient_error(self):
+        admin = FakeAdmin()
+        cache = _cache(admin, ttl=0.05, refresh_ahead=1.0)
+
+        cache.get('orders')
+        time.sleep(0.08)
+        admin.error = Unavailable('admin down')
+        assert cache.get('orders')['version'] == 1
+        assert cache.stats()['stale_served'] == 1
+
+    def test_stale_window_expires(self):
+        admin = FakeAdmin()
+        cache = _cache(admin, ttl=0.05, stale_ttl=0.05, refresh_ahead=1.0)
+
+        cache.get('orders')
+        time.sleep(0.12)
+        admin.error = Unavailable('admin down')
+        with pytest.raises(Unavailable):
+            cache.get('orders')
+
+    def test_authoritative_error_drops_entry(self):
+        admin = FakeAdmin()
+        cache = _cache(admin, ttl=0.05, refresh_ahead=1.0)
+
+        cache.get('orders')
+        time.sleep(0.08)
+        admin.error = LookupError('not found')
+        with pytest.raises(LookupError):
+            cache.get('orders')
+        assert cache.stats()['size'] == 0
+
+    def test_error_without_entry_raises(self):
+        admin = FakeAdmin()
+        admin.error = Unavailable('admin down')
+        cache = _cache(admin)
+
+        with pytest.raises(Unavailable):
+            cache.get('orders')
+
+
+class TestInvalidation:
+    """Tests for invalidate() and on_change"""
+
+    def test_invalidate_one(self):
+        admin = FakeAdmin()
+        cache = _cache(admin)
+
+        cache.get('orders')
+        cache.get('users')
+        cache.invalidate('orders')
+        cache.get('orders')
+        cache.get('users')
+        assert admin.calls == ['orders', 'users', 'orders']
+
+    def test_invalidate_all(self):
+        admin = FakeAdmin()
+        cache = _cache(admin)
+
+        cache.get('orders')
+        cache.get('users')
+        cache.invalidate()
+        cache.get('orders')
+        cache.get('users')
+        assert len(admin.calls) == 4
+
+    def test_invalidated_entry_served_while_admin_down(self):
+        admin = FakeAdmin()
+        cache = _cache(admin)
+
+        cache.get('orders')
+        cache.invalidate('orders')
+        admin.error = Unavailable('admin down')
+        assert cache.get('orders')['version'] == 1
+
+    def test_on_change_called_for_new_config(self):
+        admin = FakeAdmin()
+        changed = []
+        cache = _cache(admin, on_change=changed.append)
+
+        cache.get('orders')
+        cache.invalidate('orders')
+        cache.get('orders')
+        assert changed == []
+
+        admin.version = 2
+        cache.invalidate('orders')
+        cache.get('orders')
+        assert changed == ['orders']
+
+
+class TestDatabaseService:
+    """Tests for Admin API resolution in DatabaseService"""
+
+    def test_admin_config_cached(self, monkeypatch):
+        service = DatabaseService()
+        calls = []
+
+        def fetch(name):
+            calls.append(name)
+            return {'type': 'sqlite', 'database': ':memory:'}
+
+        monkeypatch.setattr(service.datasource_cache, '_fetch', fetch)
+        service.get_datasource_config('remote')
+        service.get_datasource_config('remote')
+        assert calls == ['remote']
+
+    def test_local_datasource_skips_cache(self):
+        service = DatabaseService(local_datasources={
+            'local': {'type': 'sqlite', 'database': ':memory:'}
+        })
+        assert service.get_datasource_config('local')['type'] == 'sqlite'
+        assert service.datasource_cache.stats()['misses'] == 0
+
+    def test_unreachable_admin_is_transient(self):
+        service = DatabaseService(admin_api_url='http://127.0.0.1:9')
+        with pytest.raises(AdminAPIUnavailableError):
+            service.get_datasource_config('remote')
+        assert issubclass(AdminAPIUnavailableError, DatabaseConnectionError)
+
+    def test_changed_config_retires_pool(self, monkeypatch, tmp_path):
+        service = DatabaseService()
+        version = {'database': str(tmp_path / 'a.db')}
+        monkeypatch.setattr(
+            service.datasource_cache, '_fetch',
+            lambda name: {'name': name, 'type': 'sqlite', **version}
+        )
+
+        service.execute_query('remote', 'SELECT 1 AS one')
+        pool = service._pools['remote']
+
+        version['database'] = str(tmp_path / 'b.db')
+        service.invalidate_datasource('remote')
+        service.get_datasource_config('remote')
+        assert 'remote' not in service._pools
+        assert pool.closed
+
+    def test_changed_config_retires_async_pool(self, monkeypatch, tmp_path):
+        service = DatabaseService()
+        version = {'database': str(tmp_path / 'a.db')}
+        monkeypatch.setattr(
+            service.datasource_cache, '_fetch',
+            lambda name: {'name': name, 'type': 'postgresql', **version}
+        )
+        pools = []
+
+        class FakePool:
+            closed = False
+
+            def close(self):
+                self.closed = True
+
+        async def create_pool(config, driver):
+            pools.append(FakePool())
+            return pools[-1]
+
+        runner = service.async_runner
+        monkeypatch.setattr(runner, '_create_pool', create_pool)
+        config = service.get_datasource_config('remote')
+        runner.submit(runner._pool(config, 'asyncpg')).result(timeout=5)
+
+        version['database'] = str(tmp_path / 'b.db')
+        service.invalidate_datasource('remote')
+        config = service.get_datasource_config('remote')
+        # The next query builds a new pool from the changed config
+        assert runner.submit(runner._pool(config, 'asyncpg')).result(timeout=5) is pools[1]
+        assert pools[0].closed
+        assert not pools[1].closed
+        service.shutdown()
+
+
+class TestInvalidateEndpoint:
+    """Tests for POST /_quantum/datasources/invalidate"""
+
+    URL = '/_quantum/datasources/invalidate'
+
+    def _client(self, host, token=None):
+        from runtime.web_server import QuantumWebServer
+        server = QuantumWebServer()
+        server.config['server']['host'] = host
+        server.config['database']['invalidate_token'] = token
+        return server.app.test_client()
+
+    def test_token_required_when_not_bound_to_localhost(self):
+        client = self._client('0.0.0.0')
+        assert client.post(self.URL, json={}).status_code == 403
+
+    def test_localhost_binding_accepts_local_callers(self):
+        client = self._client('127.0.0.1')
+        assert client.post(self.URL, json={'name': 'db'}).get_json() == {'invalidated': 'db'}
+        remote = client.post(self.URL, json={}, environ_base={'REMOTE_ADDR': '10.0.0.5'})
+        assert remote.status_code == 403
+
+    def test_token_checked(self):
+        client = self._client('0.0.0.0', token='secret')
+        assert client.post(self.URL, json={}).status_code == 403
+        response = client.post(self.URL, json={}, headers={'X-Quantum-Token': 'secret'})
+        assert response.get_json() == {'invalidated': '*'}
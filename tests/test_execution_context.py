@@ -0,0 +1,167 @@
+"""
+Tests for ExecutionContext variable views
+
+Tests cover:
+- Live VariableView reflecting writes without rebuilding
+- Lookup priority matching get_all_variables()
+- Prefixed scope keys (session.x, application.x, request.x)
+- View invalidation when a scope dict is replaced
+- Version counter bumps on writes
+- Loop block scopes (push_scope/pop_scope, lazy row fields)
+"""
+
+import pytest
+
+from runtime.execution_context import LoopScope, VariableView
+
+
+class TestVariableView:
+    """Tests for ExecutionContext.variables"""
+
+    def test_view_is_cached(self, execution_context):
+        assert execution_context.variables is execution_context.variables
+
+    def test_view_sees_later_writes(self, execution_context):
+        view = execution_context.variables
+        execution_context.set_variable('x', 1)
+        execution_context.set_variable('total', 10, scope='component')
+
+        assert view['x'] == 1
+        assert view.get('total') == 10
+        assert 'missing' not in view
+        assert view.get('missing', 'default') == 'default'
+        assert execution_context.variables is view
+
+    def test_priority_matches_get_all_variables(self, execution_context):
+        execution_context.set_variable('name', 'session', scope='session')
+        execution_context.set_variable('name', 'application', scope='application')
+        execution_context.set_variable('name', 'component', scope='component')
+        child = execution_context.create_child_context()
+        child.set_variable('name', 'function', scope='function')
+
+        assert child.variables['name'] == 'function'
+        child.set_variable('name', 'local')
+        assert child.variables['name'] == 'local'
+        assert dict(child.variables) == child.get_all_variables()
+
+    def test_parent_variables_visible_in_child(self, execution_context):
+        execution_context.set_variable('outer', 1)
+        child = execution_context.create_child_context()
+        child.set_variable('inner', 2)
+
+        assert child.variables['outer'] == 1
+        assert child.variables['inner'] == 2
+        assert 'inner' not in execution_context.variables
+
+    def test_prefixed_scope_keys(self, execution_context):
+        execution_context.set_variable('session.userId', 42)
+        execution_context.set_variable('request.path', '/home')
+
+        view = execution_context.variables
+        assert view['session.userId'] == 42
+        assert view['userId'] == 42
+        assert view['request.path'] == '/home'
+        assert 'application.userId' not in view
+
+    def test_replacing_scope_dict_invalidates_view(self, execution_context):
+        child = execution_context.create_child_context()
+        old_view = child.variables
+
+        execution_context.session_vars = {'user': 'alice'}
+
+        assert child.variables is not old_view
+        assert child.variables['user'] == 'alice'
+        assert child.variables['session.user'] == 'alice'
+
+    def test_view_is_read_only(self, execution_context):
+        with pytest.raises(TypeError):
+            execution_context.variables['x'] = 1
+
+    def test_get_all_variables_returns_mutable_copy(self, execution_context):
+        execution_context.set_variable('x', 1)
+        flat = execution_context.get_all_variables()
+        flat['x'] = 99
+
+        assert isinstance(flat, dict)
+        assert execution_context.get_variable('x') == 1
+
+    def test_copy_flattens_view(self, execution_context):
+        execution_context.set_variable('a', 1)
+        execution_context.set_variable('b', 2, scope='session')
+
+        flat = execution_context.variables.copy()
+        assert flat == {'a': 1, 'b': 2, 'session.b': 2}
+        assert isinstance(execution_context.variables, VariableView)
+
+
+class TestContextVersion:
+    """Tests for ExecutionContext.version"""
+
+    def test_writes_bump_version(self, execution_context):
+        start = execution_context.version
+        execution_context.set_variable('x', 1)
+        execution_context.update_variable('x', 2)
+        execution_context.delete_variable('x')
+
+        assert execution_context.version == start + 3
+
+    def test_version_shared_across_tree(self, execution_context):
+        child = execution_context.create_child_context()
+        start = execution_context.version
+        child.set_variable('x', 1)
+
+        assert execution_context.version == start + 1
+        assert child.version == execution_context.version
+
+
+class TestLoopScope:
+    """Tests for LoopScope and ExecutionContext.push_scope()"""
+
+    def test_bindings_shadow_local_vars(self, execution_context):
+        execution_context.set_variable('i', 'outer')
+        scope = LoopScope()
+        execution_context.push_scope(scope)
+        scope.bindings['i'] = 1
+
+        assert execution_context.get_variable('i') == 1
+        assert execution_context.variables['i'] == 1
+
+        execution_context.pop_scope()
+        assert execution_context.get_variable('i') == 'outer'
+
+    def test_row_fields_resolve_against_current_row(self):
+        scope = LoopScope('users')
+        scope.row = {'id': 1, 'name': 'Alice'}
+
+        assert scope['name'] == 'Alice'
+        assert scope['users.id'] == 1
+        assert scope['currentRow'] == {'id': 1, 'name': 'Alice'}
+
+        scope.row = {'id': 2, 'name': 'Bob'}
+        assert scope['users.name'] == 'Bob'
+        assert 'users.email' not in scope
+        assert 'email' not in scope
+
+    def test_scope_keys(self):
+        scope = LoopScope('users')
+        scope.row = {'id': 1}
+        scope.bindings['index'] = 0
+
+        assert dict(scope) == {'index': 0, 'users.id': 1, 'id': 1, 'currentRow': {'id': 1}}
+
+    def test_scope_visible_from_child_context(self, execution_context):
+        scope = LoopScope()
+        scope.bindings['item'] = 'x'
+        execution_context.push_scope(scope)
+        child = execution_context.create_child_context()
+
+        assert child.get_variable('item') == 'x'
+        assert child.variables['item'] == 'x'
+
+    def test_writes_inside_scope_go_to_regular_scopes(self, execution_context):
+        scope = LoopScope()
+        execution_context.push_scope(scope)
+        execution_context.set_variable('total', 5)
+        execution_context.pop_scope()
+
+        assert execution_context.get_variable('total') == 5
@@ -2,6 +2,7 @@
 Tests for Job Execution System (q:schedule, q:thread, q:job)
 """
 
+import functools
 import pytest
 import time
 import threading
@@ -15,8 +16,25 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 from runtime.job_executor import (
     parse_duration, format_duration,
     ScheduleService, ThreadService, JobQueueService, JobExecutor,
-    ScheduleError, ThreadError, JobQueueError
+    ScheduleError, ThreadError, JobQueueError,
+    DeadlineScheduler, current_cancellation_token
 )
+from runtime.job_stores import SQLiteJobStore
+
+
+# Process-isolated bodies are pickled into a forkserver/spawn child, so
+# they must be module-level functions
+def _add(a, b):
+    return a + b
+
+
+def _divide_by_zero():
+    return 1 / 0
+
+
+def _runaway():
+    while True:
+        pass
 
 
 class TestParseDuration:
@@ -188,6 +206,173 @@ class TestThreadService:
 
         service.shutdown()
 
+    def test_timeout_cancels_cooperative_body(self):
+        service = ThreadService(max_workers=2)
+        stopped = threading.Event()
+
+        def task():
+            token = current_cancellation_token()
+            while not token.wait(0.01):
+                pass
+            stopped.set()
+            token.raise_if_cancelled()
+
+        service.run_thread("slow", task, timeout="1s")
+        assert stopped.wait(3)
+        with pytest.raises(ThreadError, match="Timed out after 1s"):
+            service.join_thread("slow", timeout=2)
+        info = service.get_thread("slow")
+        assert info.status == "terminated"
+        assert info.error == "Timed out after 1s"
+        assert 0.9 < info.wall_time < 2
+
+        service.shutdown()
+
+    def test_timeouts_share_one_timer_thread(self):
+        service = ThreadService(max_workers=20)
+        before = threading.active_count()
+
+        for n in range(20):
+            service.run_thread(f"timed-{n}", lambda: time.sleep(0.2), timeout="1m")
+        time.sleep(0.1)
+
+        timers = [t for t in threading.enumerate() if t.name == "quantum-deadlines"]
+        assert len(timers) == 1
+        assert threading.active_count() - before <= 21
+        for n in range(20):
+            service.join_thread(f"timed-{n}", timeout=5)
+        # Finished threads drop their deadline
+        assert len(service._deadlines) == 0
+
+        service.shutdown()
+
+    def test_terminate_cancels_token(self):
+        service = ThreadService(max_workers=2)
+        started = threading.Event()
+        completed = []
+
+        def task():
+            started.set()
+            current_cancellation_token().wait(5)
+            current_cancellation_token().raise_if_cancelled()
+
+        service.run_thread("stoppable", task, on_complete=completed.append)
+        assert started.wait(2)
+        assert service.terminate_thread("stoppable")
+        assert not service.terminate_thread("stoppable")
+
+        with pytest.raises(ThreadError, match="Terminated"):
+            service.join_thread("stoppable", timeout=2)
+        assert service.get_thread("stoppable").status == "terminated"
+        assert completed == []
+
+        service.shutdown()
+
+    def test_records_queue_wait_and_wall_time(self):
+        service = ThreadService(max_workers=1)
+
+        service.run_thread("first", lambda: time.sleep(0.2))
+        service.run_thread("second", lambda: None)
+        service.join_thread("first", timeout=2)
+        service.join_thread("second", timeout=2)
+
+        first = service.get_thread("first")
+        second = service.get_thread("second")
+        assert first.wall_time >= 0.2
+        assert first.queue_wait < 0.1
+        assert second.queue_wait >= 0.15
+        assert second.finished_at >= first.finished_at
+
+        service.shutdown()
+
+    def test_process_isolation_returns_result(self):
+        service = ThreadService(max_workers=2)
+
+        service.run_thread("isolated", functools.partial(_add, 40, 2), isolation="process")
+        assert service.join_thread("isolated", timeout=10) == 42
+        assert service.get_thread("isolated").isolation == "process"
+
+        service.run_thread("isolated-error", _divide_by_zero, isolation="process")
+        with pytest.raises(ThreadError, match="division by zero"):
+            service.join_thread("isolated-error", timeout=10)
+        assert service.get_thread("isolated-error").status == "failed"
+
+        service.shutdown()
+
+    def test_process_isolation_kills_runaway_body(self):
+        service = ThreadService(max_workers=2)
+
+        started = time.monotonic()
+        service.run_thread("runaway", _runaway, timeout="1s", isolation="process")
+        with pytest.raises(ThreadError, match="Timed out"):
+            service.join_thread("runaway", timeout=10)
+        assert time.monotonic() - started < 5
+        assert service.get_thread("runaway").status == "terminated"
+        assert not service._processes
+
+        service.shutdown()
+
+    def test_process_isolated_component_thread(self, parser):
+        from runtime.component import ComponentRuntime
+        runtime = ComponentRuntime({})
+        runtime.execute_component(parser.parse('''
+            <q:component name="Isolated">
+              <q:set name="base" value="40" type="number" />
+              <q:thread name="calc" isolation="process">
+                <q:set name="answer" value="{base + 2}" type="number" />
+              </q:thread>
+              <q:thread name="calc" action="join" />
+            </q:component>
+        '''))
+
+        thread = runtime.job_executor.thread.get_thread("calc")
+        assert thread.isolation == "process"
+        assert thread.status == "completed"
+        runtime.job_executor.thread.shutdown()
+
+    def test_process_isolation_rejects_unpicklable_body(self):
+        service = ThreadService(max_workers=1)
+        offset = 40
+
+        service.run_thread("closure", lambda: offset + 2, isolation="process")
+        with pytest.raises(ThreadError):
+            service.join_thread("closure", timeout=10)
+
+        service.shutdown()
+
+    def test_invalid_isolation(self):
+        service = ThreadService(max_workers=1)
+
+        with pytest.raises(ThreadError):
+            service.run_thread("invalid", lambda: None, isolation="container")
+
+        service.shutdown()
+
+
+class TestDeadlineScheduler:
+    """Tests for the shared deadline timer"""
+
+    def test_runs_callbacks_in_due_order(self):
+        scheduler = DeadlineScheduler()
+        fired = []
+        done = threading.Event()
+
+        scheduler.schedule(0.2, lambda: (fired.append("late"), done.set()))
+        scheduler.schedule(0.05, lambda: fired.append("early"))
+        assert done.wait(2)
+        assert fired == ["early", "late"]
+
+    def test_cancelled_deadline_does_not_fire(self):
+        scheduler = DeadlineScheduler()
+        fired = []
+
+        handle = scheduler.schedule(0.05, lambda: fired.append("cancelled"))
+        scheduler.schedule(0.1, lambda: fired.append("kept"))
+        scheduler.cancel(handle)
+        time.sleep(0.3)
+        assert fired == ["kept"]
+        assert len(scheduler) == 0
+
 
 class TestJobQueueService:
     """Tests for JobQueueService"""
@@ -281,6 +466,147 @@ class TestJobQueueService:
         assert len(job_ids) == 3
 
 
+class TestJobQueueWorkers:
+    """Tests for notification-driven workers and atomic claims"""
+
+    @pytest.fixture
+    def job_service(self, tmp_path):
+        service = JobQueueService(db_path=str(tmp_path / "workers.db"))
+        yield service
+        service.stop_workers()
+
+    def test_dispatch_wakes_idle_worker(self, job_service):
+        started = threading.Event()
+        job_service.register_handler("wake", lambda params: started.set())
+        # A long poll interval: only the dispatch notification can start the job in time
+        job_service.start_worker("default", poll_interval=30)
+        time.sleep(0.1)
+
+        dispatched_at = time.perf_counter()
+        job_service.dispatch("wake")
+        assert started.wait(2)
+        assert time.perf_counter() - dispatched_at < 1
+
+    def test_concurrent_claims_are_exclusive(self, job_service):
+        job_ids = job_service.dispatch_batch([{"name": "claim"} for _ in range(40)])
+        claimed = []
+        lock = threading.Lock()
+
+        def claim_all():
+            conn = job_service.connect()
+            try:
+                while True:
+                    job = job_service._fetch_next_job("default", conn)
+                    if job is None:
+                        return
+                    with lock:
+                        claimed.append(job.id)
+            finally:
+                conn.close()
+
+        threads = [threading.Thread(target=claim_all) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(claimed) == sorted(job_ids)
+
+    def test_expired_lease_is_reclaimed(self, job_service):
+        job_id = job_service.dispatch("crashy")
+        assert job_service._fetch_next_job("default").id == job_id
+        assert job_service._fetch_next_job("default") is None
+
+        # The worker died: its lease runs out
+        conn = job_service.connect()
+        conn.execute("UPDATE quantum_jobs SET lease_expires_at = '2000-01-01T00:00:00' WHERE id = ?", (job_id,))
+        conn.commit()
+        conn.close()
+
+        assert job_service._fetch_next_job("default").id == job_id
+
+    def test_worker_concurrency(self, job_service):
+        done = []
+        job_service.register_handler("work", lambda params: done.append(params["n"]))
+        job_service.start_worker("default", poll_interval=30, concurrency=3)
+        assert len(job_service._workers["default"]) == 3
+
+        job_service.dispatch_batch([{"name": "work", "params": {"n": n}} for n in range(10)])
+        deadline = time.time() + 5
+        while len(done) < 10 and time.time() < deadline:
+            time.sleep(0.01)
+        assert sorted(done) == list(range(10))
+        assert job_service.get_queue_stats()["completed"] == 10
+
+    def test_stop_workers_joins_idle_workers(self, job_service):
+        job_service.start_worker("default", poll_interval=30)
+        workers = list(job_service._workers["default"])
+        job_service.stop_workers()
+        assert not any(worker.is_alive() for worker in workers)
+
+    def test_dispatch_batch_one_transaction(self, job_service):
+        job_ids = job_service.dispatch_batch([
+            {"name": "first", "params": {"n": 1}},
+            {"name": "second", "queue": "other", "priority": 5},
+        ])
+        assert job_ids == [job_ids[0], job_ids[0] + 1]
+        assert job_service.get_job(job_ids[0]).params == {"n": 1}
+        assert job_service.get_job(job_ids[1]).queue == "other"
+
+        with pytest.raises(JobQueueError):
+            job_service.dispatch_batch([{"name": "ok"}, {"params": {}}])
+        assert len(job_service.list_jobs()) == 2
+
+    def test_claim_batch_in_priority_order(self, job_service):
+        job_service.dispatch_batch([{"name": f"job{n}", "priority": n % 3} for n in range(6)])
+        jobs = job_service.claim_jobs("default", 4)
+        assert [job.priority for job in jobs] == [2, 2, 1, 1]
+        assert all(job.status == "running" for job in jobs)
+        assert len(job_service.claim_jobs("default", 4)) == 2
+
+    def test_batch_worker_groups_completions(self, job_service, monkeypatch):
+        commits = []
+        complete = job_service._complete_jobs
+        monkeypatch.setattr(job_service, "_complete_jobs",
+                            lambda job_ids, conn=None: (commits.append(len(job_ids)), complete(job_ids, conn)))
+        job_service.register_handler("small", lambda params: None)
+        job_service.dispatch_batch([{"name": "small"} for _ in range(20)])
+
+        job_service.start_worker("default", poll_interval=30, batch_size=10)
+        deadline = time.time() + 5
+        while job_service.get_queue_stats()["completed"] < 20 and time.time() < deadline:
+            time.sleep(0.01)
+        assert job_service.get_queue_stats()["completed"] == 20
+        assert commits == [10, 10]
+
+    def test_wal_and_claim_index(self, job_service):
+        conn = job_service.connect()
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            plan = conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT id {SQLiteJobStore.NEXT_JOBS_SQL}",
+                ("default", "2030-01-01", 10)
+            ).fetchall()
+        finally:
+            conn.close()
+        assert "COVERING INDEX idx_quantum_jobs_claim" in str([tuple(row) for row in plan])
+
+    def test_adds_lease_column_to_old_database(self, tmp_path):
+        import sqlite3
+        db_path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE quantum_jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, "
+                     "queue TEXT DEFAULT 'default', params TEXT, status TEXT DEFAULT 'pending', "
+                     "priority INTEGER DEFAULT 0, attempts INTEGER DEFAULT 0, max_attempts INTEGER DEFAULT 3, "
+                     "backoff_seconds INTEGER DEFAULT 30, scheduled_at DATETIME, started_at DATETIME, "
+                     "completed_at DATETIME, error TEXT, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)")
+        conn.close()
+
+        service = JobQueueService(db_path=db_path)
+        service.dispatch("old")
+        assert service._fetch_next_job("default").name == "old"
+
+
 class TestJobExecutor:
     """Tests for unified JobExecutor"""
 
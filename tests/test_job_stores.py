@@ -0,0 +1,269 @@
+"""
+Conformance tests for the job queue stores
+
+Every JobStore runs the same suite through JobQueueService:
+- sqlite: always
+- redis: with fakeredis (skipped when it is not installed)
+- postgresql: against the server in QUANTUM_TEST_POSTGRES_DSN (skipped
+  when unset; the quantum_jobs table is truncated)
+
+Tests cover:
+- Dispatch, priority/FIFO claim order and delayed jobs
+- Exclusive claims from concurrent workers
+- Lease expiry, renewal and per-queue running limits
+- Retries with backoff, cancel, retry, purge and stats
+- Worker threads draining a backlog (with a throughput floor)
+"""
+
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+
+from runtime.job_executor import JobQueueService
+from runtime.job_stores import create_job_store, RedisJobStore, SQLiteJobStore
+
+
+@pytest.fixture(params=['sqlite', 'redis', 'postgresql'])
+def store(request, tmp_path):
+    if request.param == 'sqlite':
+        store = SQLiteJobStore(str(tmp_path / "jobs.db"))
+    elif request.param == 'redis':
+        fakeredis = pytest.importorskip('fakeredis')
+        # Tests of one session share the fake server: keep them apart
+        store = RedisJobStore(
+            {'prefix': f"test-{uuid.uuid4().hex}:"},
+            client=fakeredis.FakeRedis(decode_responses=True)
+        )
+    else:
+        dsn = os.getenv('QUANTUM_TEST_POSTGRES_DSN')
+        if not dsn:
+            pytest.skip("QUANTUM_TEST_POSTGRES_DSN not set")
+        store = create_job_store({'backend': 'postgresql', 'dsn': dsn})
+        with store.connection() as conn, conn, conn.cursor() as cursor:
+            cursor.execute("TRUNCATE quantum_jobs RESTART IDENTITY")
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def service(store):
+    service = JobQueueService(store=store)
+    yield service
+    service.stop_workers()
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestJobStoreConformance:
+    """Behavior every store must share"""
+
+    def test_dispatch_and_get(self, service):
+        job_id = service.dispatch("send", queue="mail", params={"to": "a@example.com"},
+                                  priority=3, attempts=5, backoff='1m')
+        job = service.get_job(job_id)
+        assert job.name == "send"
+        assert job.queue == "mail"
+        assert job.params == {"to": "a@example.com"}
+        assert job.status == "pending"
+        assert job.priority == 3
+        assert job.max_attempts == 5
+        assert job.backoff_seconds == 60
+        assert isinstance(job.created_at, datetime)
+        assert service.get_job(job_id + 1000) is None
+
+    def test_dispatch_batch_ids_in_order(self, service):
+        ids = service.dispatch_batch([{"name": f"job{i}"} for i in range(5)])
+        assert len(set(ids)) == 5
+        assert [service.get_job(job_id).name for job_id in ids] == [f"job{i}" for i in range(5)]
+
+    def test_claims_by_priority_then_oldest(self, service):
+        low = service.dispatch("low", priority=1)
+        first = service.dispatch("first", priority=5)
+        second = service.dispatch("second", priority=5)
+
+        jobs = service.claim_jobs("default", 2)
+        assert [job.id for job in jobs] == [first, second]
+        assert all(job.status == "running" for job in jobs)
+        assert [job.id for job in service.claim_jobs("default", 2)] == [low]
+        assert service.claim_jobs("default", 2) == []
+
+    def test_claims_only_own_queue(self, service):
+        service.dispatch("other", queue="other")
+        assert service.claim_jobs("default", 1) == []
+        assert len(service.claim_jobs("other", 1)) == 1
+
+    def test_delayed_job_waits(self, service):
+        job_id = service.dispatch("later", delay='1s')
+        assert service.claim_jobs("default", 1) == []
+        assert service.get_job(job_id).scheduled_at > datetime.now()
+
+        time.sleep(1.1)
+        jobs = service.claim_jobs("default", 1)
+        assert [job.id for job in jobs] == [job_id]
+
+    def test_concurrent_claims_are_exclusive(self, service):
+        service.dispatch_batch([{"name": "work"} for _ in range(100)])
+        claimed = []
+        lock = threading.Lock()
+
+        def claim():
+            conn = service.connect()
+            try:
+                while True:
+                    jobs = service.claim_jobs("default", 3, conn)
+                    if not jobs:
+                        return
+                    with lock:
+                        claimed.extend(job.id for job in jobs)
+            finally:
+                service.close_connection(conn)
+
+        threads = [threading.Thread(target=claim) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(claimed) == 100
+        assert len(set(claimed)) == 100
+
+    def test_expired_lease_is_claimed_again(self, store):
+        service = JobQueueService(store=store, lease='1s')
+        job_id = service.dispatch("stuck")
+        assert [job.id for job in service.claim_jobs("default", 1)] == [job_id]
+        assert service.claim_jobs("default", 1) == []
+
+        time.sleep(1.1)
+        assert [job.id for job in service.claim_jobs("default", 1)] == [job_id]
+
+    def test_renewed_lease_is_kept(self, store):
+        service = JobQueueService(store=store, lease='1s')
+        job_id = service.dispatch("long")
+        service.claim_jobs("default", 1)
+
+        time.sleep(0.6)
+        assert service.renew_lease(job_id)
+        time.sleep(0.6)
+        assert service.claim_jobs("default", 1) == []
+
+        service._complete_jobs([job_id])
+        assert not service.renew_lease(job_id)
+
+    def test_max_running_limits_claims(self, service):
+        service.dispatch_batch([{"name": "report"} for _ in range(4)])
+        jobs = service.claim_jobs("default", 4, max_running=2)
+        assert len(jobs) == 2
+        assert service.claim_jobs("default", 1, max_running=2) == []
+
+        service._complete_jobs([jobs[0].id])
+        assert len(service.claim_jobs("default", 4, max_running=2)) == 1
+
+    def test_failure_retries_with_backoff_then_fails(self, service):
+        job_id = service.dispatch("flaky", attempts=2, backoff='1s')
+        job, = service.claim_jobs("default", 1)
+        service._handle_job_failure(job, "boom")
+
+        retried = service.get_job(job_id)
+        assert retried.status == "pending"
+        assert retried.attempts == 1
+        assert retried.error == "boom"
+        assert retried.scheduled_at > datetime.now()
+        assert service.claim_jobs("default", 1) == []
+
+        time.sleep(1.1)
+        job, = service.claim_jobs("default", 1)
+        service._handle_job_failure(job, "boom again")
+        failed = service.get_job(job_id)
+        assert failed.status == "failed"
+        assert failed.attempts == 2
+        assert failed.error == "boom again"
+
+    def test_release_job_requeues(self, service):
+        job_id = service.dispatch("orphan")
+        service.claim_jobs("default", 1)
+        assert service.release_job(job_id)
+        assert service.get_job(job_id).status == "pending"
+        assert not service.release_job(job_id)
+        assert [job.id for job in service.claim_jobs("default", 1)] == [job_id]
+
+    def test_cancel_only_pending(self, service):
+        pending = service.dispatch("a")
+        delayed = service.dispatch("b", delay='1h')
+        running = service.dispatch("c", priority=9)
+        service.claim_jobs("default", 1)
+
+        assert service.cancel_job(pending)
+        assert service.cancel_job(delayed)
+        assert not service.cancel_job(running)
+        assert service.get_job(pending).status == "cancelled"
+        assert service.claim_jobs("default", 5) == []
+
+    def test_retry_failed_job(self, service):
+        job_id = service.dispatch("once", attempts=1)
+        job, = service.claim_jobs("default", 1)
+        service._handle_job_failure(job, "boom")
+        assert service.get_job(job_id).status == "failed"
+
+        assert service.retry_job(job_id)
+        job = service.get_job(job_id)
+        assert job.status == "pending"
+        assert job.attempts == 0
+        assert job.error is None
+        assert not service.retry_job(job_id)
+
+    def test_list_stats_and_purge(self, service):
+        service.dispatch("p1", queue="q", priority=1)
+        service.dispatch("p2", queue="q", priority=2)
+        service.dispatch("r", queue="q")
+        service.dispatch("elsewhere", queue="other")
+        running = service.claim_jobs("q", 1)[0]
+
+        assert [job.name for job in service.list_jobs(queue="q", status="pending")] == ["p1", "r"]
+        assert len(service.list_jobs(queue="q")) == 3
+        assert len(service.list_jobs(queue="q", limit=2)) == 2
+        stats = service.get_queue_stats("q")
+        assert stats["pending"] == 2
+        assert stats["running"] == 1
+        assert stats["completed"] == 0
+        assert stats["failed"] == 0
+
+        assert service.purge_queue("q") == 2
+        assert [job.id for job in service.list_jobs(queue="q")] == [running.id]
+        assert service.get_queue_stats("other")["pending"] == 1
+
+    def test_workers_drain_queue(self, service):
+        done = []
+        service.register_handler("record", lambda params: done.append(params["n"]))
+        service.register_handler("fail", lambda params: 1 / 0)
+        service.dispatch_batch([{"name": "record", "params": {"n": n}} for n in range(20)])
+        failing = service.dispatch("fail", attempts=1)
+
+        service.start_worker("default", poll_interval=0.05, concurrency=2, batch_size=4)
+        assert _wait_for(lambda: service.get_queue_stats()["completed"] == 20
+                         and service.get_job(failing).status == "failed")
+        assert sorted(done) == list(range(20))
+
+
+class TestJobStoreThroughput:
+    """Loose floors that catch claims degrading to one job per poll"""
+
+    JOBS = 1000
+
+    def test_worker_throughput(self, service):
+        service.register_handler("noop", lambda params: None)
+        service.dispatch_batch([{"name": "noop"} for _ in range(self.JOBS)])
+
+        started = time.perf_counter()
+        service.start_worker("default", poll_interval=1.0, concurrency=4, batch_size=10)
+        assert _wait_for(lambda: service.get_queue_stats()["completed"] == self.JOBS, timeout=60)
+        jobs_per_second = self.JOBS / (time.perf_counter() - started)
+        assert jobs_per_second > 100, f"{service.store.backend}: {jobs_per_second:.0f} jobs/s"
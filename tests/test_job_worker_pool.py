@@ -0,0 +1,209 @@
+"""
+Tests for the multi-process job worker pool
+
+Tests cover:
+- Queue limit parsing and handler module resolution
+- Claims limited by the number of running jobs of a queue
+- Lease renewal and release of jobs of dead workers
+- Worker processes draining a backlog, with per-worker stats
+- Per-queue concurrency limits across processes
+- Crash detection and restart
+- Graceful drain on SIGTERM, and requeue of jobs killed at the drain timeout
+
+Worker processes import this module to register the handlers below.
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from runtime.job_executor import JobQueueError, JobQueueService
+from runtime.job_worker_pool import WorkerPool, parse_queue_limits, resolve_setup
+
+
+def _record(params):
+    """Sleep, then write 'pid start end' to params['path']/params['n']"""
+    start = time.time()
+    time.sleep(params.get('sleep', 0))
+    Path(params['path'], str(params['n'])).write_text(f"{os.getpid()} {start} {time.time()}")
+
+
+def _crash(params):
+    os._exit(3)
+
+
+def register_jobs(queue):
+    queue.register_handler('record', _record)
+    queue.register_handler('crash', _crash)
+
+
+def _wait_for(predicate, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.05)
+
+
+def _records(path):
+    return [tuple(float(value) for value in f.read_text().split()) for f in Path(path).iterdir()]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'jobs.db')
+
+
+@pytest.fixture
+def out(tmp_path):
+    path = tmp_path / 'out'
+    path.mkdir()
+    return str(path)
+
+
+@pytest.fixture
+def pools():
+    started = []
+    yield started
+    for pool in started:
+        pool.stop(timeout=5)
+
+
+def _pool(pools, db_path, **options):
+    pool = WorkerPool('tests.test_job_worker_pool', db_path=db_path, poll_interval=0.05, **options)
+    pools.append(pool)
+    pool.start()
+    return pool
+
+
+class TestConfiguration:
+    """Tests for parse_queue_limits and resolve_setup"""
+
+    def test_parse_queue_limits(self):
+        assert parse_queue_limits("reports:2, default") == {'reports': 2, 'default': None}
+        with pytest.raises(JobQueueError):
+            parse_queue_limits("reports:0")
+        with pytest.raises(JobQueueError):
+            parse_queue_limits(" , ")
+
+    def test_resolve_setup(self):
+        assert resolve_setup('tests.test_job_worker_pool') is register_jobs
+        with pytest.raises(JobQueueError, match="register_jobs"):
+            resolve_setup('json')
+
+
+class TestJobStore:
+    """Tests for the JobQueueService methods used by the pool"""
+
+    def test_claim_limited_by_running_jobs(self, db_path):
+        service = JobQueueService(db_path=db_path)
+        service.dispatch_batch([{'name': 'record', 'queue': 'reports'} for _ in range(5)])
+
+        assert len(service.claim_jobs('reports', 5, max_running=2)) == 2
+        assert service.claim_jobs('reports', 5, max_running=2) == []
+        assert len(service.claim_jobs('reports', 5, max_running=3)) == 1
+
+    def test_renew_and_release(self, db_path):
+        service = JobQueueService(db_path=db_path, lease='1s')
+        first, second = service.dispatch_batch([
+            {'name': 'record', 'attempts': 2}, {'name': 'record'}
+        ])
+        service.claim_jobs('default', 2)
+
+        assert service.renew_lease(first)
+        assert service.release_job(first, "Worker process exited with code -9")
+        job = service.get_job(first)
+        assert (job.status, job.attempts, job.error) == ('pending', 1, "Worker process exited with code -9")
+        assert not service.renew_lease(first)
+
+        assert service.release_job(second)
+        job = service.get_job(second)
+        assert (job.status, job.attempts) == ('pending', 0)
+        assert not service.release_job(second)
+
+
+class TestWorkerPool:
+    """Tests for WorkerPool processes"""
+
+    def test_drains_backlog_across_processes(self, pools, db_path, out):
+        service = JobQueueService(db_path=db_path)
+        service.dispatch_batch([
+            {'name': 'record', 'params': {'path': out, 'n': n, 'sleep': 0.2}} for n in range(12)
+        ])
+        pool = _pool(pools, db_path, processes=3)
+        _wait_for(lambda: service.get_queue_stats()['completed'] == 12)
+        pool.stop()
+
+        per_pid = Counter(int(record[0]) for record in _records(out))
+        assert len(per_pid) > 1
+        stats = pool.stats()
+        assert {stat.pid: stat.completed for stat in stats if stat.completed} == per_pid
+        assert all(stat.busy_seconds >= 0.2 * stat.completed for stat in stats)
+        assert sum(stat.jobs_per_second for stat in stats) > 0
+        assert not any(stat.alive for stat in stats)
+
+    def test_queue_concurrency_limit(self, pools, db_path, out):
+        service = JobQueueService(db_path=db_path)
+        service.dispatch_batch([
+            {'name': 'record', 'queue': 'reports', 'params': {'path': out, 'n': n, 'sleep': 0.2}}
+            for n in range(4)
+        ])
+        _pool(pools, db_path, processes=3, queues='reports:1,default')
+        _wait_for(lambda: service.get_queue_stats('reports')['completed'] == 4)
+
+        intervals = sorted(record[1:] for record in _records(out))
+        for (_, end), (next_start, _) in zip(intervals, intervals[1:]):
+            assert next_start >= end
+
+    def test_crashed_worker_restarted(self, pools, db_path, out):
+        service = JobQueueService(db_path=db_path)
+        crash_id = service.dispatch('crash', attempts=1)
+        service.dispatch_batch([{'name': 'record', 'params': {'path': out, 'n': n}} for n in range(2)])
+        pool = _pool(pools, db_path, processes=1)
+
+        def done():
+            pool.check_workers()  # What run() does between sleeps
+            return service.get_queue_stats()['completed'] == 2
+
+        _wait_for(done)
+        job = service.get_job(crash_id)
+        assert job.status == 'failed'
+        assert job.error == "Worker process exited with code 3"
+        assert pool.stats()[0].restarts == 1
+
+    def test_drain_timeout_requeues_job(self, pools, db_path, out):
+        service = JobQueueService(db_path=db_path)
+        job_id = service.dispatch('record', params={'path': out, 'n': 0, 'sleep': 10})
+        pool = _pool(pools, db_path, processes=1)
+        _wait_for(lambda: service.get_job(job_id).status == 'running')
+
+        pool.stop(timeout=0.2)
+        job = service.get_job(job_id)
+        assert (job.status, job.attempts) == ('pending', 0)
+
+    def test_sigterm_drains(self, db_path, out):
+        root = Path(__file__).parent.parent
+        script = (
+            f"import sys; sys.path[:0] = [{str(root / 'src')!r}, {str(root)!r}]\n"
+            "from runtime.job_worker_pool import WorkerPool\n"
+            f"WorkerPool('tests.test_job_worker_pool', db_path={db_path!r}, processes=2,"
+            " poll_interval=0.05).run()\n"
+        )
+        service = JobQueueService(db_path=db_path)
+        job_id = service.dispatch('record', params={'path': out, 'n': 0, 'sleep': 1})
+
+        supervisor = subprocess.Popen([sys.executable, '-c', script])
+        try:
+            _wait_for(lambda: service.get_job(job_id).status == 'running')
+            supervisor.send_signal(signal.SIGTERM)
+            assert supervisor.wait(timeout=30) == 0
+        finally:
+            supervisor.kill()
+
+        assert service.get_job(job_id).status == 'completed'
+        assert len(_records(out)) == 1
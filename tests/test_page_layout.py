@@ -0,0 +1,250 @@
+"""
+Tests for cached page post-processing in the web server
+
+Tests cover:
+- Renderer collecting inline <style>/<script> blocks (collect_assets)
+- Page shell + asset extraction built once per AST version
+- Output identical to whole-document extraction
+- Prettify skipped in production
+- Per-stage timings (Server-Timing header, /health)
+- Nested components sharing the page's services
+"""
+
+import json
+
+import pytest
+import yaml
+
+from runtime.component import ComponentRuntime
+from runtime.renderer import HTMLRenderer
+
+
+STYLED_FRAGMENT = '''<q:component name="Styled">
+    <q:set name="title" value="Hello" />
+    <style>h1 { color: red; }</style>
+    <div>
+        <h1>{title}</h1>
+        <script src="/lib.js"></script>
+        <script>console.log('ready');</script>
+    </div>
+</q:component>'''
+
+STYLED_PAGE = '''<q:component name="StyledPage" type="page">
+    <html>
+        <head><title>Page</title><style>body { margin: 0; }</style></head>
+        <body><p>Content</p><script>init();</script></body>
+    </html>
+</q:component>'''
+
+# The <html> element is not top-level, so only the rendered output shows a document
+CONDITIONAL_PAGE = '''<q:component name="ConditionalPage" type="page">
+    <q:set name="ready" value="true" type="boolean" />
+    <q:if condition="{ready}">
+        <html>
+            <head><title>Page</title><style>body { margin: 0; }</style></head>
+            <body><p>Content</p></body>
+        </html>
+    </q:if>
+</q:component>'''
+
+# Nested components render through their own HTMLRenderer
+BADGE_COMPONENT = '''<q:component name="Badge">
+    <q:param name="label" type="string" default="new" />
+    <style>.badge { color: blue; }</style>
+    <div>
+        <span class="badge">{label}</span>
+        <script>badge();</script>
+    </div>
+</q:component>'''
+
+NESTED_FRAGMENT = '''<q:component name="Nested">
+    <style>h1 { color: red; }</style>
+    <h1>Title</h1>
+    <Badge label="hot" />
+</q:component>'''
+
+
+def _render(parser, source, collect_assets):
+    ast = parser.parse(source)
+    runtime = ComponentRuntime()
+    runtime.execute_component(ast)
+    renderer = HTMLRenderer(runtime.execution_context)
+    renderer.collect_assets = collect_assets
+    return renderer, ast, renderer.render(ast)
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    from runtime.web_server import QuantumWebServer
+
+    components = tmp_path / 'components'
+    components.mkdir()
+    (components / 'styled.q').write_text(STYLED_FRAGMENT)
+    (components / 'page.q').write_text(STYLED_PAGE)
+    (components / 'Badge.q').write_text(BADGE_COMPONENT)
+    (components / 'nested.q').write_text(NESTED_FRAGMENT)
+
+    config_path = tmp_path / 'quantum.config.yaml'
+    config_path.write_text(yaml.safe_dump({
+        'paths': {'components': str(components), 'static': str(tmp_path / 'static')},
+    }))
+
+    monkeypatch.chdir(tmp_path)
+    server = QuantumWebServer(config_path=str(config_path))
+    server.app.config['TESTING'] = True
+    return server
+
+
+class TestCollectAssets:
+    """Tests for HTMLRenderer.collect_assets"""
+
+    def test_inline_blocks_are_collected(self, parser):
+        renderer, _, html = _render(parser, STYLED_FRAGMENT, collect_assets=True)
+
+        assert renderer.inline_assets == {
+            'style': ['h1 { color: red; }'],
+            'script': ["console.log('ready');"],
+        }
+        assert '<style' not in html
+        assert '<script src="/lib.js"></script>' in html
+        assert "console.log" not in html
+
+    def test_disabled_by_default(self, parser):
+        renderer, _, html = _render(parser, STYLED_FRAGMENT, collect_assets=False)
+
+        assert '<style>h1 { color: red; }</style>' in html
+        assert renderer.inline_assets == {'style': [], 'script': []}
+
+
+class TestPageLayout:
+    """Tests for QuantumWebServer page assembly"""
+
+    @pytest.mark.parametrize('source, path', [
+        (STYLED_FRAGMENT, 'styled'),
+        (STYLED_PAGE, 'page'),
+        (CONDITIONAL_PAGE, 'conditional'),
+    ])
+    def test_matches_whole_document_extraction(self, server, parser, source, path):
+        _, ast, plain_html = _render(parser, source, collect_assets=False)
+        if server._is_full_document(ast, plain_html):
+            expected = server._extract_inline_assets(server._inject_htmx(plain_html))
+        else:
+            expected = server._extract_inline_assets(server._wrap_with_htmx(plain_html, path))
+
+        renderer, _, html = _render(parser, source, collect_assets=True)
+        layout = server._get_page_layout(path, path, ast, html)
+
+        assert server._assemble_page(layout, html, renderer.inline_assets) == expected
+
+    def test_rendered_document_is_not_wrapped(self, server, parser):
+        renderer, ast, html = _render(parser, CONDITIONAL_PAGE, collect_assets=True)
+        assert not server._is_full_document(ast)
+
+        layout = server._get_page_layout('key', 'conditional', ast, html)
+        page = server._assemble_page(layout, html, renderer.inline_assets)
+        assert layout.full_document
+        assert page.count('<html') == 1
+        assert 'htmx.org' in page.split('</head>')[0]
+
+    def test_layout_cached_per_ast(self, server, parser):
+        ast = parser.parse(STYLED_FRAGMENT)
+        layout = server._get_page_layout('key', 'styled', ast)
+
+        assert server._get_page_layout('key', 'styled', ast) is layout
+        assert server._get_page_layout('key', 'styled', parser.parse(STYLED_FRAGMENT)) is not layout
+
+    def test_nested_component_assets_extracted(self, server, tmp_path):
+        html = server.app.test_client().get('/nested').get_data(as_text=True)
+
+        assert '<span class="badge">hot</span>' in html
+        assert '<style' not in html
+        assert 'badge();' not in html
+        css = next((tmp_path / 'static').glob('styles-*')).read_text()
+        assert css.index('h1 { color: red; }') < css.index('.badge { color: blue; }')
+        js = next((tmp_path / 'static').glob('scripts-*')).read_text()
+        assert 'badge();' in js
+
+    def test_asset_files_written_once(self, server, tmp_path, monkeypatch):
+        client = server.app.test_client()
+        html = client.get('/styled').get_data(as_text=True)
+
+        assert '<link rel="stylesheet" href="static/styles-' in html
+        assert '<script src="static/scripts-' in html
+        assert '<style' not in html
+        assert len(list((tmp_path / 'static').iterdir())) == 2
+
+        written = []
+        monkeypatch.setattr(server, '_write_asset_files', lambda *args: written.append(args))
+        assert client.get('/styled').get_data(as_text=True) == html
+        assert written == []
+
+
+class TestPrettifyAndTimings:
+    """Tests for production prettify skipping and stage timings"""
+
+    def test_prettify_follows_debug_mode(self, server):
+        assert server._should_prettify() is True
+
+        server.config['server']['debug'] = False
+        assert server._should_prettify() is False
+
+        server.config['performance']['prettify_html'] = True
+        assert server._should_prettify() is True
+
+    def test_server_timing_header(self, server):
+        response = server.app.test_client().get('/styled')
+
+        stages = [part.split(';')[0] for part in response.headers['Server-Timing'].split(', ')]
+        assert stages == ['load', 'execute', 'render', 'layout', 'prettify', 'total']
+
+    def test_no_prettify_stage_when_disabled(self, server):
+        server.config['performance']['prettify_html'] = False
+        response = server.app.test_client().get('/styled')
+
+        assert 'prettify' not in response.headers['Server-Timing']
+
+    def test_health_reports_render_timings(self, server):
+        client = server.app.test_client()
+        client.get('/styled')
+        client.get('/styled')
+
+        timings = json.loads(client.get('/health').get_data(as_text=True))['render_timings']
+        assert timings['total']['count'] == 2
+        assert timings['render']['avg_ms'] >= 0
+
+
+COUNT_COMPONENT = '''<q:component name="ItemCount">
+    <q:query name="items" datasource="db">SELECT COUNT(*) AS n FROM items</q:query>
+    <span class="count">{items[0].n}</span>
+</q:component>'''
+
+
+class TestNestedComponentServices:
+    """Tests for nested components sharing the parent runtime's services"""
+
+    def test_child_query_uses_parent_services(self, parser, tmp_path, monkeypatch):
+        from runtime.service_container import ServiceContainer
+
+        components = tmp_path / 'components'
+        components.mkdir()
+        (components / 'ItemCount.q').write_text(COUNT_COMPONENT)
+        monkeypatch.chdir(tmp_path)
+
+        services = ServiceContainer({'datasources': {
+            'db': {'type': 'sqlite', 'database': str(tmp_path / 'items.db')}
+        }})
+        services.database.execute_query('db', "CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        services.database.execute_query('db', "INSERT INTO items (id) VALUES (1), (2)")
+        pool = services.database.get_pool(services.database.get_datasource_config('db'))
+
+        ast = parser.parse('''<q:component name="Page"><div><ItemCount /></div></q:component>''')
+        for _ in range(2):
+            runtime = ComponentRuntime(config=services.config, services=services)
+            runtime.execute_component(ast)
+            html = HTMLRenderer(runtime.execution_context, services=services).render(ast)
+            assert '<span class="count">2</span>' in html
+
+        # Both renders went through the one shared pool
+        assert services.database._pools == {'db': pool}
+        assert pool.stats()['created'] == 1
+        services.shutdown()
@@ -0,0 +1,213 @@
+"""
+Tests for q:query pagination strategies
+
+Tests cover:
+- window: COUNT(*) OVER() rewrite, one query per page, count fallback
+- keyset: seek SQL, cursor tokens, forward/backward navigation, tie-breakers
+- count: totals cached with countCache
+- pagination/countCache/orderBy/cursor parsed and applied by ComponentRuntime
+"""
+
+import pytest
+
+from runtime.component import ComponentRuntime
+from runtime.database_service import DatabaseService
+from runtime.pagination import (
+    TOTAL_COUNT_COLUMN, decode_cursor, encode_cursor, paginate_query, window_count_sql
+)
+from runtime.service_container import ServiceContainer
+
+
+COUNT_SQL = "SELECT COUNT(*) as count FROM (SELECT id, name FROM items) AS count_query"
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = DatabaseService(local_datasources={
+        'db': {'type': 'sqlite', 'database': str(tmp_path / 'pages.db')}
+    })
+    service.execute_query('db', "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    with service.connection(service.get_datasource_config('db')) as conn:
+        conn.executemany("INSERT INTO items (name) VALUES (?)", [(f'item{i}',) for i in range(1, 96)])
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def recorded(service, monkeypatch):
+    """SQL statements sent through execute_query"""
+    statements = []
+    execute = service.execute_query
+
+    def record(datasource, sql, params=None, **kwargs):
+        statements.append(sql)
+        return execute(datasource, sql, params, **kwargs)
+
+    monkeypatch.setattr(service, 'execute_query', record)
+    return statements
+
+
+class TestWindowRewrite:
+    """Tests for window_count_sql"""
+
+    def test_adds_count_before_top_level_from(self):
+        sql = "SELECT id, (SELECT MAX(x) FROM y) AS m FROM items WHERE name <> 'from' ORDER BY id"
+        rewritten = window_count_sql(sql)
+        assert rewritten.startswith(f"SELECT id, (SELECT MAX(x) FROM y) AS m, COUNT(*) OVER() AS {TOTAL_COUNT_COLUMN}\nFROM items")
+
+    def test_unsupported_statements(self):
+        assert window_count_sql("SELECT DISTINCT name FROM items") is None
+        assert window_count_sql("SELECT id FROM a UNION SELECT id FROM b") is None
+        assert window_count_sql("WITH x AS (SELECT 1) SELECT * FROM x") is None
+        assert window_count_sql("SELECT 1") is None
+        assert window_count_sql("SELECT COUNT(DISTINCT name) AS n FROM items") is not None
+
+
+class TestStrategies:
+    """Tests for paginate_query against SQLite"""
+
+    def _paginate(self, service, **kwargs):
+        return paginate_query(service.execute_query, 'db', "SELECT id, name FROM items ORDER BY id",
+                              {}, COUNT_SQL, **kwargs)
+
+    def test_count_strategy_returns_sql(self, service):
+        result, metadata, sql = self._paginate(service, page=2, page_size=10)
+        assert result is None
+        assert sql.endswith("LIMIT 10 OFFSET 10")
+        assert metadata['totalRecords'] == 95
+
+    def test_window_single_query(self, service, recorded):
+        result, metadata, _ = self._paginate(service, strategy='window', page=3, page_size=10)
+        assert len(recorded) == 1
+        assert result.column_list == ['id', 'name']
+        assert [row.id for row in result.data] == list(range(21, 31))
+        assert result.data[0] == {'id': 21, 'name': 'item21'}
+        assert metadata['totalRecords'] == 95
+        assert metadata['totalPages'] == 10
+        assert metadata['strategy'] == 'window'
+
+    def test_window_past_last_page_counts(self, service, recorded):
+        result, metadata, _ = self._paginate(service, strategy='window', page=20, page_size=10)
+        assert result.data == []
+        assert metadata['totalRecords'] == 95
+        assert len(recorded) == 2
+
+    def test_window_unsupported_falls_back(self, service):
+        result, metadata, sql = self._paginate(service, strategy='window', page=1, page_size=10,
+                                               window_functions=False)
+        assert result is None
+        assert metadata['strategy'] == 'count'
+
+    def test_keyset_walk(self, service):
+        seen = []
+        cursor = None
+        while True:
+            result, metadata, _ = self._paginate(service, strategy='keyset', order_by='id',
+                                                 cursor=cursor, page_size=40)
+            seen.extend(row.id for row in result.data)
+            if not metadata['hasNextPage']:
+                break
+            cursor = metadata['nextCursor']
+        assert seen == list(range(1, 96))
+        assert metadata['totalRecords'] is None
+
+        # Back from the last page
+        result, metadata, _ = self._paginate(service, strategy='keyset', order_by='id',
+                                             cursor=metadata['previousCursor'], page_size=40)
+        assert [row.id for row in result.data] == list(range(41, 81))
+        assert metadata['hasPreviousPage'] and metadata['hasNextPage']
+
+    def test_keyset_descending(self, service):
+        result, metadata, _ = self._paginate(service, strategy='keyset', order_by='id DESC', page_size=5)
+        assert [row.id for row in result.data] == [95, 94, 93, 92, 91]
+        result, _, _ = self._paginate(service, strategy='keyset', order_by='id DESC', page_size=5,
+                                      cursor=metadata['nextCursor'])
+        assert [row.id for row in result.data] == [90, 89, 88, 87, 86]
+
+    def test_keyset_tie_breaker_across_page_boundary(self, service):
+        # Five rows per group name: every page boundary splits a group
+        service.execute_query('db', "UPDATE items SET name = 'group' || ((id - 1) / 5)")
+        sql = "SELECT id, name FROM items"
+
+        def page(cursor=None):
+            return paginate_query(service.execute_query, 'db', sql, {}, COUNT_SQL, strategy='keyset',
+                                  order_by='name DESC, id', cursor=cursor, page_size=7)[:2]
+
+        seen = []
+        cursor = None
+        while True:
+            result, metadata = page(cursor)
+            seen.extend(row.id for row in result.data)
+            if not metadata['hasNextPage']:
+                break
+            cursor = metadata['nextCursor']
+        expected = sorted(range(1, 96), key=lambda id: (f"group{(id - 1) // 5}", id), reverse=True)
+        assert seen == expected
+
+        # Back from the last page (rows 92-95 of the walk)
+        result, _ = page(metadata['previousCursor'])
+        assert [row.id for row in result.data] == expected[84:91]
+
+    def test_keyset_order_by_directions(self, service):
+        with pytest.raises(ValueError, match="all be ASC or all be DESC"):
+            self._paginate(service, strategy='keyset', order_by='name DESC, id ASC', page_size=5)
+
+    def test_keyset_requires_order_by(self, service):
+        with pytest.raises(ValueError):
+            self._paginate(service, strategy='keyset', page_size=5)
+
+    def test_cursor_tokens(self):
+        assert decode_cursor(encode_cursor(42, 'next')) == ('next', 42)
+        assert decode_cursor('garbage!') is None
+        assert decode_cursor(None) is None
+
+    def test_count_cached(self, service):
+        for _ in range(2):
+            self._paginate(service, page=1, page_size=10, count_options={'cache_ttl': 60})
+        assert service.get_query_cache_stats()['hits'] == 1
+
+
+PAGED_COMPONENT = '''<q:component name="Items" xmlns:q="https://quantum.lang/ns">
+    <q:query name="items" datasource="db" paginate="true" pageSize="10" page="2" {attrs}>
+        SELECT id, name FROM items ORDER BY id
+    </q:query>
+</q:component>'''
+
+
+class TestComponentPagination:
+    """Tests for pagination attributes on q:query"""
+
+    def _run(self, parser, service, attrs, variables=None):
+        services = ServiceContainer()
+        services._services['database'] = service
+        runtime = ComponentRuntime(services=services)
+        for name, value in (variables or {}).items():
+            runtime.execution_context.set_variable(name, value, scope='component')
+        runtime.execute_component(parser.parse(PAGED_COMPONENT.format(attrs=attrs)))
+        context = runtime.execution_context
+        return context.get_variable('items'), context.get_variable('items_result')['pagination']
+
+    def test_parse(self, parser):
+        from core.ast_nodes import QueryNode
+        ast = parser.parse(PAGED_COMPONENT.format(
+            attrs='pagination="keyset" orderBy="id" cursor="{next}" countCache="5m"'
+        ))
+        node = next(s for s in ast.statements if isinstance(s, QueryNode))
+        assert node.pagination == 'keyset'
+        assert node.order_by == 'id'
+        assert node.cursor == '{next}'
+        assert node.count_cache == '5m'
+
+    def test_window(self, parser, service, recorded):
+        rows, pagination = self._run(parser, service, 'pagination="window"')
+        assert [row['id'] for row in rows] == list(range(11, 21))
+        assert pagination['totalRecords'] == 95
+        assert len(recorded) == 1
+
+    def test_keyset_cursor_from_variable(self, parser, service):
+        rows, pagination = self._run(parser, service, 'pagination="keyset" orderBy="id"')
+        assert rows[-1]['id'] == 10
+
+        rows, _ = self._run(parser, service, 'pagination="keyset" orderBy="id" cursor="{next}"',
+                            {'next': pagination['nextCursor']})
+        assert [row['id'] for row in rows] == list(range(11, 21))
@@ -0,0 +1,96 @@
+"""
+Tests for :param translation in DatabaseService._prepare_query
+
+Tests cover:
+- Placeholders per dialect and parameter order (including repeats)
+- Literals, quoted identifiers, comments and :: casts left untouched
+- Backslashes in literals: plain characters except in MySQL and E'...' strings
+- % escaping for psycopg2/pymysql
+- Translation cached once per (sql, dialect)
+"""
+
+import pytest
+
+from runtime.database_service import DatabaseService, QueryExecutionError, compile_sql
+
+
+@pytest.fixture
+def service():
+    return DatabaseService()
+
+
+class TestPrepareQuery:
+    """Tests for placeholder translation"""
+
+    def test_dialects(self, service):
+        sql = "SELECT * FROM users WHERE id = :id AND name = :name"
+        params = {'name': 'ada', 'id': 1}
+        assert service._prepare_query(sql, params, 'postgresql') == (
+            "SELECT * FROM users WHERE id = %s AND name = %s", [1, 'ada'])
+        assert service._prepare_query(sql, params, 'mysql')[0].count('%s') == 2
+        assert service._prepare_query(sql, params, 'sqlite') == (
+            "SELECT * FROM users WHERE id = ? AND name = ?", [1, 'ada'])
+
+    def test_repeated_and_prefix_names(self, service):
+        sql = "SELECT :id, :identifier, :id"
+        assert service._prepare_query(sql, {'id': 1, 'identifier': 2}, 'sqlite') == (
+            "SELECT ?, ?, ?", [1, 2, 1])
+
+    def test_missing_param_is_null(self, service):
+        assert service._prepare_query("SELECT :x", {}, 'sqlite') == ("SELECT ?", [None])
+
+    def test_casts_literals_and_comments_untouched(self, service):
+        sql = (
+            "SELECT created::date, '10:30', 'it''s :nope', \"col:x\", $$ :body $$ "
+            "FROM t -- :comment\n WHERE a = :a /* :b */"
+        )
+        prepared, values = service._prepare_query(sql, {'a': 1}, 'postgresql')
+        assert values == [1]
+        assert "created::date" in prepared
+        assert "'it''s :nope'" in prepared
+        assert "$$ :body $$" in prepared
+        assert prepared.endswith("WHERE a = %s /* :b */")
+
+    def test_backslash_is_literal_outside_mysql(self, service):
+        sql = "SELECT * FROM files WHERE path = 'C:\\' AND id = :id"
+        assert service._prepare_query(sql, {'id': 1}, 'sqlite') == (
+            "SELECT * FROM files WHERE path = 'C:\\' AND id = ?", [1])
+        assert service._prepare_query(sql, {'id': 1}, 'postgresql')[1] == [1]
+
+    def test_backslash_escapes(self, service):
+        # PostgreSQL E'...' strings and MySQL literals escape quotes with a backslash
+        sql = "SELECT E'it\\'s :nope', :id"
+        assert service._prepare_query(sql, {'id': 1}, 'postgresql') == (
+            "SELECT E'it\\'s :nope', %s", [1])
+        sql = "SELECT 'it\\'s :nope', :id"
+        assert service._prepare_query(sql, {'id': 1}, 'mysql') == ("SELECT 'it\\'s :nope', %s", [1])
+
+    def test_percent_escaped_for_format_dialects(self, service):
+        sql = "SELECT * FROM t WHERE name LIKE 'a%' AND x = :x"
+        assert service._prepare_query(sql, {'x': 1}, 'mysql')[0] == (
+            "SELECT * FROM t WHERE name LIKE 'a%%' AND x = %s")
+        assert service._prepare_query(sql, {'x': 1}, 'sqlite')[0] == (
+            "SELECT * FROM t WHERE name LIKE 'a%' AND x = ?")
+
+    def test_unsupported_type(self, service):
+        with pytest.raises(QueryExecutionError):
+            service._prepare_query("SELECT 1", {}, 'oracle')
+
+    def test_translation_cached(self, service):
+        sql = "SELECT :cached_param_test"
+        compile_sql.cache_clear()
+        for _ in range(3):
+            service._prepare_query(sql, {'cached_param_test': 1}, 'sqlite')
+        info = compile_sql.cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
+
+    def test_sqlite_executes_like_with_params(self, tmp_path):
+        service = DatabaseService(local_datasources={
+            'db': {'type': 'sqlite', 'database': str(tmp_path / 'p.db'), 'statement_cache_size': 16}
+        })
+        service.execute_query('db', "CREATE TABLE t (name TEXT, at TEXT)")
+        service.execute_query('db', "INSERT INTO t VALUES (:name, '10:30')", {'name': 'ada'})
+        result = service.execute_query('db', "SELECT name, at FROM t WHERE name LIKE 'a%' AND at = '10:30' AND name = :n", {'n': 'ada'})
+        assert result.data == [{'name': 'ada', 'at': '10:30'}]
+        service.shutdown()
@@ -101,6 +101,30 @@ class TestQuantumBridgeLogging:
 class TestQuantumBridgeUtilities:
     """Tests for bridge utility methods"""
 
+    def test_sleep_stops_when_thread_cancelled(self):
+        """Test q.sleep() and q.is_cancelled() inside a terminated q:thread"""
+        import time
+        from runtime.job_executor import ThreadService, ThreadError
+        bridge = QuantumBridge({})
+        service = ThreadService(max_workers=1)
+        seen = []
+
+        def body():
+            seen.append(bridge.is_cancelled())
+            bridge.sleep(5)
+
+        service.run_thread("sleeper", body)
+        time.sleep(0.1)
+        started = time.monotonic()
+        service.terminate_thread("sleeper")
+        with pytest.raises(ThreadError, match="Terminated"):
+            service.join_thread("sleeper", timeout=2)
+        assert time.monotonic() - started < 1
+        assert seen == [False]
+        assert bridge.is_cancelled() is False
+        bridge.check_cancelled()  # No-op outside a thread
+        service.shutdown()
+
     def test_now_method(self):
         """Test q.now() method"""
         from datetime import datetime
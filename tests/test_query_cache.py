@@ -0,0 +1,215 @@
+"""
+Tests for the q:query result cache
+
+Tests cover:
+- SQL fingerprinting, write detection and table extraction
+- LRU + TTL + byte budget bounds
+- Table-tag invalidation
+- DatabaseService caching reads, invalidating on writes and honouring maxrows
+- cache/ttl/maxrows parsed from q:query and applied by ComponentRuntime
+"""
+
+import time
+
+import pytest
+
+from runtime.database_service import DatabaseService, QueryResult
+from runtime.query_cache import (
+    QueryCache,
+    create_query_cache,
+    is_write_query,
+    normalize_sql,
+    query_cache_key,
+    referenced_tables,
+    resolve_cache_ttl,
+    table_tags,
+)
+
+
+def _result(rows):
+    return QueryResult(data=rows, column_list=['v'], execution_time=0.0, record_count=len(rows))
+
+
+class TestFingerprint:
+    """Tests for SQL normalization"""
+
+    def test_whitespace_case_and_comments_ignored(self):
+        a = "SELECT id\n  FROM users -- all users\n WHERE id = :id;"
+        b = "select id from users /* x */ where id = :id"
+        assert normalize_sql(a) == normalize_sql(b)
+        assert query_cache_key('db', a, {'id': 1}) == query_cache_key('db', b, {'id': 1})
+
+    def test_string_literals_preserved(self):
+        assert normalize_sql("SELECT 'A  B'") == "select 'A  B'"
+        assert query_cache_key('db', "SELECT 'A'") != query_cache_key('db', "SELECT 'a'")
+
+    def test_key_depends_on_params_datasource_and_maxrows(self):
+        sql = "SELECT * FROM users WHERE id = :id"
+        base = query_cache_key('db', sql, {'id': 1})
+        assert base != query_cache_key('db', sql, {'id': 2})
+        assert base != query_cache_key('other', sql, {'id': 1})
+        assert base != query_cache_key('db', sql, {'id': 1}, max_rows=10)
+
+    def test_write_detection(self):
+        assert is_write_query("INSERT INTO users VALUES (1)")
+        assert is_write_query("  update users set name = 'x'")
+        assert is_write_query("-- note\nDELETE FROM users")
+        assert is_write_query("WITH x AS (SELECT 1) DELETE FROM users")
+        assert not is_write_query("SELECT * FROM users")
+        assert not is_write_query("WITH x AS (SELECT 1) SELECT * FROM x")
+
+    def test_referenced_tables(self):
+        sql = "SELECT * FROM public.orders o JOIN users u ON u.id = o.user_id"
+        assert referenced_tables(sql) == {'public.orders', 'orders', 'users'}
+        assert referenced_tables("UPDATE Users SET a = 1") == {'users'}
+        assert referenced_tables("INSERT INTO \"orders\" VALUES (1)") == {'orders'}
+
+
+class TestQueryCache:
+    """Tests for the in-memory backend"""
+
+    def test_put_get(self):
+        cache = QueryCache()
+        cache.put('k', _result([{'v': 1}]), ttl=60)
+        assert cache.get('k').data == [{'v': 1}]
+        assert cache.get('missing') is None
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+
+    def test_expired_entries_purged_without_access(self):
+        cache = QueryCache()
+        cache.put('old', _result([]), ttl=0.05)
+        time.sleep(0.08)
+        cache.put('new', _result([]), ttl=60)
+        assert len(cache) == 1
+        assert cache.stats()['expirations'] == 1
+
+    def test_lru_eviction_by_entries(self):
+        cache = QueryCache(max_entries=2)
+        cache.put('a', _result([]), ttl=60)
+        cache.put('b', _result([]), ttl=60)
+        cache.get('a')
+        cache.put('c', _result([]), ttl=60)
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+        assert cache.stats()['evictions'] == 1
+
+    def test_eviction_by_bytes(self):
+        row = [{'v': 'x' * 400 * 1024}]
+        cache = QueryCache(max_memory_mb=1)
+        for key in 'abc':
+            cache.put(key, _result(row), ttl=60)
+        assert len(cache) == 2
+        assert cache.get('a') is None
+        assert cache.stats()['memory_kb'] <= 1024
+
+    def test_oversized_result_not_cached(self):
+        cache = QueryCache(max_memory_mb=0.01)
+        cache.put('big', _result([{'v': 'x' * 100000}]), ttl=60)
+        assert len(cache) == 0
+
+    def test_invalidate_tables(self):
+        cache = QueryCache()
+        cache.put('users', _result([]), ttl=60, tags=table_tags('db', "SELECT * FROM users"))
+        cache.put('join', _result([]), ttl=60,
+                  tags=table_tags('db', "SELECT * FROM orders JOIN users ON 1=1"))
+        cache.put('orders', _result([]), ttl=60, tags=table_tags('db', "SELECT * FROM orders"))
+        cache.put('other_db', _result([]), ttl=60, tags=table_tags('other', "SELECT * FROM users"))
+
+        assert cache.invalidate_tables('db', ['users']) == 2
+        assert cache.get('users') is None
+        assert cache.get('join') is None
+        assert cache.get('orders') is not None
+        assert cache.get('other_db') is not None
+
+    def test_resolve_cache_ttl(self):
+        assert resolve_cache_ttl(False, 60) == 0
+        assert resolve_cache_ttl(True) == 300
+        assert resolve_cache_ttl(True, 30) == 30
+        assert resolve_cache_ttl('5m') == 300
+        assert resolve_cache_ttl(True, '1h') == 3600
+        assert resolve_cache_ttl('soon') == 0
+
+    def test_redis_backend_falls_back_to_memory(self):
+        cache = create_query_cache({'backend': 'redis', 'redis': {'host': '127.0.0.1', 'port': 9}})
+        assert isinstance(cache, QueryCache)
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = DatabaseService(local_datasources={
+        'db': {'type': 'sqlite', 'database': str(tmp_path / 'cache.db')}
+    })
+    service.execute_query('db', "CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+    for name in ('ada', 'bob', 'cy'):
+        service.execute_query('db', "INSERT INTO users (name) VALUES (:name)", {'name': name})
+    yield service
+    service.shutdown()
+
+
+class TestDatabaseService:
+    """Tests for caching in DatabaseService.execute_query"""
+
+    def test_cached_read(self, service):
+        sql = "SELECT name FROM users ORDER BY id"
+        first = service.execute_query('db', sql, cache_ttl=60)
+        second = service.execute_query('db', sql, cache_ttl=60)
+        assert not first.cached
+        assert second.cached
+        assert second.data == first.data
+
+    def test_no_cache_without_ttl(self, service):
+        service.execute_query('db', "SELECT name FROM users")
+        assert service.get_query_cache_stats()['stores'] == 0
+
+    def test_write_invalidates(self, service):
+        sql = "SELECT COUNT(*) AS n FROM users"
+        assert service.execute_query('db', sql, cache_ttl=60).data[0]['n'] == 3
+        service.execute_query('db', "DELETE FROM users WHERE name = :name", {'name': 'bob'})
+        result = service.execute_query('db', sql, cache_ttl=60)
+        assert not result.cached
+        assert result.data[0]['n'] == 2
+
+    def test_max_rows(self, service):
+        result = service.execute_query('db', "SELECT name FROM users ORDER BY id", max_rows=2)
+        assert [row['name'] for row in result.data] == ['ada', 'bob']
+        assert result.record_count == 2
+
+
+class TestQueryAttributes:
+    """Tests for cache/ttl/maxrows on q:query"""
+
+    def _query(self, parser, attrs):
+        from core.ast_nodes import QueryNode
+        ast = parser.parse(
+            '<q:component name="T" xmlns:q="https://quantum.lang/ns">'
+            f'<q:query name="users" datasource="db" {attrs}>SELECT name FROM users</q:query>'
+            '</q:component>'
+        )
+        return next(s for s in ast.statements if isinstance(s, QueryNode))
+
+    def test_parse_attributes(self, parser):
+        node = self._query(parser, 'cache="true" ttl="60" maxrows="5"')
+        assert node.cache is True
+        assert node.ttl == 60
+        assert node.maxrows == 5
+
+        node = self._query(parser, 'cache="5m" ttl="1h"')
+        assert node.cache == '5m'
+        assert node.ttl == '1h'
+
+    def test_runtime_honours_attributes(self, parser, service):
+        from runtime.component import ComponentRuntime
+        from runtime.service_container import ServiceContainer
+
+        services = ServiceContainer()
+        services._services['database'] = service
+        node = self._query(parser, 'cache="true" ttl="60" maxrows="2"')
+
+        runtime = ComponentRuntime(services=services)
+        first = runtime._execute_query(node, runtime.execution_context)
+        second = runtime._execute_query(node, runtime.execution_context)
+
+        assert len(first.data) == 2
+        assert second.cached
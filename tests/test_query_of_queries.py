@@ -0,0 +1,127 @@
+"""
+Tests for the Query of Queries engine
+
+Tests cover:
+- Column types inferred from values (numeric sorting and comparison)
+- Sources loaded once and reused until the variable changes
+- Indexes on filtered/sorted columns of large sources
+- Parameter binding by name, FROM {name} syntax
+- q:query source="..." in ComponentRuntime sharing one engine per request
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from runtime.component import ComponentRuntime
+from runtime.query_of_queries import QueryOfQueriesEngine, column_type, filtered_columns
+from runtime.query_stream import Row, column_index
+
+
+def _rows(count):
+    index = column_index(['id', 'name', 'price'])
+    return [Row(index, (i, f'item{i}', i * 1.5)) for i in range(1, count + 1)]
+
+
+class TestTypeInference:
+    """Tests for column types"""
+
+    def test_column_type(self):
+        assert column_type([1, 2, None]) == 'INTEGER'
+        assert column_type([1, 2.5]) == 'REAL'
+        assert column_type([Decimal('1.5')]) == 'REAL'
+        assert column_type(['a', None]) == 'TEXT'
+        assert column_type([b'x']) == 'BLOB'
+        assert column_type([1, 'a']) == ''
+        assert column_type([None]) == ''
+
+    def test_numeric_sort_and_compare(self):
+        engine = QueryOfQueriesEngine()
+        rows = [{'n': 10}, {'n': 9}, {'n': 100}]
+        result = engine.execute('nums', rows, "SELECT n FROM nums WHERE n > 9 ORDER BY n")
+        assert [row['n'] for row in result.data] == [10, 100]
+
+    def test_decimal_and_dates_loaded(self):
+        from datetime import date
+        engine = QueryOfQueriesEngine()
+        rows = [{'amount': Decimal('2.50'), 'day': date(2024, 1, 2)}]
+        result = engine.execute('t', rows, "SELECT amount * 2 AS doubled, day FROM t")
+        assert result.data == [{'doubled': 5.0, 'day': '2024-01-02'}]
+
+
+class TestEngine:
+    """Tests for loading, reuse and indexing"""
+
+    def test_source_loaded_once(self):
+        engine = QueryOfQueriesEngine()
+        rows = _rows(50)
+        for limit in (1, 2, 3):
+            result = engine.execute('items', rows, f"SELECT id FROM items ORDER BY id LIMIT {limit}")
+            assert len(result.data) == limit
+        assert engine.stats()['loads'] == 1
+        assert engine.stats()['reuses'] == 2
+
+    def test_reloaded_when_source_changes(self):
+        engine = QueryOfQueriesEngine()
+        engine.execute('items', _rows(5), "SELECT COUNT(*) AS n FROM items")
+        result = engine.execute('items', _rows(8), "SELECT COUNT(*) AS n FROM items")
+        assert result.data[0]['n'] == 8
+
+        rows = _rows(2)
+        engine.execute('items', rows, "SELECT COUNT(*) AS n FROM items")
+        rows.append({'id': 3, 'name': 'item3', 'price': 4.5})
+        assert engine.execute('items', rows, "SELECT COUNT(*) AS n FROM items").data[0]['n'] == 3
+        assert engine.stats()['loads'] == 4
+
+    def test_params_bound_by_name(self):
+        engine = QueryOfQueriesEngine()
+        result = engine.execute(
+            'items', _rows(10),
+            "SELECT id FROM {items} WHERE price >= :low AND id < :high ORDER BY id",
+            {'high': 5, 'low': 3}
+        )
+        assert [row.id for row in result.data] == [2, 3, 4]
+        assert result.column_list == ['id']
+
+    def test_indexes_large_sources(self):
+        engine = QueryOfQueriesEngine(index_min_rows=100)
+        engine.execute('small', _rows(10), "SELECT * FROM small WHERE id = 1")
+        engine.execute('items', _rows(200), "SELECT name FROM items WHERE price > 10 ORDER BY id")
+        assert engine.stats()['indexes'] == ['items.id', 'items.price']
+
+        plan = engine._connection().execute(
+            'EXPLAIN QUERY PLAN SELECT name FROM items WHERE price > 10'
+        ).fetchall()
+        assert 'qoq_items_price' in str(plan)
+
+    def test_filtered_columns(self):
+        sql = "SELECT name, 'where x' FROM t JOIN u ON t.id = u.tid WHERE \"Price\" > 1 GROUP BY kind ORDER BY name"
+        assert filtered_columns(sql) == {'t', 'id', 'u', 'tid', 'price', 'kind', 'name'}
+
+    def test_non_mapping_rows_rejected(self):
+        with pytest.raises(TypeError):
+            QueryOfQueriesEngine().execute('t', [1, 2], "SELECT * FROM t")
+
+
+QOQ_COMPONENT = '''<q:component name="Report" xmlns:q="https://quantum.lang/ns">
+    <q:query name="cheap" source="items">SELECT name FROM items WHERE price &lt; 3 ORDER BY price</q:query>
+    <q:query name="total" source="items">SELECT SUM(price) AS total FROM items</q:query>
+    <q:query name="top" source="cheap">SELECT name FROM cheap ORDER BY name DESC LIMIT 1</q:query>
+</q:component>'''
+
+
+class TestComponentQueryOfQueries:
+    """Tests for q:query source="..." """
+
+    def test_sources_reused_in_request(self, parser):
+        runtime = ComponentRuntime()
+        ast = parser.parse(QOQ_COMPONENT)
+        runtime.execution_context.set_variable('items', _rows(3), scope='component')
+        runtime.execute_component(ast)
+
+        context = runtime.execution_context
+        assert [row['name'] for row in context.get_variable('cheap')] == ['item1']
+        assert context.get_variable('total.total') == 9.0
+        assert context.get_variable('top.name') == 'item1'
+        assert runtime.qoq_engine.stats()['loads'] == 2
+        assert runtime.qoq_engine.stats()['reuses'] == 1
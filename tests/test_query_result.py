@@ -0,0 +1,235 @@
+"""
+Tests for the columnar QueryResult representation
+
+Tests cover:
+- Rows returned as Row views sharing one column index
+- Dict compatibility (equality, repr, .get, items) and template access
+- to_dict() without copying rows, columnar to_json()
+- Memory footprint compared to per-row dicts
+- Pickling (Redis query cache)
+- Rows in q:set objects, cache size estimates, job and message params
+- Rows in q:dump output and q:log context
+"""
+
+import json
+import pickle
+import tracemalloc
+
+import pytest
+
+from runtime.component import ComponentRuntime
+from runtime.database_service import DatabaseService
+from runtime.query_stream import Row, column_index, json_default
+from runtime.service_container import ServiceContainer
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = DatabaseService(local_datasources={
+        'db': {'type': 'sqlite', 'database': str(tmp_path / 'result.db')}
+    })
+    service.execute_query('db', "CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, email TEXT)")
+    service.execute_query('db', "INSERT INTO users (name, email) VALUES ('ada', 'ada@example.com')")
+    service.execute_query('db', "INSERT INTO users (name, email) VALUES ('bob', 'bob@example.com')")
+    yield service
+    service.shutdown()
+
+
+class TestRows:
+    """Tests for Row views in QueryResult.data"""
+
+    def test_rows_share_columns(self, service):
+        result = service.execute_query('db', "SELECT id, name FROM users ORDER BY id")
+        assert result.column_list == ['id', 'name']
+        assert all(isinstance(row, Row) for row in result.data)
+        assert result.data[0]._index is result.data[1]._index
+
+    def test_dict_compatible(self, service):
+        result = service.execute_query('db', "SELECT id, name FROM users ORDER BY id")
+        row = result.data[0]
+        assert row == {'id': 1, 'name': 'ada'}
+        assert result.data == [{'id': 1, 'name': 'ada'}, {'id': 2, 'name': 'bob'}]
+        assert repr(row) == repr({'id': 1, 'name': 'ada'})
+        assert row.name == 'ada'
+        assert dict(row.items()) == {'id': 1, 'name': 'ada'}
+        assert row.get('email', 'none') == 'none'
+
+    def test_empty_result_keeps_columns(self, service):
+        result = service.execute_query('db', "SELECT id, name FROM users WHERE id = 0")
+        assert result.data == []
+        assert result.column_list == ['id', 'name']
+
+    def test_pickle_roundtrip(self, service):
+        result = service.execute_query('db', "SELECT id, name FROM users ORDER BY id")
+        restored = pickle.loads(pickle.dumps(result))
+        assert restored.data == result.data
+        assert restored.data[1].name == 'bob'
+
+
+class TestSerialization:
+    """Tests for to_dict() and to_json()"""
+
+    def test_to_dict_shares_rows(self, service):
+        result = service.execute_query('db', "SELECT id FROM users")
+        result_dict = result.to_dict()
+        assert result_dict['data'] is result.data
+        assert result_dict['columnList'] == ['id']
+        assert result_dict['recordCount'] == 2
+
+    def test_to_json_is_columnar(self, service):
+        result = service.execute_query('db', "SELECT id, name FROM users ORDER BY id")
+        payload = json.loads(result.to_json())
+        assert payload['columns'] == ['id', 'name']
+        assert payload['rows'] == [[1, 'ada'], [2, 'bob']]
+        assert payload['recordCount'] == 2
+
+    def test_json_default(self):
+        row = Row(column_index(['a']), (1,))
+        assert json.dumps([row], default=json_default) == '[{"a": 1}]'
+
+
+class TestMemory:
+    """Tests for the memory footprint of wide results"""
+
+    def test_smaller_than_dicts(self):
+        columns = [f'column_{i}' for i in range(20)]
+        values = [tuple(range(20)) for _ in range(2000)]
+
+        def measure(build):
+            tracemalloc.start()
+            rows = build()
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            assert len(rows) == 2000
+            return size
+
+        index = column_index(columns)
+        as_rows = measure(lambda: [Row(index, row) for row in values])
+        as_dicts = measure(lambda: [dict(zip(columns, row)) for row in values])
+        assert as_dicts > 3 * as_rows
+
+
+class TestTemplateAccess:
+    """Tests for query rows in templates"""
+
+    def test_single_row_fields_and_loop(self, parser, service):
+        services = ServiceContainer()
+        services._services['database'] = service
+        runtime = ComponentRuntime(services=services)
+
+        ast = parser.parse('''<q:component name="T" xmlns:q="https://quantum.lang/ns">
+            <q:query name="user" datasource="db">SELECT name, email FROM users WHERE id = 1</q:query>
+            <q:query name="users" datasource="db">SELECT name FROM users ORDER BY id</q:query>
+            <q:set name="names" value="" />
+            <q:loop query="users">
+                <q:set name="names" value="{names}{name};" />
+            </q:loop>
+        </q:component>''')
+        runtime.execute_component(ast)
+
+        context = runtime.execution_context
+        assert context.get_variable('user.email') == 'ada@example.com'
+        assert context.get_variable('names') == 'ada;bob;'
+
+
+class TestRowConsumers:
+    """Tests for code that takes rows where it used to take dicts"""
+
+    def test_object_set_and_operations(self, parser, service):
+        services = ServiceContainer()
+        services._services['database'] = service
+        runtime = ComponentRuntime(services=services)
+
+        ast = parser.parse('''<q:component name="T" xmlns:q="https://quantum.lang/ns">
+            <q:query name="users" datasource="db">SELECT id, name FROM users ORDER BY id</q:query>
+            <q:set name="first" type="object" value="{users[0]}" />
+        </q:component>''')
+        runtime.execute_component(ast)
+
+        context = runtime.execution_context
+        assert context.get_variable('first') == {'id': 1, 'name': 'ada'}
+
+        # Object operations on a variable holding a row
+        row = context.get_variable('users')[1]
+        context.set_variable('user', row, scope="component")
+        context.set_variable('source', row, scope="component")
+        statements = parser.parse('''<q:component name="Ops" xmlns:q="https://quantum.lang/ns">
+            <q:set name="user" operation="setProperty" key="role" value="admin" />
+            <q:set name="user" operation="clone" source="source" />
+        </q:component>''').statements
+        assert runtime._execute_set_object_operation(statements[0], context, {}) == {
+            'id': 2, 'name': 'bob', 'role': 'admin'}
+        cloned = runtime._execute_set_object_operation(statements[1], context, {})
+        assert cloned == {'id': 2, 'name': 'bob'}
+        assert type(cloned) is dict
+
+    def test_cache_size_counts_values(self):
+        from runtime.query_cache import VALUE_OVERHEAD, estimate_result_size
+        from runtime.database_service import QueryResult
+
+        index = column_index(['c'])
+        rows = [Row(index, ('x' * 100,))]
+        size = estimate_result_size(QueryResult(data=rows, column_list=['c'], execution_time=0.0, record_count=1))
+        dict_size = estimate_result_size(QueryResult(data=[{'c': 'x' * 100}], column_list=['c'],
+                                                     execution_time=0.0, record_count=1))
+        assert size == dict_size
+        assert size > VALUE_OVERHEAD + 100
+
+    def test_row_job_and_message_params(self, service, tmp_path):
+        from runtime.job_executor import JobQueueService
+        from runtime.message_queue_service import MessageQueueService
+
+        row = service.execute_query('db', "SELECT id, name FROM users WHERE id = 1").data[0]
+
+        jobs = JobQueueService(db_path=str(tmp_path / 'jobs.db'))
+        job_id = jobs.dispatch("welcome", params={'user': row})
+        assert jobs.get_job(job_id).params == {'user': {'id': 1, 'name': 'ada'}}
+
+        messages = MessageQueueService({'broker_type': 'memory'})
+        messages.connect()
+        try:
+            assert messages.publish("users.created", {'user': row}).success
+            assert messages.send("welcome", [row]).success
+        finally:
+            messages.disconnect()
+
+    def _run(self, parser, service, body):
+        services = ServiceContainer()
+        services._services['database'] = service
+        runtime = ComponentRuntime(services=services)
+        runtime.execute_component(parser.parse(f'''<q:component name="T" xmlns:q="https://quantum.lang/ns">
+            <q:query name="users" datasource="db">SELECT id, name FROM users ORDER BY id</q:query>
+            {body}
+        </q:component>'''))
+        return runtime.execution_context
+
+    def test_dump_rows(self, parser, service):
+        context = self._run(parser, service, '''
+            <q:dump var="{users}" label="json" format="json" />
+            <q:dump var="{users}" label="text" format="text" />
+            <q:dump var="{users}" label="html" />''')
+
+        dumped = context.get_variable('_dump_json')
+        assert json.loads(dumped.split('\n', 1)[1]) == [{'id': 1, 'name': 'ada'}, {'id': 2, 'name': 'bob'}]
+        text = context.get_variable('_dump_text')
+        assert '(dict, 2 items)' in text
+        assert 'name => "ada" (str)' in text
+        assert '(Row)' not in text
+        html = context.get_variable('_dump_html')
+        assert '(dict, 2 items)' in html
+        assert '(Row)' not in html
+
+    def test_log_row_context(self, parser, service, caplog):
+        with caplog.at_level('INFO'):
+            self._run(parser, service, '''
+                <q:log level="info" message="Loaded" context="{users[0]}" />''')
+
+        messages = [record.getMessage() for record in caplog.records if record.getMessage().startswith('Loaded')]
+        assert messages == ['Loaded | context={"id": 1, "name": "ada"}']
+
+    def test_log_service_serializes_rows(self, service):
+        from core.features.logging.src import LoggingService
+
+        rows = service.execute_query('db', "SELECT id, name FROM users ORDER BY id").data
+        result = LoggingService().log('info', 'Loaded', context={'users': rows})
+        assert result['success']
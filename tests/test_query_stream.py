@@ -0,0 +1,188 @@
+"""
+Tests for streaming q:query results
+
+Tests cover:
+- Row mapping/attribute access sharing one column index
+- DatabaseService.stream_query fetching lazily in batches (SQLite)
+- maxrows, re-iteration and connection release
+- The cursor opened on first iteration, not at q:query
+- q:query stream="true" feeding q:loop and HTMLRenderer
+"""
+
+import pytest
+
+from runtime.component import ComponentRuntime
+from runtime.database_service import DatabaseService, QueryExecutionError
+from runtime.query_stream import QueryStream, Row, column_index
+from runtime.renderer import HTMLRenderer
+from runtime.service_container import ServiceContainer
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = DatabaseService(local_datasources={
+        'db': {'type': 'sqlite', 'database': str(tmp_path / 'stream.db'), 'pool_size': 1, 'max_overflow': 0}
+    })
+    service.execute_query('db', "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    with service.connection(service.get_datasource_config('db')) as conn:
+        conn.executemany(
+            "INSERT INTO items (name) VALUES (?)",
+            [(f'item{i}',) for i in range(1, 251)]
+        )
+        conn.commit()
+    yield service
+    service.shutdown()
+
+
+class TestRow:
+    """Tests for the Row mapping"""
+
+    def test_access(self):
+        index = column_index(['id', 'name'])
+        row = Row(index, (1, 'ada'))
+        assert row['name'] == 'ada'
+        assert row.id == 1
+        assert list(row) == ['id', 'name']
+        assert row == {'id': 1, 'name': 'ada'}
+        assert row.get('missing') is None
+        with pytest.raises(AttributeError):
+            row.missing
+
+    def test_rows_share_index(self):
+        index = column_index(['id'])
+        assert Row(index, (1,))._index is Row(index, (2,))._index
+
+
+class TestStreamQuery:
+    """Tests for DatabaseService.stream_query"""
+
+    def test_streams_all_rows(self, service):
+        stream = service.stream_query('db', "SELECT id, name FROM items ORDER BY id", fetch_size=16)
+        assert isinstance(stream, QueryStream)
+        assert stream.columns == ['id', 'name']
+
+        names = [row['name'] for row in stream]
+        assert len(names) == 250
+        assert names[0] == 'item1'
+        assert stream.rows_read == 250
+
+    def test_fetches_in_batches(self, service, monkeypatch):
+        fetches = []
+
+        original = service._open_stream_cursor
+
+        def open_cursor(conn, db_type):
+            cursor = original(conn, db_type)
+
+            class Recording:
+                description = property(lambda self: cursor.description)
+
+                def execute(self, *args):
+                    return cursor.execute(*args)
+
+                def fetchmany(self, size):
+                    rows = cursor.fetchmany(size)
+                    fetches.append(len(rows))
+                    return rows
+
+                def close(self):
+                    cursor.close()
+
+            return Recording()
+
+        monkeypatch.setattr(service, '_open_stream_cursor', open_cursor)
+        stream = service.stream_query('db', "SELECT id FROM items", fetch_size=100)
+        assert fetches == []
+
+        iterator = iter(stream)
+        for _ in range(150):
+            next(iterator)
+        assert fetches == [100, 100]
+        iterator.close()
+
+    def test_max_rows(self, service):
+        stream = service.stream_query('db', "SELECT id FROM items ORDER BY id", fetch_size=7, max_rows=10)
+        assert [row.id for row in stream] == list(range(1, 11))
+
+    def test_reiteration_reexecutes(self, service):
+        stream = service.stream_query('db', "SELECT id FROM items", max_rows=3)
+        assert len(list(stream)) == 3
+        assert len(list(stream)) == 3
+
+    def test_connection_released(self, service):
+        pool = service.get_pool(service.get_datasource_config('db'))
+
+        stream = service.stream_query('db', "SELECT id FROM items")
+        iterator = iter(stream)
+        next(iterator)
+        assert pool.stats()['in_use'] == 1
+        iterator.close()
+        assert pool.stats()['in_use'] == 0
+
+        # A single-connection pool is usable again
+        assert service.execute_query('db', "SELECT COUNT(*) AS n FROM items").data[0]['n'] == 250
+
+    def test_cursor_opened_on_first_iteration(self, service):
+        pool = service.get_pool(service.get_datasource_config('db'))
+
+        stream = service.stream_query('db', "SELECT id FROM items ORDER BY id")
+        assert pool.stats()['in_use'] == 0
+        assert stream.to_dict()['columnList'] is None
+        # The single-connection pool is free between q:query and q:loop
+        assert service.execute_query('db', "SELECT COUNT(*) AS n FROM items").data[0]['n'] == 250
+
+        assert next(iter(stream)).id == 1
+        assert stream.to_dict()['columnList'] == ['id']
+
+    def test_errors_surface_on_iteration(self, service):
+        stream = service.stream_query('db', "SELECT nope FROM items")
+        with pytest.raises(QueryExecutionError):
+            list(stream)
+
+
+STREAM_COMPONENT = '''<q:component name="Items" xmlns:q="https://quantum.lang/ns">
+    <q:query name="items" datasource="db" stream="true" fetchSize="8" maxrows="20">
+        SELECT id, name FROM items ORDER BY id
+    </q:query>
+    <ul>
+        <q:loop query="items">
+            <li>{items.name}</li>
+        </q:loop>
+    </ul>
+</q:component>'''
+
+
+class TestStreamingComponent:
+    """Tests for q:query stream="true" """
+
+    def _runtime(self, service):
+        services = ServiceContainer()
+        services._services['database'] = service
+        return ComponentRuntime(services=services)
+
+    def test_parse(self, parser):
+        from core.ast_nodes import QueryNode
+        ast = parser.parse(STREAM_COMPONENT)
+        node = next(s for s in ast.statements if isinstance(s, QueryNode))
+        assert node.stream is True
+        assert node.fetch_size == 8
+        assert node.maxrows == 20
+
+    def test_variable_is_stream(self, parser, service):
+        runtime = self._runtime(service)
+        runtime.execute_component(parser.parse(STREAM_COMPONENT))
+
+        items = runtime.execution_context.get_variable('items')
+        assert isinstance(items, QueryStream)
+        assert runtime.execution_context.get_variable('items_result')['streaming'] is True
+
+    def test_renderer_iterates_stream(self, parser, service):
+        runtime = self._runtime(service)
+        ast = parser.parse(STREAM_COMPONENT)
+        runtime.execute_component(ast)
+
+        renderer = HTMLRenderer(runtime.execution_context)
+        html = ''.join(renderer.iter_render(ast, chunk_size=64))
+        assert html.count('<li>') == 20
+        assert '<li>item1</li>' in html
+        assert '<li>item20</li>' in html
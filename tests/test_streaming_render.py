@@ -0,0 +1,169 @@
+"""
+Tests for streaming HTML rendering
+
+Tests cover:
+- HTMLRenderer.iter_render() producing the same markup as render()
+- Chunking and the early flush after </head>
+- Structural injections before closing tags
+- Loop variables restored when a stream is closed early
+- Streaming responses from the web server (performance.stream_responses)
+"""
+
+import pytest
+import yaml
+
+from runtime.component import ComponentRuntime
+from runtime.renderer import HTMLRenderer
+
+
+PAGE_COMPONENT = '''<q:component name="Page" type="page">
+    <q:set name="items" value="[1, 2, 3, 4, 5, 6, 7, 8, 9, 10]" type="array" />
+    <html>
+        <head><title>Items</title></head>
+        <body>
+            <ul>
+                <q:loop type="array" items="{items}" var="item">
+                    <li class="item-{item}">Item {item}</li>
+                </q:loop>
+            </ul>
+        </body>
+    </html>
+</q:component>'''
+
+# The <html> element is not top-level, so only the rendered output shows a document
+CONDITIONAL_PAGE_COMPONENT = '''<q:component name="ConditionalPage" type="page">
+    <q:set name="ready" value="true" type="boolean" />
+    <q:if condition="{ready}">
+        <html>
+            <head><title>Ready</title></head>
+            <body><p>Ready</p></body>
+        </html>
+    </q:if>
+</q:component>'''
+
+FRAGMENT_COMPONENT = '''<q:component name="Fragment">
+    <q:set name="title" value="Hello" />
+    <h1>{title}</h1>
+</q:component>'''
+
+
+def _renderer_for(parser, source):
+    ast = parser.parse(source)
+    runtime = ComponentRuntime()
+    runtime.execute_component(ast)
+    return HTMLRenderer(runtime.execution_context), ast
+
+
+class TestIterRender:
+    """Tests for HTMLRenderer.iter_render()"""
+
+    def test_matches_render(self, parser):
+        renderer, ast = _renderer_for(parser, PAGE_COMPONENT)
+
+        html = renderer.render(ast)
+        assert ''.join(renderer.iter_render(ast, chunk_size=16)) == html
+        assert 'class="item-10"' in html
+
+    def test_chunking(self, parser):
+        renderer, ast = _renderer_for(parser, PAGE_COMPONENT)
+
+        chunks = list(renderer.iter_render(ast, chunk_size=64))
+
+        assert len(chunks) > 2
+        assert all(chunks)
+
+    def test_flushes_after_head(self, parser):
+        renderer, ast = _renderer_for(parser, PAGE_COMPONENT)
+
+        first = next(renderer.iter_render(ast, chunk_size=1024 * 1024))
+
+        assert first.endswith('</head>')
+
+    def test_injections_before_closing_tags(self, parser):
+        renderer, ast = _renderer_for(parser, PAGE_COMPONENT)
+
+        html = ''.join(renderer.iter_render(ast, injections={
+            'HEAD': '<script src="htmx.js"></script>',
+            'body': '<script>init()</script>',
+        }))
+
+        assert '<script src="htmx.js"></script></head>' in html
+        assert '<script>init()</script></body>' in html
+        assert html.count('htmx.js') == 1
+
+    def test_injections_are_per_stream(self, parser):
+        renderer, ast = _renderer_for(parser, PAGE_COMPONENT)
+        list(renderer.iter_render(ast, injections={'head': '<meta name="x">'}))
+
+        assert '<meta name="x">' not in ''.join(renderer.iter_render(ast))
+
+    def test_closing_stream_restores_loop_variables(self, parser):
+        renderer, ast = _renderer_for(parser, PAGE_COMPONENT)
+        renderer.context.set_variable('item', 'outer')
+
+        stream = renderer.iter_render(ast, chunk_size=1)
+        for chunk in stream:
+            if 'Item 3' in chunk:
+                break
+        stream.close()
+
+        assert renderer.context.get_variable('item') == 'outer'
+
+
+class TestStreamingServer:
+    """Tests for streamed responses from QuantumWebServer"""
+
+    @pytest.fixture
+    def server(self, tmp_path, monkeypatch):
+        from runtime.web_server import QuantumWebServer
+
+        components = tmp_path / 'components'
+        components.mkdir()
+        (components / 'page.q').write_text(PAGE_COMPONENT)
+        (components / 'fragment.q').write_text(FRAGMENT_COMPONENT)
+        (components / 'conditional.q').write_text(CONDITIONAL_PAGE_COMPONENT)
+
+        config_path = tmp_path / 'quantum.config.yaml'
+        config_path.write_text(yaml.safe_dump({
+            'paths': {'components': str(components), 'static': str(tmp_path / 'static')},
+            'performance': {'stream_responses': True, 'stream_chunk_size': 64},
+        }))
+
+        monkeypatch.chdir(tmp_path)
+        server = QuantumWebServer(config_path=str(config_path))
+        server.app.config['TESTING'] = True
+        return server
+
+    def test_full_document_is_streamed(self, server):
+        response = server.app.test_client().get('/page')
+
+        assert response.status_code == 200
+        assert 'Content-Length' not in response.headers
+        html = response.get_data(as_text=True)
+        assert html.startswith('<!DOCTYPE html>')
+        assert 'htmx.org' in html.split('</head>')[0]
+        assert 'htmx.config.defaultSwapStyle' in html.split('</body>')[0]
+        assert 'Item 10' in html
+
+    def test_nested_document_is_not_wrapped(self, server):
+        html = server.app.test_client().get('/conditional').get_data(as_text=True)
+
+        assert html.count('<html') == 1
+        assert 'Quantum</title>' not in html
+        assert 'htmx.org' in html.split('</head>')[0]
+        assert 'htmx.config.defaultSwapStyle' in html.split('</body>')[0]
+
+    def test_fragment_is_wrapped(self, server):
+        response = server.app.test_client().get('/fragment')
+
+        assert 'Content-Length' not in response.headers
+        html = response.get_data(as_text=True)
+        assert '<title>fragment - Quantum</title>' in html
+        assert '<h1>Hello</h1>' in html
+        assert html.rstrip().endswith('</html>')
+
+    def test_partials_are_not_streamed(self, server):
+        response = server.app.test_client().get('/_partial/fragment')
+
+        assert 'Content-Length' in response.headers
+        assert response.get_data(as_text=True) == '<h1>Hello</h1>'
@@ -0,0 +1,280 @@
+"""
+Tests for q:transaction on DatabaseService
+
+Tests cover:
+- One pinned connection with a real BEGIN/COMMIT/ROLLBACK (SQLite)
+- Savepoints for nested transactions
+- Repeated INSERT/UPDATE statements batched into executemany() (opt-in)
+- Query cache invalidation on commit
+- q:transaction around a q:loop of inserts in ComponentRuntime
+"""
+
+import sqlite3
+
+import pytest
+
+from runtime.component import ComponentRuntime, ComponentExecutionError
+from runtime.database_service import (
+    DatabaseService, QueryExecutionError, WRITE_BATCH_SIZE, is_batchable_write
+)
+from runtime.service_container import ServiceContainer
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'tx.db')
+
+
+@pytest.fixture
+def service(db_path):
+    service = DatabaseService(local_datasources={
+        'db': {'type': 'sqlite', 'database': db_path}
+    })
+    service.execute_query('db', "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, qty INTEGER)")
+    yield service
+    service.shutdown()
+
+
+def _count(db_path):
+    """Row count seen by a separate connection (committed data only)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestBatchableWrites:
+    """Tests for executemany() eligibility"""
+
+    def test_detection(self):
+        assert is_batchable_write("INSERT INTO items (name) VALUES (:name)")
+        assert is_batchable_write("-- add\n  update items SET qty = :qty WHERE id = :id")
+        assert not is_batchable_write("INSERT INTO items (name) VALUES (:name) RETURNING id")
+        assert not is_batchable_write("DELETE FROM items")
+        assert not is_batchable_write("SELECT * FROM items")
+
+
+class TestTransactions:
+    """Tests for begin/commit/rollback on a real connection"""
+
+    def test_commit(self, service, db_path):
+        transaction = service.begin_transaction('db')
+        service.execute_query('db', "INSERT INTO items (name) VALUES ('a')")
+        service.execute_query('db', "DELETE FROM items WHERE name = 'zzz'")
+        assert _count(db_path) == 0
+
+        service.commit_transaction(transaction)
+        assert transaction['committed']
+        assert _count(db_path) == 1
+        assert service.get_pool_stats()['db']['in_use'] == 0
+
+    def test_rollback(self, service, db_path):
+        transaction = service.begin_transaction('db')
+        for i in range(10):
+            service.execute_query('db', "INSERT INTO items (name) VALUES (:name)", {'name': f'i{i}'})
+        service.rollback_transaction(transaction)
+
+        assert _count(db_path) == 0
+        assert service.execute_query('db', "SELECT COUNT(*) AS n FROM items").data[0]['n'] == 0
+
+    def test_nested_rollback_to_savepoint(self, service, db_path):
+        outer = service.begin_transaction('db')
+        service.execute_query('db', "INSERT INTO items (name) VALUES ('outer')")
+        inner = service.begin_transaction('db')
+        assert inner['savepoint']
+        service.execute_query('db', "INSERT INTO items (name) VALUES ('inner')")
+        service.rollback_transaction(inner)
+        service.commit_transaction(outer)
+
+        names = [row['name'] for row in service.execute_query('db', "SELECT name FROM items").data]
+        assert names == ['outer']
+
+    def test_nested_commit(self, service, db_path):
+        outer = service.begin_transaction('db')
+        inner = service.begin_transaction('db')
+        service.execute_query('db', "INSERT INTO items (name) VALUES ('inner')")
+        service.commit_transaction(inner)
+        assert _count(db_path) == 0
+        service.commit_transaction(outer)
+        assert _count(db_path) == 1
+
+    def test_finished_transaction_is_noop(self, service):
+        transaction = service.begin_transaction('db')
+        service.rollback_transaction(transaction)
+        assert service.rollback_transaction(transaction)
+        assert service.get_pool_stats()['db']['in_use'] == 0
+
+
+class TestBatching:
+    """Tests for executemany() of repeated writes"""
+
+    def test_repeated_inserts_batched(self, service, db_path):
+        transaction = service.begin_transaction('db', batch_writes=True)
+        for i in range(50):
+            result = service.execute_query('db', "INSERT INTO items (name, qty) VALUES (:name, :qty)",
+                                           {'name': f'i{i}', 'qty': i})
+            # The first run executes at once; repeats are queued
+            assert result.batched == (i > 0)
+
+        # Reads see the queued rows
+        assert service.execute_query('db', "SELECT COUNT(*) AS n FROM items").data[0]['n'] == 50
+        service.commit_transaction(transaction)
+
+        assert transaction['batched_rows'] == 49
+        assert _count(db_path) == 50
+
+    def test_not_batched_by_default(self, service, db_path):
+        transaction = service.begin_transaction('db')
+        for i in range(5):
+            result = service.execute_query('db', "INSERT INTO items (name) VALUES (:name)", {'name': f'i{i}'})
+            assert not result.batched
+            assert result.affected_rows == 1
+            assert result.last_insert_id == i + 1
+        service.commit_transaction(transaction)
+
+        assert transaction['batched_rows'] == 0
+        assert _count(db_path) == 5
+
+    def test_nested_transaction_inherits_batching(self, service):
+        outer = service.begin_transaction('db', batch_writes=True)
+        inner = service.begin_transaction('db')
+        assert inner['batch_writes']
+        service.commit_transaction(inner)
+        service.commit_transaction(outer)
+
+    def test_single_insert_reports_insert_id(self, service):
+        transaction = service.begin_transaction('db', batch_writes=True)
+        result = service.execute_query('db', "INSERT INTO items (name) VALUES (:name)", {'name': 'order'})
+        assert not result.batched
+        assert result.last_insert_id == 1
+        assert result.affected_rows == 1
+
+        detail = service.execute_query('db', "UPDATE items SET qty = :qty WHERE id = :id",
+                                       {'qty': 3, 'id': result.last_insert_id})
+        assert detail.affected_rows == 1
+        service.commit_transaction(transaction)
+
+    def test_batch_flushed_when_statement_changes(self, service):
+        transaction = service.begin_transaction('db', batch_writes=True)
+        service.execute_query('db', "INSERT INTO items (name, qty) VALUES ('a', 1)")
+        service.execute_query('db', "UPDATE items SET qty = qty + :n", {'n': 10})
+        service.execute_query('db', "UPDATE items SET qty = qty + :n", {'n': 5})
+        service.commit_transaction(transaction)
+        assert service.execute_query('db', "SELECT qty FROM items").data[0]['qty'] == 16
+
+    def test_full_batch_sent(self, service, monkeypatch):
+        calls = []
+        transaction = service.begin_transaction('db', batch_writes=True)
+        root_flush = service._flush_writes
+
+        def flush(root):
+            if root.get('_batch'):
+                calls.append(len(root['_batch'][1]))
+            root_flush(root)
+
+        monkeypatch.setattr(service, '_flush_writes', flush)
+        for i in range(WRITE_BATCH_SIZE + 3):
+            service.execute_query('db', "INSERT INTO items (qty) VALUES (:i)", {'i': i})
+        service.commit_transaction(transaction)
+        assert calls == [WRITE_BATCH_SIZE, 2]
+
+    def test_batched_error_rolls_back(self, service, db_path):
+        service.execute_query('db', "CREATE UNIQUE INDEX items_name ON items (name)")
+        transaction = service.begin_transaction('db', batch_writes=True)
+        for name in ('a', 'b', 'a'):
+            service.execute_query('db', "INSERT INTO items (name) VALUES (:name)", {'name': name})
+        with pytest.raises(QueryExecutionError):
+            service.commit_transaction(transaction)
+
+        assert transaction['rolled_back']
+        assert _count(db_path) == 0
+        assert service.get_pool_stats()['db']['in_use'] == 0
+
+    def test_batched_error_deferred_to_flush(self, service):
+        service.execute_query('db', "CREATE UNIQUE INDEX items_name ON items (name)")
+        transaction = service.begin_transaction('db', batch_writes=True)
+        for name in ('a', 'b', 'a'):
+            # The duplicate is only queued: no error, no row count
+            result = service.execute_query('db', "INSERT INTO items (name) VALUES (:name)", {'name': name})
+        assert result.batched
+        assert result.record_count == 0
+
+        # The next other statement flushes the batch and raises
+        with pytest.raises(QueryExecutionError, match='Batched write failed'):
+            service.execute_query('db', "SELECT COUNT(*) AS n FROM items")
+        service.rollback_transaction(transaction)
+
+    def test_unbatched_error_raised_at_query(self, service):
+        service.execute_query('db', "CREATE UNIQUE INDEX items_name ON items (name)")
+        transaction = service.begin_transaction('db')
+        service.execute_query('db', "INSERT INTO items (name) VALUES ('a')")
+        with pytest.raises(QueryExecutionError):
+            service.execute_query('db', "INSERT INTO items (name) VALUES ('a')")
+        service.rollback_transaction(transaction)
+
+    def test_commit_invalidates_cache(self, service):
+        sql = "SELECT COUNT(*) AS n FROM items"
+        assert service.execute_query('db', sql, cache_ttl=60).data[0]['n'] == 0
+
+        transaction = service.begin_transaction('db')
+        service.execute_query('db', "INSERT INTO items (name) VALUES ('a')")
+        service.commit_transaction(transaction)
+
+        result = service.execute_query('db', sql, cache_ttl=60)
+        assert not result.cached
+        assert result.data[0]['n'] == 1
+
+
+LOOP_COMPONENT = '''<q:component name="Bulk" xmlns:q="https://quantum.lang/ns">
+    <q:transaction batch="true">
+        <q:loop type="range" var="i" from="1" to="COUNT">
+            <q:query name="add" datasource="db">
+                INSERT INTO items (name, qty) VALUES (:name, :qty)
+                <q:param name="name" value="item{i}" type="string" />
+                <q:param name="qty" value="{i}" type="integer" />
+            </q:query>
+        </q:loop>
+        <q:query name="total" datasource="db">SELECT SUM(qty) AS total FROM items</q:query>
+    </q:transaction>
+</q:component>'''
+
+
+class TestComponentTransaction:
+    """Tests for q:transaction in ComponentRuntime"""
+
+    def _runtime(self, service):
+        services = ServiceContainer()
+        services._services['database'] = service
+        return ComponentRuntime(services=services)
+
+    def test_loop_inserts_batched(self, parser, service, db_path):
+        runtime = self._runtime(service)
+        runtime.execute_component(parser.parse(LOOP_COMPONENT.replace('COUNT', '200')))
+
+        result = runtime.execution_context.get_variable('_transaction_result')
+        assert result['committed']
+        assert result['batched_rows'] == 199
+        assert runtime.execution_context.get_variable('total')[0]['total'] == sum(range(1, 201))
+        assert _count(db_path) == 200
+
+    def test_loop_inserts_unbatched_by_default(self, parser, service, db_path):
+        runtime = self._runtime(service)
+        ast = parser.parse(LOOP_COMPONENT.replace('COUNT', '20').replace(' batch="true"', ''))
+        assert not ast.statements[0].batch
+        runtime.execute_component(ast)
+
+        result = runtime.execution_context.get_variable('_transaction_result')
+        assert result['committed']
+        assert result['batched_rows'] == 0
+        assert _count(db_path) == 20
+
+    def test_failure_rolls_back_loop(self, parser, service, db_path):
+        runtime = self._runtime(service)
+        ast = parser.parse(LOOP_COMPONENT.replace('COUNT', '20').replace(
+            'SELECT SUM(qty) AS total FROM items', 'SELECT missing_column FROM items'
+        ))
+        with pytest.raises(ComponentExecutionError):
+            runtime.execute_component(ast)
+
+        assert _count(db_path) == 0
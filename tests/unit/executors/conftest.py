@@ -7,23 +7,45 @@ the interfaces required by BaseExecutor.
 
 import pytest
 import re
+from collections import ChainMap
 from unittest.mock import MagicMock
 from typing import Any, Dict
 
+from runtime.query_of_queries import QueryOfQueriesEngine
+
 
 class MockExecutionContext:
     """Mock execution context that mimics real ExecutionContext"""
 
     def __init__(self, variables: Dict[str, Any] = None):
         self._variables = variables.copy() if variables else {}
+        self._scopes = []
         self.parent = None
 
     def get_all_variables(self) -> Dict[str, Any]:
         """Get all variables"""
         return self._variables.copy()
 
+    @property
+    def variables(self) -> Dict[str, Any]:
+        """Live read-only view of all variables"""
+        if self._scopes:
+            return ChainMap(*self._scopes, self._variables)
+        return self._variables
+
+    def push_scope(self, scope):
+        """Layer a block scope above the variables"""
+        self._scopes.insert(0, scope)
+
+    def pop_scope(self):
+        """Remove the innermost block scope"""
+        return self._scopes.pop(0)
+
     def get_variable(self, name: str) -> Any:
         """Get a variable by name"""
+        for scope in self._scopes:
+            if name in scope:
+                return scope[name]
         if name in self._variables:
             return self._variables[name]
         # Support dotted access like "obj.field"
@@ -65,6 +87,7 @@ class MockRuntime:
     def __init__(self, variables: Dict[str, Any] = None):
         self.execution_context = MockExecutionContext(variables)
         self._executor_registry = MagicMock()
+        self.qoq_engine = QueryOfQueriesEngine()
 
     @property
     def services(self):
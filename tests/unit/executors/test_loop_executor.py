@@ -325,6 +325,33 @@ class TestQueryLoop:
         result = executor.execute(node, runtime.execution_context)
         assert result == [0, 1]
 
+    def test_query_loop_resolves_row_fields_lazily(self):
+        """Test {field} and {currentRow} resolve against each row"""
+        rows = [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}]
+        runtime = MockRuntime({"users": rows})
+        executor = LoopExecutor(runtime)
+
+        node = LoopNode("query", "users")
+        node.body = [
+            QuantumReturn(value="{name}"),
+            QuantumReturn(value="{currentRow}"),
+        ]
+
+        result = executor.execute(node, runtime.execution_context)
+        assert result == ["Alice", rows[0], "Bob", rows[1]]
+
+    def test_query_loop_scope_removed_after_loop(self):
+        """Test row fields do not leak into the context after the loop"""
+        runtime = MockRuntime({"users": [{"name": "Alice"}]})
+        executor = LoopExecutor(runtime)
+
+        node = LoopNode("query", "users")
+        node.body = [QuantumReturn(value="{name}")]
+
+        executor.execute(node, runtime.execution_context)
+        assert "name" not in runtime.execution_context.variables
+        assert "currentRow" not in runtime.execution_context.variables
+
     def test_query_loop_empty_results(self):
         """Test query loop with empty result set raises error (falsy check)"""
         # Note: The current executor treats empty list as "not found"
@@ -71,7 +71,7 @@ class MockDatabaseService:
         # Default empty result
         return MockQueryResult(success=True, data=[], record_count=0)
 
-    def begin_transaction(self, datasource: str):
+    def begin_transaction(self, datasource: str, isolation_level=None):
         return {"datasource": datasource, "active": True}
 
     def commit_transaction(self, context):
@@ -30,7 +30,7 @@ class MockDatabaseService:
         self.rolled_back = False
         self.last_datasource = None
 
-    def begin_transaction(self, datasource: str):
+    def begin_transaction(self, datasource: str, isolation_level=None):
         """Begin transaction"""
         self.transaction_started = True
         self.last_datasource = datasource
@@ -187,6 +187,52 @@ class TestServiceContainer:
         assert not container.is_initialized('logging')
         assert not container.is_initialized('dump')
 
+    def test_concurrent_access_creates_single_instance(self):
+        """Test that racing threads share one lazily created service"""
+        import threading
+        from runtime.service_container import ServiceContainer
+
+        container = ServiceContainer()
+        seen = []
+        barrier = threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            seen.append(container.logging)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(seen) == 8
+        assert all(service is seen[0] for service in seen)
+
+    def test_runtime_construction_is_lazy(self):
+        """Test that ComponentRuntime does not create services up front"""
+        from runtime.component import ComponentRuntime
+        from runtime.service_container import ServiceContainer
+
+        container = ServiceContainer()
+        runtime = ComponentRuntime(services=container)
+
+        assert runtime.services is container
+        assert container.initialized_services == []
+        assert runtime._executor_registry is None
+
+    def test_runtimes_share_container_services(self):
+        """Test that runtimes bound to one container share service instances"""
+        from runtime.component import ComponentRuntime
+        from runtime.service_container import ServiceContainer
+
+        container = ServiceContainer()
+        first = ComponentRuntime(services=container)
+        second = ComponentRuntime(services=container)
+
+        assert first.database_service is second.database_service
+        assert first.execution_context is not second.execution_context
+
 
 class TestControlFlowExecutors:
     """Test control flow executors"""